@@ -0,0 +1,10 @@
+"""
+Benchmark suite for JSON QA webapp.
+
+``corpus`` generates repeatable synthetic corpora (documents for a schema from
+``schemas/``, dummy PDFs, lock files, corrected documents and audit history) and
+``suite`` times the file, diff, validation and model primitives against one.
+
+Usage:
+    python -m benchmarks [--documents 500] [--audit-entries 5000] [--output results.json] [--baseline old.json]
+"""
@@ -0,0 +1,224 @@
+"""
+Synthetic corpus generator for the benchmark suite.
+
+``build_corpus(root, spec)`` writes a complete working tree under ``root``:
+
+- json_docs: ``spec.documents`` documents generated from a schema in ``schemas/``;
+  arrays get ``spec.array_size`` rows and values satisfy the field constraints
+  (patterns, lengths, ranges, choices) where a simple generator can
+- pdf_docs: a small dummy PDF per document
+- corrected: an edited copy of a ``spec.corrected`` share of the documents
+- locks: live locks on a ``spec.locked`` share of the pending documents
+- audits/audit.jsonl: ``spec.audit_entries`` audit entries built with
+  ``create_audit_diff_entry``
+
+Output is determined by ``spec.seed`` (lock expiry times aside), so runs with the
+same spec time the same work.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+import re
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCHEMAS_DIR = REPO_ROOT / "schemas"
+DEFAULT_SCHEMA = "purchase_order_with_items_schema.yaml"
+DIRECTORY_NAMES = ("json_docs", "corrected", "audits", "pdf_docs", "locks")
+
+BASE_TIME = datetime(2024, 1, 1, 9, 0, 0)
+
+# Distinct diffs generated for the audit history; entries cycle through them
+AUDIT_TEMPLATES = 20
+
+DUMMY_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+@dataclass
+class CorpusSpec:
+    """Size and shape of a synthetic corpus."""
+    documents: int = 200
+    schema: str = DEFAULT_SCHEMA
+    array_size: int = 10
+    audit_entries: int = 1000
+    corrected: float = 0.1
+    locked: float = 0.1
+    seed: int = 42
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Corpus:
+    """A generated corpus on disk."""
+    root: Path
+    spec: CorpusSpec
+    schema: Dict[str, Any]
+    documents: List[str]
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration pointing the app's directories at the corpus."""
+        return {'directories': {name: str(self.root / name) for name in DIRECTORY_NAMES}}
+
+    def load(self, filename: str) -> Dict[str, Any]:
+        with open(self.root / "json_docs" / filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def load_schema(name: str) -> Dict[str, Any]:
+    """Load a schema from ``schemas/`` (or a path)."""
+    import yaml
+
+    path = Path(name) if Path(name).exists() else SCHEMAS_DIR / name
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def _string_value(config: Dict[str, Any], rng: random.Random) -> str:
+    n = rng.randint(1000, 9999)
+    pattern = config.get('pattern')
+    if pattern:
+        candidates = [f"PO-{n}", f"{n % 90 + 10} PCS", str(n), f"{n % 24:02d}:{n % 60:02d}",
+                      f"user{n}@example.com", f"+1 555 {n}", f"ref_{n}"]
+        regex = re.compile(pattern)
+        for candidate in candidates:
+            if regex.match(candidate):
+                return candidate
+    label = str(config.get('label') or "Value")
+    value = f"{label} {n}"
+    min_length = int(config.get('min_length') or 0)
+    if len(value) < min_length:
+        value = value.ljust(min_length, "x")
+    max_length = config.get('max_length')
+    return value[:int(max_length)] if max_length else value
+
+
+def _number_value(config: Dict[str, Any], rng: random.Random, integer: bool) -> Any:
+    low = config.get('min_value', 0)
+    high = config.get('max_value', 10000)
+    if integer:
+        return rng.randint(int(low), int(high))
+    return round(rng.uniform(float(low), float(high)), 2)
+
+
+def generate_value(config: Dict[str, Any], rng: random.Random, array_size: int) -> Any:
+    """Return a value for a field configuration."""
+    field_type = config.get('type', 'string')
+    if field_type == 'string':
+        return _string_value(config, rng)
+    if field_type in ('number', 'integer'):
+        return _number_value(config, rng, field_type == 'integer')
+    if field_type == 'boolean':
+        return rng.random() < 0.5
+    if field_type == 'date':
+        return (BASE_TIME - timedelta(days=rng.randint(0, 365))).date().isoformat()
+    if field_type == 'datetime':
+        return (BASE_TIME - timedelta(minutes=rng.randint(0, 525600))).isoformat()
+    if field_type == 'enum':
+        choices = config.get('choices') or ["A"]
+        return rng.choice(choices)
+    if field_type == 'object':
+        return {name: generate_value(sub, rng, array_size) for name, sub in (config.get('properties') or {}).items()}
+    if field_type == 'array':
+        items = config.get('items') or {'type': 'string'}
+        return [generate_value(items, rng, array_size) for _ in range(array_size)]
+    return None
+
+
+def generate_document(schema: Dict[str, Any], rng: random.Random, array_size: int) -> Dict[str, Any]:
+    """Return a document with a value for every schema field."""
+    return {name: generate_value(config, rng, array_size) for name, config in schema.get('fields', {}).items()}
+
+
+def edit_document(document: Dict[str, Any], schema: Dict[str, Any], rng: random.Random,
+                  edits: int = 3) -> Dict[str, Any]:
+    """Return a reviewer-style correction: a few scalar edits, one array row edited and one added."""
+    edited = copy.deepcopy(document)
+    fields = schema.get('fields', {})
+    scalars = [name for name, config in fields.items() if config.get('type') not in ('array', 'object')]
+    for name in rng.sample(scalars, min(edits, len(scalars))):
+        edited[name] = generate_value(fields[name], rng, 0)
+    for name, config in fields.items():
+        rows = edited.get(name)
+        if config.get('type') == 'array' and isinstance(rows, list) and rows:
+            rows[rng.randrange(len(rows))] = generate_value(config.get('items') or {}, rng, 0)
+            rows.append(generate_value(config.get('items') or {}, rng, 0))
+            break
+    return edited
+
+
+def _write_json(path: Path, data: Any) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def build_corpus(root: Path, spec: Optional[CorpusSpec] = None) -> Corpus:
+    """
+    Write a synthetic corpus under ``root``.
+
+    Args:
+        root: Directory to create the corpus in (normally empty)
+        spec: Corpus size and shape
+
+    Returns:
+        Corpus describing what was written
+    """
+    from utils.diff_utils import create_audit_diff_entry
+
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    schema = load_schema(spec.schema)
+    root = Path(root)
+    for name in DIRECTORY_NAMES:
+        (root / name).mkdir(parents=True, exist_ok=True)
+
+    filenames: List[str] = []
+    corrected_count = int(spec.documents * spec.corrected)
+    locked_count = int(spec.documents * spec.locked)
+    lock_expiry = (datetime.now() + timedelta(days=1)).isoformat()
+    templates: List[Dict[str, Any]] = []
+
+    for i in range(spec.documents):
+        filename = f"doc_{i:05d}.json"
+        filenames.append(filename)
+        document = generate_document(schema, rng, spec.array_size)
+        _write_json(root / "json_docs" / filename, document)
+        (root / "pdf_docs" / filename.replace('.json', '.pdf')).write_bytes(DUMMY_PDF)
+
+        if i < corrected_count or len(templates) < AUDIT_TEMPLATES:
+            edited = edit_document(document, schema, rng)
+            if i < corrected_count:
+                _write_json(root / "corrected" / filename, edited)
+            if len(templates) < AUDIT_TEMPLATES:
+                templates.append(create_audit_diff_entry(document, edited))
+        if corrected_count <= i < corrected_count + locked_count:
+            _write_json(root / "locks" / f"{filename}.lock", {
+                "filename": filename, "user": f"reviewer{i % 5}",
+                "timestamp": BASE_TIME.isoformat(), "expires": lock_expiry})
+
+    with open(root / "audits" / "audit.jsonl", 'w', encoding='utf-8') as f:
+        for n in range(spec.audit_entries if templates else 0):
+            entry = dict(templates[n % len(templates)])
+            entry.update({
+                'filename': filenames[n % len(filenames)],
+                'timestamp': (BASE_TIME + timedelta(minutes=n)).isoformat(),
+                'user': f"reviewer{n % 5}",
+                'action': 'corrected',
+                'submission_method': 'manual_review',
+            })
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    return Corpus(root=root, spec=spec, schema=schema, documents=filenames)
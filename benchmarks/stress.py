@@ -0,0 +1,385 @@
+"""
+Concurrency stress test for the claim, submit and audit primitives.
+
+Builds a synthetic corpus (``benchmarks/corpus.py``) in a shared temporary
+directory and starts ``--workers`` processes that each walk the queue oldest first
+and, like reviewers, ``claim_file`` a document, edit it, ``save_corrected_json``,
+``append_audit_log`` and ``release_file``. A ``--abandon`` share of first claims is
+left behind with a lock that expires after ``--abandon-seconds``; workers come back
+to documents they found busy until the queue is empty. A separate process runs
+``cleanup_stale_locks`` every ``cleanup_interval`` seconds while the workers claim,
+so stale-lock removal races with the ``is_file_locked`` checks of the claims.
+Afterwards it checks for:
+
+- double claims: two workers holding the same document at overlapping times
+- duplicate submissions: a document corrected more than once
+- torn audit lines (not valid JSON) and lost ones (acknowledged appends missing
+  from the log)
+- orphaned locks: live locks left behind once every worker has exited
+
+and reports throughput plus p50/p90/p99 claim and submit latency.
+
+Usage:
+    python -m benchmarks.stress [--workers 8] [--documents 200] [--array-size 50]
+                                [--abandon 0.05] [--abandon-seconds 0.2] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.corpus import CorpusSpec, build_corpus, edit_document
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker may take before the run is abandoned
+WORKER_TIMEOUT_SECONDS = 300
+
+
+@dataclass
+class StressSpec:
+    """Shape of a stress run."""
+    workers: int = 8
+    documents: int = 200
+    array_size: int = 50
+    abandon: float = 0.05
+    abandon_seconds: float = 0.2
+    cleanup_interval: float = 0.02
+    lock_minutes: int = 15
+    seed: int = 42
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _worker(worker_id: int, config: Dict[str, Any], filenames: List[str], spec: Dict[str, Any],
+            barrier, results) -> None:
+    """Claim, edit and submit documents until the queue is exhausted; report what happened."""
+    logging.disable(logging.INFO)
+    from utils import file_utils
+    from utils.diff_utils import create_audit_diff_entry
+
+    file_utils.initialize_directories(config)
+    schema = json.loads(spec['schema'])
+    rng = random.Random(spec['seed'] * 1000 + worker_id)
+    # Reviewers take the oldest documents first; shuffling within small windows keeps
+    # every worker competing for the same few documents
+    window = max(spec['window'], 1)
+    order = []
+    for start in range(0, len(filenames), window):
+        chunk = list(filenames[start:start + window])
+        rng.shuffle(chunk)
+        order.extend(chunk)
+    # Load the diff machinery before the start so the first submission is not an import
+    create_audit_diff_entry({'warm': 1}, {'warm': 2})
+    user = f"worker{worker_id}"
+    corrected_dir = Path(config['directories']['corrected'])
+    report: Dict[str, Any] = {'worker': worker_id, 'claims': [], 'claim_ms': [], 'submit_ms': [], 'busy': 0,
+                              'abandoned': 0, 'appended': [], 'audit_failures': 0, 'save_failures': 0,
+                              'errors': []}
+    deadline = time.monotonic() + WORKER_TIMEOUT_SECONDS / 2
+    barrier.wait()
+    first_pass = True
+    # Documents found busy are revisited, like reviewers refreshing the queue, until
+    # every document is corrected; abandoned locks expire and are reclaimed meanwhile
+    while order and time.monotonic() < deadline:
+        for filename in order:
+            if (corrected_dir / filename).exists():
+                continue
+            try:
+                # Only first claims are abandoned, so every document is eventually submitted
+                abandon = first_pass and rng.random() < spec['abandon']
+                timeout_minutes = spec['abandon_seconds'] / 60 if abandon else spec['lock_minutes']
+                started_ns = time.time_ns()
+                started = time.perf_counter()
+                claimed = file_utils.claim_file(filename, user, timeout_minutes)
+                report['claim_ms'].append((time.perf_counter() - started) * 1000)
+                if not claimed:
+                    report['busy'] += 1
+                    continue
+                if abandon:
+                    report['abandoned'] += 1
+                    continue
+
+                submit_started = time.perf_counter()
+                original = file_utils.load_json_file(filename) or {}
+                edited = edit_document(original, schema, rng)
+                if not file_utils.save_corrected_json(filename, edited):
+                    report['save_failures'] += 1
+                entry = create_audit_diff_entry(original, edited)
+                seq = len(report['appended'])
+                entry.update({'filename': filename, 'timestamp': datetime.now().isoformat(), 'user': user,
+                              'action': 'corrected', 'submission_method': 'stress_test',
+                              'stress_worker': worker_id, 'stress_seq': seq})
+                if file_utils.append_audit_log(entry):
+                    report['appended'].append(seq)
+                else:
+                    report['audit_failures'] += 1
+                file_utils.release_file(filename)
+                report['submit_ms'].append((time.perf_counter() - submit_started) * 1000)
+                report['claims'].append([filename, started_ns, time.time_ns()])
+            except Exception as e:
+                report['errors'].append(f"{filename}: {type(e).__name__}: {e}")
+        order = [filename for filename in order if not (corrected_dir / filename).exists()]
+        first_pass = False
+        if order:
+            time.sleep(spec['abandon_seconds'] / 4)
+    results.put(report)
+
+
+def _cleaner(config: Dict[str, Any], interval: float, stop, results) -> None:
+    """Run cleanup_stale_locks every ``interval`` seconds until ``stop`` is set; report the reclaims."""
+    logging.disable(logging.INFO)
+    from utils import file_utils
+
+    file_utils.initialize_directories(config)
+    reclaimed = passes = 0
+    errors: List[str] = []
+    while not stop.is_set():
+        try:
+            reclaimed += file_utils.cleanup_stale_locks()
+        except Exception as e:
+            errors.append(f"cleanup: {type(e).__name__}: {e}")
+        passes += 1
+        stop.wait(interval)
+    results.put({'reclaimed': reclaimed, 'passes': passes, 'errors': errors})
+
+
+def find_double_claims(claims: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return pairs of overlapping claims of the same document.
+
+    Args:
+        claims: Dicts with ``filename``, ``worker``, ``start_ns`` and ``end_ns``
+    """
+    by_file: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for claim in claims:
+        by_file[claim['filename']].append(claim)
+    overlaps = []
+    for filename, held in by_file.items():
+        held.sort(key=lambda claim: claim['start_ns'])
+        for i, first in enumerate(held):
+            for second in held[i + 1:]:
+                if second['start_ns'] >= first['end_ns']:
+                    break
+                overlaps.append({'filename': filename, 'workers': [first['worker'], second['worker']]})
+    return overlaps
+
+
+def check_audit_log(path: Path, appended: Dict[int, List[int]]) -> Dict[str, Any]:
+    """
+    Check the audit log against the appends each worker saw acknowledged.
+
+    Returns:
+        Dict with ``lines``, ``torn`` (undecodable lines), ``lost`` (acknowledged
+        appends missing from the log) and ``duplicated`` entries
+    """
+    seen: Dict[Any, int] = defaultdict(int)
+    lines = torn = 0
+    if path.exists():
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    torn += 1
+                    continue
+                if 'stress_worker' in entry:
+                    seen[(entry['stress_worker'], entry['stress_seq'])] += 1
+    expected = {(worker, seq) for worker, seqs in appended.items() for seq in seqs}
+    return {
+        'lines': lines,
+        'torn': torn,
+        'lost': len(expected - set(seen)),
+        'duplicated': sum(count - 1 for count in seen.values() if count > 1),
+    }
+
+
+def run_stress(spec: Optional[StressSpec] = None, workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Run the stress test and check its invariants.
+
+    Args:
+        spec: Workers, corpus size and behaviour
+        workdir: Directory for the shared corpus (default: a temporary directory)
+
+    Returns:
+        Dict with ``spec``, ``throughput`` (submissions per second), ``latency_ms``
+        (claim and submit percentiles), ``counts`` and ``anomalies``; ``ok`` is
+        False when any anomaly was found
+    """
+    from utils import file_utils
+    from utils.perf import summarize
+
+    spec = spec or StressSpec()
+    with tempfile.TemporaryDirectory(prefix="qa-stress-") as tmp:
+        root = Path(workdir) if workdir else Path(tmp)
+        corpus = build_corpus(root, CorpusSpec(documents=spec.documents, array_size=spec.array_size,
+                                               audit_entries=0, corrected=0.0, locked=0.0, seed=spec.seed))
+        worker_spec = {'seed': spec.seed, 'abandon': spec.abandon, 'abandon_seconds': spec.abandon_seconds,
+                       'lock_minutes': spec.lock_minutes, 'window': spec.workers,
+                       'schema': json.dumps(corpus.schema)}
+
+        # spawn: forking a threaded Streamlit server is not safe
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(spec.workers + 1)
+        results = context.Queue()
+        processes = [context.Process(target=_worker, name=f"stress-{i}", daemon=True,
+                                     args=(i, corpus.config, corpus.documents, worker_spec, barrier, results))
+                     for i in range(spec.workers)]
+        stop_cleaner = context.Event()
+        cleaner_results = context.Queue()
+        cleaner = context.Process(target=_cleaner, name="stress-cleanup", daemon=True,
+                                  args=(corpus.config, spec.cleanup_interval, stop_cleaner, cleaner_results))
+        cleaner.start()
+        for process in processes:
+            process.start()
+        barrier.wait(timeout=WORKER_TIMEOUT_SECONDS)
+        started = time.perf_counter()
+        reports = [results.get(timeout=WORKER_TIMEOUT_SECONDS) for _ in processes]
+        wall_seconds = time.perf_counter() - started
+        stop_cleaner.set()
+        cleanup = cleaner_results.get(timeout=WORKER_TIMEOUT_SECONDS)
+        for process in processes + [cleaner]:
+            process.join(timeout=WORKER_TIMEOUT_SECONDS)
+        # Let the last abandoned locks expire, so only live ones count as orphans
+        time.sleep(spec.abandon_seconds)
+
+        # What is left once every worker is gone: expired locks are reclaimable, live ones are orphans
+        previous_directories = file_utils._directory_config
+        file_utils.initialize_directories(corpus.config)
+        try:
+            left_behind = len(list((root / "locks").glob("*.lock")))
+            stale_reclaimed = file_utils.cleanup_stale_locks()
+            orphaned = sorted(path.name for path in (root / "locks").glob("*.lock"))
+        finally:
+            file_utils._directory_config = previous_directories
+        audit = check_audit_log(root / "audits" / "audit.jsonl",
+                                {report['worker']: report['appended'] for report in reports})
+        corrected = len(list((root / "corrected").glob("*.json")))
+
+    claims = [{'filename': filename, 'worker': report['worker'], 'start_ns': start_ns, 'end_ns': end_ns}
+              for report in reports for filename, start_ns, end_ns in report['claims']]
+    submissions: Dict[str, int] = defaultdict(int)
+    for claim in claims:
+        submissions[claim['filename']] += 1
+    double_claims = find_double_claims(claims)
+    anomalies = {
+        'double_claims': len(double_claims),
+        'duplicate_submissions': sum(count - 1 for count in submissions.values() if count > 1),
+        'torn_audit_lines': audit['torn'],
+        'lost_audit_lines': audit['lost'],
+        'duplicated_audit_lines': audit['duplicated'],
+        'orphaned_locks': len(orphaned),
+        'save_failures': sum(report['save_failures'] for report in reports),
+        'audit_failures': sum(report['audit_failures'] for report in reports),
+        'worker_errors': sum(len(report['errors']) for report in reports) + len(cleanup['errors']),
+    }
+    summary = summarize({'claim': [ms for report in reports for ms in report['claim_ms']],
+                         'submit': [ms for report in reports for ms in report['submit_ms']]})
+    return {
+        'spec': spec.to_dict(),
+        'wall_s': round(wall_seconds, 3),
+        'throughput': round(len(claims) / wall_seconds, 1) if wall_seconds else 0.0,
+        'latency_ms': summary,
+        'counts': {
+            'submitted': len(claims),
+            'corrected_files': corrected,
+            'busy_claims': sum(report['busy'] for report in reports),
+            'abandoned': sum(report['abandoned'] for report in reports),
+            'reclaimed_during_run': cleanup['reclaimed'],
+            'cleanup_passes': cleanup['passes'],
+            'locks_left_behind': left_behind,
+            'stale_reclaimed_after_run': stale_reclaimed,
+            'audit_lines': audit['lines'],
+        },
+        'anomalies': anomalies,
+        'examples': {
+            'double_claims': double_claims[:5],
+            'orphaned_locks': orphaned[:5],
+            'worker_errors': ([error for report in reports for error in report['errors']] + cleanup['errors'])[:5],
+        },
+        'ok': not any(anomalies.values()),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    spec = report['spec']
+    print(f"Stress: {spec['workers']} workers, {spec['documents']} documents (arrays of {spec['array_size']}), "
+          f"{spec['abandon']:.0%} of first claims abandoned for {spec['abandon_seconds']:g} s")
+    counts = report['counts']
+    print(f"  {counts['submitted']} submissions in {report['wall_s']:.2f} s ({report['throughput']:.1f}/s), "
+          f"{counts['busy_claims']} busy claims, {counts['abandoned']} abandoned, "
+          f"{counts['reclaimed_during_run']} stale locks reclaimed by {counts['cleanup_passes']} concurrent cleanups, "
+          f"{counts['stale_reclaimed_after_run']} after the run")
+    for name, row in report['latency_ms'].items():
+        print(f"  {name:<8} p50 {row['p50']:>8.2f} ms  p90 {row['p90']:>8.2f} ms  "
+              f"p99 {row['p99']:>8.2f} ms  max {row['max']:>8.2f} ms")
+    for name, count in report['anomalies'].items():
+        if count:
+            print(f"  ANOMALY {name}: {count}")
+    for name, examples in report['examples'].items():
+        for example in examples:
+            print(f"    {name}: {example}")
+    if report['ok']:
+        print("  No anomalies")
+
+
+def add_arguments(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    """Add the stress options (optionally prefixed, for the suite's command line)."""
+    defaults = StressSpec()
+    parser.add_argument(f"--{prefix}workers", type=int, default=defaults.workers, help="Worker processes")
+    parser.add_argument(f"--{prefix}documents", type=int, default=defaults.documents, help="Documents in the queue")
+    parser.add_argument(f"--{prefix}array-size", type=int, default=defaults.array_size,
+                        help="Rows per array field (larger rows make longer audit lines)")
+    parser.add_argument(f"--{prefix}abandon", type=float, default=defaults.abandon,
+                        help="Share of first claims left behind with a short-lived lock")
+    parser.add_argument(f"--{prefix}abandon-seconds", type=float, default=defaults.abandon_seconds,
+                        help="Lifetime of abandoned locks")
+
+
+def spec_from_args(args: argparse.Namespace, prefix: str = "", seed: int = StressSpec.seed) -> StressSpec:
+    attr = prefix.replace("-", "_")
+    return StressSpec(workers=getattr(args, f"{attr}workers"), documents=getattr(args, f"{attr}documents"),
+                      array_size=getattr(args, f"{attr}array_size"), abandon=getattr(args, f"{attr}abandon"),
+                      abandon_seconds=getattr(args, f"{attr}abandon_seconds"), seed=seed)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_arguments(parser)
+    parser.add_argument("--seed", type=int, default=StressSpec.seed, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("utils").setLevel(logging.WARNING)
+
+    report = run_stress(spec_from_args(args, seed=args.seed))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
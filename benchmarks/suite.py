@@ -0,0 +1,315 @@
+"""
+Timings and memory for the file, diff, validation and model primitives.
+
+Each benchmark is set up against a synthetic corpus (``benchmarks/corpus.py``),
+warmed up once, then timed ``--repeat`` times; peak allocation of one further call
+is measured with tracemalloc, so tracing does not slow the timed calls. Results
+(median, p90, min and max in ms, peak KiB) are printed or written as JSON; with
+``--baseline`` they are compared against an earlier JSON result and the run fails
+when the fastest run or the peak grew by more than ``--tolerance``.
+
+The multi-process stress test (``benchmarks/stress.py``) runs afterwards unless
+``--no-stress`` is given; the run also fails when it finds an anomaly.
+
+Usage:
+    python -m benchmarks [--documents 200] [--array-size 10] [--audit-entries 1000]
+                         [--schema purchase_order_with_items_schema.yaml] [--repeat 7]
+                         [--only calculate_diff ...] [--output results.json]
+                         [--baseline baseline.json] [--tolerance 0.25] [--json]
+                         [--no-stress] [--stress-workers 8] [--stress-documents 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import stress
+from benchmarks.corpus import Corpus, CorpusSpec, build_corpus, edit_document
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 7
+DEFAULT_TOLERANCE = 0.25
+
+# Differences below these are noise, whatever the ratio
+MIN_REGRESSION_MS = 1.0
+MIN_REGRESSION_KIB = 64.0
+
+
+@dataclass
+class Benchmark:
+    """A named benchmark; ``setup(corpus)`` returns the callable to time."""
+    name: str
+    setup: Callable[[Corpus], Callable[[], Any]]
+    description: str = ""
+
+
+def _use_corpus(corpus: Corpus) -> None:
+    from utils.file_utils import initialize_directories
+
+    initialize_directories(corpus.config)
+
+
+def _edited_pair(corpus: Corpus):
+    import random
+
+    original = corpus.load(corpus.documents[-1])
+    return original, edit_document(original, corpus.schema, random.Random(corpus.spec.seed))
+
+
+def _setup_list_unverified_files(corpus: Corpus):
+    from utils.file_utils import list_unverified_files
+
+    _use_corpus(corpus)
+    return list_unverified_files
+
+
+def _setup_read_audit_logs(corpus: Corpus):
+    from utils.file_utils import read_audit_logs
+
+    _use_corpus(corpus)
+    return read_audit_logs
+
+
+def _setup_calculate_diff(corpus: Corpus):
+    from utils.diff_utils import calculate_diff
+
+    original, edited = _edited_pair(corpus)
+    return lambda: calculate_diff(original, edited)
+
+
+def _setup_format_diff_for_display(corpus: Corpus):
+    from utils.diff_utils import calculate_diff, format_diff_for_display
+
+    original, edited = _edited_pair(corpus)
+    diff = calculate_diff(original, edited)
+    return lambda: format_diff_for_display(diff, original, edited)
+
+
+def _setup_comprehensive_validate_data(corpus: Corpus):
+    from utils.submission_handler import SubmissionHandler
+
+    document = corpus.load(corpus.documents[-1])
+    return lambda: SubmissionHandler.comprehensive_validate_data(document, corpus.schema)
+
+
+def _setup_create_model_from_schema(corpus: Corpus):
+    from utils.model_builder import create_model_from_schema
+
+    return lambda: create_model_from_schema(corpus.schema)
+
+
+def _setup_append_audit_log(corpus: Corpus):
+    from utils.diff_utils import create_audit_diff_entry
+    from utils.file_utils import append_audit_log
+
+    _use_corpus(corpus)
+    original, edited = _edited_pair(corpus)
+    entry = create_audit_diff_entry(original, edited)
+    entry.update({'filename': corpus.documents[-1], 'timestamp': "2024-06-01T12:00:00",
+                  'user': "bench", 'action': 'corrected', 'submission_method': 'manual_review'})
+    return lambda: append_audit_log(entry)
+
+
+# append_audit_log grows the audit log, so it runs after read_audit_logs
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("list_unverified_files", _setup_list_unverified_files, "Queue listing with lock lookups"),
+    Benchmark("read_audit_logs", _setup_read_audit_logs, "Parse and sort the full audit log"),
+    Benchmark("calculate_diff", _setup_calculate_diff, "Diff of one edited document"),
+    Benchmark("format_diff_for_display", _setup_format_diff_for_display, "Render that diff as text"),
+    Benchmark("comprehensive_validate_data", _setup_comprehensive_validate_data, "Compiled validators, one document"),
+    Benchmark("create_model_from_schema", _setup_create_model_from_schema, "Build the Pydantic model"),
+    Benchmark("append_audit_log", _setup_append_audit_log, "Append one audit entry"),
+]
+
+
+def measure(func: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """
+    Time ``func`` after one warm-up call and measure the peak allocation of one call.
+
+    Returns:
+        Dict with ``runs``, ``median_ms``, ``p90_ms``, ``min_ms``, ``max_ms`` and ``peak_kib``
+    """
+    func()
+    durations = []
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ordered = sorted(durations)
+    return {
+        'runs': len(durations),
+        'median_ms': round(statistics.median(ordered), 3),
+        'p90_ms': round(ordered[min(int(0.9 * len(ordered)), len(ordered) - 1)], 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_suite(spec: CorpusSpec, names: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+              workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Build a corpus and run the selected benchmarks against it.
+
+    Args:
+        spec: Corpus to generate
+        names: Benchmarks to run (default: all)
+        repeat: Timed calls per benchmark
+        workdir: Directory for the corpus (default: a temporary directory)
+
+    Returns:
+        Dict with ``meta`` (corpus spec, environment) and ``results`` per benchmark
+    """
+    unknown = set(names or ()) - {benchmark.name for benchmark in BENCHMARKS}
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    selected = [benchmark for benchmark in BENCHMARKS if not names or benchmark.name in names]
+
+    with tempfile.TemporaryDirectory(prefix="qa-bench-") as tmp:
+        root = Path(workdir) if workdir else Path(tmp)
+        started = time.perf_counter()
+        corpus = build_corpus(root, spec)
+        build_seconds = time.perf_counter() - started
+
+        results = {}
+        for benchmark in selected:
+            results[benchmark.name] = measure(benchmark.setup(corpus), repeat)
+
+    return {
+        'meta': {
+            'corpus': spec.to_dict(),
+            'corpus_build_s': round(build_seconds, 2),
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Compare a run against a baseline run.
+
+    A benchmark regresses when its fastest run (the least noisy statistic) or its
+    peak memory exceeds the baseline by more than ``tolerance`` (a fraction) and
+    by more than the noise floor (``MIN_REGRESSION_MS`` / ``MIN_REGRESSION_KIB``).
+
+    Returns:
+        One dict per benchmark and metric present in both runs, with ``name``, ``metric``,
+        ``baseline``, ``current``, ``change`` (fraction) and ``regression``
+    """
+    if baseline.get('meta', {}).get('corpus') != results.get('meta', {}).get('corpus'):
+        logger.warning("Baseline was recorded with a different corpus; comparison is approximate")
+
+    rows = []
+    for name, current in results.get('results', {}).items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        for metric, floor in (('min_ms', MIN_REGRESSION_MS), ('peak_kib', MIN_REGRESSION_KIB)):
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            rows.append({
+                'name': name, 'metric': metric, 'baseline': old, 'current': new, 'change': round(change, 3),
+                'regression': change > tolerance and new - old > floor,
+            })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    defaults = CorpusSpec()
+    parser.add_argument("--documents", type=int, default=defaults.documents, help="Documents in the corpus")
+    parser.add_argument("--schema", default=defaults.schema, help="Schema file in schemas/ (or a path)")
+    parser.add_argument("--array-size", type=int, default=defaults.array_size, help="Rows per array field")
+    parser.add_argument("--audit-entries", type=int, default=defaults.audit_entries, help="Audit log entries")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Corpus random seed")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed calls per benchmark")
+    parser.add_argument("--only", nargs="+", default=None, metavar="NAME",
+                        help=f"Benchmarks to run ({', '.join(b.name for b in BENCHMARKS)})")
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep the corpus in this directory")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier --output to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed growth before a regression is reported (fraction)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--no-stress", action="store_true", help="Skip the multi-process stress test")
+    stress.add_arguments(parser, prefix="stress-")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("utils").setLevel(logging.WARNING)
+
+    spec = CorpusSpec(documents=args.documents, schema=args.schema, array_size=args.array_size,
+                      audit_entries=args.audit_entries, seed=args.seed)
+    try:
+        report = run_suite(spec, args.only, args.repeat, args.workdir)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not args.no_stress:
+        report['stress'] = stress.run_stress(stress.spec_from_args(args, prefix="stress-", seed=args.seed))
+
+    comparison = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparison = compare(report, json.load(f), args.tolerance)
+        report['comparison'] = comparison
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        corpus = report['meta']['corpus']
+        print(f"Corpus: {corpus['documents']} documents ({corpus['schema']}), arrays of {corpus['array_size']}, "
+              f"{corpus['audit_entries']} audit entries; {args.repeat} runs each")
+        print(f"  {'benchmark':<30} {'min ms':>10} {'median ms':>10} {'p90 ms':>10} {'peak KiB':>10}")
+        for name, row in report['results'].items():
+            print(f"  {name:<30} {row['min_ms']:>10.2f} {row['median_ms']:>10.2f} "
+                  f"{row['p90_ms']:>10.2f} {row['peak_kib']:>10.1f}")
+        for row in comparison:
+            if row['regression']:
+                print(f"  REGRESSION {row['name']} {row['metric']}: {row['baseline']} -> {row['current']} "
+                      f"({row['change']:+.0%})")
+        if 'stress' in report:
+            stress.print_report(report['stress'])
+
+    regressed = any(row['regression'] for row in comparison)
+    return 1 if regressed or not report.get('stress', {}).get('ok', True) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,23 +9,11 @@ from pathlib import Path
 import logging
 from datetime import datetime
 
-# Import utility modules
-from utils.file_utils import (
-    initialize_directories,
-    ensure_directories_exist, 
-    cleanup_stale_locks,
-    list_unverified_files,
-    claim_file,
-    release_file,
-    load_json_file,
-    save_corrected_json,
-    append_audit_log,
-    get_pdf_path,
-    read_audit_logs
-)
-from utils.schema_loader import get_schema_for_file, load_schema, load_config, get_config_value
-from utils.model_builder import create_model_from_schema, validate_model_data
-from utils.diff_utils import calculate_diff, format_diff_for_display, has_changes, create_audit_diff_entry
+# Import utility modules. Views and their heavy dependencies (pydantic, deepdiff,
+# pandas, PyPDF2) are imported where they are used, so the queue does not load them.
+from utils.file_utils import cleanup_stale_locks, list_unverified_files, release_file
+from utils.schema_loader import load_config, get_config_value
+from utils import metrics, perf
 
 def get_logging_level(level_str):
     """Map string logging level to logging constant."""
@@ -80,18 +68,26 @@ def main():
     """Main application entry point."""
     from utils.error_handler import ErrorHandler, ErrorType
     from utils.ui_feedback import show_loading
+    from utils.session_manager import SessionManager
     
+    perf.begin_rerun(st.session_state.get('current_page', ''), SessionManager.get_session_id())
     try:
         # Initialize application with loading indicator
-        with show_loading("Initializing application..."):
+        with show_loading("Initializing application..."), perf.span("startup"):
             setup_directories()
             init_session_state()
+            SessionManager.track_memory()
             cleanup_stale_locks(LOCK_TIMEOUT_MINUTES)
         
         # Render application
         render_header()
-        render_sidebar()
-        render_main_content()
+        with perf.span("sidebar"):
+            render_sidebar()
+        with perf.span(f"page.{st.session_state.current_page}"):
+            render_main_content()
+        
+        if st.session_state.get('show_perf_panel', False):
+            render_perf_panel()
         
     except Exception as e:
         ErrorHandler.handle_error(
@@ -100,29 +96,23 @@ def main():
             ErrorType.SYSTEM,
             recovery_options=ErrorHandler.create_recovery_options("system")
         )
+    finally:
+        profile = perf.end_rerun()
+        if profile is not None:
+            metrics.RERUN_SECONDS.observe(profile.total_ms() / 1000, page=profile.page)
 
 
 def setup_directories():
-    """Initialize directory configuration and ensure all required directories exist."""
+    """
+    Run the process-level bootstrap (directories, configuration, schema, PDF server and cache).
+
+    The bootstrap is cached per process and only repeated when config.yaml changes or
+    the periodic health check is due, so most reruns just show its stored messages.
+    """
+    from utils.bootstrap import get_bootstrap
+    
     try:
-        # Initialize directory configuration system
-        if not initialize_directories():
-            logger.error("Failed to initialize directory configuration")
-            st.error("❌ **Directory Configuration Error**")
-            st.error("Failed to initialize directory configuration. Please check your config.yaml file and directory permissions.")
-            st.info("💡 **Troubleshooting:**")
-            st.info("• Ensure config.yaml exists and has valid directory configuration")
-            st.info("• Check that the application has write permissions to create directories")
-            st.info("• Verify that configured directory paths are valid")
-            st.stop()
-        
-        # Fallback to legacy method for additional safety
-        ensure_directories_exist()
-        logger.info("Directory setup completed successfully")
-        
-        # Validate configuration and schema
-        validate_configuration()
-        
+        result = get_bootstrap()
     except Exception as e:
         logger.error(f"Failed to setup directories: {e}")
         st.error("❌ **Critical Error During Startup**")
@@ -133,71 +123,25 @@ def setup_directories():
         st.info("• Ensure config.yaml is properly formatted")
         st.info("• Try restarting the application")
         st.stop()
-
-
-def validate_configuration():
-    """Validate configuration and provide user feedback."""
-    try:
-        from utils.config_loader import load_config, validate_config, get_config_summary
-        from utils.directory_validator import DirectoryValidator
-        from utils.file_utils import get_directories
-        
-        # Load and validate configuration
-        config = load_config()
-        is_valid = validate_config(config)
-        
-        if not is_valid:
-            st.warning("⚠️ **Configuration Issues Detected**")
-            st.warning("Some configuration settings are invalid, using defaults where necessary.")
-        
-        # Get configuration summary for user feedback
-        config_summary = get_config_summary(config)
-        
-        # Validate directory accessibility
-        dirs = get_directories()
-        validator = DirectoryValidator()
-        validation_results = validator.validate_all_paths(dirs)
-        validation_summary = validator.get_validation_summary(validation_results)
-        
-        # Show configuration status in sidebar or as success message
-        if validation_summary['ready_directories'] == validation_summary['total_directories']:
-            logger.info("✅ All directories are ready and accessible")
-            # Custom directory UI message removed to avoid taking up space.
-            # If you want a compact indicator later, consider using a small st.caption or a status icon.
-        else:
-            st.warning("⚠️ **Directory Configuration Issues**")
-            if validation_summary['permission_issues'] > 0:
-                st.warning(f"• {validation_summary['permission_issues']} directories have permission issues")
-            if validation_summary['missing_directories'] > 0:
-                st.info(f"• {validation_summary['missing_directories']} directories were created automatically")
-        
-        # Validate schema
-        primary_schema = get_config_value('schema', 'primary_schema', 'default_schema.yaml')
-        
-        try:
-            from utils.schema_loader import get_configured_schema
-            schema = get_configured_schema()
-            
-            if schema:
-                logger.info(f"✅ Schema validated: {primary_schema}")
-            else:
-                st.warning("⚠️ **Schema Validation Warning**")
-                st.warning(f"Primary schema '{primary_schema}' not found, using fallback mechanisms")
-                
-        except Exception as schema_error:
-            logger.warning(f"Schema validation failed: {schema_error}")
-            st.warning("⚠️ **Schema Loading Issues**")
-            st.warning("Schema validation failed, but fallback mechanisms are in place")
-            
-    except Exception as e:
-        logger.error(f"Configuration validation failed: {e}")
-        st.error("❌ **Configuration Validation Failed**")
-        st.error(f"Error: {str(e)}")
+        return
+    
+    if not result.ok:
+        st.error("❌ **Directory Configuration Error**")
+        st.error("Failed to initialize directory configuration. Please check your config.yaml file and directory permissions.")
+        st.info("💡 **Troubleshooting:**")
+        st.info("• Ensure config.yaml exists and has valid directory configuration")
+        st.info("• Check that the application has write permissions to create directories")
+        st.info("• Verify that configured directory paths are valid")
+        st.stop()
+        return
+    
+    for level, message in result.messages:
+        getattr(st, level)(message)
+    if any(level == "error" for level, _ in result.messages):
         st.info("💡 **Troubleshooting:**")
         st.info("• Check config.yaml file format and content")
         st.info("• Verify schema files are accessible")
         st.info("• Check application logs for detailed errors")
-        # Don't raise - let the app continue with defaults
 
 
 def init_session_state():
@@ -213,18 +157,6 @@ def init_session_state():
     
     if 'lock_timeout' not in st.session_state:
         st.session_state.lock_timeout = LOCK_TIMEOUT_MINUTES
-    
-    if 'form_data' not in st.session_state:
-        st.session_state.form_data = {}
-    
-    if 'original_data' not in st.session_state:
-        st.session_state.original_data = {}
-    
-    if 'schema' not in st.session_state:
-        st.session_state.schema = {}
-    
-    if 'model_class' not in st.session_state:
-        st.session_state.model_class = None
 
 
 def render_header():
@@ -501,6 +433,19 @@ def render_sidebar():
         if new_timeout != st.session_state.lock_timeout:
             st.session_state.lock_timeout = new_timeout
         
+        if get_config_value('processing', 'session_memory_panel', False):
+            st.checkbox(
+                "Show session memory",
+                key="show_memory_panel",
+                help="Live per-session memory totals and idle eviction"
+            )
+        
+        st.checkbox(
+            "Show performance panel",
+            key="show_perf_panel",
+            help="Time spent in each phase of this rerun, with percentiles over recent reruns"
+        )
+        
         st.divider()
         
         # Quick actions
@@ -538,6 +483,67 @@ def render_sidebar():
             # Schema editor sidebar content will be added in future tasks
             st.markdown("**Schema Editor**")
             st.markdown("Manage validation schemas")
+        
+        if (st.session_state.get('show_memory_panel', False)
+                and get_config_value('processing', 'session_memory_panel', False)):
+            render_session_memory_panel()
+
+
+def render_session_memory_panel():
+    """Render live per-session memory totals and idle eviction (admin)."""
+    from utils.session_manager import SessionManager
+    from utils.session_memory import get_session_ledger
+    
+    ledger = get_session_ledger()
+    with st.expander("🧠 Session Memory", expanded=False):
+        totals = ledger.totals()
+        col1, col2 = st.columns(2)
+        col1.metric("Sessions", totals['sessions'])
+        col2.metric("Estimated", f"{totals['total_bytes'] / (1024 * 1024):.1f} MB")
+        idle_minutes = ledger.idle_seconds / 60
+        st.caption(
+            f"Idle eviction after {idle_minutes:g} min · evictions since start: {totals['evictions']}"
+            if idle_minutes else "Idle eviction disabled"
+        )
+        
+        rows = ledger.snapshot()
+        if rows:
+            st.dataframe([{k: v for k, v in row.items() if k != 'sizes'} for row in rows], hide_index=True)
+        
+        if idle_minutes and st.button("🧹 Evict idle sessions now", key="evict_idle_sessions"):
+            evicted = ledger.evict_idle(exclude=SessionManager.get_store_id())
+            st.success(f"Evicted {len(evicted)} idle session(s)")
+
+
+def render_perf_panel():
+    """Render this rerun's phase timings and recent percentiles in the sidebar."""
+    profile = perf.current_profile()
+    if profile is None:
+        return
+    phases = profile.phases()
+    summary = perf.get_recorder().summary({row['name'] for row in phases} | {'rerun'})
+    
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        rerun = summary.get('rerun', {})
+        col1, col2 = st.columns(2)
+        col1.metric("This rerun", f"{profile.total_ms():.0f} ms")
+        col2.metric("Rerun p90", f"{rerun.get('p90', 0):.0f} ms", help=f"Over the last {rerun.get('count', 0)} reruns")
+        rows = []
+        for row in phases:
+            stats = summary.get(row['name'], {})
+            rows.append({
+                'phase': "· " * row['depth'] + row['name'],
+                'calls': row['calls'],
+                'ms': round(row['total_ms'], 1),
+                'p50': stats.get('p50'),
+                'p90': stats.get('p90'),
+                'p99': stats.get('p99'),
+            })
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        log_file = perf.get_recorder().log_file
+        st.caption(f"Nested phases are indented; percentiles are per call in ms"
+                   + (f" · logging to {log_file}" if log_file else ""))
 
 
 def render_main_content():
@@ -595,18 +601,18 @@ def render_dynamic_form():
     from utils.session_manager import SessionManager
     
     try:
-        if not st.session_state.schema:
+        if not SessionManager.get_schema():
             st.error("Schema not loaded")
             return
         
         # Render the dynamic form
         updated_data = FormGenerator.render_dynamic_form(
-            st.session_state.schema,
-            st.session_state.form_data
+            SessionManager.get_schema(),
+            SessionManager.get_form_data()
         )
         
         # Update session state if data changed
-        if updated_data != st.session_state.form_data:
+        if updated_data != SessionManager.get_form_data():
             SessionManager.set_form_data(updated_data)
             st.rerun()
     
@@ -617,18 +623,22 @@ def render_dynamic_form():
 
 def render_diff_section():
     """Render the diff section showing changes."""
+    from utils.session_manager import SessionManager
+    
     st.subheader("🔍 Changes Preview")
     
-    if not st.session_state.original_data or not st.session_state.form_data:
+    if not SessionManager.get_original_data() or not SessionManager.get_form_data():
         st.info("No data to compare")
         return
     
+    from utils.diff_utils import calculate_diff, format_diff_for_display, has_changes
+    
     try:
-        diff = calculate_diff(st.session_state.original_data, st.session_state.form_data)
+        diff = calculate_diff(SessionManager.get_original_data(), SessionManager.get_form_data())
         
         if has_changes(diff):
             # Get original and modified data from session state if available
-            original_data = st.session_state.get('original_data')
+            original_data = SessionManager.get_original_data()
             modified_data = st.session_state.get('current_data')
             formatted_diff = format_diff_for_display(diff, original_data, modified_data)
             st.markdown(formatted_diff)
@@ -641,6 +651,8 @@ def render_diff_section():
 
 def render_action_buttons():
     """Render action buttons for submit/cancel."""
+    from utils.session_manager import SessionManager
+    
     st.divider()
     
     col1, col2, col3 = st.columns([1, 1, 2])
@@ -655,20 +667,26 @@ def render_action_buttons():
     
     with col3:
         if st.button("🔄 Reset to Original", help="Reset form to original data"):
-            st.session_state.form_data = st.session_state.original_data.copy()
+            SessionManager.set_form_data(SessionManager.get_original_data())
             st.rerun()
 
 
 def submit_changes():
     """Submit the corrected data."""
+    from utils.file_utils import save_corrected_json, append_audit_log
+    from utils.model_builder import validate_model_data
+    from utils.diff_utils import create_audit_diff_entry
+    from utils.session_manager import SessionManager
+    
     try:
-        if not st.session_state.current_file or not st.session_state.form_data:
+        form_data = SessionManager.get_form_data()
+        if not st.session_state.current_file or not form_data:
             st.error("No data to submit")
             return
         
         # Validate data
-        if st.session_state.model_class:
-            validation_errors = validate_model_data(st.session_state.form_data, st.session_state.model_class)
+        if SessionManager.get_model_class():
+            validation_errors = validate_model_data(form_data, SessionManager.get_model_class())
             if validation_errors:
                 st.error("❌ Validation failed:")
                 for error in validation_errors:
@@ -676,11 +694,11 @@ def submit_changes():
                 return
         
         # Save corrected data
-        if save_corrected_json(st.session_state.current_file, st.session_state.form_data):
+        if save_corrected_json(st.session_state.current_file, form_data):
             # Create audit entry
             audit_entry = create_audit_diff_entry(
-                st.session_state.original_data,
-                st.session_state.form_data
+                SessionManager.get_original_data(),
+                form_data
             )
             audit_entry.update({
                 'filename': st.session_state.current_file,
@@ -728,18 +746,18 @@ def cancel_editing():
 
 def has_unsaved_changes():
     """Check if there are unsaved changes in the form."""
-    original = st.session_state.get('original_data', {})
-    current = st.session_state.get('form_data', {})
-    return original != current
+    from utils.session_manager import SessionManager
+    
+    return SessionManager.get_original_data() != SessionManager.get_form_data()
 
 
 def reset_session():
     """Reset session state for editing."""
+    from utils.session_manager import SessionManager
+    from utils.session_memory import get_session_store
+    
     st.session_state.current_file = None
-    st.session_state.form_data = {}
-    st.session_state.original_data = {}
-    st.session_state.schema = {}
-    st.session_state.model_class = None
+    get_session_store().clear(SessionManager.get_store_id())
 
 
 def render_audit_view():
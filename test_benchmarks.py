@@ -0,0 +1,90 @@
+"""
+Unit tests for the benchmark suite and its synthetic corpus generator.
+"""
+
+import json
+
+import pytest
+
+import utils.file_utils as file_utils
+from benchmarks.corpus import CorpusSpec, build_corpus
+from benchmarks.stress import StressSpec, check_audit_log, find_double_claims, run_stress
+from benchmarks.suite import BENCHMARKS, compare, run_suite
+from utils.submission_handler import SubmissionHandler
+
+SMALL = CorpusSpec(documents=10, array_size=3, audit_entries=25, corrected=0.2, locked=0.3)
+
+
+@pytest.fixture(autouse=True)
+def restore_directories(monkeypatch):
+    monkeypatch.setattr(file_utils, "_directory_config", None)
+    monkeypatch.setattr(file_utils, "_max_file_size_mb", None)
+
+
+def test_corpus_is_repeatable_and_valid_for_its_schema(tmp_path):
+    corpus = build_corpus(tmp_path / "a", SMALL)
+    again = build_corpus(tmp_path / "b", SMALL)
+
+    assert [corpus.load(name) for name in corpus.documents] == [again.load(name) for name in again.documents]
+    assert len(list((tmp_path / "a" / "pdf_docs").glob("*.pdf"))) == 10
+    assert len(list((tmp_path / "a" / "corrected").glob("*.json"))) == 2
+    assert len(list((tmp_path / "a" / "locks").glob("*.lock"))) == 3
+    audit_lines = (tmp_path / "a" / "audits" / "audit.jsonl").read_text().splitlines()
+    assert len(audit_lines) == 25 and all(json.loads(line)["action"] == "corrected" for line in audit_lines)
+    for name in corpus.documents:
+        document = corpus.load(name)
+        assert len(document["Items"]) == 3
+        assert SubmissionHandler.comprehensive_validate_data(document, corpus.schema)["is_valid"]
+
+
+def test_queue_of_the_corpus_reflects_corrected_and_locked_documents(tmp_path):
+    corpus = build_corpus(tmp_path, SMALL)
+    file_utils.initialize_directories(corpus.config)
+
+    queue = file_utils.list_unverified_files()
+
+    assert len(queue) == 8
+    assert sum(1 for info in queue if info["is_locked"]) == 3
+
+
+def test_suite_reports_every_benchmark(tmp_path):
+    report = run_suite(SMALL, repeat=1, workdir=tmp_path)
+
+    assert list(report["results"]) == [benchmark.name for benchmark in BENCHMARKS]
+    assert report["meta"]["corpus"] == SMALL.to_dict()
+    assert all(row["runs"] == 1 and row["min_ms"] <= row["median_ms"] for row in report["results"].values())
+    with pytest.raises(ValueError):
+        run_suite(SMALL, names=["nope"], repeat=1, workdir=tmp_path)
+
+
+def test_compare_flags_only_growth_above_tolerance_and_noise_floor():
+    baseline = {"results": {"a": {"min_ms": 10.0, "peak_kib": 100.0}, "b": {"min_ms": 0.2, "peak_kib": 10.0}}}
+    current = {"results": {"a": {"min_ms": 20.0, "peak_kib": 110.0}, "b": {"min_ms": 0.6, "peak_kib": 30.0},
+                           "c": {"min_ms": 1.0, "peak_kib": 1.0}}}
+
+    rows = compare(current, baseline, tolerance=0.25)
+
+    assert [(row["name"], row["metric"]) for row in rows if row["regression"]] == [("a", "min_ms")]
+    assert {row["name"] for row in rows} == {"a", "b"}
+
+
+def test_stress_detects_overlapping_claims_and_torn_or_lost_audit_lines(tmp_path):
+    claims = [{"filename": "a", "worker": 0, "start_ns": 0, "end_ns": 10},
+              {"filename": "a", "worker": 1, "start_ns": 5, "end_ns": 20},
+              {"filename": "a", "worker": 2, "start_ns": 20, "end_ns": 30},
+              {"filename": "b", "worker": 0, "start_ns": 0, "end_ns": 10}]
+    audit = tmp_path / "audit.jsonl"
+    audit.write_text('{"stress_worker": 0, "stress_seq": 0}\n{"stress_wor\n{"stress_worker": 0, "stress_seq": 0}\n')
+
+    assert find_double_claims(claims) == [{"filename": "a", "workers": [0, 1]}]
+    assert check_audit_log(audit, {0: [0], 1: [0]}) == {"lines": 3, "torn": 1, "lost": 1, "duplicated": 1}
+
+
+def test_stress_run_finds_no_anomalies(tmp_path):
+    report = run_stress(StressSpec(workers=3, documents=12, array_size=3, abandon=0.2), workdir=tmp_path)
+
+    assert report["ok"], report["anomalies"]
+    assert report["counts"]["submitted"] == report["counts"]["corrected_files"] == 12
+    assert report["counts"]["audit_lines"] == 12
+    assert report["counts"]["cleanup_passes"] > 0
+    assert report["latency_ms"]["submit"]["count"] == 12
@@ -0,0 +1,97 @@
+"""
+Unit tests for bootstrap module.
+"""
+
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils import bootstrap
+from utils.bootstrap import BootstrapResult
+
+
+@pytest.fixture
+def runs(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("app: {}\n")
+    monkeypatch.setattr(bootstrap, "CONFIG_FILE", config_file)
+    mock_run = MagicMock(side_effect=lambda mtime: BootstrapResult(True, mtime, time.time(), 1.0))
+    monkeypatch.setattr(bootstrap, "run_bootstrap", mock_run)
+    bootstrap.reset_bootstrap()
+    yield mock_run
+    bootstrap.reset_bootstrap()
+
+
+def test_bootstrap_runs_once_until_config_changes(runs):
+    first = bootstrap.get_bootstrap(now=0.0)
+    assert bootstrap.get_bootstrap(now=10.0) is first
+    assert runs.call_count == 1
+
+    os.utime(bootstrap.CONFIG_FILE, ns=(0, first.config_mtime + 1_000_000_000))
+    second = bootstrap.get_bootstrap(now=20.0)
+
+    assert runs.call_count == 2
+    assert second.config_mtime == first.config_mtime + 1_000_000_000
+
+
+def test_health_tick_reruns_the_bootstrap(runs):
+    bootstrap.get_bootstrap(now=10.0)
+    bootstrap.get_bootstrap(now=bootstrap.DEFAULT_HEALTH_CHECK_SECONDS - 1)
+    assert runs.call_count == 1
+
+    bootstrap.get_bootstrap(now=bootstrap.DEFAULT_HEALTH_CHECK_SECONDS + 1)
+    assert runs.call_count == 2
+
+
+def test_failed_bootstrap_is_retried(runs):
+    runs.side_effect = lambda mtime: BootstrapResult(False, mtime, time.time(), 1.0, error="no dirs")
+
+    assert not bootstrap.get_bootstrap(now=0.0).ok
+    assert not bootstrap.get_bootstrap(now=0.0).ok
+    assert runs.call_count == 2
+
+
+def test_run_bootstrap_reloads_config_and_creates_directories(tmp_path, monkeypatch):
+    (tmp_path / "config.yaml").write_text(
+        "schema: {primary_schema: missing.yaml}\n"
+        "pdf_viewer: {serve_by_url: false, page_images: {enabled: false}, text_extraction: {enabled: false}}\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    import utils.file_utils as file_utils
+    from utils.schema_loader import get_config_value, reload_config
+    monkeypatch.setattr(file_utils, "_directory_config", None)
+    monkeypatch.setattr(file_utils, "_max_file_size_mb", file_utils._max_file_size_mb)
+
+    try:
+        result = bootstrap.run_bootstrap(config_mtime=1)
+
+        assert result.ok and result.config_mtime == 1 and result.error is None
+        assert (tmp_path / "json_docs").is_dir() and (tmp_path / "locks").is_dir()
+        assert get_config_value("schema", "primary_schema") == "missing.yaml"
+    finally:
+        monkeypatch.undo()
+        reload_config()
+
+
+def test_run_bootstrap_reads_config_yaml_once(tmp_path, monkeypatch):
+    (tmp_path / "config.yaml").write_text(
+        "pdf_viewer: {serve_by_url: false, page_images: {enabled: false}, text_extraction: {enabled: false}}\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    import utils.file_utils as file_utils
+    from utils.config_service import get_config_service
+    from utils.schema_loader import reload_config
+    monkeypatch.setattr(file_utils, "_directory_config", None)
+    monkeypatch.setattr(file_utils, "_max_file_size_mb", file_utils._max_file_size_mb)
+    service = get_config_service()
+    reloads = MagicMock(wraps=service.reload)
+    monkeypatch.setattr(service, "reload", reloads)
+
+    try:
+        assert bootstrap.run_bootstrap(config_mtime=1).ok
+        assert reloads.call_count == 1
+    finally:
+        monkeypatch.undo()
+        reload_config()
@@ -0,0 +1,133 @@
+"""
+Unit tests for business_rules module.
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from utils import validator_compiler as vc
+from utils.business_rules import (
+    RuleSyntaxError,
+    BusinessRule,
+    get_rule_set,
+    validate_directory,
+    validate_documents,
+    validate_rules_config,
+)
+from utils.schema_loader import validate_schema
+
+
+SCHEMA = {
+    "fields": {
+        "Invoice Amount": {"type": "number"},
+        "Invoice date": {"type": "date"},
+        "Due date": {"type": "date"},
+        "Items": {"type": "array", "items": {"type": "object", "properties": {"Amount": {"type": "number"}}}},
+    },
+    "business_rules": [
+        {
+            "name": "items_total",
+            "expression": "sum(Items.Amount) == `Invoice Amount`",
+            "message": "Invoice Amount ({rhs}) should equal the item total ({lhs})",
+        },
+        {"name": "due_after_invoice", "expression": "`Due date` >= `Invoice date`"},
+        {"name": "has_items", "expression": "len(Items) > 0 and max(Items.Amount) <= `Invoice Amount`"},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    vc.clear_validator_cache()
+    yield
+    vc.clear_validator_cache()
+
+
+def test_default_rules_apply_without_business_rules_key():
+    """Schemas without rules keep the historic invoice checks."""
+    errors = get_rule_set({"fields": {}}).validate(
+        {"subtotal": 100.0, "tax_amount": 8.0, "invoice_amount": 120.0}
+    )
+
+    assert errors == ["Invoice amount (120.0) should equal subtotal + tax (108.0)"]
+    assert get_rule_set({"fields": {}, "business_rules": []}).validate({"subtotal": 1, "invoice_amount": 0}) == []
+
+
+def test_declared_rules_cross_field_and_aggregate():
+    """Aggregates, backtick-quoted names and dates evaluate as declared."""
+    rules = get_rule_set(SCHEMA)
+    good = {
+        "Invoice Amount": 30.0,
+        "Invoice date": "2025-01-10",
+        "Due date": "2025-02-10",
+        "Items": [{"Amount": 10}, {"Amount": "20"}, {"Amount": None}],
+    }
+    bad = {**good, "Invoice Amount": 25.0, "Due date": "2025-01-01"}
+
+    assert rules.fields == {"Invoice Amount", "Invoice date", "Due date", "Items"}
+    assert rules.validate(good) == []
+    assert rules.validate(bad) == [
+        "Invoice Amount (25.0) should equal the item total (30.0)",
+        "Business rule 'due_after_invoice' failed: `Due date` >= `Invoice date`",
+    ]
+
+
+def test_missing_values_skip_rules():
+    """A rule whose inputs are missing or non-numeric is not reported."""
+    rules = get_rule_set(SCHEMA)
+
+    assert rules.validate({"Invoice Amount": None, "Due date": "not a date", "Invoice date": "2025-01-01"}) == []
+    assert rules.validate({"Invoice Amount": 5.0, "Items": []}) == [
+        "Invoice Amount (5.0) should equal the item total (0.0)",
+        "Business rule 'has_items' failed: len(Items) > 0 and max(Items.Amount) <= `Invoice Amount`",
+    ]
+
+
+def test_batch_matches_single_document_evaluation():
+    """Evaluating many documents at once gives the per-document results."""
+    documents = {
+        f"doc_{i}.json": {"Invoice Amount": float(i), "Items": [{"Amount": 1.0}] * (i % 3)}
+        for i in range(50)
+    }
+    rules = get_rule_set(SCHEMA)
+
+    batch = validate_documents(documents, SCHEMA)
+    single = {name: rules.validate(doc) for name, doc in documents.items()}
+
+    assert batch == {name: errors for name, errors in single.items() if errors}
+
+
+def test_validate_directory_skips_unreadable_files():
+    """Directory batches load every JSON document and skip broken ones."""
+    directory = Path(tempfile.mkdtemp())
+    try:
+        (directory / "ok.json").write_text(json.dumps({"Invoice Amount": 1.0, "Items": [{"Amount": 1.0}]}))
+        (directory / "bad.json").write_text(json.dumps({"Invoice Amount": 2.0, "Items": [{"Amount": 1.0}]}))
+        (directory / "broken.json").write_text("{")
+
+        results = validate_directory(directory, SCHEMA)
+    finally:
+        shutil.rmtree(directory)
+
+    assert list(results) == ["bad.json"]
+
+
+@pytest.mark.parametrize("expression", [
+    "Items.Amount > 0",
+    "__import__('os')",
+    "total ** 2 > 1",
+    "median(Items.Amount) > 0",
+    "total >",
+])
+def test_invalid_expressions_rejected(expression):
+    """Unsupported syntax fails at compile time and fails schema validation."""
+    with pytest.raises(RuleSyntaxError):
+        BusinessRule({"expression": expression})
+
+    schema = {"fields": {"total": {"type": "number"}}, "business_rules": [{"expression": expression}]}
+    assert validate_rules_config(schema["business_rules"])
+    assert validate_schema(schema) is False
@@ -10,7 +10,8 @@ from unittest.mock import patch, mock_open
 
 from utils.config_loader import (
     load_config, validate_config, get_directory_config, 
-    get_default_config, deep_merge, save_config, get_config_summary
+    get_default_config, deep_merge, save_config, get_config_summary,
+    translate_legacy_keys
 )
 from utils.directory_config import DirectoryConfig
 
@@ -131,7 +132,30 @@ directories:
                 assert config['directories']['corrected'] == 'custom_output'
                 # Should have defaults for missing values
                 assert config['directories']['audits'] == 'audits'
-    
+
+    def test_load_config_translates_legacy_max_file_size_mb(self):
+        """Test that processing.max_file_size_mb maps to max_file_size."""
+        yaml_content = """
+processing:
+  max_file_size_mb: 25
+"""
+
+        with patch('builtins.open', mock_open(read_data=yaml_content)):
+            with patch('pathlib.Path.exists', return_value=True):
+                config = load_config(Path('test.yaml'))
+
+                assert config['processing']['max_file_size'] == 25
+                assert 'max_file_size_mb' not in config['processing']
+
+    def test_translate_legacy_keys_prefers_canonical(self):
+        """Test that the canonical key wins when both spellings are present."""
+        user_config = {'processing': {'max_file_size': 5, 'max_file_size_mb': 50}}
+
+        translated = translate_legacy_keys(user_config)
+
+        assert translated['processing'] == {'max_file_size': 5}
+        assert user_config['processing']['max_file_size_mb'] == 50  # input untouched
+
     def test_load_config_invalid_yaml(self):
         """Test loading config with invalid YAML."""
         invalid_yaml = "invalid: yaml: content: ["
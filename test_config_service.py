@@ -0,0 +1,88 @@
+"""
+Unit tests for config_service module.
+"""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+
+import utils.config_service as config_service
+from utils.config_service import ConfigService
+
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(yaml.safe_dump(data))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    _write(path, {"schema": {"primary_schema": "a.yaml"}, "logging": {"level": "INFO"}}, mtime_ns=10**18)
+    return path
+
+
+def test_snapshot_is_immutable_and_merged_with_defaults(config_file):
+    snapshot = ConfigService(config_file).snapshot()
+
+    assert snapshot.primary_schema == "a.yaml"
+    assert snapshot.get("processing", "max_file_size") == 10
+    assert snapshot.get("missing", "key", "default") == "default"
+    with pytest.raises(TypeError):
+        snapshot.data["schema"]["primary_schema"] = "b.yaml"
+
+
+def test_reloads_when_the_file_changes(config_file):
+    service = ConfigService(config_file, check_interval=0)
+    first = service.snapshot()
+    assert service.snapshot() is first
+
+    _write(config_file, {"schema": {"primary_schema": "b.yaml"}}, mtime_ns=10**18 + 1)
+    second = service.snapshot()
+
+    assert second.primary_schema == "b.yaml"
+    assert second.version == first.version + 1
+
+    # Within the check interval the snapshot is served without looking at the file
+    throttled = ConfigService(config_file, check_interval=3600)
+    before = throttled.snapshot()
+    _write(config_file, {"schema": {"primary_schema": "c.yaml"}}, mtime_ns=10**18 + 2)
+    assert throttled.snapshot() is before
+    assert throttled.reload().primary_schema == "c.yaml"
+
+
+def test_subscribers_are_notified_of_changed_sections(config_file):
+    service = ConfigService(config_file, check_interval=0)
+    service.snapshot()
+    on_schema, on_ui = MagicMock(), MagicMock()
+    failing = MagicMock(side_effect=RuntimeError("boom"))
+    service.subscribe(failing)
+    service.subscribe(on_schema, sections=("schema",))
+    unsubscribe = service.subscribe(on_ui, sections=("ui",))
+
+    _write(config_file, {"schema": {"primary_schema": "b.yaml"}}, mtime_ns=10**18 + 1)
+    service.snapshot()
+    unsubscribe()
+    _write(config_file, {"schema": {"primary_schema": "b.yaml"}, "ui": {"page_title": "X"}}, mtime_ns=10**18 + 2)
+    service.snapshot()
+
+    old, new = on_schema.call_args.args
+    assert (old.primary_schema, new.primary_schema) == ("a.yaml", "b.yaml")
+    assert on_schema.call_count == 1
+    on_ui.assert_not_called()
+    assert failing.call_count == 2
+
+
+def test_get_config_value_follows_config_edits(tmp_path, monkeypatch):
+    from utils.schema_loader import get_config_value
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_service, "_service", ConfigService(check_interval=0))
+    _write(tmp_path / "config.yaml", {"ui": {"page_title": "First"}}, mtime_ns=10**18)
+    assert get_config_value("ui", "page_title") == "First"
+
+    _write(tmp_path / "config.yaml", {"ui": {"page_title": "Second"}}, mtime_ns=10**18 + 1)
+    assert get_config_value("ui", "page_title") == "Second"
@@ -2,6 +2,7 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import utils.edit_view as edit_view
+import utils.field_validation as field_validation
 
 
 class _DummyContext:
@@ -179,13 +180,82 @@ def test_render_diff_section_with_changes_sets_current_diff(monkeypatch):
         return_value={"total": 1, "modified": 1, "added": 0, "removed": 0},
     ), patch.object(
         edit_view, "format_diff_for_display", return_value="formatted diff"
-    ):
+    ), patch.object(edit_view.SessionManager, "set_current_diff") as mock_set_diff:
         edit_view.EditView._render_diff_section()
 
-    assert st.session_state["current_diff"] == diff
+    mock_set_diff.assert_called_once_with(diff)
     st.markdown.assert_called_once_with("formatted diff")
 
 
+def test_render_diff_section_reuses_diff_until_widgets_change(monkeypatch):
+    st = _mock_st(session_state={"schema_fields": ["a"]})
+    monkeypatch.setattr(edit_view, "st", st)
+    prefetched = SimpleNamespace(schema_fields=frozenset({"a"}), original_data={"a": 1})
+    current = {"a": 1}
+
+    with patch.object(edit_view.SessionManager, "get_current_file", return_value="doc.json"), patch.object(
+        edit_view.SessionManager, "get_schema", return_value={"fields": {"a": {"type": "integer"}}}
+    ), patch("utils.prefetch.get_prefetched_document", return_value=prefetched), patch.object(
+        edit_view, "load_json_file"
+    ) as mock_load, patch(
+        "utils.form_data_collector.collect_all_form_data", side_effect=lambda _schema: dict(current)
+    ), patch.object(edit_view, "calculate_diff", return_value={}) as mock_diff, patch.object(
+        edit_view, "has_changes", return_value=False
+    ):
+        edit_view.EditView._render_diff_section()
+        edit_view.EditView._render_diff_section()
+        current["a"] = 2
+        edit_view.EditView._render_diff_section()
+
+    mock_load.assert_not_called()
+    assert mock_diff.call_count == 2
+    assert mock_diff.call_args.args == ({"a": 1}, {"a": 2})
+
+
+def test_editor_panel_renders_form_diff_and_actions(monkeypatch):
+    st = _mock_st(session_state={})
+    monkeypatch.setattr(edit_view, "st", st)
+    calls = []
+    callback = MagicMock()
+
+    with patch.object(edit_view.EditView, "_render_form_column", side_effect=lambda: calls.append("form")), \
+            patch.object(edit_view.EditView, "_render_diff_section", side_effect=lambda: calls.append("diff")), \
+            patch.object(edit_view.EditView, "_render_action_buttons",
+                         side_effect=lambda cancel_callback: calls.append(("actions", cancel_callback))):
+        edit_view.EditView._render_editor_panel(cancel_callback=callback)
+
+    assert calls == ["form", "diff", ("actions", callback)]
+
+
+def test_editor_fragment_rerun_is_profiled_as_a_fragment(monkeypatch):
+    import utils.perf as perf
+
+    st = _mock_st(session_state={})
+    monkeypatch.setattr(edit_view, "st", st)
+    monkeypatch.setattr(perf, "_configured", True)
+    monkeypatch.setattr(perf, "_enabled", True)
+    monkeypatch.setattr(perf, "_recorder", perf.PerfRecorder(history=10))
+    profiles = []
+
+    def render_panel(cancel_callback=None):
+        with perf.span("render_form"):
+            profiles.append(perf.current_profile())
+
+    with patch.object(edit_view.SessionManager, "was_evicted", return_value=False), \
+            patch.object(edit_view.SessionManager, "get_session_id", return_value="s1"), \
+            patch.object(edit_view.EditView, "_render_editor_panel", side_effect=render_panel):
+        # Outside main(): the fragment profiles its own rerun
+        edit_view.EditView._render_editor_fragment.__wrapped__()
+        # Inside main(): its spans join the full run's profile
+        full_run = perf.begin_rerun("edit", "s1")
+        edit_view.EditView._render_editor_fragment.__wrapped__()
+        perf.end_rerun()
+
+    assert profiles[0].fragment and profiles[0].page == "edit" and profiles[0].session == "s1"
+    assert profiles[1] is full_run
+    assert set(perf.get_recorder().summary()) == {"render_form", "fragment_rerun", "rerun"}
+
+
 def test_render_action_buttons_status_branches(monkeypatch):
     st = _mock_st(session_state={})
     monkeypatch.setattr(edit_view, "st", st)
@@ -236,6 +306,7 @@ def test_render_cancel_confirmation_without_unsaved_changes_calls_callback(monke
 def test_handle_reset_increments_form_version_and_reruns(monkeypatch):
     st = _mock_st(session_state={"form_version": 2})
     monkeypatch.setattr(edit_view, "st", st)
+    monkeypatch.setattr(field_validation, "st", st)
 
     with patch.object(edit_view.SessionManager, "clear_validation_errors") as mock_clear, patch(
         "utils.edit_view.Notify.success"
@@ -246,3 +317,51 @@ def test_handle_reset_increments_form_version_and_reruns(monkeypatch):
     mock_clear.assert_called_once()
     mock_success.assert_called_once()
     st.rerun.assert_called_once()
+
+
+def test_handle_reset_drops_cached_field_results(monkeypatch):
+    st = _mock_st(session_state={"form_version": 0})
+    monkeypatch.setattr(edit_view, "st", st)
+    monkeypatch.setattr(field_validation, "st", st)
+    config = {"type": "string", "pattern": r"^INV-\d+$"}
+
+    field_validation.on_field_change("invoice_number")
+    assert field_validation.check_rendered_field("invoice_number", config, "BAD1")
+
+    with patch("utils.edit_view.Notify.success"):
+        edit_view.EditView._handle_reset()
+
+    # The re-initialized widget shows the original value without firing on_change
+    assert field_validation.check_rendered_field("invoice_number", config, "INV-1") == []
+
+
+def test_full_reruns_of_the_same_document_keep_cached_field_results(monkeypatch):
+    st = _mock_st(session_state={"form_version": 0})
+    monkeypatch.setattr(edit_view, "st", st)
+    monkeypatch.setattr(field_validation, "st", st)
+    config = {"type": "string", "pattern": r"^INV-\d+$"}
+    schema = {"fields": {"invoice_number": config}}
+
+    with patch("utils.prefetch.get_prefetched_document", return_value=None), patch(
+        "utils.prefetch.prefetch_document"
+    ), patch.object(edit_view, "load_json_file", return_value={"invoice_number": "BAD1"}), patch(
+        "utils.schema_loader.load_config", return_value={"schema": {"primary_schema": "schema.yaml"}}
+    ), patch("utils.schema_loader.load_active_schema", return_value=schema), patch(
+        "utils.ui_feedback.show_progress", return_value=MagicMock()
+    ), patch.object(edit_view.SessionManager, "get_schema", return_value=schema), patch.object(
+        edit_view.SessionManager, "set_original_data"
+    ), patch.object(edit_view.SessionManager, "set_form_data"), patch.object(
+        edit_view.SessionManager, "take_restored_draft", return_value=None
+    ), patch.object(edit_view.SessionManager, "get_model_class", return_value=dict), patch(
+        "utils.edit_view.Notify.success"
+    ):
+        assert edit_view.EditView._initialize_edit_data("a.json")
+        field_validation.on_field_change("invoice_number")
+        assert field_validation.check_rendered_field("invoice_number", config, "BAD1")
+
+        # Validate, sidebar actions and navigation rerun the whole script
+        assert edit_view.EditView._initialize_edit_data("a.json")
+        assert "invoice_number" in st.session_state[field_validation.FIELD_RESULTS_KEY]
+
+        assert edit_view.EditView._initialize_edit_data("b.json")
+        assert st.session_state[field_validation.FIELD_RESULTS_KEY] == {}
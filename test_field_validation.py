@@ -0,0 +1,90 @@
+"""
+Unit tests for field_validation module.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from utils import field_validation
+from utils import validator_compiler as vc
+from utils.submission_handler import SubmissionHandler
+
+
+SCHEMA = {
+    "fields": {
+        "invoice_number": {"type": "string", "required": True, "pattern": r"^INV-\d+$"},
+        "subtotal": {"type": "number", "min_value": 0},
+        "tax_amount": {"type": "number"},
+        "invoice_amount": {"type": "number"},
+        "notes": {"type": "string", "max_length": 5},
+    }
+}
+
+DATA = {
+    "invoice_number": "BAD",
+    "subtotal": 100.0,
+    "tax_amount": 10.0,
+    "invoice_amount": 90.0,
+    "notes": "ok",
+}
+
+
+@pytest.fixture
+def session():
+    """Isolated session state for each test."""
+    state = {}
+    with patch("utils.field_validation.st.session_state", state):
+        yield state
+
+
+def test_aggregate_matches_full_validation_pass(session):
+    """Per-field aggregation reports the same errors as the full-document pass."""
+    field_errors, rule_errors = field_validation.aggregate_field_results(DATA, SCHEMA)
+    incremental = [e for errs in field_errors.values() for e in errs] + rule_errors
+
+    assert sorted(incremental) == sorted(SubmissionHandler._validate_submission_data(DATA, SCHEMA))
+    assert rule_errors == [
+        "Invoice amount cannot be less than subtotal",
+        "Invoice amount (90.0) should equal subtotal + tax (110.0)",
+    ]
+
+
+def test_aggregate_only_revalidates_changed_fields(session):
+    """After a first pass, only fields whose values changed are validated again."""
+    field_validation.aggregate_field_results(DATA, SCHEMA)
+
+    with patch.object(vc, "get_validator", wraps=vc.get_validator) as spy:
+        field_errors, _ = field_validation.aggregate_field_results({**DATA, "notes": "too long"}, SCHEMA)
+
+    field_configs = [call.args[1] for call in spy.call_args_list if call.args[0] is vc.build_comprehensive_field]
+    assert field_configs == [SCHEMA["fields"]["notes"]]
+    assert set(field_errors) == {"invoice_number", "notes"}
+
+
+def test_rendered_field_validates_only_when_changed(session):
+    """Rendering reuses cached errors until the widget's on_change marks the field."""
+    config = SCHEMA["fields"]["invoice_number"]
+    assert field_validation.check_rendered_field("invoice_number", config, "BAD") == [
+        "Item at invoice_number must match pattern '^INV-\\d+$', got 'BAD'"
+    ]
+
+    with patch.object(vc, "get_validator", side_effect=AssertionError("revalidated")):
+        assert field_validation.check_rendered_field("invoice_number", config, "BAD")
+
+    field_validation.on_field_change("invoice_number")
+    assert field_validation.check_rendered_field("invoice_number", config, "INV-1") == []
+    assert field_validation.get_field_errors("invoice_number") == []
+    assert "invoice_number" not in session[field_validation.PENDING_FIELDS_KEY]
+
+
+def test_business_rules_rerun_only_when_inputs_change(session):
+    """Rules are cached by the hash of the fields they read."""
+    field_validation.validate_business_rules(DATA, SCHEMA)
+
+    with patch.object(SubmissionHandler, "_validate_business_rules", return_value=[]) as rules:
+        field_validation.validate_business_rules({**DATA, "notes": "other"}, SCHEMA)
+        assert rules.call_count == 0
+
+        assert field_validation.validate_business_rules({**DATA, "invoice_amount": 110.0}, SCHEMA) == []
+        assert rules.call_count == 1
@@ -195,6 +195,30 @@ class TestFileUtils:
         loaded_data = load_json_file("test.json")
         assert loaded_data == test_data
     
+    def test_list_unverified_files_flags_oversized(self, monkeypatch) -> None:
+        """Test that files above processing.max_file_size are flagged."""
+        monkeypatch.setattr(file_utils, "_max_file_size_mb", 100 / (1024 * 1024))  # 100 bytes
+        Path("json_docs/small.json").write_text(json.dumps({"a": 1}))
+        Path("json_docs/big.json").write_text(json.dumps({"a": "x" * 500}))
+
+        flags = {f["filename"]: f["exceeds_size_limit"] for f in list_unverified_files()}
+
+        assert flags == {"small.json": False, "big.json": True}
+
+    def test_load_json_file_streams_oversized(self, monkeypatch) -> None:
+        """Test that oversized files only decode the requested fields."""
+        monkeypatch.setattr(file_utils, "_max_file_size_mb", 100 / (1024 * 1024))
+        test_data = {"keep": "value", "drop": "x" * 500}
+        Path("json_docs/big.json").write_text(json.dumps(test_data))
+
+        loaded_data = load_json_file("big.json", fields={"keep"})
+
+        assert loaded_data == {"keep": "value"}
+        assert loaded_data.skipped_fields == ["drop"]
+        # Small files ignore the field hint and load in full
+        monkeypatch.setattr(file_utils, "_max_file_size_mb", 10.0)
+        assert load_json_file("big.json", fields={"keep"}) == test_data
+
     def test_load_json_file_not_found(self) -> None:
         """Test loading a non-existent JSON file."""
         result = load_json_file("nonexistent.json")
@@ -392,6 +416,36 @@ def test_claim_file_returns_false_when_lock_write_fails(monkeypatch, tmp_path):
         assert claim_file("doc.json", "user") is False
 
 
+def test_claim_file_loses_to_a_lock_created_after_the_check(tmp_path):
+    locks = tmp_path / "locks"
+    locks.mkdir()
+    fake_dirs = SimpleNamespace(locks=locks, corrected=tmp_path / "corrected")
+    (locks / "doc.json.lock").write_text('{"user": "other"}')
+
+    with patch.object(file_utils, "ensure_directories_exist"), patch.object(
+        file_utils, "get_directories", return_value=fake_dirs
+    ), patch.object(file_utils, "is_file_locked", return_value=False):
+        assert claim_file("doc.json", "user") is False
+
+    assert json.loads((locks / "doc.json.lock").read_text()) == {"user": "other"}
+    assert sorted(path.name for path in locks.iterdir()) == [file_utils.LOCKS_MUTEX_NAME, "doc.json.lock"]
+
+
+def test_claim_file_refuses_an_already_corrected_document(tmp_path):
+    locks, corrected = tmp_path / "locks", tmp_path / "corrected"
+    locks.mkdir()
+    corrected.mkdir()
+    (corrected / "doc.json").write_text("{}")
+    fake_dirs = SimpleNamespace(locks=locks, corrected=corrected)
+
+    with patch.object(file_utils, "ensure_directories_exist"), patch.object(
+        file_utils, "get_directories", return_value=fake_dirs
+    ):
+        assert claim_file("doc.json", "user") is False
+
+    assert [path.name for path in locks.iterdir()] == [file_utils.LOCKS_MUTEX_NAME]
+
+
 def test_release_file_returns_false_when_unlink_fails(tmp_path):
     locks = tmp_path / "locks"
     locks.mkdir()
@@ -418,6 +472,56 @@ def test_is_file_locked_invalid_lock_data_removes_lock_and_returns_false(tmp_pat
     assert not lock_file.exists()
 
 
+def test_stale_lock_replaced_by_a_fresh_claim_is_not_removed(tmp_path):
+    locks = tmp_path / "locks"
+    locks.mkdir()
+    lock_file = locks / "doc.json.lock"
+    stale = json.dumps({"user": "a", "expires": (datetime.now() - timedelta(minutes=1)).isoformat()}).encode()
+    fresh = json.dumps({"user": "b", "expires": (datetime.now() + timedelta(minutes=5)).isoformat()}).encode()
+    # Another process reclaimed the stale lock and claimed the document after it was read
+    lock_file.write_bytes(fresh)
+
+    assert file_utils._reclaim_lock(lock_file, stale) is False
+    assert lock_file.read_bytes() == fresh
+    assert file_utils._reclaim_lock(lock_file, fresh) is True
+    assert not lock_file.exists()
+    assert file_utils._reclaim_lock(lock_file, fresh) is False
+    assert [path.name for path in locks.iterdir()] == [file_utils.LOCKS_MUTEX_NAME]
+
+
+def test_is_file_locked_keeps_a_fresh_lock_that_replaced_the_stale_one_it_read(tmp_path):
+    locks = tmp_path / "locks"
+    locks.mkdir()
+    lock_file = locks / "doc.json.lock"
+    stale = json.dumps({"user": "a", "expires": (datetime.now() - timedelta(minutes=1)).isoformat()}).encode()
+    fresh = json.dumps({"user": "b", "expires": (datetime.now() + timedelta(minutes=5)).isoformat()}).encode()
+    lock_file.write_bytes(fresh)
+    reads = iter([stale])
+    read_lock = file_utils._read_lock
+
+    # The stale lock was read, then reclaimed and claimed again by another process
+    with patch.object(file_utils, "get_directories", return_value=SimpleNamespace(locks=locks)), patch.object(
+        file_utils, "_read_lock", side_effect=lambda path: next(reads, None) or read_lock(path)
+    ):
+        assert is_file_locked("doc.json") is True
+
+    assert lock_file.read_bytes() == fresh
+
+
+def test_is_file_locked_reports_a_lock_it_could_not_reclaim_as_held(tmp_path):
+    locks = tmp_path / "locks"
+    locks.mkdir()
+    stale = json.dumps({"user": "a", "expires": (datetime.now() - timedelta(minutes=1)).isoformat()})
+    (locks / "doc.json.lock").write_text(stale, encoding="utf-8")
+
+    with patch.object(file_utils, "get_directories", return_value=SimpleNamespace(locks=locks)), patch.object(
+        file_utils, "_locks_mutex", side_effect=PermissionError("denied")
+    ):
+        assert is_file_locked("doc.json") is True
+
+    assert (locks / "doc.json.lock").exists()
+
+
 def test_get_lock_owner_invalid_json_returns_none(tmp_path):
     locks = tmp_path / "locks"
     locks.mkdir()
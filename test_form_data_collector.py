@@ -1,10 +1,10 @@
 from datetime import date, datetime
 
 import numpy as np
-import pandas as pd
 import pytest
 
 import utils.form_data_collector as form_data_collector
+from utils.object_array_buffer import ObjectArrayBuffer
 
 
 def test_collect_all_form_data_missing_versioned_keys_defaults(monkeypatch):
@@ -35,8 +35,8 @@ def test_collect_all_form_data_missing_versioned_keys_defaults(monkeypatch):
     }
 
 
-@pytest.mark.parametrize("source", ["current_dataframe", "fallback_list"])
-def test_collect_all_form_data_object_array_current_and_fallback(monkeypatch, source):
+@pytest.mark.parametrize("source", ["edit_buffer", "fallback_list"])
+def test_collect_all_form_data_object_array_buffer_and_fallback(monkeypatch, source):
     schema = {
         "fields": {
             "line_items": {
@@ -50,8 +50,9 @@ def test_collect_all_form_data_object_array_current_and_fallback(monkeypatch, so
     }
     session_state = {"form_version": 0, "field_line_items_v0": []}
 
-    if source == "current_dataframe":
-        session_state["array_line_items_v0_current"] = pd.DataFrame([{"name": "widget"}])
+    if source == "edit_buffer":
+        properties = schema["fields"]["line_items"]["items"]["properties"]
+        session_state["array_line_items_v0"] = ObjectArrayBuffer([{"name": "widget"}], properties)
     else:
         session_state["field_line_items_v0"] = [{"name": "widget"}]
 
@@ -67,6 +67,7 @@ if "streamlit" not in sys.modules:
         ),
         cache_data=_pass_through_cache,
         cache_resource=types.SimpleNamespace(clear=MagicMock()),
+        fragment=lambda func: func,
     )
     sys.modules["streamlit"] = mock_streamlit
 
@@ -465,3 +466,44 @@ def test_edit_view_handle_reset_restores_array_state(session_state, tmp_path):
     # With the simplified reset logic, old keys remain but are ignored
     # because widgets will use versioned keys (v1 after reset)
     # The old v0 keys are effectively orphaned and will be ignored
+
+
+def test_paged_editor_records_only_cells_the_reviewer_edited(session_state, tmp_path):
+    import json
+
+    import utils.form_generator as form_generator
+    from utils.json_streaming import stream_json_fields
+
+    rows = [{"Description": "A", "Quantity": 1}, {"Description": "B", "Note": "x"}] * 30
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps({"Items": rows}), encoding="utf-8")
+    items = stream_json_fields(path, lazy_array_threshold=10, page_size=20)["Items"]
+    field_config = {"type": "array", "label": "Items", "items": {"type": "object", "properties": {
+        "Description": {"type": "string"}, "Quantity": {"type": "integer"}}}}
+    session_state["form_version"] = 0
+
+    def _data_editor(df, key, **kwargs):
+        edited = df.copy()
+        for position, cells in (session_state.get(key) or {}).get("edited_rows", {}).items():
+            for column, value in cells.items():
+                edited.iloc[position, edited.columns.get_loc(column)] = value
+        return edited
+
+    with patch.object(form_generator.st, "container", side_effect=_context_manager_mock), patch.object(
+        form_generator.st, "markdown"
+    ), patch.object(form_generator.st, "caption"), patch.object(
+        form_generator.st, "number_input", return_value=1
+    ), patch.object(form_generator.st, "error"), patch.object(
+        form_generator.st, "data_editor", side_effect=_data_editor
+    ):
+        # Viewing a page of mixed-key rows (NaN-filled ints, missing keys) is not an edit
+        untouched = FormGenerator._render_paged_array_editor("Items", field_config, items)
+        assert untouched.edited_indices == []
+
+        session_state["data_editor_Items_p0_v0"] = {
+            "edited_rows": {1: {"Description": "Changed"}}, "added_rows": [], "deleted_rows": []}
+        edited = FormGenerator._render_paged_array_editor("Items", field_config, items)
+
+    assert edited.edited_indices == [1]
+    assert edited[1] == {"Description": "Changed", "Note": "x"}
+    assert edited[0] == {"Description": "A", "Quantity": 1}
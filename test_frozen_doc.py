@@ -0,0 +1,104 @@
+"""
+Unit tests for frozen_doc module.
+"""
+
+import copy
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import utils.session_manager as session_manager
+from utils.frozen_doc import FrozenDict, FrozenList, assoc, freeze, shared_fraction, thaw
+from utils.session_manager import SessionManager
+
+DOCUMENT = {
+    "supplier_name": "ACME",
+    "total_amount": 12.5,
+    "line_items": [{"description": "Desk", "quantity": 2}, {"description": "Lamp", "quantity": 1}],
+    "address": {"city": "Oslo", "lines": ["Main St 1"]},
+}
+
+
+class _MockSessionState(dict):
+    """Minimal session_state stand-in supporting attribute access."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as exc:
+            raise AttributeError(key) from exc
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def test_frozen_snapshot_behaves_like_plain_data_but_refuses_changes():
+    doc = freeze(copy.deepcopy(DOCUMENT))
+
+    assert isinstance(doc, dict) and isinstance(doc["line_items"], FrozenList)
+    assert doc == DOCUMENT
+    assert json.loads(json.dumps(doc)) == DOCUMENT
+    assert freeze(doc) is doc
+
+    with pytest.raises(TypeError):
+        doc["supplier_name"] = "Other"
+    with pytest.raises(TypeError):
+        doc["line_items"].append({})
+
+    # deepcopy/copy hand back plain, mutable data
+    mutable = copy.deepcopy(doc)
+    assert type(mutable) is dict and type(mutable["line_items"][0]) is dict
+    assert type(copy.copy(doc)) is dict and type(doc["address"].copy()) is dict
+
+
+def test_freeze_shares_unchanged_subtrees_with_the_original():
+    original = freeze(copy.deepcopy(DOCUMENT))
+    edited = copy.deepcopy(DOCUMENT)
+    edited["line_items"][1]["quantity"] = 3
+
+    snapshot = freeze(edited, share_with=original)
+
+    assert snapshot["address"] is original["address"]
+    assert snapshot["line_items"][0] is original["line_items"][0]
+    assert snapshot["line_items"][1] is not original["line_items"][1]
+    assert freeze(thaw(original), share_with=original) is original
+    # Equal but differently typed values are not shared
+    assert freeze({"total_amount": 12}, share_with=freeze({"total_amount": 12.0}))["total_amount"] == 12
+    assert type(freeze([1], share_with=freeze([True]))[0]) is int
+
+
+def test_assoc_copies_only_the_path():
+    original = freeze(copy.deepcopy(DOCUMENT))
+
+    updated = assoc(original, ("line_items", 0, "quantity"), 5)
+
+    assert updated["line_items"][0]["quantity"] == 5
+    assert original["line_items"][0]["quantity"] == 2
+    assert updated["address"] is original["address"]
+    assert updated["line_items"][1] is original["line_items"][1]
+    assert isinstance(assoc(original, ("notes",), ["a"])["notes"], FrozenList)
+    assert shared_fraction(original, updated) == 0.5  # item 1, address, address.lines
+
+
+def test_session_form_data_shares_the_original(monkeypatch):
+    state = _MockSessionState()
+    monkeypatch.setattr(session_manager, "st", SimpleNamespace(session_state=state))
+
+    with patch.object(SessionManager, "update_activity"):
+        SessionManager.set_original_data(copy.deepcopy(DOCUMENT))
+        original = SessionManager.get_original_data()
+        assert SessionManager.get_form_data() is original
+
+        SessionManager.set_form_data(thaw(original))
+        assert SessionManager.get_form_data() is original
+        assert state.unsaved_changes is False
+
+        edited = thaw(original)
+        edited["supplier_name"] = "Other"
+        SessionManager.set_form_data(edited)
+
+    assert isinstance(SessionManager.get_form_data(), FrozenDict)
+    assert state.unsaved_changes is True
+    assert SessionManager.get_form_data()["line_items"] is original["line_items"]
@@ -0,0 +1,121 @@
+"""
+Unit tests for json_streaming module.
+"""
+
+import copy
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from utils.json_streaming import (
+    JsonStreamError,
+    LazyJsonArray,
+    StreamedDocument,
+    materialize_lazy_arrays,
+    stream_json_fields,
+)
+
+
+class TestJsonStreaming:
+    """Test class for the streaming JSON loader."""
+
+    def setup_method(self):
+        """Create a temporary document with a large array and tricky strings."""
+        self.test_dir = tempfile.mkdtemp()
+        self.document = {
+            "Invoice Number": 'INV-"42" ] }',
+            "Items": [{"Description": f"Item {i} [x]", "Amount": i * 1.5} for i in range(250)],
+            "Legacy": {"nested": [1, 2, {"text": "}\\\\"}]},
+            "Total": -12.5e2,
+            "Paid": True,
+            "Notes": None,
+            "Tags": ["a", "b"],
+        }
+        self.path = Path(self.test_dir) / "large.json"
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.document, f, indent=2)
+
+    def teardown_method(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.test_dir)
+
+    @pytest.mark.parametrize("chunk_size", [5, 64, 65536])
+    def test_stream_all_fields_matches_json_load(self, chunk_size):
+        """Test that streaming every field reproduces json.load across chunk boundaries."""
+        result = stream_json_fields(self.path, lazy_array_threshold=10_000, chunk_size=chunk_size)
+
+        assert isinstance(result, StreamedDocument)
+        assert result == self.document
+        assert result.skipped_fields == []
+
+    def test_stream_selected_fields_skips_others(self):
+        """Test that unrequested keys are skipped and reported."""
+        result = stream_json_fields(self.path, fields={"Invoice Number", "Total"})
+
+        assert result == {"Invoice Number": 'INV-"42" ] }', "Total": -1250.0}
+        assert sorted(result.skipped_fields) == ["Items", "Legacy", "Notes", "Paid", "Tags"]
+
+    def test_large_array_is_lazy_and_paged(self):
+        """Test that arrays above the threshold stay on disk and decode by page."""
+        result = stream_json_fields(self.path, fields={"Items", "Tags"}, lazy_array_threshold=100, page_size=40)
+
+        items = result["Items"]
+        assert isinstance(items, LazyJsonArray)
+        assert isinstance(result["Tags"], list)
+        assert len(items) == 250
+        assert items.page_count == 7
+        assert items.page(6) == self.document["Items"][240:]
+        assert items[-1] == self.document["Items"][-1]
+        assert items[10:12] == self.document["Items"][10:12]
+        assert items == self.document["Items"]
+
+    def test_lazy_array_edits_are_copy_on_write(self):
+        """Test that with_rows layers edits without touching the original view."""
+        items = stream_json_fields(self.path, lazy_array_threshold=100)["Items"]
+
+        edited = items.with_rows(3, [{"Description": "Changed", "Amount": 0}])
+
+        assert edited[3]["Description"] == "Changed"
+        assert items[3] == self.document["Items"][3]
+        assert edited != items
+        assert edited.edited_indices == [3]
+        assert copy.deepcopy(edited) is edited
+
+        # Mutating a returned item must not leak into the cached page
+        row = items[0]
+        row["Description"] = "mutated"
+        assert items[0] == self.document["Items"][0]
+
+    def test_lazy_array_rejects_changed_source(self):
+        """Test that reading from a file that changed after indexing fails loudly."""
+        items = stream_json_fields(self.path, lazy_array_threshold=100)["Items"]
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"Items": []}, f)
+
+        with pytest.raises(JsonStreamError):
+            items.page(0)
+
+    def test_materialize_lazy_arrays(self):
+        """Test that lazy arrays become plain lists and other data is untouched."""
+        result = stream_json_fields(self.path, lazy_array_threshold=100)
+        plain = {"a": [1, 2]}
+
+        materialized = materialize_lazy_arrays(result)
+
+        assert isinstance(materialized["Items"], list)
+        assert materialized == self.document
+        assert materialize_lazy_arrays(plain) is plain
+
+    def test_invalid_document_raises(self):
+        """Test that non-object or truncated documents raise JsonStreamError."""
+        self.path.write_text('[1, 2, 3]', encoding="utf-8")
+        with pytest.raises(JsonStreamError):
+            stream_json_fields(self.path)
+
+        self.path.write_text('{"a": [1, 2', encoding="utf-8")
+        with pytest.raises(JsonStreamError):
+            stream_json_fields(self.path)
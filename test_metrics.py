@@ -0,0 +1,116 @@
+"""
+Unit tests for metrics module (Prometheus text exporter).
+"""
+
+import json
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.metrics as metrics
+from utils.file_utils import append_audit_log, claim_file, cleanup_stale_locks
+from utils.metrics import MetricsRegistry, MetricsServer, write_textfile
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ['json_docs', 'corrected', 'audits', 'pdf_docs', 'locks']:
+        (tmp_path / name).mkdir()
+    return tmp_path
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs.", ["kind"]).inc(kind='a"b')
+    registry.gauge("depth", "Depth.").set(3)
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP depth Depth.", "# TYPE depth gauge", "depth 3",
+        "# HELP jobs_total Jobs.", "# TYPE jobs_total counter", 'jobs_total{kind="a\\"b"} 1',
+        "# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1', 'latency_seconds_bucket{le="1"} 2', 'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 2.55", "latency_seconds_count 3",
+    ]
+
+
+def test_registry_rejects_conflicting_metrics_and_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.", ["kind"])
+
+    assert registry.counter("jobs_total", "Jobs.", ["kind"]) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("jobs_total", "Jobs.", ["kind"])
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+
+
+def test_timed_decorator_labels_each_call_by_its_result():
+    latency = MetricsRegistry().histogram("submit_seconds", "Submit.", ["outcome"])
+
+    @latency.timed(lambda ok: "saved" if ok else "invalid")
+    def submit(ok):
+        if ok is None:
+            raise RuntimeError("boom")
+        return ok
+
+    assert submit(True) and not submit(False)
+    with pytest.raises(RuntimeError):
+        submit(None)
+    assert [latency.count(outcome=outcome) for outcome in ("saved", "invalid", "error")] == [1, 1, 1]
+
+
+def test_file_operations_record_queue_lock_and_audit_metrics(workdir):
+    for name in ("a.json", "b.json"):
+        (workdir / "json_docs" / name).write_text("{}")
+    stale = {"filename": "old.json", "user": "x", "expires": (datetime.now() - timedelta(minutes=1)).isoformat()}
+    (workdir / "locks" / "old.json.lock").write_text(json.dumps(stale))
+    (workdir / "locks" / "bad.json.lock").write_text("{not json")
+    reclaims = {reason: metrics.LOCK_RECLAIMS.value(reason=reason) for reason in ("expired", "corrupted")}
+    claims = {outcome: metrics.CLAIM_SECONDS.count(outcome=outcome) for outcome in ("claimed", "busy")}
+    audit_writes = metrics.AUDIT_WRITE_SECONDS.count()
+
+    assert cleanup_stale_locks() == 2
+    assert claim_file("a.json", "alice") and not claim_file("a.json", "bob")
+    assert append_audit_log({"filename": "a.json"})
+
+    # Queue gauges are counted from disk whenever the registry is rendered
+    metrics.REGISTRY.render()
+    assert (metrics.QUEUE_DEPTH.value(), metrics.LOCKED_DOCUMENTS.value()) == (2, 1)
+    (workdir / "corrected" / "b.json").write_text("{}")
+    metrics.REGISTRY.render()
+    assert (metrics.QUEUE_DEPTH.value(), metrics.LOCKED_DOCUMENTS.value()) == (1, 1)
+    assert {reason: metrics.LOCK_RECLAIMS.value(reason=reason) - count for reason, count in reclaims.items()} == {
+        "expired": 1, "corrupted": 1}
+    assert {outcome: metrics.CLAIM_SECONDS.count(outcome=outcome) - count for outcome, count in claims.items()} == {
+        "claimed": 1, "busy": 1}
+    assert metrics.AUDIT_WRITE_SECONDS.count() == audit_writes + 1
+
+
+def test_http_endpoint_and_textfile_expose_the_registry(tmp_path):
+    registry = MetricsRegistry()
+    registry.gauge("qa_queue_depth", "Depth.").set(7)
+    server = MetricsServer(registry, port=0)
+    assert server.start()
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.stop()
+    textfile = tmp_path / "textfile" / "qa.prom"
+    write_textfile(textfile, registry)
+
+    assert content_type == metrics.CONTENT_TYPE
+    assert "qa_queue_depth 7" in body.splitlines()
+    assert textfile.read_text() == registry.render()
+    assert list(textfile.parent.iterdir()) == [textfile]
+
+
+def test_exporter_is_disabled_by_default():
+    assert metrics.start_metrics_exporter({}) is None
+    assert metrics.start_metrics_exporter({"metrics": {"enabled": False}}) is None
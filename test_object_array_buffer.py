@@ -0,0 +1,90 @@
+"""
+Unit tests for object_array_buffer module.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+import utils.form_generator as form_generator
+from utils.form_generator import FormGenerator
+from utils.object_array_buffer import ObjectArrayBuffer
+
+PROPERTIES = {"description": {"type": "string"}, "quantity": {"type": "integer"}}
+ROWS = [{"description": "Desk", "quantity": 2}, {"description": "Lamp", "quantity": 1, "sku": "L-1"}]
+
+
+def _edited(buffer, row, column, value):
+    frame = buffer.frame.copy()
+    frame.loc[row, column] = value
+    return frame
+
+
+def test_buffer_builds_frame_once_with_schema_columns_first():
+    buffer = ObjectArrayBuffer(ROWS, PROPERTIES)
+
+    assert list(buffer.frame.columns) == ["description", "quantity", "sku"]
+    assert len(buffer) == 2
+    assert buffer.to_records()[1]["sku"] == "L-1"
+
+
+def test_rows_are_converted_only_when_the_editor_delta_changes():
+    buffer = ObjectArrayBuffer(ROWS, PROPERTIES)
+    cleaner = MagicMock(side_effect=lambda records, properties: records)
+
+    buffer.record_edits(buffer.frame, {"edited_rows": {}})
+    first = buffer.to_records(cleaner)
+    buffer.record_edits(buffer.frame.copy(), {"edited_rows": {}})
+    assert buffer.to_records(cleaner) is first
+    assert cleaner.call_count == 1
+
+    state = {"edited_rows": {"0": {"quantity": 5}}}
+    assert buffer.record_edits(_edited(buffer, 0, "quantity", 5), state)
+    assert buffer.to_records(cleaner)[0]["quantity"] == 5
+    assert cleaner.call_count == 2
+
+
+def test_add_and_delete_rows_keep_cell_edits():
+    buffer = ObjectArrayBuffer(ROWS, PROPERTIES)
+    buffer.record_edits(_edited(buffer, 0, "description", "Chair"), {"edited_rows": {"0": {"description": "Chair"}}})
+
+    buffer.add_row({"description": "New Item", "quantity": 1})
+    records = buffer.to_records()
+    assert [row["description"] for row in records] == ["Chair", "Lamp", "New Item"]
+
+    buffer.delete_last_row()
+    buffer.delete_last_row()
+    assert [row["description"] for row in buffer.to_records()] == ["Chair"]
+
+
+def test_editor_reuses_buffer_across_reruns(monkeypatch):
+    session_state = {"form_version": 0}
+    field_config = {"type": "array", "items": {"type": "object", "properties": PROPERTIES}}
+    ctx = MagicMock()
+    ctx.__enter__ = MagicMock(return_value=None)
+    ctx.__exit__ = MagicMock(return_value=False)
+    st = SimpleNamespace(
+        session_state=session_state,
+        container=MagicMock(return_value=ctx),
+        columns=MagicMock(return_value=(ctx, ctx)),
+        button=MagicMock(return_value=False),
+        markdown=MagicMock(),
+        caption=MagicMock(),
+        error=MagicMock(),
+        success=MagicMock(),
+        data_editor=MagicMock(side_effect=lambda frame, **kwargs: frame.copy()),
+    )
+    monkeypatch.setattr(form_generator, "st", st)
+
+    with patch.object(FormGenerator, "_clean_object_array", wraps=FormGenerator._clean_object_array) as mock_clean:
+        first = FormGenerator._render_object_array_editor("line_items", field_config, ROWS)
+        second = FormGenerator._render_object_array_editor("line_items", field_config, ROWS)
+
+    assert first == second
+    assert first[1]["quantity"] == 1
+    assert mock_clean.call_count == 1
+    buffer = session_state["array_line_items_v0"]
+    assert isinstance(buffer, ObjectArrayBuffer)
+    assert all(call.args[0] is buffer.frame for call in st.data_editor.call_args_list)
+    assert isinstance(buffer.frame, pd.DataFrame)
@@ -0,0 +1,259 @@
+"""
+Unit tests for pdf_cache module.
+"""
+
+import json
+import os
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import utils.pdf_cache as pdf_cache
+import utils.pdf_viewer as pdf_viewer
+
+
+class _FakeExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.submitted.append((fn, args, future))
+        return future
+
+
+def _make_cache(tmp_path, **kwargs):
+    cache = pdf_cache.PDFCache(tmp_path / "cache", scales=(1.5, 0.25), max_pages=5, **kwargs)
+    executor = _FakeExecutor()
+    cache._get_executor = lambda: executor
+    cache.executor = executor
+    return cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return _make_cache(tmp_path, extract_info=False)
+
+
+@pytest.fixture
+def info_cache(tmp_path):
+    return _make_cache(tmp_path, render_pages=False)
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4 test")
+    return path
+
+
+def _write_manifest(cache, pdf_path, pages=2, page_count=None):
+    entry = cache.entry_dir(cache.content_hash(pdf_path))
+    entry.mkdir(parents=True)
+    manifest = {
+        "version": pdf_cache.MANIFEST_VERSION,
+        "page_count": page_count or pages,
+        "scales": ["0.25", "1.5"],
+        "pages": [
+            {"page": n, "width": 612, "height": 792,
+             "images": {"0.25": f"page-{n:04d}@0.25x.png", "1.5": f"page-{n:04d}@1.5x.png"}}
+            for n in range(1, pages + 1)
+        ],
+    }
+    (entry / pdf_cache.MANIFEST_NAME).write_text(json.dumps(manifest))
+    return entry
+
+
+def test_content_hash_follows_file_content(cache, pdf_file):
+    first = cache.content_hash(pdf_file)
+    assert first == cache.content_hash(pdf_file)
+
+    pdf_file.write_bytes(b"%PDF-1.4 changed")
+    stat = pdf_file.stat()
+    os.utime(pdf_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.content_hash(pdf_file) != first
+    assert cache.content_hash(pdf_file.with_name("missing.pdf")) is None
+
+
+def test_get_pages_resolves_cached_images(cache, pdf_file):
+    assert cache.get_pages(pdf_file) is None
+
+    entry = _write_manifest(cache, pdf_file)
+    manifest = cache.get_pages(pdf_file)
+
+    assert manifest["page_count"] == 2
+    assert manifest["pages"][1]["images"]["1.5"] == entry / "page-0002@1.5x.png"
+
+
+def test_warm_renders_once_per_content_hash(cache, pdf_file, tmp_path):
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(pdf_file.read_bytes())
+
+    [future] = cache.warm(pdf_file)
+    assert cache.warm(copy) == [future]
+    assert len(cache.executor.submitted) == 1
+    fn, args, _ = cache.executor.submitted[0]
+    assert fn is pdf_cache.render_pdf_pages
+    assert args[2] == (0.25, 1.5)
+
+    future.set_result({})
+    _write_manifest(cache, pdf_file)
+    assert cache.warm(pdf_file) == []
+    assert len(cache.executor.submitted) == 1
+
+
+def test_failed_render_is_not_retried(cache, pdf_file):
+    cache.warm(pdf_file)[0].set_exception(RuntimeError("corrupt"))
+
+    assert cache.warm(pdf_file) == []
+    assert len(cache.executor.submitted) == 1
+
+
+def test_watcher_warms_new_and_changed_files(cache, tmp_path):
+    pdf_dir = tmp_path / "pdf_docs"
+    pdf_dir.mkdir()
+    (pdf_dir / "a.pdf").write_bytes(b"a")
+    (pdf_dir / "notes.txt").write_text("x")
+    watcher = pdf_cache._DirectoryWatcher(cache, pdf_dir, interval=60)
+
+    with patch.object(cache, "warm", return_value=[Future()]) as mock_warm:
+        assert watcher.scan() == 1
+        assert watcher.scan() == 0
+        (pdf_dir / "b.pdf").write_bytes(b"b")
+        assert watcher.scan() == 1
+
+    assert [call.args[0].name for call in mock_warm.call_args_list] == ["a.pdf", "b.pdf"]
+
+
+def test_viewer_shows_cached_page_image(cache, pdf_file, monkeypatch):
+    entry = _write_manifest(cache, pdf_file, pages=2, page_count=30)
+    st = SimpleNamespace(
+        toggle=MagicMock(return_value=False),
+        selectbox=MagicMock(return_value=2),
+        image=MagicMock(),
+        caption=MagicMock(),
+    )
+    monkeypatch.setattr(pdf_viewer, "st", st)
+    monkeypatch.setattr(pdf_cache, "_cache", cache)
+
+    with patch.object(pdf_viewer.PDFViewer, "_display_pdf_info"), \
+            patch.object(pdf_viewer.PDFViewer, "_try_url_embed") as mock_url:
+        pdf_viewer.PDFViewer._display_pdf(pdf_file)
+
+    mock_url.assert_not_called()
+    assert st.image.call_args_list[0].args[0] == str(entry / "page-0002@1.5x.png")
+    assert "first 2 of 30 pages" in st.caption.call_args.args[0]
+
+    # Full PDF view falls through to the other display methods
+    st.toggle.return_value = True
+    assert pdf_viewer.PDFViewer._try_cached_pages(pdf_file) is False
+
+
+def test_viewer_schedules_render_when_uncached(cache, pdf_file, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "_cache", cache)
+
+    assert pdf_viewer.PDFViewer._try_cached_pages(pdf_file) is False
+    assert len(cache.executor.submitted) == 1
+
+
+def test_info_is_extracted_once_and_read_from_cache(info_cache, pdf_file, tmp_path):
+    assert info_cache.get_info(pdf_file) is None
+    [future] = info_cache.warm(pdf_file)
+    fn, args, _ = info_cache.executor.submitted[0]
+    assert fn is pdf_cache.extract_pdf_info
+
+    class FakePage:
+        def extract_text(self):
+            return "Invoice INV-1"
+
+    class FakeReader:
+        def __init__(self, _):
+            self.pages = [FakePage(), FakePage()]
+            self.metadata = {"/Title": "Invoice"}
+
+    with patch.dict("sys.modules", {"PyPDF2": SimpleNamespace(PdfReader=FakeReader)}):
+        future.set_result(fn(*args))
+
+    with patch.dict("sys.modules", {"PyPDF2": None}):
+        info = info_cache.get_info(pdf_file)
+    assert info["page_count"] == 2
+    assert info["metadata"]["title"] == "Invoice"
+    assert info["pages"][0]["text"] == "Invoice INV-1"
+    assert info["size"] == pdf_file.stat().st_size
+    assert info_cache.warm(pdf_file) == []
+
+
+def test_unreadable_pdf_is_recorded(tmp_path):
+    pdf_path = tmp_path / "broken.pdf"
+    pdf_path.write_bytes(b"not a pdf")
+
+    info = pdf_cache.extract_pdf_info(str(pdf_path), str(tmp_path / "out"), max_pages=5)
+
+    assert info["page_count"] is None
+    assert info["error"]
+    assert json.loads((tmp_path / "out" / pdf_cache.INFO_NAME).read_text()) == info
+
+
+def test_viewer_metadata_and_text_come_from_cache(info_cache, pdf_file, monkeypatch):
+    entry = info_cache.entry_dir(info_cache.content_hash(pdf_file))
+    entry.mkdir(parents=True)
+    (entry / pdf_cache.INFO_NAME).write_text(json.dumps({
+        "version": pdf_cache.INFO_VERSION,
+        "page_count": 4,
+        "metadata": {"title": "Cached", "author": None},
+        "pages": [{"page": 1, "text": "First page text"}],
+        "error": None,
+    }))
+    st = SimpleNamespace(expander=MagicMock(), text_area=MagicMock(), info=MagicMock(), caption=MagicMock())
+    st.expander.return_value.__enter__ = MagicMock()
+    st.expander.return_value.__exit__ = MagicMock(return_value=False)
+    monkeypatch.setattr(pdf_viewer, "st", st)
+    monkeypatch.setattr(pdf_cache, "_cache", info_cache)
+
+    with patch.dict("sys.modules", {"PyPDF2": None}):
+        metadata = pdf_viewer.PDFViewer.get_pdf_metadata(pdf_file)
+        pdf_viewer.PDFViewer._try_display_pdf_text_preview(pdf_file)
+
+    assert metadata["title"] == "Cached"
+    assert metadata["page_count"] == 4
+    assert st.text_area.call_args.kwargs["value"] == "First page text"
+
+
+def test_prune_removes_least_recently_used_entries(cache, tmp_path):
+    entries = {}
+    for n, name in enumerate(("old", "used", "new")):
+        pdf_path = tmp_path / f"{name}.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 " + name.encode())
+        entries[name] = _write_manifest(cache, pdf_path, pages=1)
+        (entries[name] / "page-0001@1.5x.png").write_bytes(b"x" * 1000)
+        os.utime(entries[name], (1000 + n, 1000 + n))
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get_pages(tmp_path / "old.pdf")
+    entry_size = sum(f.stat().st_size for f in entries["new"].iterdir())
+
+    assert cache.prune(max_bytes=0) == 0
+    assert cache.prune(max_bytes=2 * entry_size) == 1
+
+    assert not entries["used"].exists()
+    assert entries["old"].exists() and entries["new"].exists()
+
+
+def test_render_pdf_pages_writes_manifest(tmp_path):
+    pytest.importorskip("pypdfium2")
+    from PyPDF2 import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=100)
+    pdf_path = tmp_path / "blank.pdf"
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    manifest = pdf_cache.render_pdf_pages(str(pdf_path), str(tmp_path / "out"), (0.5, 1.0), max_pages=2)
+
+    assert manifest["page_count"] == 3
+    assert len(manifest["pages"]) == 2
+    assert (tmp_path / "out" / "page-0002@1x.png").exists()
+    assert (tmp_path / "out" / pdf_cache.MANIFEST_NAME).exists()
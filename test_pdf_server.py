@@ -0,0 +1,167 @@
+"""
+Unit tests for pdf_server module.
+"""
+
+import http.client
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlsplit
+
+import pytest
+
+import utils.pdf_server as pdf_server
+import utils.pdf_viewer as pdf_viewer
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 8 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def server():
+    srv = pdf_server.PDFFileServer(port=0)
+    assert srv.start()
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "invoice 1.pdf"
+    path.write_bytes(PDF_BYTES)
+    return path
+
+
+def _request(url, method="GET", headers=None):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+    try:
+        conn.request(method, parts.path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_full_and_range_requests(server, pdf_file):
+    url = server.register(pdf_file)
+
+    status, headers, body = _request(url)
+    assert status == 200
+    assert body == PDF_BYTES
+    assert headers["Accept-Ranges"] == "bytes"
+    assert headers["Content-Type"] == "application/pdf"
+
+    status, headers, body = _request(url, headers={"Range": "bytes=10-19"})
+    assert status == 206
+    assert body == PDF_BYTES[10:20]
+    assert headers["Content-Range"] == f"bytes 10-19/{len(PDF_BYTES)}"
+
+    status, _, body = _request(url, headers={"Range": "bytes=-7"})
+    assert status == 206
+    assert body == PDF_BYTES[-7:]
+
+    status, headers, _ = _request(url, headers={"Range": f"bytes={len(PDF_BYTES)}-"})
+    assert status == 416
+    assert headers["Content-Range"] == f"bytes */{len(PDF_BYTES)}"
+
+
+def test_etag_revalidation_and_if_range(server, pdf_file):
+    url = server.register(pdf_file)
+    _, headers, _ = _request(url, method="HEAD")
+    etag = headers["ETag"]
+
+    status, _, body = _request(url, headers={"If-None-Match": etag})
+    assert status == 304
+    assert body == b""
+
+    # A stale If-Range validator gets the whole file instead of a range
+    status, _, body = _request(url, headers={"Range": "bytes=0-3", "If-Range": '"stale"'})
+    assert status == 200
+    assert body == PDF_BYTES
+
+
+def test_only_registered_current_files_are_served(server, pdf_file, tmp_path):
+    url = server.register(pdf_file)
+    other = tmp_path / "other.pdf"
+    other.write_bytes(PDF_BYTES)
+
+    assert _request(f"{server.base_url}/pdf/not-a-token/other.pdf")[0] == 404
+    assert _request(f"{server.base_url}/other.pdf")[0] == 404
+
+    pdf_file.write_bytes(PDF_BYTES + b"changed")
+    stat = pdf_file.stat()
+    os.utime(pdf_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert _request(url)[0] == 410
+
+    new_url = server.register(pdf_file)
+    assert new_url != url
+    assert _request(new_url)[2] == PDF_BYTES + b"changed"
+
+
+def test_parse_range():
+    assert pdf_server.parse_range(None, 100) is None
+    assert pdf_server.parse_range("bytes=0-", 100) == (0, 99)
+    assert pdf_server.parse_range("bytes=90-200", 100) == (90, 99)
+    assert pdf_server.parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ValueError):
+        pdf_server.parse_range("bytes=5-2", 100)
+
+
+def test_display_pdf_prefers_url_embed(server, pdf_file, monkeypatch):
+    st = SimpleNamespace(markdown=MagicMock(), caption=MagicMock())
+    monkeypatch.setattr(pdf_viewer, "st", st)
+    monkeypatch.setattr(pdf_server, "_server", server)
+
+    with patch.object(pdf_viewer.PDFViewer, "_display_pdf_info"), \
+            patch.object(pdf_viewer.PDFViewer, "_try_iframe_embed") as mock_iframe, \
+            patch.object(pdf_viewer.PDFViewer, "_try_streamlit_pdf_viewer") as mock_viewer:
+        pdf_viewer.PDFViewer._display_pdf(pdf_file)
+
+    mock_viewer.assert_not_called()
+    mock_iframe.assert_not_called()
+    html = st.markdown.call_args.args[0]
+    assert f"{server.base_url}/pdf/" in html
+    assert "base64" not in html
+
+
+def test_url_embed_without_server(pdf_file, monkeypatch):
+    monkeypatch.setattr(pdf_server, "_server", None)
+    assert pdf_viewer.PDFViewer._try_url_embed(pdf_file) is False
+
+
+def test_registry_keeps_only_the_most_recent_entries(tmp_path):
+    srv = pdf_server.PDFFileServer(port=0, max_entries=2)
+    assert srv.start()
+    try:
+        paths = []
+        for n in range(3):
+            paths.append(tmp_path / f"{n}.pdf")
+            paths[-1].write_bytes(PDF_BYTES)
+        first, second, third = (srv.register(path) for path in paths)
+        srv.register(paths[1])
+
+        assert _request(first)[0] == 404
+        assert _request(second)[0] == 200 and _request(third)[0] == 200
+    finally:
+        srv.stop()
+
+
+def test_server_starts_by_default_and_serves_local_browsers_only(pdf_file, monkeypatch):
+    monkeypatch.setattr(pdf_server, "_server", None)
+    srv = pdf_server.start_pdf_server({"pdf_viewer": {"serve_by_url": True, "public_url": None}})
+    try:
+        assert srv is not None and srv.base_url.startswith("http://127.0.0.1:")
+        url = pdf_server.get_pdf_url(pdf_file, browser_host="localhost:8501")
+        assert _request(url)[0] == 200
+        # The loopback URL would not load in a browser on another host: embed inline instead
+        assert pdf_server.get_pdf_url(pdf_file, browser_host="qa.example.com") is None
+
+        srv.public_url = "https://qa.example.com"
+        assert pdf_server.get_pdf_url(pdf_file, browser_host="qa.example.com").startswith("https://qa.example.com/pdf/")
+    finally:
+        pdf_server.stop_pdf_server()
+
+
+def test_is_loopback_host():
+    assert all(pdf_server.is_loopback_host(host) for host in ("localhost:8501", "127.0.0.1", "[::1]:8501"))
+    assert not any(pdf_server.is_loopback_host(host) for host in ("qa.example.com", "10.0.0.5:8501", None))
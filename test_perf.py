@@ -0,0 +1,97 @@
+"""
+Unit tests for perf module (per-rerun phase timing).
+"""
+
+import json
+
+import pytest
+
+import utils.perf as perf
+from utils.perf import PerfRecorder, percentile, span, timed
+
+
+@pytest.fixture(autouse=True)
+def recorder(monkeypatch, tmp_path):
+    recorder = PerfRecorder(history=100)
+    monkeypatch.setattr(perf, "_recorder", recorder)
+    monkeypatch.setattr(perf, "_configured", True)
+    monkeypatch.setattr(perf, "_enabled", True)
+    yield recorder
+    perf._local.profile = None
+
+
+def test_spans_are_collected_per_rerun_with_nesting():
+    @timed("render_form")
+    def render_form():
+        with span("validate"):
+            pass
+
+    perf.begin_rerun("edit", "s1")
+    with span("page.edit"):
+        render_form()
+        render_form()
+    profile = perf.end_rerun()
+
+    assert [(row["name"], row["depth"], row["calls"]) for row in profile.phases()] == [
+        ("page.edit", 0, 1), ("render_form", 1, 2), ("validate", 2, 2)]
+    assert perf.current_profile() is None
+    assert profile.total_ms() >= profile.phases()[0]["total_ms"]
+
+
+def test_recorded_spans_feed_percentiles_and_the_jsonl_log(recorder, tmp_path):
+    log_file = tmp_path / "perf.jsonl"
+    recorder.configure(100, log_file)
+
+    for ms in (10.0, 20.0, 30.0, 40.0):
+        perf.begin_rerun("queue", "s1")
+        perf.record("list_unverified_files", ms)
+        perf.end_rerun()
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [line["span"] for line in lines[:2]] == ["list_unverified_files", "rerun"]
+    assert {line["page"] for line in lines} == {"queue"}
+    assert recorder.summary(["list_unverified_files"])["list_unverified_files"] == {
+        "count": 4, "p50": 20.0, "p90": 40.0, "p99": 40.0, "max": 40.0}
+    assert perf.summarize_log(log_file)["list_unverified_files"]["p50"] == 20.0
+    assert perf.summarize_log(log_file, page="edit") == {}
+
+
+def test_fragment_reruns_are_logged_apart_from_full_reruns(recorder, tmp_path):
+    log_file = tmp_path / "perf.jsonl"
+    recorder.configure(100, log_file)
+
+    perf.begin_rerun("edit", "s1", fragment=True)
+    perf.record("render_form", 5.0)
+    perf.end_rerun()
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [line["span"] for line in lines] == ["render_form", "fragment_rerun"]
+    assert all(line["fragment"] for line in lines)
+    assert set(recorder.summary()) == {"render_form", "fragment_rerun"}
+
+
+def test_spans_outside_a_rerun_only_update_the_history(recorder):
+    with span("prefetch"):
+        pass
+
+    assert recorder.summary()["prefetch"]["count"] == 1
+    assert recorder.reruns == 0
+
+
+def test_disabled_profiling_records_nothing(recorder, monkeypatch):
+    perf.configure({"enabled": False})
+
+    assert perf.begin_rerun("queue") is None
+    with span("list_unverified_files"):
+        pass
+    perf.record("validate.schema", 1.0)
+
+    assert perf.end_rerun() is None
+    assert recorder.summary() == {}
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+
+    assert [percentile(values, pct) for pct in (50, 90, 99)] == [50, 90, 99]
+    assert percentile([], 50) == 0.0
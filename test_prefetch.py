@@ -0,0 +1,104 @@
+"""
+Unit tests for prefetch module.
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+import utils.prefetch as prefetch
+from utils.directory_config import DirectoryConfig
+
+SCHEMA_YAML = """
+title: Test
+fields:
+  invoice_number:
+    type: string
+    required: true
+  total:
+    type: number
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ["json_docs", "corrected", "audits", "pdf_docs", "locks", "schemas"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "schemas" / "test_schema.yaml").write_text(SCHEMA_YAML)
+    dirs = DirectoryConfig.from_config({"directories": {
+        name: str(tmp_path / name) for name in ["json_docs", "corrected", "audits", "pdf_docs", "locks"]
+    }})
+    monkeypatch.setattr("utils.file_utils.get_directories", lambda: dirs)
+    monkeypatch.setattr(prefetch, "_primary_schema_path", lambda: "test_schema.yaml")
+    return tmp_path
+
+
+def _write_doc(workspace, name, data):
+    path = workspace / "json_docs" / name
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_prefetched_document_matches_edit_view_preparation(workspace):
+    _write_doc(workspace, "a.json", {"invoice_number": "INV-1", "total": 5, "legacy": "x"})
+    prefetcher = prefetch.DocumentPrefetcher(max_documents=2)
+
+    prefetcher.prefetch("a.json").result(timeout=10)
+    document = prefetcher.get("a.json")
+
+    assert document.filtered_data == {"invoice_number": "INV-1", "total": 5}
+    assert list(document.extras) == ["legacy"]
+    assert document.schema_fields == {"invoice_number", "total"}
+    assert document.model_class is not None
+    assert prefetcher.prefetch("a.json") is None
+    prefetcher.shutdown()
+
+
+def test_stale_documents_are_dropped(workspace):
+    path = _write_doc(workspace, "a.json", {"invoice_number": "INV-1"})
+    prefetcher = prefetch.DocumentPrefetcher(max_documents=2)
+    prefetcher.prefetch("a.json").result(timeout=10)
+
+    path.write_text(json.dumps({"invoice_number": "INV-22"}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert prefetcher.get("a.json") is None
+    prefetcher.shutdown()
+
+
+def test_cache_is_bounded(workspace):
+    prefetcher = prefetch.DocumentPrefetcher(max_documents=2)
+    for name in ["a.json", "b.json", "c.json"]:
+        _write_doc(workspace, name, {"invoice_number": name})
+        prefetcher.prefetch(name).result(timeout=10)
+
+    assert prefetcher.get("a.json", wait=0) is None
+    assert prefetcher.get("c.json", wait=0) is not None
+    prefetcher.shutdown()
+
+
+def test_prefetch_next_skips_current_and_locked(workspace):
+    _write_doc(workspace, "current.json", {"invoice_number": "1"})
+    _write_doc(workspace, "locked.json", {"invoice_number": "2"})
+    _write_doc(workspace, "next.json", {"invoice_number": "3"})
+    prefetcher = prefetch.DocumentPrefetcher(max_documents=4)
+
+    with patch("utils.file_utils.is_file_locked", side_effect=lambda name: name == "locked.json"):
+        assert prefetcher.prefetch_next(exclude="current.json").result(timeout=10) == "next.json"
+
+    assert prefetcher.get("next.json") is not None
+    assert prefetcher.get("current.json", wait=0) is None
+    prefetcher.shutdown()
+
+
+def test_disabled_prefetcher_does_nothing(workspace):
+    _write_doc(workspace, "a.json", {"invoice_number": "1"})
+    prefetcher = prefetch.DocumentPrefetcher(max_documents=0)
+
+    assert prefetcher.prefetch("a.json") is None
+    assert prefetcher.prefetch_next() is None
+    assert prefetcher.get("a.json") is None
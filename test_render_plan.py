@@ -0,0 +1,109 @@
+"""
+Unit tests for render_plan module.
+"""
+
+import copy
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import utils.form_generator as form_generator
+import utils.render_plan as render_plan
+from utils.form_generator import FormGenerator
+
+SCHEMA = {
+    "title": "Invoice",
+    "fields": {
+        "supplier_name": {"type": "string", "label": "Supplier", "pattern": "^[A-Z]"},
+        "total_amount": {"type": "number", "label": "Total", "required": True},
+        "status": {"type": "enum", "choices": ["open", "paid"]},
+        "invoice_date": {"type": "date"},
+        "line_items": {
+            "type": "array",
+            "items": {"type": "object", "properties": {
+                "description": {"type": "string"},
+                "quantity": {"type": "integer"},
+            }},
+        },
+        "extraction_confidence": {"type": "number", "readonly": True},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    render_plan.clear_render_plan_cache()
+    yield
+    render_plan.clear_render_plan_cache()
+
+
+def test_plan_is_shared_per_schema_version():
+    plan = render_plan.get_render_plan(SCHEMA)
+
+    assert render_plan.get_render_plan(copy.deepcopy(SCHEMA)) is plan
+    assert render_plan.get_render_plan_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    edited = copy.deepcopy(SCHEMA)
+    edited["fields"]["status"]["choices"].append("void")
+    assert render_plan.get_render_plan(edited) is not plan
+
+
+def test_plan_matches_form_layout():
+    plan = render_plan.get_render_plan(SCHEMA)
+
+    grouped = FormGenerator._group_fields(SCHEMA["fields"])
+    assert [(group, [p.name for p in plans]) for group, plans in plan.groups] == [
+        (group, list(fields)) for group, fields in grouped.items()
+    ]
+
+    fields = plan.fields
+    assert fields["supplier_name"].widget_kwargs["help"] == "Pattern: ^[A-Z]"
+    assert fields["total_amount"].widget_type == "number_input"
+    assert fields["total_amount"].default == 0
+    assert fields["status"].widget_kwargs["options"] == (None, "open", "paid")
+    assert fields["invoice_date"].coerce("2024-03-01").isoformat() == "2024-03-01"
+    assert fields["line_items"].full_width
+    assert fields["line_items"].column_order == ("description", "quantity")
+    assert dict(fields["line_items"].default_row) == {"description": "New Item", "quantity": 1}
+    assert fields["extraction_confidence"].widget_kwargs["disabled"] is True
+
+    with pytest.raises(TypeError):
+        fields["status"].widget_kwargs["options"] = ()
+
+
+def test_render_field_uses_plan_kwargs(monkeypatch):
+    session_state = {}
+    st = SimpleNamespace(session_state=session_state, text_input=MagicMock(return_value=None))
+    monkeypatch.setattr(form_generator, "st", st)
+    field_plan = render_plan.get_render_plan(SCHEMA).fields["supplier_name"]
+
+    value = FormGenerator._render_field("supplier_name", field_plan.config, "ACME", plan=field_plan)
+
+    assert value == ""
+    assert session_state["field_supplier_name_v0"] == "ACME"
+    kwargs = st.text_input.call_args.kwargs
+    assert kwargs["key"] == "field_supplier_name_v0"
+    assert kwargs["label"] == "Supplier"
+    assert kwargs["args"] == ("supplier_name",)
+    # The shared plan is never modified by rendering
+    assert "key" not in field_plan.widget_kwargs
+
+
+def test_render_form_fields_reuses_plan(monkeypatch):
+    st = SimpleNamespace(
+        session_state={},
+        subheader=MagicMock(),
+        columns=MagicMock(return_value=(MagicMock(), MagicMock())),
+        container=MagicMock(),
+    )
+    monkeypatch.setattr(form_generator, "st", st)
+
+    with patch.object(FormGenerator, "_render_field", return_value="x") as mock_render, \
+            patch.object(FormGenerator, "_show_field_errors"), \
+            patch.object(form_generator.field_validation, "check_rendered_field"):
+        FormGenerator._render_form_fields(SCHEMA["fields"], {})
+        FormGenerator._render_form_fields(copy.deepcopy(SCHEMA["fields"]), {})
+
+    assert render_plan.get_render_plan_cache_stats()["misses"] == 1
+    assert all(call.kwargs["plan"] is not None for call in mock_render.call_args_list)
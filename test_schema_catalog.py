@@ -0,0 +1,71 @@
+"""
+Unit tests for schema_catalog module and the schema editor's list view.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+import utils.schema_catalog as schema_catalog
+import utils.schema_editor_view as schema_editor_view
+from utils.schema_catalog import SchemaCatalog, load_yaml
+
+
+def _write_schema(directory, name, fields, mtime_ns=None):
+    path = directory / name
+    path.write_text(yaml.safe_dump({"title": name, "fields": fields}))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+@pytest.fixture
+def schemas_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(schema_catalog, "_catalog", SchemaCatalog())
+    directory = tmp_path / "schemas"
+    directory.mkdir()
+    _write_schema(directory, "a.yaml", {"supplier": {"type": "string", "label": "Supplier"}}, mtime_ns=10**18)
+    _write_schema(directory, "b.yaml", {"bad": {"type": "unknown"}}, mtime_ns=10**18)
+    return directory
+
+
+def test_list_schema_files_reparses_only_changed_files(schemas_dir):
+    with patch.object(schema_editor_view, "load_schema", wraps=schema_editor_view.load_schema) as mock_load:
+        first = schema_editor_view.list_schema_files()
+        assert mock_load.call_count == 2
+
+        assert schema_editor_view.list_schema_files() == first
+        assert mock_load.call_count == 2
+
+        _write_schema(schemas_dir, "a.yaml", {"supplier": {"type": "string"}, "total": {"type": "number"}},
+                      mtime_ns=10**18 + 1)
+        (schemas_dir / "b.yaml").unlink()
+        updated = schema_editor_view.list_schema_files()
+
+    assert mock_load.call_count == 3
+    assert [(f["filename"], f["is_valid"], f["field_count"]) for f in first] == [("a.yaml", True, 1), ("b.yaml", False, 1)]
+    assert first[1]["error_message"].startswith("Validation errors")
+    assert [(f["filename"], f["field_count"]) for f in updated] == [("a.yaml", 2)]
+    assert schema_catalog.get_schema_catalog().stats() == {"files": 1, "parsed": 3, "reused": 2}
+
+
+def test_clearing_schema_caches_invalidates_the_catalog(schemas_dir):
+    schema_editor_view.list_schema_files()
+
+    with patch.object(schema_editor_view, "Notify"):
+        schema_editor_view._clear_schema_caches()
+    with patch.object(schema_editor_view, "load_schema", wraps=schema_editor_view.load_schema) as mock_load:
+        schema_editor_view.list_schema_files()
+
+    assert mock_load.call_count == 2
+
+
+def test_load_yaml_matches_safe_load():
+    text = "title: T\nfields:\n  n: {type: number, min_value: 1.5}\n  d: {type: date}\nflag: yes\n"
+
+    assert load_yaml(text) == yaml.safe_load(text)
+    with pytest.raises(yaml.YAMLError):
+        load_yaml("!!python/object:os.system {}")
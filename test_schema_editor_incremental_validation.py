@@ -0,0 +1,131 @@
+"""
+Unit tests for the schema editor's incremental field validation and lazy field editors.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import utils.schema_editor_view as schema_editor_view
+from utils.schema_editor_view import (
+    EXPANDED_FIELDS_KEY,
+    FieldValidationIndex,
+    SchemaEditor,
+    validate_schema_structure,
+)
+
+
+class _MockSessionState(dict):
+    """Minimal session_state stand-in supporting attribute access."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as exc:
+            raise AttributeError(key) from exc
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def _fields(count=300):
+    fields = [{"id": f"f{i}", "name": f"field_{i}", "type": "string", "label": f"Field {i}",
+               "required": False, "help": ""} for i in range(count)]
+    fields[3].update({"name": "Field_1"})
+    fields[4].update({"name": "value"})
+    fields[5].update({"type": "enum", "choices": None})
+    fields[6].update({"pattern": "(unclosed"})
+    return fields
+
+
+def _schema(fields):
+    return {"title": "T", "description": "", "fields": {
+        f["name"]: schema_editor_view._editor_field_config(f) for f in fields if f["name"]}}
+
+
+@pytest.fixture
+def mock_st(monkeypatch):
+    st = MagicMock()
+    st.session_state = _MockSessionState()
+    st.columns.side_effect = lambda spec: [MagicMock() for _ in range(spec if isinstance(spec, int) else len(spec))]
+    st.button.return_value = False
+    st.selectbox.return_value = "All Types"
+    monkeypatch.setattr(schema_editor_view, "st", st)
+    return st
+
+
+def test_index_errors_match_full_schema_validation():
+    fields = _fields()
+    index = FieldValidationIndex()
+
+    assert index.sync(fields) == len(fields)
+    assert index.errors() == validate_schema_structure(_schema(fields))[1]
+    assert "Field names must be unique (case-insensitive)" in index.errors()
+
+
+def test_editing_one_field_revalidates_only_that_field():
+    fields = _fields()
+    index = FieldValidationIndex()
+    index.sync(fields)
+
+    fields[10] = {**fields[10], "name": "field_11", "max_length": 5}
+    with patch.object(schema_editor_view, "validate_field", wraps=schema_editor_view.validate_field) as mock_validate:
+        assert index.sync(fields) == 1
+    assert mock_validate.call_count == 1
+
+    assert index.field_errors("f11") == ["Field name 'field_11' is used multiple times"]
+    fields[10] = {**fields[10], "name": "renamed"}
+    del fields[5]
+    index.sync(fields)
+    assert index.field_errors("f11") == []
+    assert index.errors() == validate_schema_structure(_schema(fields))[1]
+
+
+def test_update_validation_on_change_uses_cached_results(mock_st):
+    fields = _fields(20)
+    mock_st.session_state.schema_editor_fields = fields
+    SchemaEditor._update_validation_on_change()
+
+    fields[0] = {**fields[0], "label": ""}
+    with patch.object(schema_editor_view, "validate_schema_structure") as mock_full, \
+         patch.object(schema_editor_view, "validate_field", wraps=schema_editor_view.validate_field) as mock_validate:
+        SchemaEditor._update_validation_on_change()
+
+    mock_full.assert_not_called()
+    assert mock_validate.call_count == 1
+    results = mock_st.session_state.schema_editor_validation_results
+    assert "Field 'field_0' missing required 'label' property" in results["errors"]
+    assert results["is_valid"] is False
+
+
+def test_confirmed_field_delete_resyncs_validation(mock_st):
+    fields = [{"id": f"f{i}", "name": name, "type": "string", "label": name, "required": False, "help": ""}
+              for i, name in enumerate(["amount", "amount", "currency"])]
+    mock_st.session_state.schema_editor_fields = fields
+    SchemaEditor._update_validation_on_change()
+    assert mock_st.session_state.schema_editor_validation_results["is_valid"] is False
+
+    mock_st.session_state.schema_editor_pending_field_delete = 1
+    mock_st.button.side_effect = lambda label, **kwargs: kwargs.get("key") == "confirm_field_delete"
+    with patch.object(schema_editor_view.Notify, "warn"):
+        SchemaEditor._handle_pending_operations()
+
+    assert [f["id"] for f in mock_st.session_state.schema_editor_fields] == ["f0", "f2"]
+    assert SchemaEditor._field_validation_index().field_errors("f0") == []
+    assert mock_st.session_state.schema_editor_validation_results == {
+        **mock_st.session_state.schema_editor_validation_results, "is_valid": True, "errors": []}
+
+
+def test_large_schema_renders_editors_only_for_opened_fields(mock_st):
+    mock_st.session_state.schema_editor_fields = _fields(50)
+    mock_st.session_state[EXPANDED_FIELDS_KEY] = {"f7"}
+
+    with patch.object(SchemaEditor, "_render_field_editor") as mock_editor, \
+         patch.object(SchemaEditor, "_show_validation_summary"):
+        SchemaEditor._render_field_management_area({})
+
+    assert [call.args[0] for call in mock_editor.call_args_list] == [7]
+    headers = [call.args[0] for call in mock_st.markdown.call_args_list]
+    assert len(headers) == 49
+    assert headers[0] == "🏷️ field_0 (string) ✅"
+    assert headers[5] == "🏷️ field_5 (enum) ❌"
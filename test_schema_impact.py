@@ -0,0 +1,106 @@
+"""
+Unit tests for schema_impact module.
+"""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import utils.schema_editor_view as schema_editor_view
+import utils.schema_impact as schema_impact
+from utils.schema_impact import CACHE_NAME, analyze_schema_change, collect_documents
+
+OLD_SCHEMA = {"fields": {
+    "supplier": {"type": "string", "label": "Supplier"},
+    "total": {"type": "number", "label": "Total", "min_value": 0},
+    "notes": {"type": "string", "label": "Notes"},
+}}
+NEW_SCHEMA = {"fields": {
+    "supplier": {"type": "string", "label": "Supplier", "max_length": 5},
+    "total": {"type": "number", "label": "Total", "min_value": 0},
+    "currency": {"type": "enum", "label": "Currency", "choices": ["EUR", "USD"]},
+}}
+
+
+def _write(directory, name, data):
+    path = directory / name
+    path.write_text(json.dumps(data))
+    return path
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    json_docs, corrected = tmp_path / "json_docs", tmp_path / "corrected"
+    json_docs.mkdir()
+    corrected.mkdir()
+    _write(json_docs, "a.json", {"supplier": "ACME", "total": 1, "notes": "x"})
+    _write(json_docs, "b.json", {"supplier": "Globex Corp", "total": 2})
+    _write(json_docs, "c.json", {"supplier": "Old draft", "total": 3, "notes": "y"})
+    _write(corrected, "c.json", {"supplier": "Initech", "total": 3, "currency": "EUR"})
+    (json_docs / "broken.json").write_text("{not json")
+    return json_docs, corrected
+
+
+def test_collect_documents_prefers_corrected_versions(corpus):
+    documents = collect_documents(*corpus)
+
+    assert [(label, path.name) for label, path in documents] == [
+        ("json_docs", "a.json"), ("json_docs", "b.json"), ("json_docs", "broken.json"), ("corrected", "c.json")]
+
+
+def test_analysis_counts_missing_extra_and_newly_invalid_per_field(corpus):
+    report = analyze_schema_change(OLD_SCHEMA, NEW_SCHEMA, collect_documents(*corpus), workers=1)
+
+    assert report.documents == {"json_docs": 2, "corrected": 1}
+    assert report.unreadable == ["broken.json"]
+    assert report.fields == {
+        "supplier": {"status": "changed", "missing": 0, "extra": 0, "newly_invalid": 2},
+        "currency": {"status": "added", "missing": 2, "extra": 0, "newly_invalid": 0},
+        "notes": {"status": "removed", "missing": 0, "extra": 1, "newly_invalid": 0},
+    }
+    assert report.affected_documents == 3
+
+
+def test_rerun_only_analyses_changed_documents(corpus, tmp_path):
+    cache_path = tmp_path / "impact" / CACHE_NAME
+    documents = collect_documents(*corpus)
+    first = analyze_schema_change(OLD_SCHEMA, NEW_SCHEMA, documents, workers=1, cache_path=cache_path)
+
+    _write(corpus[0], "a.json", {"supplier": "ACME", "total": -1})
+    os.utime(corpus[0] / "a.json", ns=(10**18, 10**18))
+    with patch.object(schema_impact, "analyze_documents", wraps=schema_impact.analyze_documents) as mock_analyze:
+        second = analyze_schema_change(OLD_SCHEMA, NEW_SCHEMA, documents, workers=1, cache_path=cache_path)
+
+    assert (first.analyzed, first.reused) == (4, 0)
+    # The unreadable document is retried; the unchanged ones come from the cache
+    assert (second.analyzed, second.reused) == (2, 2)
+    assert sorted(os.path.basename(p) for call in mock_analyze.call_args_list for p in call.args[0]) == [
+        "a.json", "broken.json"]
+    assert second.fields["notes"]["extra"] == 0
+
+
+def test_process_pool_matches_in_process_analysis(corpus, monkeypatch):
+    monkeypatch.setattr(schema_impact, "MIN_DOCUMENTS_FOR_POOL", 1)
+    monkeypatch.setattr(schema_impact, "BATCH_SIZE", 2)
+    documents = collect_documents(*corpus)
+
+    pooled = analyze_schema_change(OLD_SCHEMA, NEW_SCHEMA, documents, workers=2)
+    serial = analyze_schema_change(OLD_SCHEMA, NEW_SCHEMA, documents, workers=1)
+
+    assert (pooled.fields, pooled.affected_documents) == (serial.fields, serial.affected_documents)
+
+
+def test_only_saves_of_the_primary_schema_start_an_analysis(monkeypatch):
+    monkeypatch.setattr(schema_editor_view, "st", SimpleNamespace(session_state={}))
+    monkeypatch.setattr(schema_impact, "impact_settings", lambda: {"enabled": True})
+
+    with patch.object(schema_impact, "start_impact_analysis") as mock_start, \
+            patch("utils.schema_loader.get_config_value", return_value="primary.yaml"):
+        schema_editor_view.SchemaEditor._start_impact_analysis(OLD_SCHEMA, NEW_SCHEMA, "schemas/other.yaml")
+        mock_start.assert_not_called()
+
+        schema_editor_view.SchemaEditor._start_impact_analysis(OLD_SCHEMA, NEW_SCHEMA, "schemas/primary.yaml")
+        mock_start.assert_called_once_with(OLD_SCHEMA, NEW_SCHEMA, "primary.yaml")
@@ -0,0 +1,82 @@
+"""
+Unit tests for session_keys module.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import utils.form_generator as form_generator
+import utils.session_manager as session_manager
+from utils import session_keys
+from utils.form_generator import FormGenerator
+from utils.session_manager import SessionManager
+
+
+class _MockSessionState(dict):
+    """Minimal session_state stand-in supporting attribute access."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as exc:
+            raise AttributeError(key) from exc
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def test_keys_are_indexed_per_form_version():
+    state = {"form_version": 0, "field_a_v0": 1, "array_a_v0": [1]}
+    session_keys.register(state, "a", "field_a_v0", "array_a_v0", "array_a_v0_item_0")
+
+    assert session_keys.keys_for(state, "a") == {"field_a_v0", "array_a_v0"}
+    assert session_keys.fields_for(state) == ["a"]
+    assert session_keys.keys_for(state, "a", version=1) == set()
+
+    session_keys.forget(state, "a", ["array_a_v0"])
+    assert "array_a_v0" not in state
+    assert session_keys.keys_for(state, "a") == {"field_a_v0"}
+
+
+def test_garbage_collection_keeps_only_the_current_version():
+    state = {"form_version": 0}
+    for version in range(3):
+        state["form_version"] = version
+        state[f"field_a_v{version}"] = version
+        state[f"scalar_array_a_size_v{version}"] = version
+        session_keys.register(state, "a", f"field_a_v{version}", f"scalar_array_a_size_v{version}")
+    state["unrelated"] = True
+
+    assert session_keys.collect_garbage(state, keep_version=2) == 4
+    assert session_keys.get_index_stats(state) == {"versions": 1, "fields": 1, "keys": 2}
+    assert set(state) == {"form_version", "unrelated", session_keys.INDEX_KEY,
+                          "field_a_v2", "scalar_array_a_size_v2"}
+
+    assert session_keys.collect_garbage(state) == 2
+    assert session_keys.get_index_stats(state)["keys"] == 0
+
+
+def test_rendered_widgets_register_their_keys(monkeypatch):
+    session_state = {"form_version": 1}
+    st = SimpleNamespace(session_state=session_state, text_input=MagicMock(return_value="x"))
+    monkeypatch.setattr(form_generator, "st", st)
+
+    FormGenerator._render_field("supplier_name", {"type": "string"}, "ACME")
+    with patch.object(SessionManager, "get_form_data", return_value={}), \
+            patch.object(SessionManager, "set_form_data"):
+        FormGenerator._sync_array_to_session("tags", ["a", "b"])
+
+    assert session_keys.keys_for(session_state, "supplier_name") == {"field_supplier_name_v1"}
+    assert session_keys.keys_for(session_state, "tags") == {"field_tags_v1", "scalar_array_tags_size_v1"}
+
+
+def test_file_change_drops_widget_keys(monkeypatch):
+    state = _MockSessionState({"form_version": 0, "current_file": "a.json", "array_items_v0": "buffer"})
+    session_keys.register(state, "items", "array_items_v0")
+    monkeypatch.setattr(session_manager, "st", SimpleNamespace(session_state=state))
+
+    with patch.object(SessionManager, "update_activity"):
+        SessionManager.set_current_file("b.json")
+
+    assert "array_items_v0" not in state
+    assert state.current_file == "b.json"
@@ -0,0 +1,145 @@
+"""
+Unit tests for session_memory module.
+"""
+
+import copy
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import utils.session_manager as session_manager
+import utils.session_memory as session_memory
+from utils import session_keys
+from utils.frozen_doc import freeze
+from utils.session_manager import SessionManager
+from utils.session_memory import SessionLedger, SessionStore, estimate_session_memory, estimate_size
+
+DOCUMENT = {
+    "supplier_name": "ACME",
+    "line_items": [{"description": f"Item {n}", "quantity": n} for n in range(200)],
+}
+
+
+class _MockSessionState(dict):
+    """Minimal session_state stand-in supporting attribute access."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as exc:
+            raise AttributeError(key) from exc
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+@pytest.fixture
+def drafts_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_memory, "_drafts_dir", lambda: tmp_path)
+    return tmp_path
+
+
+def _edit_session(store, session_id, edited_name="Edited"):
+    original = freeze(copy.deepcopy(DOCUMENT))
+    form_data = freeze({**DOCUMENT, "supplier_name": edited_name}, share_with=original)
+    for key, value in dict(original_data=original, form_data=form_data,
+                           schema={"fields": {}}, model_class=dict).items():
+        store.set(session_id, key, value)
+    state = _MockSessionState(
+        current_file="invoice.json", unsaved_changes=True, form_version=0,
+        array_line_items_v0=list(DOCUMENT["line_items"]),
+    )
+    state[session_memory.STORE_ID_KEY] = session_id
+    session_keys.register(state, "line_items", "array_line_items_v0")
+    return state
+
+
+def test_shared_subtrees_are_counted_once():
+    store = SessionStore()
+    state = _edit_session(store, "s1")
+
+    sizes = estimate_session_memory(state, store.values("s1"))
+
+    assert sizes["original_data"] > 200 * estimate_size({})
+    # form_data shares the line items with original_data; only its top-level dict is new
+    assert sizes["form_data"] < sizes["original_data"] / 10
+    assert sizes["widgets"] > 0
+
+
+def test_idle_session_values_are_freed_without_another_run_of_that_session(drafts_dir):
+    store = SessionStore()
+    ledger = SessionLedger(idle_seconds=60, sweep_seconds=0, store=store)
+    state = _edit_session(store, "idle")
+    ledger.record_run("idle", state, current_file="invoice.json", now=1000.0)
+    tracked = ledger.totals()["total_bytes"]
+
+    assert ledger.evict_idle(now=1030.0) == []
+    assert ledger.evict_idle(now=1100.0) == ["idle"]
+
+    # Freed right away: no further record_run of the idle session
+    assert store.values("idle") == {}
+    assert ledger.totals()["total_bytes"] < tracked / 2 and ledger.totals()["evictions"] == 1
+    assert ledger.snapshot(now=1100.0)[0]["evicted"]
+    assert len(list(drafts_dir.glob("*.json"))) == 1
+    # The sweeper never touches the session's own state; nothing is left to evict
+    assert "array_line_items_v0" in state
+    assert ledger.evict_idle(now=1200.0) == []
+
+    assert session_memory.restore_evicted_state(state, "idle", store)
+    assert "array_line_items_v0" not in state
+    assert state[session_memory.RESTORED_DRAFT_KEY]["supplier_name"] == "Edited"
+    assert not list(drafts_dir.glob("*.json"))
+    assert not store.is_evicted("idle")
+
+
+def test_sizes_are_sampled_and_sweeps_exclude_the_running_session(drafts_dir):
+    store = SessionStore()
+    ledger = SessionLedger(idle_seconds=60, sample_seconds=30, sweep_seconds=10, store=store)
+    idle_state, active_state = _edit_session(store, "idle"), _edit_session(store, "active")
+    ledger.record_run("idle", idle_state, now=0.0)
+
+    with patch.object(session_memory, "estimate_session_memory", wraps=estimate_session_memory) as mock_estimate:
+        ledger.record_run("active", active_state, now=100.0)
+        ledger.record_run("active", active_state, now=110.0)
+
+    assert mock_estimate.call_count == 1
+    # The sweep ran on the active session's thread and evicted only the idle session
+    assert store.values("idle") == {} and store.values("active")["original_data"]
+    rows = {row["session"]: row for row in ledger.snapshot(now=110.0)}
+    assert rows["idle"]["evicted"] and not rows["active"]["evicted"]
+
+
+def test_session_manager_keeps_heavy_values_out_of_session_state(monkeypatch):
+    state = _MockSessionState()
+    monkeypatch.setattr(session_manager, "st", SimpleNamespace(session_state=state))
+    monkeypatch.setattr(session_memory, "_store", SessionStore())
+
+    with patch.object(SessionManager, "update_activity"):
+        SessionManager.set_original_data(copy.deepcopy(DOCUMENT))
+    SessionManager.set_model_class(dict)
+
+    assert set(state) <= {session_memory.STORE_ID_KEY, "unsaved_changes", "diff_cache"}
+    assert SessionManager.get_form_data()["supplier_name"] == "ACME"
+    assert SessionManager.get_model_class() is dict
+
+
+def test_track_memory_restores_the_draft_of_an_evicted_session_for_the_edit_view(drafts_dir, monkeypatch):
+    store = SessionStore()
+    state = _edit_session(store, "s1")
+    state.update(session_id="s1", current_user="operator", last_activity=datetime.now())
+    ledger = SessionLedger(idle_seconds=0, store=store)
+    ledger.record_run("s1", state, current_file="invoice.json", now=0.0)
+    ledger.evict_idle(idle_seconds=0)
+    monkeypatch.setattr(session_manager, "st", SimpleNamespace(session_state=state))
+    monkeypatch.setattr(session_memory, "_store", store)
+    monkeypatch.setattr(session_memory, "_ledger", ledger)
+
+    assert SessionManager.was_evicted()
+    SessionManager.track_memory()
+
+    assert SessionManager.get_original_data() == {} and SessionManager.get_model_class() is None
+    assert not SessionManager.was_evicted()
+    assert SessionManager.take_restored_draft()["supplier_name"] == "Edited"
+    assert SessionManager.take_restored_draft() is None
@@ -0,0 +1,58 @@
+"""
+Cold-start import budget tests (tools/import_profile.py).
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "import_profile", Path(__file__).resolve().parent / "tools" / "import_profile.py"
+)
+import_profile = importlib.util.module_from_spec(_spec)
+sys.modules.setdefault("import_profile", import_profile)
+_spec.loader.exec_module(import_profile)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       300 |        300 | encodings
+import time:       100 |        100 |       streamlit.version
+import time:      2000 |       2100 |     streamlit
+import time:       500 |        500 |       yaml.reader
+import time:       700 |       1200 |     yaml
+import time:       400 |       3700 |   utils.file_utils
+import time:      1000 |       4700 | streamlit_app
+"""
+
+
+def test_parse_importtime_builds_the_import_tree():
+    roots = import_profile.parse_importtime(SAMPLE)
+
+    assert [root.name for root in roots] == ["encodings", "streamlit_app"]
+    app = roots[1]
+    assert [child.name for child in app.children] == ["utils.file_utils"]
+    assert [child.name for child in app.children[0].children] == ["streamlit", "yaml"]
+    assert app.children[0].children[1].children[0].name == "yaml.reader"
+    # streamlit (and what it imports) is the baseline
+    assert import_profile.cost_outside_baseline_us([app]) == 1000 + 400 + 700 + 500
+
+
+def test_queue_cold_start_stays_within_budget():
+    result = import_profile.measure(import_profile.QUEUE_MODULES, runs=3, top=10)
+
+    assert result["lazy_violations"] == [], f"Loaded eagerly for the queue: {result['lazy_violations']}"
+    assert result["median_ms"] <= import_profile.budget_ms(), (
+        f"Import cost {result['median_ms']} ms exceeds {import_profile.budget_ms()} ms; slowest: {result['slowest']}"
+    )
+
+
+@pytest.mark.parametrize("module, absent", [
+    ("utils.audit_view", {"pandas", "deepdiff"}),
+    ("utils.schema_loader", {"numpy", "pydantic"}),
+])
+def test_views_load_heavy_dependencies_on_use(module, absent):
+    loaded = {record.package for record in import_profile.outside_baseline(import_profile.profile([module]))}
+
+    assert not loaded & absent
@@ -13,6 +13,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 # Import the module to test
+import utils.metrics as metrics
 import utils.submission_handler as submission_handler
 from utils.submission_handler import (
     SubmissionHandler,
@@ -64,12 +65,15 @@ class TestSubmissionHandler:
             }
         }
         
+        submits = metrics.SUBMIT_SECONDS.count(outcome="saved")
+        
         success, errors = SubmissionHandler.validate_and_submit(
             filename, form_data, original_data, schema, user="test_user"
         )
         
         assert success == True
         assert len(errors) == 0
+        assert metrics.SUBMIT_SECONDS.count(outcome="saved") == submits + 1
         
         # Check that corrected file was created
         corrected_file = Path("corrected/test.json")
@@ -96,6 +100,8 @@ class TestSubmissionHandler:
             }
         }
         
+        submits = metrics.SUBMIT_SECONDS.count(outcome="invalid")
+        
         success, errors = SubmissionHandler.validate_and_submit(
             filename, form_data, original_data, schema, user="test_user"
         )
@@ -103,6 +109,7 @@ class TestSubmissionHandler:
         assert success == False
         assert len(errors) > 0
         assert any("required" in error.lower() for error in errors)
+        assert metrics.SUBMIT_SECONDS.count(outcome="invalid") == submits + 1
     
     def test_validate_string_field(self):
         """Test string field validation."""
@@ -315,6 +322,7 @@ class TestSubmissionHandler:
         # Mock Streamlit functions and Notify
         with patch('utils.submission_handler.Notify.success') as mock_notify_success, \
              patch('streamlit.balloons') as mock_balloons, \
+             patch('utils.prefetch.get_prefetcher') as mock_prefetcher, \
              patch('utils.submission_handler.SubmissionHandler.validate_and_submit') as mock_validate_submit:
             
             # Mock successful validation and submission
@@ -325,6 +333,7 @@ class TestSubmissionHandler:
             assert result == True
             mock_notify_success.assert_called()
             mock_balloons.assert_called_once()
+            mock_prefetcher.return_value.prefetch_next.assert_called_once_with(exclude="test.json")
     
     @patch('utils.submission_handler.SessionManager')
     def test_handle_streamlit_submission_missing_data(self, mock_session_manager):
@@ -431,6 +440,41 @@ def test_validate_submission_data_handles_internal_exception():
     assert any("Validation system error" in e for e in errors)
 
 
+def test_validate_submission_memoizes_by_schema_and_payload():
+    schema = {"fields": {"name": {"type": "string", "required": True}, "amount": {"type": "number"}}}
+    session = {}
+
+    with patch("utils.submission_handler.st.session_state", session), patch.object(
+        SubmissionHandler, "_run_validation_stages", wraps=SubmissionHandler._run_validation_stages
+    ) as spy:
+        first = SubmissionHandler.validate_submission({"name": "", "amount": 1}, schema)
+        # Same payload with different key order is a cache hit
+        second = SubmissionHandler.validate_submission({"amount": 1, "name": ""}, schema)
+        # A schema edit invalidates the cached result
+        edited = {"fields": {**schema["fields"], "name": {"type": "string"}}}
+        third = SubmissionHandler.validate_submission({"name": "", "amount": 1}, edited)
+
+    assert spy.call_count == 2
+    assert first["cache_hit"] is False and second["cache_hit"] is True and third["cache_hit"] is False
+    assert first["errors"] == second["errors"] and first["errors"]
+    assert third["errors"] == []
+    assert {"schema", "business_rules", "total"} <= set(first["timings"])
+    assert len(session[submission_handler.VALIDATION_CACHE_KEY]) == 2
+
+
+def test_validate_submission_does_not_cache_system_errors():
+    schema = {"fields": {"name": {"type": "string"}}}
+    session = {}
+
+    with patch("utils.submission_handler.st.session_state", session), patch(
+        "utils.field_validation.vc.get_validator", side_effect=RuntimeError("boom")
+    ):
+        result = SubmissionHandler.validate_submission({"name": "x"}, schema)
+
+    assert any("Validation system error" in e for e in result["errors"])
+    assert not session.get(submission_handler.VALIDATION_CACHE_KEY)
+
+
 def test_validate_against_schema_and_validate_field_required_boolean_and_optional():
     schema = {
         "fields": {
@@ -0,0 +1,123 @@
+"""
+Unit tests for validator_compiler module.
+"""
+
+import re
+from unittest.mock import patch
+
+import pytest
+
+from utils import validator_compiler as vc
+from utils.submission_handler import SubmissionHandler
+from utils.form_generator import FormGenerator
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    vc.clear_validator_cache()
+    yield
+    vc.clear_validator_cache()
+
+
+SCHEMA = {
+    "fields": {
+        "Invoice Number": {"type": "string", "required": True, "pattern": r"^INV-\d+$"},
+        "Total": {"type": "number", "min_value": 0},
+        "Status": {"type": "enum", "choices": ["open", "paid"]},
+        "Items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "Description": {"type": "string", "required": True},
+                    "Amount": {"type": "number", "min_value": 0},
+                },
+            },
+        },
+    }
+}
+
+
+def test_compile_schema_is_cached_by_content():
+    """Equal schemas share one compiled tree; edited schemas get a new one."""
+    compiled = vc.compile_schema(SCHEMA)
+    assert vc.compile_schema({"fields": dict(SCHEMA["fields"])}) is compiled
+
+    edited = {"fields": {**SCHEMA["fields"], "Total": {"type": "number", "min_value": 10}}}
+    assert vc.compile_schema(edited) is not compiled
+
+
+def test_repeat_lookups_of_a_loaded_schema_skip_serialization():
+    """The same schema object is found by identity without re-serializing it."""
+    compiled = vc.compile_schema(SCHEMA)
+    validator = vc.get_validator(vc.build_comprehensive_field, SCHEMA["fields"]["Total"])
+
+    with patch.object(vc, "_fingerprint", side_effect=AssertionError("serialized")):
+        assert vc.compile_schema(SCHEMA) is compiled
+        assert vc.get_validator(vc.build_comprehensive_field, SCHEMA["fields"]["Total"]) is validator
+
+
+def test_patterns_compiled_once_per_schema():
+    """Validating many rows must not touch re.match/re.compile again."""
+    data = {
+        "Invoice Number": "INV-1",
+        "Items": [{"Description": f"Row {i}", "Amount": i} for i in range(200)],
+    }
+    vc.compile_schema(SCHEMA).validate_comprehensive(data)
+
+    with patch.object(re, "compile", side_effect=AssertionError("recompiled")), \
+            patch.object(re, "match", side_effect=AssertionError("re.match used")):
+        result = SubmissionHandler.comprehensive_validate_data(data, SCHEMA)
+
+    assert result == {"is_valid": True, "errors": []}
+
+
+def test_dialects_report_same_failures():
+    """Comprehensive, legacy and form validators are driven by the same schema."""
+    data = {
+        "Invoice Number": "BAD",
+        "Total": -1,
+        "Status": "void",
+        "Items": [{"Description": "", "Amount": -5}],
+    }
+
+    comprehensive = [e["field_path"] for e in SubmissionHandler.comprehensive_validate_data(data, SCHEMA)["errors"]]
+    legacy = SubmissionHandler._validate_against_schema(data, SCHEMA)
+
+    assert comprehensive == ["Invoice Number", "Total", "Status", "Items[0].Description", "Items[0].Amount"]
+    assert legacy == [
+        "'Invoice Number' format is invalid",
+        "'Total' must be at least 0",
+        "'Status' must be one of: open, paid",
+        "'Items[0].Description' is required",
+        "'Items[0].Amount' must be at least 0",
+    ]
+    assert FormGenerator._validate_field_value("Invoice Number", "BAD", SCHEMA["fields"]["Invoice Number"]) == [
+        "Field 'Invoice Number' format is invalid"
+    ]
+    assert FormGenerator._validate_object_array("Items", data["Items"], SCHEMA["fields"]["Items"]["items"]) == [
+        "Items[0].Description: is required",
+        "Items[0].Amount must be at least 0",
+    ]
+
+
+def test_invalid_pattern_is_reported_not_raised():
+    """A broken schema regex is logged at compile time and never raises."""
+    config = {"type": "string", "pattern": "("}
+
+    assert FormGenerator._validate_field_value("code", "abc", config) == []
+    assert SubmissionHandler._validate_string_field("code", "abc", config) == []
+    assert FormGenerator._validate_scalar_item("code[0]", "abc", "string", config) == [
+        "code[0] has invalid pattern: ("
+    ]
+
+
+def test_cache_stats_track_hits():
+    """Repeated lookups for the same config are cache hits."""
+    config = {"type": "string", "max_length": 3}
+    for _ in range(3):
+        SubmissionHandler._validate_field("code", "abcd", config)
+
+    stats = vc.get_validator_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
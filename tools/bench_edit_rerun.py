@@ -0,0 +1,182 @@
+"""
+Edit view rerun latency benchmark.
+
+Builds a throwaway workspace with a synthetic schema (100 fields by default) and one
+claimed document, then times two kinds of rerun with Streamlit's AppTest harness:
+
+- full: what every field change used to cost - edit sidebar plus the whole edit view
+  (session initialization, PDF column, form, diff, actions).
+- fragment: what a field change costs now - only the editor fragment
+  (form, diff, actions).
+
+Each iteration changes one field value before rerunning, so the diff is recomputed.
+``--line-items N`` adds an object array field with N rows (a data editor table).
+
+Usage:
+    python tools/bench_edit_rerun.py [--fields 100] [--line-items 0] [--runs 20] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DOC_NAME = "bench_doc.json"
+WORKSPACE_DIRS = ["json_docs", "corrected", "audits", "pdf_docs", "locks", "schemas"]
+
+
+def _field_definition(index: int) -> Dict:
+    kind = index % 4
+    if kind == 0:
+        return {"type": "string", "label": f"Text {index}"}
+    if kind == 1:
+        return {"type": "number", "label": f"Amount {index}"}
+    if kind == 2:
+        return {"type": "boolean", "label": f"Flag {index}"}
+    return {"type": "enum", "label": f"Choice {index}", "choices": ["A", "B", "C"]}
+
+
+def _field_value(index: int):
+    return ["value", float(index), index % 2 == 0, "A"][index % 4]
+
+
+def build_workspace(root: Path, field_count: int, line_items: int = 0) -> None:
+    """Write config, schema and one document into ``root``."""
+    for name in WORKSPACE_DIRS:
+        (root / name).mkdir()
+
+    schema = {
+        "title": f"Benchmark schema ({field_count} fields)",
+        "fields": {f"field_{i:03d}": _field_definition(i) for i in range(field_count)},
+    }
+    document = {f"field_{i:03d}": _field_value(i) for i in range(field_count)}
+    if line_items:
+        schema["fields"]["line_items"] = {
+            "type": "array",
+            "label": "Line items",
+            "items": {"type": "object", "properties": {
+                "description": {"type": "string"},
+                "quantity": {"type": "integer"},
+                "unit_price": {"type": "number"},
+                "taxable": {"type": "boolean"},
+            }},
+        }
+        document["line_items"] = [
+            {"description": f"Item {n}", "quantity": n % 7 + 1, "unit_price": round(n * 1.25, 2), "taxable": n % 2 == 0}
+            for n in range(line_items)
+        ]
+    (root / "schemas" / "bench_schema.yaml").write_text(yaml.safe_dump(schema, sort_keys=False))
+    (root / "json_docs" / DOC_NAME).write_text(json.dumps(document))
+
+    config = {
+        "schema": {"primary_schema": "bench_schema.yaml"},
+        "directories": {name: name for name in WORKSPACE_DIRS if name != "schemas"},
+        "processing": {"prefetch_documents": 0},
+    }
+    (root / "config.yaml").write_text(yaml.safe_dump(config))
+
+
+def _bench_app(mode: str, iteration: int) -> None:
+    """AppTest script body; runs in the benchmark workspace."""
+    import streamlit as st
+    from utils.edit_view import EditView
+    from utils.session_manager import SessionManager
+
+    if "current_file" not in st.session_state or not st.session_state.current_file:
+        SessionManager.initialize()
+        SessionManager.set_current_user("bench")
+        SessionManager.set_current_file("bench_doc.json")
+        st.session_state["_bench_initialized"] = False
+
+    # Simulate the reviewer editing a field between reruns
+    version = st.session_state.get("form_version", 0)
+    st.session_state[f"field_field_000_v{version}"] = f"edited {iteration}"
+
+    if mode == "fragment" and st.session_state.get("_bench_initialized"):
+        EditView._render_editor_panel()
+    else:
+        EditView.render_edit_sidebar()
+        EditView.render()
+        st.session_state["_bench_initialized"] = True
+
+
+def time_reruns(mode: str, runs: int) -> List[float]:
+    """Return per-rerun wall times in milliseconds for ``mode``."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(_bench_app, args=(mode, 0), default_timeout=60)
+    app.run()  # first render: claims the session and primes caches
+    if app.exception:
+        raise RuntimeError(f"{mode} warm-up failed: {app.exception[0].message}")
+
+    timings = []
+    for iteration in range(1, runs + 1):
+        app.args = (mode, iteration)
+        start = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if app.exception:
+            raise RuntimeError(f"{mode} rerun failed: {app.exception[0].message}")
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "median_ms": round(statistics.median(ordered), 2),
+        "p90_ms": round(ordered[max(int(len(ordered) * 0.9) - 1, 0)], 2),
+        "min_ms": round(ordered[0], 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=100, help="Number of schema fields")
+    parser.add_argument("--line-items", type=int, default=0, help="Rows in an extra object array field")
+    parser.add_argument("--runs", type=int, default=20, help="Timed reruns per mode")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    logging.disable(logging.ERROR)  # the app logs expected misses (no PDF, no claimed lock)
+    previous_cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_edit_rerun_") as workspace:
+        build_workspace(Path(workspace), args.fields, args.line_items)
+        os.chdir(workspace)
+        try:
+            for mode in ("full", "fragment"):
+                results[mode] = summarize(time_reruns(mode, args.runs))
+        finally:
+            os.chdir(previous_cwd)
+
+    results["fields"] = args.fields
+    results["line_items"] = args.line_items
+    results["speedup"] = round(results["full"]["median_ms"] / max(results["fragment"]["median_ms"], 1e-9), 2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        table = f", {args.line_items}-row object array" if args.line_items else ""
+        print(f"Edit view rerun latency, {args.fields}-field schema{table} ({args.runs} runs per mode)")
+        for mode in ("full", "fragment"):
+            r = results[mode]
+            print(f"  {mode:<9} median {r['median_ms']:>8.2f} ms   p90 {r['p90_ms']:>8.2f} ms   min {r['min_ms']:>8.2f} ms")
+        print(f"  speedup   {results['speedup']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
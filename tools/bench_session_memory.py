@@ -0,0 +1,159 @@
+"""
+Edit session memory benchmark.
+
+Loads a synthetic document (``--line-items`` object rows plus ``--fields`` scalar fields)
+into a session the way the edit view does, then applies ``--edits`` single-field edits
+through SessionManager.set_form_data, as the form collector does on each rerun.
+Memory is measured with tracemalloc:
+
+- peak: highest allocation while loading the document into the session
+- retained: what the session keeps (original_data + form_data) after the edits
+
+Two modes are compared:
+
+- deepcopy: the previous behaviour - the filter step and both setters deep-copy
+- frozen: frozen snapshots (utils/frozen_doc.py) - form data shares unchanged
+  subtrees with the original
+
+Usage:
+    python tools/bench_session_memory.py [--fields 50] [--line-items 5000] [--edits 20] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+class _SessionState(dict):
+    """Attribute-access dict standing in for st.session_state."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError as exc:
+            raise AttributeError(key) from exc
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def build_document(field_count: int, line_items: int) -> Dict[str, Any]:
+    document: Dict[str, Any] = {f"field_{i:03d}": f"value {i}" for i in range(field_count)}
+    document["line_items"] = [
+        {"description": f"Item {n}", "quantity": n % 7 + 1, "unit_price": round(n * 1.25, 2),
+         "tags": [f"t{n % 5}", "stock"]}
+        for n in range(line_items)
+    ]
+    return document
+
+
+def _load_deepcopy(state: _SessionState, document: Dict[str, Any]) -> None:
+    filtered = {k: copy.deepcopy(v) for k, v in document.items()}
+    state.original_data = copy.deepcopy(filtered)
+    state.form_data = copy.deepcopy(filtered)
+
+
+def _edit_deepcopy(state: _SessionState, collected: Dict[str, Any]) -> None:
+    state.form_data = copy.deepcopy(collected)
+
+
+def _data_deepcopy(state: _SessionState) -> tuple:
+    return state.original_data, state.form_data
+
+
+def _load_frozen(state: _SessionState, document: Dict[str, Any]) -> None:
+    from utils.session_manager import SessionManager
+
+    filtered = {k: v for k, v in document.items()}
+    SessionManager.set_original_data(filtered)
+    SessionManager.set_form_data(SessionManager.get_original_data())
+
+
+def _edit_frozen(state: _SessionState, collected: Dict[str, Any]) -> None:
+    from utils.session_manager import SessionManager
+
+    SessionManager.set_form_data(collected)
+
+
+def _data_frozen(state: _SessionState) -> tuple:
+    from utils.session_manager import SessionManager
+
+    return SessionManager.get_original_data(), SessionManager.get_form_data()
+
+
+def measure(mode: str, document_json: str, edits: int) -> Dict[str, Any]:
+    """Return peak and retained bytes for one session in ``mode``."""
+    import utils.session_manager as session_manager
+
+    state = _SessionState(form_data={}, original_data={})
+    session_manager.st = type("st", (), {"session_state": state})
+    load, edit, data = ((_load_frozen, _edit_frozen, _data_frozen) if mode == "frozen"
+                        else (_load_deepcopy, _edit_deepcopy, _data_deepcopy))
+
+    document = json.loads(document_json)  # the parsed file, as load_json_file returns it
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    load(state, document)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    del document
+    for n in range(edits):
+        # The collector builds a fresh dict of widget values on every rerun
+        collected = copy.deepcopy(dict(data(state)[1]))
+        collected[f"field_{n % 10:03d}"] = f"edited {n}"
+        edit(state, collected)
+        del collected
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    from utils.frozen_doc import shared_fraction
+    return {
+        "peak_load_kb": round(peak / 1024, 1),
+        "retained_kb": round(retained / 1024, 1),
+        "shared_containers": round(shared_fraction(*data(state)), 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=50, help="Scalar fields in the document")
+    parser.add_argument("--line-items", type=int, default=5000, help="Rows in the object array field")
+    parser.add_argument("--edits", type=int, default=20, help="Form data updates after loading")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    import utils.session_manager  # noqa: F401  (imported before measuring)
+    document_json = json.dumps(build_document(args.fields, args.line_items))
+
+    results: Dict[str, Any] = {mode: measure(mode, document_json, args.edits) for mode in ("deepcopy", "frozen")}
+    results["document_kb"] = round(len(document_json) / 1024, 1)
+    results["retained_ratio"] = round(
+        results["deepcopy"]["retained_kb"] / max(results["frozen"]["retained_kb"], 1e-9), 2
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Edit session memory, {args.fields} fields + {args.line_items}-row array "
+              f"({results['document_kb']} KB JSON), {args.edits} edits")
+        for mode in ("deepcopy", "frozen"):
+            r = results[mode]
+            print(f"  {mode:<9} peak load {r['peak_load_kb']:>9.1f} KB   retained {r['retained_kb']:>9.1f} KB"
+                  f"   shared containers {r['shared_containers']:.0%}")
+        print(f"  retained  {results['retained_ratio']}x smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Startup and per-rerun bootstrap benchmark.
+
+Builds a throwaway workspace (config.yaml, directories and a ``--fields`` field
+primary schema) and times the work ``setup_directories`` does at the top of every
+script run:
+
+- uncached: the previous behaviour - directory initialization, configuration,
+  directory and schema validation on every rerun (``bootstrap.run_bootstrap``)
+- cached: the process-level bootstrap (``bootstrap.get_bootstrap``); after the first
+  run a rerun costs one ``stat`` of config.yaml and a cache lookup
+
+The first cached call is reported separately as the cold start. The PDF server and
+cache are disabled in the workspace so only the bootstrap itself is measured.
+
+Usage:
+    python tools/bench_startup.py [--fields 100] [--runs 50] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WORKSPACE_DIRS = ["json_docs", "corrected", "audits", "pdf_docs", "locks", "schemas"]
+
+
+def build_workspace(root: Path, field_count: int) -> None:
+    """Write config.yaml and a primary schema into ``root``."""
+    for name in WORKSPACE_DIRS:
+        (root / name).mkdir()
+    schema = {
+        "title": f"Benchmark schema ({field_count} fields)",
+        "fields": {f"field_{i:03d}": {"type": "string", "label": f"Text {i}", "required": i % 3 == 0}
+                   for i in range(field_count)},
+    }
+    (root / "schemas" / "bench_schema.yaml").write_text(yaml.safe_dump(schema, sort_keys=False))
+    config = {
+        "schema": {"primary_schema": "bench_schema.yaml"},
+        "directories": {name: name for name in WORKSPACE_DIRS if name != "schemas"},
+        "pdf_viewer": {"serve_by_url": False, "page_images": {"enabled": False},
+                       "text_extraction": {"enabled": False}},
+    }
+    (root / "config.yaml").write_text(yaml.safe_dump(config))
+
+
+def time_calls(call: Callable[[], object], runs: int) -> List[float]:
+    """Return per-call wall times in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "median_ms": round(statistics.median(ordered), 4),
+        "p90_ms": round(ordered[max(int(len(ordered) * 0.9) - 1, 0)], 4),
+        "min_ms": round(ordered[0], 4),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=100, help="Fields in the primary schema")
+    parser.add_argument("--runs", type=int, default=50, help="Timed reruns per mode")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    logging.disable(logging.ERROR)
+    from utils import bootstrap
+
+    previous_cwd = os.getcwd()
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as workspace:
+        build_workspace(Path(workspace), args.fields)
+        os.chdir(workspace)
+        try:
+            bootstrap.reset_bootstrap()
+            results["cold"] = summarize(time_calls(bootstrap.get_bootstrap, 1))
+            results["cached"] = summarize(time_calls(bootstrap.get_bootstrap, args.runs))
+            results["uncached"] = summarize(time_calls(bootstrap.run_bootstrap, args.runs))
+        finally:
+            os.chdir(previous_cwd)
+
+    output = {**results, "fields": args.fields,
+              "speedup": round(results["uncached"]["median_ms"] / max(results["cached"]["median_ms"], 1e-9), 1)}
+    if args.json:
+        print(json.dumps(output, indent=2))
+    else:
+        print(f"Per-rerun bootstrap cost, {args.fields}-field primary schema ({args.runs} runs per mode)")
+        for mode in ("cold", "uncached", "cached"):
+            r = results[mode]
+            print(f"  {mode:<9} median {r['median_ms']:>10.4f} ms   p90 {r['p90_ms']:>10.4f} ms   min {r['min_ms']:>10.4f} ms")
+        print(f"  speedup   {output['speedup']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+"""
+Import-time profile and cold-start budget.
+
+Runs ``python -X importtime -c "import <modules>"`` in fresh interpreters and parses
+the report into a tree. Streamlit itself (and anything it imports) is the framework
+baseline every worker pays; the budget covers the rest - the app's own modules and
+the libraries they pull in at import time.
+
+- ``--modules``: what to import (default: what a worker loads to show the queue)
+- ``--top N``: list the N slowest imports outside the baseline (time spent in
+  each import and its non-baseline imports)
+- ``--budget-ms``: fail (exit 1) if the median cost outside the baseline exceeds it
+- ``--json``: print the result as JSON
+
+Heavy libraries that only some views need (pandas, deepdiff, pydantic, PyPDF2,
+numpy) must not be loaded for the queue; they are reported as violations.
+
+Usage:
+    python tools/import_profile.py [--modules streamlit_app utils.queue_view] [--runs 3]
+                                   [--top 15] [--budget-ms 150] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Imported by a worker before it shows the queue
+QUEUE_MODULES = ("streamlit_app", "utils.queue_view")
+
+# The framework's own import cost, excluded from the budget
+BASELINE_PACKAGES = ("streamlit",)
+
+# Loaded lazily by the views that need them
+LAZY_PACKAGES = ("pandas", "numpy", "deepdiff", "pydantic", "PyPDF2", "pypdfium2")
+
+# Median import cost outside the baseline (ms); STARTUP_BUDGET_MS overrides it
+DEFAULT_BUDGET_MS = 150.0
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output; times are in microseconds."""
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    children: List["ImportRecord"] = field(default_factory=list)
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".", 1)[0]
+
+    def walk(self) -> Iterable["ImportRecord"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Parse ``-X importtime`` output into a forest of import records.
+
+    A module's line follows the lines of the imports it triggered, indented one
+    level deeper (two spaces per level).
+
+    Args:
+        output: stderr of ``python -X importtime``
+
+    Returns:
+        Top-level import records, in import order
+    """
+    pending: List[ImportRecord] = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        record = ImportRecord(match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2)
+        while pending and pending[-1].depth > record.depth:
+            record.children.insert(0, pending.pop())
+        pending.append(record)
+    return pending
+
+
+def loaded_modules(roots: Sequence[ImportRecord]) -> Dict[str, ImportRecord]:
+    """Return every imported module by name."""
+    return {record.name: record for root in roots for record in root.walk()}
+
+
+def outside_baseline(roots: Sequence[ImportRecord], baseline: Sequence[str] = BASELINE_PACKAGES) -> List[ImportRecord]:
+    """Return all imports that are not part of a baseline package's import."""
+    records = []
+    stack = list(roots)
+    while stack:
+        record = stack.pop()
+        if record.package in baseline:
+            continue
+        records.append(record)
+        stack.extend(record.children)
+    return records
+
+
+def cost_outside_baseline_us(roots: Sequence[ImportRecord], baseline: Sequence[str] = BASELINE_PACKAGES) -> int:
+    """Sum the self time of all imports that are not part of a baseline package's import."""
+    return sum(record.self_us for record in outside_baseline(roots, baseline))
+
+
+def profile(modules: Sequence[str], python: Optional[str] = None) -> List[ImportRecord]:
+    """
+    Import ``modules`` in a fresh interpreter with ``-X importtime`` and parse the report.
+
+    Returns:
+        Import records of the requested modules' packages (interpreter start-up
+        imports such as ``site`` are dropped)
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    completed = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{completed.stderr[-2000:]}")
+    packages = {module.split(".", 1)[0] for module in modules}
+    return [root for root in parse_importtime(completed.stderr) if root.package in packages]
+
+
+def measure(modules: Sequence[str] = QUEUE_MODULES, runs: int = 3, top: int = 15) -> Dict:
+    """
+    Profile ``modules`` ``runs`` times and summarize the cost outside the baseline.
+
+    Returns:
+        Dict with ``median_ms``, ``runs_ms``, ``lazy_violations`` (lazy packages that were
+        imported) and ``slowest`` (imports outside the baseline, by their cost outside it)
+    """
+    costs = []
+    roots: List[ImportRecord] = []
+    for _ in range(max(runs, 1)):
+        roots = profile(modules)
+        costs.append(cost_outside_baseline_us(roots) / 1000)
+
+    rows = [(record, cost_outside_baseline_us([record])) for record in outside_baseline(roots)]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return {
+        "modules": list(modules),
+        "median_ms": round(statistics.median(costs), 1),
+        "runs_ms": [round(cost, 1) for cost in costs],
+        "lazy_violations": sorted({record.package for record in outside_baseline(roots)} & set(LAZY_PACKAGES)),
+        "slowest": [{"module": record.name, "cost_ms": round(cost / 1000, 1), "self_ms": round(record.self_us / 1000, 1)}
+                    for record, cost in rows[:top]],
+    }
+
+
+def budget_ms() -> float:
+    """Return the startup budget, honouring the STARTUP_BUDGET_MS environment variable."""
+    return float(os.environ.get("STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=list(QUEUE_MODULES), help="Modules to import")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to profile")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail above this median cost")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = measure(args.modules, args.runs, args.top)
+    limit = args.budget_ms if args.budget_ms is not None else budget_ms()
+    result["budget_ms"] = limit
+    result["within_budget"] = result["median_ms"] <= limit and not result["lazy_violations"]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Import cost of {', '.join(args.modules)} outside {', '.join(BASELINE_PACKAGES)}: "
+              f"median {result['median_ms']} ms over {args.runs} runs (budget {limit} ms)")
+        for row in result["slowest"]:
+            print(f"  {row['cost_ms']:>8.1f} ms  (self {row['self_ms']:>6.1f})  {row['module']}")
+        if result["lazy_violations"]:
+            print(f"  loaded eagerly: {', '.join(result['lazy_violations'])}")
+    return 0 if result["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
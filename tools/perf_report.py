@@ -0,0 +1,54 @@
+"""
+Phase timing percentiles from the perf log.
+
+Reads the JSONL log written when ``perf.log_file`` is set (one line per timed phase
+of a rerun, see ``utils/perf.py``) and prints count, p50/p90/p99 and max per phase,
+slowest p90 first. ``rerun`` is the whole script run, ``fragment_rerun`` a whole rerun of the editor fragment.
+
+Usage:
+    python tools/perf_report.py [audits/perf.jsonl] [--page edit] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("log_file", nargs="?", type=Path, default=None,
+                        help="Perf log (default: perf.log_file from config.yaml)")
+    parser.add_argument("--page", default=None, help="Only reruns of this page (queue, edit, audit, schema_editor)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(REPO_ROOT))
+    from utils.perf import summarize_log
+
+    log_file = args.log_file
+    if log_file is None:
+        from utils.config_loader import load_config
+        configured = (load_config(REPO_ROOT / "config.yaml").get("perf") or {}).get("log_file")
+        if not configured:
+            parser.error("no log file given and perf.log_file is not set")
+        log_file = Path(configured) if Path(configured).is_absolute() else REPO_ROOT / configured
+
+    summary = summarize_log(log_file, page=args.page)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"{log_file}{f' (page {args.page})' if args.page else ''}")
+    print(f"  {'phase':<44} {'count':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for name, row in sorted(summary.items(), key=lambda item: item[1]["p90"], reverse=True):
+        print(f"  {name:<44} {row['count']:>7} {row['p50']:>9.1f} {row['p90']:>9.1f} {row['p99']:>9.1f} {row['max']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
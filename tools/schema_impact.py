@@ -0,0 +1,82 @@
+"""
+Schema change impact analysis over the document corpus.
+
+Compares an old and a new version of a schema against the pending (json_docs) and
+corrected documents and lists, per field, how many documents would lack an added
+field (missing), carry a dropped field (extra) or hold a value the new schema rejects
+but the old one accepted (newly_invalid). This is the analysis the schema editor runs
+after a save (``utils/schema_impact.py``).
+
+Directories, workers and the result cache come from config.yaml (``schema_impact``
+section); the cache makes reruns only read documents that changed.
+
+Usage:
+    python tools/schema_impact.py OLD.yaml NEW.yaml [--json-docs DIR] [--corrected DIR]
+                                  [--workers 2] [--no-cache] [--save-report] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("old", type=Path, help="Schema currently in use")
+    parser.add_argument("new", type=Path, help="Schema replacing it")
+    parser.add_argument("--json-docs", type=Path, default=None, help="Pending documents (default: configured)")
+    parser.add_argument("--corrected", type=Path, default=None, help="Corrected documents (default: configured)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: configured)")
+    parser.add_argument("--no-cache", action="store_true", help="Analyse every document again")
+    parser.add_argument("--save-report", action="store_true", help="Also write the report under the cache dir")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, str(REPO_ROOT))
+    from utils.file_utils import get_directories
+    from utils.schema_catalog import load_yaml
+    from utils.schema_impact import CACHE_NAME, analyze_schema_change, collect_documents, impact_settings, save_report
+
+    old_schema = load_yaml(args.old.read_text(encoding="utf-8")) or {}
+    new_schema = load_yaml(args.new.read_text(encoding="utf-8")) or {}
+    settings = impact_settings()
+    dirs = get_directories()
+    documents = collect_documents(args.json_docs or dirs.json_docs, args.corrected or dirs.corrected)
+
+    report = analyze_schema_change(
+        old_schema, new_schema,
+        documents=documents,
+        workers=args.workers if args.workers is not None else settings["workers"],
+        cache_path=None if args.no_cache else settings["cache_dir"] / CACHE_NAME,
+        schema_name=args.new.name,
+    )
+    if args.save_report:
+        report_path = save_report(report, settings["cache_dir"])
+        print(f"Report written to {report_path}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0
+
+    total = sum(report.documents.values())
+    print(f"{args.old.name} -> {args.new.name}: {report.affected_documents} of {total} documents affected "
+          f"({', '.join(f'{label} {count}' for label, count in report.documents.items()) or 'no documents'})")
+    print(f"  {report.analyzed} analysed, {report.reused} cached, {report.duration_ms:.0f} ms")
+    if report.fields:
+        print(f"  {'field':<32} {'status':<10} {'missing':>8} {'extra':>8} {'newly_invalid':>14}")
+        for name, row in report.fields.items():
+            print(f"  {name:<32} {row['status']:<10} {row['missing']:>8} {row['extra']:>8} {row['newly_invalid']:>14}")
+    if report.unreadable:
+        print(f"  unreadable: {', '.join(report.unreadable)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,6 @@ Handles audit log display, filtering, and detailed diff viewing.
 
 import streamlit as st
 import streamlit.components.v1 as components
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import logging
@@ -661,6 +660,7 @@ class AuditView:
                 
                 # Convert to DataFrame and then CSV
                 if flattened_data:
+                    import pandas as pd
                     df = pd.DataFrame(flattened_data)
                     csv_data = df.to_csv(index=False)
                     logger.info(f"Successfully generated CSV with {len(flattened_data)} rows")
@@ -0,0 +1,178 @@
+"""
+Process-level application bootstrap for JSON QA webapp.
+Directory initialization, configuration and schema validation and the PDF
+server/cache start-up run once per process instead of on every script run. The
+result is cached with ``st.cache_resource`` under the config file's mtime and a
+periodic health tick, so a rerun only pays for one ``stat`` and a cache lookup.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = Path("config.yaml")
+
+# Seconds between health checks that rerun the bootstrap with an unchanged config
+DEFAULT_HEALTH_CHECK_SECONDS = 300
+
+
+@dataclass
+class BootstrapResult:
+    """Outcome of one bootstrap run; ``messages`` are (level, text) pairs for the UI."""
+    ok: bool
+    config_mtime: Optional[int]
+    completed_at: float
+    duration_ms: float
+    messages: List[Tuple[str, str]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def config_fingerprint(path: Optional[Path] = None) -> Optional[int]:
+    """
+    Return the config file's mtime in nanoseconds, or None if it does not exist.
+
+    Args:
+        path: Config file (defaults to config.yaml)
+
+    Returns:
+        mtime in nanoseconds or None
+    """
+    try:
+        return os.stat(path or CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _validate_configuration(messages: List[Tuple[str, str]]) -> None:
+    """Validate config, directories and the primary schema, recording UI messages."""
+    from .config_loader import load_config, validate_config
+    from .directory_validator import DirectoryValidator
+    from .file_utils import get_directories
+    from .schema_loader import get_config_value, get_configured_schema
+
+    if not validate_config(load_config()):
+        messages.append(("warning", "⚠️ **Configuration Issues Detected**"))
+        messages.append(("warning", "Some configuration settings are invalid, using defaults where necessary."))
+
+    validator = DirectoryValidator()
+    validation_summary = validator.get_validation_summary(validator.validate_all_paths(get_directories()))
+    if validation_summary['ready_directories'] == validation_summary['total_directories']:
+        logger.info("✅ All directories are ready and accessible")
+    else:
+        messages.append(("warning", "⚠️ **Directory Configuration Issues**"))
+        if validation_summary['permission_issues'] > 0:
+            messages.append(("warning", f"• {validation_summary['permission_issues']} directories have permission issues"))
+        if validation_summary['missing_directories'] > 0:
+            messages.append(("info", f"• {validation_summary['missing_directories']} directories were created automatically"))
+
+    primary_schema = get_config_value('schema', 'primary_schema', 'default_schema.yaml')
+    try:
+        if get_configured_schema():
+            logger.info(f"✅ Schema validated: {primary_schema}")
+        else:
+            messages.append(("warning", "⚠️ **Schema Validation Warning**"))
+            messages.append(("warning", f"Primary schema '{primary_schema}' not found, using fallback mechanisms"))
+    except Exception as schema_error:
+        logger.warning(f"Schema validation failed: {schema_error}")
+        messages.append(("warning", "⚠️ **Schema Loading Issues**"))
+        messages.append(("warning", "Schema validation failed, but fallback mechanisms are in place"))
+
+
+def run_bootstrap(config_mtime: Optional[int] = None) -> BootstrapResult:
+    """
+    Initialize directories, validate configuration and start the PDF server and cache.
+
+    Does not touch Streamlit; problems are returned as messages for the caller to show.
+
+    Args:
+        config_mtime: Config fingerprint the run is for (recorded in the result)
+
+    Returns:
+        BootstrapResult; ``ok`` is False when directory initialization failed
+    """
+    from .file_utils import ensure_directories_exist, initialize_directories
+    from .metrics import start_metrics_exporter
+    from .pdf_cache import start_pdf_cache
+    from .pdf_server import start_pdf_server
+    from .schema_loader import reload_config
+
+    started = time.perf_counter()
+    messages: List[Tuple[str, str]] = []
+
+    def _result(ok: bool, error: Optional[str] = None) -> BootstrapResult:
+        duration_ms = (time.perf_counter() - started) * 1000
+        return BootstrapResult(ok, config_mtime, time.time(), round(duration_ms, 2), messages, error)
+
+    # The config may have changed since the schema loader cached it
+    config = reload_config()
+    if not initialize_directories(raw_config=config):
+        logger.error("Failed to initialize directory configuration")
+        return _result(False, "Failed to initialize directory configuration")
+
+    ensure_directories_exist()
+    logger.info("Directory setup completed successfully")
+
+    try:
+        _validate_configuration(messages)
+    except Exception as e:
+        # Don't fail the bootstrap - let the app continue with defaults
+        logger.error(f"Configuration validation failed: {e}")
+        messages.append(("error", "❌ **Configuration Validation Failed**"))
+        messages.append(("error", f"Error: {str(e)}"))
+
+    # Serve PDFs by URL (falls back to inline embedding if this fails)
+    start_pdf_server(config)
+    # Pre-render PDF pages in the background so previews show instantly
+    start_pdf_cache(config)
+    # Expose operational metrics to Prometheus (metrics.enabled)
+    start_metrics_exporter(config)
+
+    result = _result(True)
+    logger.info(f"Bootstrap completed in {result.duration_ms:.1f} ms")
+    return result
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _cached_bootstrap(config_mtime: Optional[int], health_tick: int) -> BootstrapResult:
+    return run_bootstrap(config_mtime)
+
+
+def get_bootstrap(now: Optional[float] = None) -> BootstrapResult:
+    """
+    Return this process's bootstrap result, running the bootstrap when needed.
+
+    The bootstrap runs again when config.yaml's mtime changes or a new health tick
+    (``processing.health_check_seconds``, default 300; 0 disables) starts. Failed
+    runs are not kept, so the next script run retries.
+
+    Args:
+        now: Current time (defaults to time.time())
+
+    Returns:
+        BootstrapResult
+    """
+    from .schema_loader import get_config_value
+
+    try:
+        interval = float(get_config_value('processing', 'health_check_seconds', DEFAULT_HEALTH_CHECK_SECONDS))
+    except (TypeError, ValueError):
+        interval = DEFAULT_HEALTH_CHECK_SECONDS
+    now = time.time() if now is None else now
+    health_tick = int(now // interval) if interval > 0 else 0
+
+    result = _cached_bootstrap(config_fingerprint(), health_tick)
+    if not result.ok:
+        _cached_bootstrap.clear()
+    return result
+
+
+def reset_bootstrap() -> None:
+    """Drop the cached bootstrap so the next script run repeats it."""
+    _cached_bootstrap.clear()
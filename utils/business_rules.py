@@ -0,0 +1,505 @@
+"""
+Declarative business rules for JSON QA webapp.
+
+Rules are declared in the schema YAML under ``business_rules``::
+
+    business_rules:
+      - name: items_total
+        expression: "sum(Items.Amount) == `Invoice Amount`"
+        message: "Invoice Amount ({rhs}) should equal the item total ({lhs})"
+
+Expressions compare fields with ``== != < <= > >=`` combined with ``and``/``or``/``not``
+and ``+ - * /``. Field names containing spaces are quoted with backticks. Array columns
+(``Items.Amount``) are only valid inside the aggregates ``sum``, ``min``, ``max``,
+``mean`` and ``count``; ``len(Items)`` counts rows. Dates are compared chronologically.
+
+Rule sets are compiled once per schema and evaluated column-wise over any number of
+documents, so one form and a directory of documents go through the same code path.
+A rule is skipped for a document when any value it needs is missing or not numeric;
+field-level validation reports those values.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import numbers
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import validator_compiler as vc
+
+logger = logging.getLogger(__name__)
+
+# Absolute tolerance for == and != comparisons (money rounding)
+DEFAULT_TOLERANCE = 0.01
+
+# Applied when a schema does not declare business_rules
+DEFAULT_BUSINESS_RULES: List[Dict[str, Any]] = [
+    {
+        'name': 'invoice_amount_covers_subtotal',
+        'expression': 'invoice_amount >= subtotal',
+        'message': 'Invoice amount cannot be less than subtotal',
+    },
+    {
+        'name': 'due_date_after_invoice_date',
+        'expression': 'due_date >= invoice_date',
+        'message': 'Due date cannot be before invoice date',
+    },
+    {
+        'name': 'invoice_amount_equals_subtotal_plus_tax',
+        'expression': 'invoice_amount == subtotal + tax_amount',
+        'message': 'Invoice amount ({lhs}) should equal subtotal + tax ({rhs})',
+    },
+]
+
+AGGREGATES = ('sum', 'min', 'max', 'mean', 'count', 'len')
+
+_QUOTED_NAME = re.compile(r'`([^`]+)`')
+
+Column = Callable[['DocumentColumns'], np.ndarray]
+
+
+class RuleSyntaxError(ValueError):
+    """Raised when a business rule cannot be compiled."""
+    pass
+
+
+def _to_number(value: Any) -> float:
+    """Convert a field value to a float for comparison; dates become timestamps, unknowns NaN."""
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).timestamp()
+    if isinstance(value, numbers.Number):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return np.nan
+        try:
+            return float(text)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+class DocumentColumns:
+    """Column views over a batch of documents, built lazily and cached per rule set run."""
+
+    def __init__(self, documents: Sequence[Dict[str, Any]]):
+        self.documents = documents
+        self.n = len(documents)
+        self._cache: Dict[Tuple[str, ...], Any] = {}
+
+    def scalar(self, field: str) -> np.ndarray:
+        """Numeric values of a top-level field, one per document."""
+        key = ('scalar', field)
+        if key not in self._cache:
+            self._cache[key] = np.fromiter(
+                (_to_number(doc.get(field)) if isinstance(doc, dict) else np.nan for doc in self.documents),
+                dtype=float, count=self.n
+            )
+        return self._cache[key]
+
+    def lengths(self, field: str) -> np.ndarray:
+        """Row counts of an array field per document (NaN where it is not a list)."""
+        key = ('lengths', field)
+        if key not in self._cache:
+            self._cache[key] = np.fromiter(
+                (len(doc[field]) if isinstance(doc, dict) and isinstance(doc.get(field), list) else np.nan
+                 for doc in self.documents),
+                dtype=float, count=self.n
+            )
+        return self._cache[key]
+
+    def column(self, field: str, prop: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Flattened values of an array-of-objects property and the owning document index."""
+        key = ('column', field, prop)
+        if key not in self._cache:
+            values: List[float] = []
+            owners: List[int] = []
+            for index, doc in enumerate(self.documents):
+                items = doc.get(field) if isinstance(doc, dict) else None
+                if not isinstance(items, list):
+                    continue
+                for item in items:
+                    if isinstance(item, dict):
+                        values.append(_to_number(item.get(prop)))
+                        owners.append(index)
+            self._cache[key] = (np.asarray(values, dtype=float), np.asarray(owners, dtype=np.intp))
+        return self._cache[key]
+
+
+def _aggregate(func: str, field: str, prop: Optional[str]) -> Column:
+    """Build a per-document aggregate over an array field (missing item values are ignored)."""
+
+    def evaluate(columns: DocumentColumns) -> np.ndarray:
+        lengths = columns.lengths(field)
+        if func == 'len':
+            return lengths.copy()
+
+        values, owners = columns.column(field, prop)
+        valid = ~np.isnan(values)
+        values, owners = values[valid], owners[valid]
+        counts = np.bincount(owners, minlength=columns.n).astype(float)
+
+        if func == 'count':
+            result = counts
+        elif func in ('sum', 'mean'):
+            result = np.bincount(owners, weights=values, minlength=columns.n)
+            if func == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    result = np.where(counts > 0, result / np.where(counts > 0, counts, 1), np.nan)
+        else:
+            ufunc, start = (np.fmin, np.inf) if func == 'min' else (np.fmax, -np.inf)
+            result = np.full(columns.n, start)
+            ufunc.at(result, owners, values)
+            result[counts == 0] = np.nan
+
+        # Documents without the array at all have no value to compare
+        result = result.astype(float)
+        result[np.isnan(lengths)] = np.nan
+        return result
+
+    return evaluate
+
+
+def _compare(op: ast.cmpop, tolerance: float) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """Return a NaN-aware comparison producing 1.0/0.0/NaN."""
+    checks = {
+        ast.Eq: lambda a, b: np.abs(a - b) <= tolerance,
+        ast.NotEq: lambda a, b: np.abs(a - b) > tolerance,
+        ast.Lt: np.less,
+        ast.LtE: np.less_equal,
+        ast.Gt: np.greater,
+        ast.GtE: np.greater_equal,
+    }
+    check = checks.get(type(op))
+    if check is None:
+        raise RuleSyntaxError(f"Unsupported comparison: {type(op).__name__}")
+
+    def compare(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            result = check(a, b).astype(float)
+        result[np.isnan(a) | np.isnan(b)] = np.nan
+        return result
+
+    return compare
+
+
+def _logical_and(values: List[np.ndarray]) -> np.ndarray:
+    stacked = np.vstack(values)
+    result = np.where(np.isnan(stacked).any(axis=0), np.nan, 1.0)
+    result[(stacked == 0).any(axis=0)] = 0.0
+    return result
+
+
+def _logical_or(values: List[np.ndarray]) -> np.ndarray:
+    stacked = np.vstack(values)
+    result = np.where(np.isnan(stacked).any(axis=0), np.nan, 0.0)
+    result[(stacked == 1).any(axis=0)] = 1.0
+    return result
+
+
+class _ExpressionCompiler:
+    """Compile a parsed rule expression into a column function."""
+
+    BINARY_OPS = {
+        ast.Add: np.add,
+        ast.Sub: np.subtract,
+        ast.Mult: np.multiply,
+        ast.Div: np.divide,
+    }
+
+    def __init__(self, aliases: Dict[str, str], tolerance: float):
+        self.aliases = aliases
+        self.tolerance = tolerance
+        self.fields: set = set()
+
+    def field_name(self, node: ast.AST) -> str:
+        if not isinstance(node, ast.Name):
+            raise RuleSyntaxError(f"Expected a field name, got: {ast.dump(node)}")
+        name = self.aliases.get(node.id, node.id)
+        self.fields.add(name)
+        return name
+
+    def prop_name(self, attr: str) -> str:
+        return self.aliases.get(attr, attr)
+
+    def compile(self, node: ast.AST) -> Column:
+        if isinstance(node, ast.Expression):
+            return self.compile(node.body)
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool):
+                constant = 1.0 if node.value else 0.0
+            elif isinstance(node.value, (int, float, str)) or node.value is None:
+                constant = _to_number(node.value)
+            else:
+                raise RuleSyntaxError(f"Unsupported constant: {node.value!r}")
+            return lambda columns: np.full(columns.n, constant)
+
+        if isinstance(node, ast.Name):
+            name = self.field_name(node)
+            return lambda columns: columns.scalar(name)
+
+        if isinstance(node, ast.Attribute):
+            raise RuleSyntaxError("Array columns must be wrapped in an aggregate, e.g. sum(Items.Amount)")
+
+        if isinstance(node, ast.BinOp):
+            op = self.BINARY_OPS.get(type(node.op))
+            if op is None:
+                raise RuleSyntaxError(f"Unsupported operator: {type(node.op).__name__}")
+            left, right = self.compile(node.left), self.compile(node.right)
+
+            def binary(columns: DocumentColumns) -> np.ndarray:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    result = op(left(columns), right(columns))
+                result[~np.isfinite(result)] = np.nan
+                return result
+
+            return binary
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, ast.USub):
+                return lambda columns: -operand(columns)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if isinstance(node.op, ast.Not):
+                return lambda columns: 1.0 - operand(columns)
+            raise RuleSyntaxError(f"Unsupported operator: {type(node.op).__name__}")
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self.compile(value) for value in node.values]
+            combine = _logical_and if isinstance(node.op, ast.And) else _logical_or
+            return lambda columns: combine([part(columns) for part in parts])
+
+        if isinstance(node, ast.Compare):
+            operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+            comparisons = [_compare(op, self.tolerance) for op in node.ops]
+
+            def compare(columns: DocumentColumns) -> np.ndarray:
+                values = [operand(columns) for operand in operands]
+                results = [cmp(values[i], values[i + 1]) for i, cmp in enumerate(comparisons)]
+                return results[0] if len(results) == 1 else _logical_and(results)
+
+            return compare
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords or len(node.args) != 1:
+                raise RuleSyntaxError("Only single-argument calls are supported")
+            func = node.func.id
+            arg = node.args[0]
+            if func == 'abs':
+                operand = self.compile(arg)
+                return lambda columns: np.abs(operand(columns))
+            if func not in AGGREGATES:
+                raise RuleSyntaxError(f"Unknown function: {func}")
+            if isinstance(arg, ast.Attribute):
+                return _aggregate(func, self.field_name(arg.value), self.prop_name(arg.attr))
+            if func in ('len', 'count') and isinstance(arg, ast.Name):
+                return _aggregate('len', self.field_name(arg), None)
+            raise RuleSyntaxError(f"{func}() expects an array column such as Items.Amount")
+
+        raise RuleSyntaxError(f"Unsupported expression: {type(node).__name__}")
+
+
+class BusinessRule:
+    """A single compiled business rule."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        if not isinstance(spec, dict) or not isinstance(spec.get('expression'), str):
+            raise RuleSyntaxError("Business rule must be a mapping with an 'expression' string")
+
+        self.expression: str = spec['expression']
+        self.name: str = str(spec.get('name') or self.expression)
+        self.message: str = spec.get('message') or f"Business rule '{self.name}' failed: {self.expression}"
+        try:
+            self.tolerance = float(spec.get('tolerance', DEFAULT_TOLERANCE))
+        except (TypeError, ValueError):
+            raise RuleSyntaxError(f"Rule '{self.name}': tolerance must be a number")
+
+        aliases: Dict[str, str] = {}
+
+        def quote(match: 're.Match[str]') -> str:
+            alias = f"__field_{len(aliases)}"
+            aliases[alias] = match.group(1)
+            return alias
+
+        source = _QUOTED_NAME.sub(quote, self.expression)
+        try:
+            tree = ast.parse(source, mode='eval')
+        except SyntaxError as e:
+            raise RuleSyntaxError(f"Rule '{self.name}': invalid expression: {e.msg}")
+
+        compiler = _ExpressionCompiler(aliases, self.tolerance)
+        try:
+            self._evaluate = compiler.compile(tree)
+            # Sides of a simple comparison are exposed to messages as {lhs}/{rhs}
+            body = tree.body
+            if isinstance(body, ast.Compare) and len(body.ops) == 1:
+                self._lhs: Optional[Column] = compiler.compile(body.left)
+                self._rhs: Optional[Column] = compiler.compile(body.comparators[0])
+            else:
+                self._lhs = self._rhs = None
+        except RuleSyntaxError as e:
+            raise RuleSyntaxError(f"Rule '{self.name}': {e}")
+        self.fields = frozenset(compiler.fields)
+
+    def violations(self, columns: DocumentColumns) -> np.ndarray:
+        """Indices of documents that break the rule (unknown results are not violations)."""
+        return np.flatnonzero(self._evaluate(columns) == 0)
+
+    def format_message(self, columns: DocumentColumns, indices: np.ndarray) -> List[str]:
+        """Render the rule message for each violating document."""
+        if self._lhs is None or '{' not in self.message:
+            return [self.message] * len(indices)
+        lhs, rhs = self._lhs(columns), self._rhs(columns)
+        messages = []
+        for i in indices:
+            try:
+                messages.append(self.message.format(lhs=float(lhs[i]), rhs=float(rhs[i]), name=self.name))
+            except (KeyError, IndexError, ValueError):
+                messages.append(self.message)
+        return messages
+
+
+class RuleSet:
+    """Compiled business rules of one schema."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        rules = spec.get('business_rules') or []
+        self.rules: List[BusinessRule] = []
+        self.errors: List[str] = []
+        for rule_spec in rules:
+            try:
+                self.rules.append(BusinessRule(rule_spec))
+            except RuleSyntaxError as e:
+                logger.error(f"Skipping business rule: {e}")
+                self.errors.append(str(e))
+        self.fields = frozenset().union(*(rule.fields for rule in self.rules))
+        self.fingerprint = hashlib.sha256(
+            json.dumps(rules, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
+    def evaluate(self, documents: Sequence[Dict[str, Any]]) -> List[List[str]]:
+        """
+        Evaluate every rule over a batch of documents.
+
+        Args:
+            documents: Documents (form data dicts) to check
+
+        Returns:
+            Error messages per document, in input order
+        """
+        columns = DocumentColumns(documents)
+        results: List[List[str]] = [[] for _ in range(columns.n)]
+        for rule in self.rules:
+            try:
+                indices = rule.violations(columns)
+                for index, message in zip(indices, rule.format_message(columns, indices)):
+                    results[index].append(message)
+            except Exception as e:
+                logger.error(f"Business rule '{rule.name}' evaluation error: {e}")
+                for errors in results:
+                    errors.append("Business rule validation failed")
+        return results
+
+    def validate(self, data: Dict[str, Any]) -> List[str]:
+        """Evaluate the rules for a single document."""
+        return self.evaluate([data])[0]
+
+
+def get_rule_set(schema: Dict[str, Any]) -> RuleSet:
+    """
+    Return the compiled rule set for a schema, compiling it at most once.
+
+    Schemas without a ``business_rules`` key get DEFAULT_BUSINESS_RULES; an explicit
+    empty list disables them.
+    """
+    rules = schema.get('business_rules') if isinstance(schema, dict) and 'business_rules' in schema \
+        else DEFAULT_BUSINESS_RULES
+    # Keyed by the rules list itself, so a loaded schema's rule set is found by identity
+    return vc.get_validator(_build_rule_set, rules)
+
+
+def _build_rule_set(rules: Any) -> RuleSet:
+    return RuleSet({'business_rules': rules})
+
+
+def validate_rules_config(rules: Any) -> List[str]:
+    """
+    Check a ``business_rules`` schema entry.
+
+    Returns:
+        Error messages; empty if every rule compiles
+    """
+    if rules is None:
+        return []
+    if not isinstance(rules, list):
+        return ["'business_rules' must be a list"]
+    errors = []
+    for rule_spec in rules:
+        try:
+            BusinessRule(rule_spec)
+        except RuleSyntaxError as e:
+            errors.append(str(e))
+    return errors
+
+
+def validate_documents(documents: Dict[str, Dict[str, Any]], schema: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Evaluate a schema's business rules over many documents in one pass.
+
+    Args:
+        documents: Mapping of document name to document data
+        schema: Schema definition
+
+    Returns:
+        Mapping of document name to its error messages (only documents with errors)
+    """
+    names = list(documents)
+    results = get_rule_set(schema).evaluate([documents[name] for name in names])
+    return {name: errors for name, errors in zip(names, results) if errors}
+
+
+def validate_directory(directory: Path, schema: Dict[str, Any], pattern: str = '*.json') -> Dict[str, List[str]]:
+    """
+    Evaluate business rules for every JSON document in a directory.
+
+    Unreadable files are logged and skipped.
+
+    Args:
+        directory: Directory containing JSON documents
+        schema: Schema definition
+        pattern: Glob pattern for documents
+
+    Returns:
+        Mapping of filename to its error messages (only documents with errors)
+    """
+    documents: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(Path(directory).glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping {path.name} in business rule batch: {e}")
+            continue
+        if isinstance(data, dict):
+            documents[path.name] = data
+    return validate_documents(documents, schema)
@@ -16,6 +16,11 @@ from .directory_exceptions import ConfigurationLoadError
 
 logger = logging.getLogger(__name__)
 
+# Legacy processing keys accepted in config.yaml, mapped to their canonical names
+LEGACY_PROCESSING_KEYS = {
+    'max_file_size_mb': 'max_file_size',
+}
+
 
 def deep_merge(base_dict: Dict[str, Any], update_dict: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -39,6 +44,40 @@ def deep_merge(base_dict: Dict[str, Any], update_dict: Dict[str, Any]) -> Dict[s
     return result
 
 
+def translate_legacy_keys(user_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map legacy processing keys (e.g. max_file_size_mb) to their canonical names.
+    
+    Canonical keys win when both spellings are present. The input is not mutated.
+    
+    Args:
+        user_config: Configuration dictionary as read from YAML
+        
+    Returns:
+        Configuration dictionary using canonical processing keys
+    """
+    processing = user_config.get('processing')
+    if not isinstance(processing, dict):
+        return user_config
+    
+    if not any(legacy in processing for legacy in LEGACY_PROCESSING_KEYS):
+        return user_config
+    
+    translated = dict(processing)
+    for legacy, canonical in LEGACY_PROCESSING_KEYS.items():
+        if legacy not in translated:
+            continue
+        value = translated.pop(legacy)
+        if canonical in translated:
+            logger.warning(f"Both processing.{legacy} and processing.{canonical} set; using {canonical}")
+        else:
+            translated[canonical] = value
+    
+    result = dict(user_config)
+    result['processing'] = translated
+    return result
+
+
 def get_default_config() -> Dict[str, Any]:
     """
     Get default configuration with current hardcoded values.
@@ -53,7 +92,7 @@ def get_default_config() -> Dict[str, Any]:
             'debug': False
         },
         'schema': {
-            'primary_schema': 'invoice_schema.yaml',
+            'primary_schema': 'default_schema.yaml',
             'fallback_schema': 'default_schema.yaml'
         },
         'directories': {
@@ -69,7 +108,48 @@ def get_default_config() -> Dict[str, Any]:
         },
         'processing': {
             'lock_timeout': 60,
-            'max_file_size': 10
+            'max_file_size': 10,
+            'prefetch_documents': 8,
+            'session_idle_minutes': 30,
+            'session_memory_panel': False,
+            'health_check_seconds': 300
+        },
+        'pdf_viewer': {
+            'serve_by_url': True,
+            'host': '127.0.0.1',
+            'port': 0,
+            'public_url': None,
+            'max_entries': 256,
+            'cache_dir': None,
+            'cache_max_mb': 1024,
+            'workers': 2,
+            'watch_interval': 5,
+            'page_images': {
+                'enabled': True,
+                'scales': [0.25, 1.5],
+                'max_pages': 20
+            },
+            'text_extraction': {
+                'enabled': True,
+                'max_pages': 50
+            }
+        },
+        'schema_impact': {
+            'enabled': True,
+            'workers': 2,
+            'cache_dir': None
+        },
+        'perf': {
+            'enabled': True,
+            'log_file': None,
+            'history': 500
+        },
+        'metrics': {
+            'enabled': False,
+            'host': '127.0.0.1',
+            'port': 9464,
+            'textfile': None,
+            'textfile_interval': 15
         }
     }
 
@@ -114,7 +194,7 @@ def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
             return default_config
         
         # Merge user config with defaults
-        config = deep_merge(default_config, user_config)
+        config = deep_merge(default_config, translate_legacy_keys(user_config))
         
         logger.info(f"Successfully loaded configuration from {config_path}")
         return config
@@ -0,0 +1,193 @@
+"""
+Configuration service for JSON QA webapp.
+One process-wide owner of config.yaml: it loads the file through
+``config_loader.load_config`` (defaults, legacy keys), keeps the result as an
+immutable snapshot and reloads it when the file's mtime or size changes. Modules
+read the current snapshot, which is a dictionary lookup; the file is checked at most
+once per ``CHECK_INTERVAL_SECONDS``. Subscribers are notified after a reload that
+changed the configuration.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .frozen_doc import FrozenDict, freeze
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = Path("config.yaml")
+
+# Seconds between checks of the config file for changes
+CHECK_INTERVAL_SECONDS = 1.0
+
+# File signature: (absolute path, mtime_ns, size); mtime_ns and size are None if missing
+Signature = Tuple[str, Optional[int], Optional[int]]
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Immutable view of the configuration at one point in time.
+
+    ``data`` is the merged configuration as a FrozenDict; ``version`` increases
+    with every reload that changed it.
+    """
+    data: FrozenDict
+    signature: Signature
+    version: int
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Return ``section.key`` or ``default``."""
+        values = self.data.get(section)
+        if not isinstance(values, dict):
+            return default
+        return values.get(key, default)
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """Return a section (empty if missing)."""
+        values = self.data.get(name)
+        return values if isinstance(values, dict) else FrozenDict()
+
+    @property
+    def mtime_ns(self) -> Optional[int]:
+        return self.signature[1]
+
+    @property
+    def primary_schema(self) -> str:
+        return self.get('schema', 'primary_schema', 'default_schema.yaml')
+
+    @property
+    def log_level(self) -> str:
+        return str(self.get('logging', 'level', 'INFO'))
+
+
+# callback(old_snapshot, new_snapshot)
+Subscriber = Callable[[ConfigSnapshot, ConfigSnapshot], None]
+
+
+def _signature(path: Path) -> Signature:
+    resolved = str(path.absolute())
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return resolved, None, None
+    return resolved, stat.st_mtime_ns, stat.st_size
+
+
+class ConfigService:
+    """Holds the current configuration snapshot and reloads it when the file changes."""
+
+    def __init__(self, path: Optional[Path] = None, check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.path = Path(path) if path is not None else None
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._next_check = 0.0
+        self._subscribers: List[Tuple[Subscriber, Optional[frozenset]]] = []
+
+    def _config_path(self) -> Path:
+        # Resolved on every check so the working directory is honoured, as before
+        return self.path if self.path is not None else CONFIG_FILE
+
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Return the current snapshot, reloading it first if config.yaml changed.
+
+        Returns:
+            ConfigSnapshot
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            signature = _signature(self._config_path())
+            if self._snapshot is not None and self._snapshot.signature == signature:
+                return self._snapshot
+            return self._load(signature)
+
+    def reload(self) -> ConfigSnapshot:
+        """Reload config.yaml now, whether or not it changed."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            return self._load(_signature(self._config_path()))
+
+    def subscribe(self, callback: Subscriber, sections: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Call ``callback(old, new)`` after a reload that changed the configuration.
+
+        Args:
+            callback: Subscriber function
+            sections: Only notify when one of these top-level sections changed
+
+        Returns:
+            Function that removes the subscription
+        """
+        entry = (callback, frozenset(sections) if sections is not None else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def _load(self, signature: Signature) -> ConfigSnapshot:
+        from .config_loader import load_config
+
+        data = freeze(load_config(self.path))
+        old = self._snapshot
+        if old is not None and old.data == data:
+            # Touched but unchanged: keep the snapshot, remember the new signature
+            self._snapshot = ConfigSnapshot(old.data, signature, old.version)
+            return self._snapshot
+
+        new = ConfigSnapshot(data, signature, old.version + 1 if old is not None else 0)
+        self._snapshot = new
+        if old is not None:
+            logger.info(f"Configuration reloaded from {signature[0]} (version {new.version})")
+            self._notify(old, new)
+        return new
+
+    def _notify(self, old: ConfigSnapshot, new: ConfigSnapshot) -> None:
+        changed = {name for name in set(old.data) | set(new.data) if old.data.get(name) != new.data.get(name)}
+        for callback, sections in list(self._subscribers):
+            if sections is not None and not (sections & changed):
+                continue
+            try:
+                callback(old, new)
+            except Exception as e:
+                logger.warning(f"Configuration subscriber {getattr(callback, '__name__', callback)!r} failed: {e}")
+
+
+def _apply_logging_level(old: ConfigSnapshot, new: ConfigSnapshot) -> None:
+    level = logging.getLevelName(new.log_level.upper())
+    if isinstance(level, int):
+        logging.getLogger().setLevel(level)
+        logger.info(f"Logging level set to {new.log_level.upper()}")
+
+
+_service: Optional[ConfigService] = None
+_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    """Return the process-wide configuration service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ConfigService()
+            _service.subscribe(_apply_logging_level, sections=('logging',))
+        return _service
+
+
+def get_config() -> ConfigSnapshot:
+    """Return the current configuration snapshot."""
+    service = _service if _service is not None else get_config_service()
+    return service.snapshot()
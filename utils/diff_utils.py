@@ -6,11 +6,13 @@ Supports audit logging, change summarization, and multiple output formats for UI
 """
 
 from typing import Dict, Any, List, Optional, Tuple, Set
-from deepdiff import DeepDiff
 import json
 import re
 import logging
 
+from .json_streaming import LazyJsonArray
+from .perf import timed
+
 logger = logging.getLogger(__name__)
 
 _MONEY_NAME_TOKENS = {
@@ -74,7 +76,7 @@ def _normalize_value_for_diff(value: Any) -> Any:
         except ValueError:
             return stripped
 
-    if isinstance(value, list):
+    if isinstance(value, (list, LazyJsonArray)):
         return [_normalize_value_for_diff(item) for item in value]
 
     if isinstance(value, dict):
@@ -91,6 +93,7 @@ def _normalize_mapping_for_diff(data: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+@timed("calculate_diff")
 def calculate_diff(original: Dict[str, Any], modified: Dict[str, Any], fields: Optional[Set[str]] = None) -> Dict[str, Any]:
     """
     Calculate differences between original and modified data with comprehensive normalization.
@@ -163,6 +166,7 @@ def calculate_diff(original: Dict[str, Any], modified: Dict[str, Any], fields: O
                     logger.info(f"[DEBUG calculate_diff]   First item: {normalized_modified[key][0]}")
 
         # Calculate differences using DeepDiff with specific configuration
+        from deepdiff import DeepDiff
         diff = DeepDiff(
             normalized_original,
             normalized_modified,
@@ -388,6 +392,7 @@ def _format_object_array_change(field_name: str, original_rows: List[Dict[str, A
     return lines
 
 
+@timed("format_diff_for_display")
 def format_diff_for_display(diff: Dict[str, Any], original_data: Optional[Dict[str, Any]] = None, modified_data: Optional[Dict[str, Any]] = None) -> str:
     """
     Format diff output for display in Streamlit.
@@ -928,11 +933,14 @@ def create_audit_diff_entry(original: Dict[str, Any], modified: Dict[str, Any])
 
     # Sort dictionaries for consistent comparison
     def sort_dict_recursive(d: Dict[str, Any]) -> Dict[str, Any]:
-        """Sort dictionary recursively."""
+        """Sort dictionary recursively, reusing dicts that are already in order."""
         if not isinstance(d, dict):
             return d
-        return {k: sort_dict_recursive(v) if isinstance(v, dict) else v
-                for k, v in sorted(d.items())}
+        items = [(k, sort_dict_recursive(v) if isinstance(v, dict) else v)
+                 for k, v in sorted(d.items())]
+        if list(d) == [k for k, _ in items] and all(v is d[k] for k, v in items):
+            return d
+        return dict(items)
 
     sorted_original = sort_dict_recursive(original)
     sorted_modified = sort_dict_recursive(modified)
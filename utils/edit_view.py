@@ -7,7 +7,6 @@ import streamlit as st
 from typing import Dict, Any, Optional
 import logging
 import json
-import copy
 
 from .session_manager import SessionManager
 from .file_utils import load_json_file, save_corrected_json, release_file, append_audit_log
@@ -17,6 +16,11 @@ from .pdf_viewer import PDFViewer
 from .form_generator import FormGenerator
 from .diff_utils import calculate_diff, format_diff_for_display, has_changes, create_audit_diff_entry
 from .submission_handler import SubmissionHandler
+from . import field_validation
+from . import metrics
+from . import perf
+from . import session_keys
+from .perf import timed
 from datetime import datetime
 from utils.ui_feedback import Notify
 
@@ -44,16 +48,8 @@ class EditView:
             if not EditView._initialize_edit_data(current_file):
                 return
             
-            # Render the side-by-side layout
-            EditView._render_side_by_side_layout()
-            
-            # Render diff section
-            st.divider()
-            EditView._render_diff_section()
-            
-            # Render action buttons
-            EditView._render_action_buttons(cancel_callback=cancel_callback)
-            
+            # Render the side-by-side layout (the editor column also holds diff and status)
+            EditView._render_side_by_side_layout(cancel_callback=cancel_callback)
             
         except Exception as e:
             Notify.error("Operation failed")
@@ -101,24 +97,33 @@ class EditView:
     @staticmethod
     def _filter_to_schema_fields(data: dict, schema_fields: set) -> tuple[dict, dict]:
         """Filter data to schema fields and extract extras."""
-        filtered_data = {k: copy.deepcopy(v) for k, v in data.items() if k in schema_fields}
-        extras = {k: copy.deepcopy(v) for k, v in data.items() if k not in schema_fields}
+        filtered_data = {k: v for k, v in data.items() if k in schema_fields}
+        extras = {k: v for k, v in data.items() if k not in schema_fields}
         return filtered_data, extras
 
     @staticmethod
-    @staticmethod
+    @timed("EditView._initialize_edit_data")
     def _initialize_edit_data(filename: str) -> bool:
         """Initialize edit data for the current file."""
         from .error_handler import ErrorHandler, ErrorType
         from .ui_feedback import show_loading, show_progress
         from .schema_loader import load_config, extract_field_names, load_active_schema, get_schema_for_file
         from .model_builder import filter_to_schema_fields as mb_filter_to_schema_fields
+        from .prefetch import get_prefetched_document, prefetch_document
         
         try:
             with show_progress(4, "Initializing edit session") as progress:
                 # Step 1: Load original data
                 progress.update(1, "Loading JSON data")
-                original_data = load_json_file(filename)
+                # Documents prepared in the background on claim/submit skip the disk reads
+                prefetched = get_prefetched_document(filename)
+                if prefetched is not None:
+                    original_data = prefetched.original_data
+                else:
+                    # Schema fields are preloaded at claim time; oversized files stream only these
+                    original_data = load_json_file(filename, fields=st.session_state.get("schema_fields") or None)
+                    # Later reruns of this edit session read the prefetched copy
+                    prefetch_document(filename)
                 if not original_data:
                     raise FileNotFoundError(f"Could not load JSON file: {filename}")
                 
@@ -155,12 +160,21 @@ class EditView:
                 if not schema_fields:
                     schema_fields = set()
                 
-                # Filter data to schema fields using model_builder utility (returns (filtered, extras_list))
-                try:
-                    filtered_data, extras = mb_filter_to_schema_fields(original_data, set(schema_fields))
-                except Exception:
-                    # Fallback to local filter if model_builder.filter_to_schema_fields fails
-                    filtered_data, extras = EditView._filter_to_schema_fields(original_data, set(schema_fields))
+                if prefetched is not None and prefetched.schema_fields == set(schema_fields):
+                    # Already filtered (and skipped fields merged) on the prefetch thread
+                    filtered_data, extras = prefetched.filtered_data, prefetched.extras
+                else:
+                    # Filter data to schema fields using model_builder utility (returns (filtered, extras_list))
+                    try:
+                        filtered_data, extras = mb_filter_to_schema_fields(original_data, set(schema_fields))
+                    except Exception:
+                        # Fallback to local filter if model_builder.filter_to_schema_fields fails
+                        filtered_data, extras = EditView._filter_to_schema_fields(original_data, set(schema_fields))
+                    
+                    # Streamed documents only decode schema fields; report the skipped keys too
+                    skipped_fields = getattr(original_data, "skipped_fields", None)
+                    if skipped_fields:
+                        extras = sorted(set(extras) | set(skipped_fields))
                 
                 if extras:
                     # Persist deprecated extras for UI and show a non-blocking notice
@@ -178,20 +192,35 @@ class EditView:
                         # streamlit may not have Notify available in some contexts; use toast as fallback
                         st.toast(msg, icon="⚠️")
                 
-                # Update session manager with filtered data (do not mutate on-disk JSON)
-                filtered_snapshot = copy.deepcopy(filtered_data)
-                SessionManager.set_original_data(filtered_snapshot)
-                SessionManager.set_form_data(copy.deepcopy(filtered_snapshot))
+                # Update session manager with filtered data (do not mutate on-disk JSON).
+                # The original is frozen once and the form data starts as the same snapshot.
+                SessionManager.set_original_data(filtered_data)
+                SessionManager.set_form_data(SessionManager.get_original_data())
+                # Every full rerun re-initializes; cached field results survive until another document is loaded
+                if st.session_state.get("edit_view_initialized_file") != filename:
+                    field_validation.clear_field_results()
+                    st.session_state["edit_view_initialized_file"] = filename
+                
+                # Unsaved edits of a session that was evicted while idle (its widgets were dropped)
+                draft = SessionManager.take_restored_draft()
+                if draft:
+                    SessionManager.set_form_data(draft)
+                    field_validation.clear_field_results()
+                    Notify.info("Restored your unsaved edits")
                 Notify.success(f"Loaded: {filename}")
                 
                 # Step 4: Create model
                 progress.update(4, "Creating validation model")
                 if not SessionManager.get_model_class():
                     try:
-                        model_class = create_model_from_schema(
-                            SessionManager.get_schema(),
-                            f"Model_{filename.replace('.', '_')}"
-                        )
+                        if (prefetched is not None and prefetched.model_class is not None
+                                and prefetched.schema == SessionManager.get_schema()):
+                            model_class = prefetched.model_class
+                        else:
+                            model_class = create_model_from_schema(
+                                SessionManager.get_schema(),
+                                f"Model_{filename.replace('.', '_')}"
+                            )
                         SessionManager.set_model_class(model_class)
                     except Exception as e:
                        logger.error(f"Failed to create model: {e}")
@@ -213,7 +242,7 @@ class EditView:
             return False
     
     @staticmethod
-    def _render_side_by_side_layout():
+    def _render_side_by_side_layout(cancel_callback=None):
         """Render the side-by-side layout with PDF and form."""
         # Create two equal-width columns
         col1, col2 = st.columns([1, 1], gap="medium")
@@ -222,7 +251,42 @@ class EditView:
             EditView._render_pdf_column()
         
         with col2:
-            EditView._render_form_column()
+            EditView._render_editor_fragment(cancel_callback=cancel_callback)
+    
+    @staticmethod
+    def _render_editor_panel(cancel_callback=None):
+        """Render the form, the changes preview and the status/action row."""
+        EditView._render_form_column()
+        
+        st.divider()
+        EditView._render_diff_section()
+        
+        EditView._render_action_buttons(cancel_callback=cancel_callback)
+    
+    @staticmethod
+    @st.fragment
+    def _render_editor_fragment(cancel_callback=None):
+        """
+        Editor panel as a fragment: a field change reruns only the form and diff.
+        
+        The PDF column, the sidebar and edit-session initialization stay as they are
+        until a full rerun (Validate, Submit, Reset and navigation call st.rerun()).
+        Fragment reruns skip main(), so they are profiled here, tagged as fragment reruns.
+        """
+        # During a full run the fragment body is part of main()'s profile
+        fragment_rerun = perf.current_profile() is None
+        if fragment_rerun:
+            perf.begin_rerun('edit', SessionManager.get_session_id(), fragment=True)
+        try:
+            if SessionManager.was_evicted():
+                # The session was idle and its data dropped; a full run reloads it
+                st.rerun()
+            EditView._render_editor_panel(cancel_callback=cancel_callback)
+        finally:
+            if fragment_rerun:
+                profile = perf.end_rerun()
+                if profile is not None:
+                    metrics.RERUN_SECONDS.observe(profile.total_ms() / 1000, page='edit:fragment')
     
     @staticmethod
     def _render_pdf_column():
@@ -277,8 +341,8 @@ class EditView:
             current_file = SessionManager.get_current_file()
             schema = SessionManager.get_schema()
             
-            # Always calculate diff fresh from file vs widgets
-            original_data = load_json_file(current_file) if current_file else None
+            # Compare the file as loaded (prefetched copy, or read from disk) with the widgets
+            original_data = EditView._get_diff_baseline(current_file) if current_file else None
             
             # Collect current data from widgets
             if schema:
@@ -291,8 +355,15 @@ class EditView:
                 Notify.info("No data to compare")
                 return
             
-            # Calculate diff
-            diff = calculate_diff(original_data, current_data)
+            # Calculate diff, reusing the previous result while the widgets are unchanged
+            from .field_validation import payload_hash
+            diff_key = f"{current_file}:{st.session_state.get('form_version', 0)}:{payload_hash(current_data)}"
+            cached_diff = SessionManager.get_cached_diff()
+            if cached_diff and cached_diff['key'] == diff_key:
+                diff = cached_diff['diff']
+            else:
+                diff = calculate_diff(original_data, current_data)
+                SessionManager.set_cached_diff({'key': diff_key, 'diff': diff})
             
             if has_changes(diff):
                 # Show summary metrics
@@ -314,10 +385,10 @@ class EditView:
                 st.markdown(formatted_diff)
                 
                 # Store diff in session for submission
-                st.session_state.current_diff = diff
+                SessionManager.set_current_diff(diff)
             else:
                 st.success("✅ No changes detected")
-                st.session_state.current_diff = {}
+                SessionManager.set_current_diff({})
         
         except Exception as e:
             Notify.error("Operation failed")
@@ -325,6 +396,18 @@ class EditView:
                 st.error(str(e))
             logger.error(f"Error in diff section: {e}", exc_info=True)
     
+    @staticmethod
+    def _get_diff_baseline(filename: str) -> Optional[Dict[str, Any]]:
+        """Return the source document for the diff without re-reading it when prefetched."""
+        from .prefetch import get_prefetched_document
+        
+        schema_fields = st.session_state.get("schema_fields") or None
+        if schema_fields:
+            prefetched = get_prefetched_document(filename)
+            if prefetched is not None and prefetched.schema_fields == set(schema_fields):
+                return prefetched.original_data
+        return load_json_file(filename, fields=schema_fields)
+    
     @staticmethod
     def _show_cancel_dialog(cancel_callback=None):
         """Show cancel confirmation as a popup dialog."""
@@ -422,9 +505,13 @@ class EditView:
             # Increment form version to force complete re-render
             # This forces Streamlit to treat all widgets as new, re-initializing from original data
             st.session_state['form_version'] = st.session_state.get('form_version', 0) + 1
+            # Drop the widget keys of the superseded version
+            session_keys.collect_garbage(st.session_state, keep_version=st.session_state['form_version'])
             
-            # Clear validation errors
+            # Clear validation errors; widgets re-initialize without on_change, so
+            # cached per-field results would otherwise describe the discarded edits
             SessionManager.clear_validation_errors()
+            field_validation.clear_field_results()
             
             Notify.success("Reset complete - form will reload from original JSON")
             st.rerun()
@@ -482,15 +569,17 @@ class EditView:
             
             if st.sidebar.button("🔄 Refresh Data"):
                 # Reload original data
-                original_data = load_json_file(current_file)
+                original_data = load_json_file(current_file, fields=st.session_state.get("schema_fields") or None)
                 if original_data:
                     SessionManager.set_original_data(original_data)
+                    field_validation.clear_field_results()
                     st.sidebar.success("Data refreshed")
                     st.rerun()
             
             if st.sidebar.button("📋 Copy JSON"):
                 import json
-                form_data = SessionManager.get_form_data()
+                from .json_streaming import materialize_lazy_arrays
+                form_data = materialize_lazy_arrays(SessionManager.get_form_data())
                 json_str = json.dumps(form_data, indent=2)
                 st.sidebar.code(json_str)
         
@@ -0,0 +1,195 @@
+"""
+Incremental per-field validation for JSON QA webapp.
+Widgets mark their field as changed in an on_change callback; only changed fields (and
+the business rules that depend on them) are revalidated, and results are cached per
+field in session state so submit-time validation is an aggregate of cached results.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from . import validator_compiler as vc
+from .business_rules import get_rule_set
+from .json_streaming import LazyJsonArray
+
+logger = logging.getLogger(__name__)
+
+# Session keys
+FIELD_RESULTS_KEY = 'field_validation_results'
+RULE_RESULTS_KEY = 'business_rule_results'
+PENDING_FIELDS_KEY = 'pending_field_validation'
+
+
+def payload_hash(value: Any) -> str:
+    """Hash a value independent of key order; type-tags non-JSON values (dates, Decimals)."""
+    try:
+        canonical = json.dumps(
+            value, sort_keys=True, ensure_ascii=False,
+            default=lambda o: f"{type(o).__name__}:{o}"
+        )
+    except (TypeError, ValueError):
+        canonical = repr(value)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _session_dict(key: str) -> Dict[str, Any]:
+    """Return a dict stored in session state, creating it if missing."""
+    value = st.session_state.get(key)
+    if not isinstance(value, dict):
+        value = {}
+        st.session_state[key] = value
+    return value
+
+
+def _pending() -> set:
+    """Return the set of fields changed since they were last validated."""
+    pending = st.session_state.get(PENDING_FIELDS_KEY)
+    if not isinstance(pending, set):
+        pending = set()
+        st.session_state[PENDING_FIELDS_KEY] = pending
+    return pending
+
+
+def on_field_change(field_name: str) -> None:
+    """
+    Widget on_change callback: mark a field for revalidation.
+
+    The callback runs before the widget's new value is available for composite
+    editors (date/time pairs, data editors), so validation itself happens when the
+    field is rendered in the rerun that the change triggers.
+    """
+    _pending().add(field_name)
+
+
+def business_rule_fields(schema: Dict[str, Any]) -> frozenset:
+    """Fields read by the schema's business rules; a change to any of them reruns the rules."""
+    return get_rule_set(schema).fields
+
+
+def validate_field(field_name: str, field_config: Dict[str, Any], value: Any) -> List[str]:
+    """
+    Validate one field, reusing the cached result while its value and config are unchanged.
+
+    Args:
+        field_name: Schema field name
+        field_config: Field configuration from the schema
+        value: Current field value
+
+    Returns:
+        Deduplicated error messages for the field
+    """
+    results = _session_dict(FIELD_RESULTS_KEY)
+    config_hash = payload_hash(field_config)
+    value_hash = payload_hash(value)
+
+    entry = results.get(field_name)
+    if entry and entry['config'] == config_hash and entry['value'] == value_hash:
+        return list(entry['errors'])
+
+    issues = vc.get_validator(vc.build_comprehensive_field, field_config)(field_name, value)
+    errors = list(dict.fromkeys(issue['message'] for issue in issues))
+    results[field_name] = {'config': config_hash, 'value': value_hash, 'errors': errors}
+    return list(errors)
+
+
+def validate_business_rules(form_data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
+    """
+    Run business rules over the fields they depend on, cached by the hash of those inputs.
+
+    Args:
+        form_data: Form data (only rule input fields are read)
+        schema: Schema definition
+
+    Returns:
+        Business rule error messages
+    """
+    from .submission_handler import SubmissionHandler
+
+    rule_set = get_rule_set(schema)
+    inputs = {name: form_data[name] for name in rule_set.fields if name in form_data}
+    inputs_hash = payload_hash([rule_set.fingerprint, inputs])
+    results = _session_dict(RULE_RESULTS_KEY)
+
+    if results.get('inputs') == inputs_hash:
+        return list(results['errors'])
+
+    errors = SubmissionHandler._validate_business_rules(inputs, schema)
+    results.clear()
+    results.update({'inputs': inputs_hash, 'errors': list(errors)})
+    return list(errors)
+
+
+def check_rendered_field(field_name: str, field_config: Dict[str, Any], value: Any) -> List[str]:
+    """
+    Return errors for a field as it is rendered, validating only when needed.
+
+    A field is validated when it changed since its last validation or has never been
+    validated in this session; otherwise its cached errors are returned as-is.
+    """
+    if isinstance(value, LazyJsonArray):
+        # Paged arrays are validated when materialized at submit time
+        return []
+    try:
+        pending = _pending()
+        entry = _session_dict(FIELD_RESULTS_KEY).get(field_name)
+        if entry is None or field_name in pending:
+            errors = validate_field(field_name, field_config, value)
+            pending.discard(field_name)
+            return errors
+        return list(entry['errors'])
+    except Exception as e:
+        logger.warning(f"Incremental validation failed for {field_name}: {e}")
+        return []
+
+
+def check_rendered_rules(form_data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
+    """Return business rule errors for the rendered form, rerunning only if their inputs changed."""
+    try:
+        return validate_business_rules(form_data, schema)
+    except Exception as e:
+        logger.warning(f"Incremental business rule validation failed: {e}")
+        return []
+
+
+def aggregate_field_results(
+    form_data: Dict[str, Any],
+    schema: Dict[str, Any]
+) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    Build submit-time schema and business rule errors from per-field results.
+
+    Fields whose cached result matches their current value are not revalidated;
+    the rest are validated and cached.
+
+    Args:
+        form_data: Form data to validate
+        schema: Schema definition
+
+    Returns:
+        Tuple of (errors grouped by field, business rule errors)
+    """
+    field_errors: Dict[str, List[str]] = {}
+    for field_name, field_config in (schema.get('fields', {}) or {}).items():
+        errors = validate_field(field_name, field_config, form_data.get(field_name))
+        if errors:
+            field_errors[field_name] = errors
+    _pending().clear()
+
+    return field_errors, validate_business_rules(form_data, schema)
+
+
+def get_field_errors(field_name: str) -> Optional[List[str]]:
+    """Return the cached errors for a field, or None if it has not been validated."""
+    entry = (st.session_state.get(FIELD_RESULTS_KEY) or {}).get(field_name)
+    return list(entry['errors']) if entry else None
+
+
+def clear_field_results() -> None:
+    """Drop all cached per-field and business rule results."""
+    st.session_state[FIELD_RESULTS_KEY] = {}
+    st.session_state[RULE_RESULTS_KEY] = {}
+    st.session_state[PENDING_FIELDS_KEY] = set()
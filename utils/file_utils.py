@@ -5,17 +5,30 @@ Handles file operations, locking, and concurrency control.
 
 import json
 import os
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Tuple
 import logging
 
-from .config_loader import load_config, get_directory_config
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .config_loader import get_directory_config
+from .config_service import get_config, get_config_service
 from .directory_config import DirectoryConfig
 from .directory_validator import DirectoryValidator
 from .directory_creator import DirectoryCreator
 from .directory_exceptions import DirectoryConfigError, handle_directory_error
 from .graceful_degradation import apply_graceful_degradation
+from .json_streaming import stream_json_fields
+from .perf import timed
+from . import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +38,15 @@ _directory_config: Optional[DirectoryConfig] = None
 # Lock timeout in minutes
 DEFAULT_LOCK_TIMEOUT = 60
 
+# Mutex file in the locks directory; lock files are created and removed while holding it
+LOCKS_MUTEX_NAME = ".locks.mutex"
+# A lock replaced this many times while being checked is reported as held
+LOCK_CHECK_ATTEMPTS = 3
+
+# Documents larger than this (in MB) are flagged in the queue and streamed on load
+DEFAULT_MAX_FILE_SIZE_MB = 10
+_max_file_size_mb: Optional[float] = None
+
 # Legacy constants for backward compatibility (deprecated)
 SAMPLE_JSON_DIR = Path("json_docs")
 CORRECTED_DIR = Path("corrected")
@@ -33,22 +55,30 @@ PDF_DOCS_DIR = Path("pdf_docs")
 LOCKS_DIR = Path("locks")
 
 
-def initialize_directories(config: Optional[Dict[str, Any]] = None) -> bool:
+def initialize_directories(config: Optional[Dict[str, Any]] = None,
+                           raw_config: Optional[Dict[str, Any]] = None) -> bool:
     """
     Initialize directory configuration and ensure directories exist with graceful degradation.
     
     Args:
         config: Optional configuration dictionary. If None, loads from config.yaml
+        raw_config: Configuration the caller already loaded from config.yaml, used
+            instead of reading it again when ``config`` is None
         
     Returns:
         True if initialization successful, False otherwise
     """
-    global _directory_config
+    global _directory_config, _max_file_size_mb
+    
+    # Re-read processing limits alongside the directory configuration
+    _max_file_size_mb = None
+    if config is not None:
+        _max_file_size_mb = _parse_max_file_size(config)
     
     try:
         # Apply graceful degradation for robust initialization
         if config is None:
-            _directory_config = apply_graceful_degradation()
+            _directory_config = apply_graceful_degradation(raw_config=raw_config)
         else:
             try:
                 _directory_config = DirectoryConfig.from_config(config)
@@ -123,6 +153,19 @@ def get_directories() -> DirectoryConfig:
     return _directory_config
 
 
+def _on_config_change(old, new) -> None:
+    """Configuration subscriber: re-read directories and limits lazily after a reload."""
+    global _directory_config, _max_file_size_mb
+    if old.section('processing') != new.section('processing'):
+        _max_file_size_mb = None
+    if old.section('directories') != new.section('directories'):
+        logger.info("Directory configuration changed, re-initializing on next use")
+        _directory_config = None
+
+
+get_config_service().subscribe(_on_config_change, sections=('directories', 'processing'))
+
+
 def ensure_directories_exist() -> None:
     """Ensure all required directories exist using configured paths."""
     dirs = get_directories()
@@ -135,15 +178,50 @@ def ensure_directories_exist() -> None:
             logger.error(f"Failed to create directory {name} ({directory}): {e}")
 
 
+def _parse_max_file_size(config: Dict[str, Any]) -> float:
+    """Read processing.max_file_size (MB) from a config dict, falling back to the default."""
+    value = config.get('processing', {}).get('max_file_size', DEFAULT_MAX_FILE_SIZE_MB)
+    try:
+        size = float(value)
+        if size > 0:
+            return size
+    except (TypeError, ValueError):
+        pass
+    logger.warning(f"Invalid processing.max_file_size {value!r}, using {DEFAULT_MAX_FILE_SIZE_MB} MB")
+    return float(DEFAULT_MAX_FILE_SIZE_MB)
+
+
+def get_max_file_size_bytes() -> int:
+    """
+    Get the configured maximum document size in bytes.
+    
+    Returns:
+        processing.max_file_size converted from MB to bytes
+    """
+    global _max_file_size_mb
+    
+    if _max_file_size_mb is None:
+        try:
+            _max_file_size_mb = _parse_max_file_size(get_config().data)
+        except Exception as e:
+            logger.warning(f"Failed to load max_file_size, using default: {e}")
+            _max_file_size_mb = float(DEFAULT_MAX_FILE_SIZE_MB)
+    
+    return int(_max_file_size_mb * 1024 * 1024)
+
+
+@timed("list_unverified_files")
 def list_unverified_files() -> List[Dict[str, Any]]:
     """
     Get list of JSON files that need validation.
     Returns files from json_docs that don't have corresponding files in corrected.
+    Files larger than processing.max_file_size are flagged with exceeds_size_limit.
     """
     ensure_directories_exist()
     
     dirs = get_directories()
     unverified_files: List[Dict[str, Any]] = []
+    max_size = get_max_file_size_bytes()
     
     if not dirs.json_docs.exists():
         return unverified_files
@@ -161,6 +239,7 @@ def list_unverified_files() -> List[Dict[str, Any]]:
             "filename": json_file.name,
             "filepath": str(json_file),
             "size": stat.st_size,
+            "exceeds_size_limit": stat.st_size > max_size,
             "created_at": datetime.fromtimestamp(stat.st_ctime),
             "modified_at": datetime.fromtimestamp(stat.st_mtime),
             "is_locked": is_file_locked(json_file.name),
@@ -176,38 +255,114 @@ def list_unverified_files() -> List[Dict[str, Any]]:
     return unverified_files
 
 
-def claim_file(filename: str, user: str, timeout_minutes: int = DEFAULT_LOCK_TIMEOUT) -> bool:
+def count_pending_documents() -> Tuple[int, int]:
     """
-    Claim a file by creating a lock.
-    Returns True if successfully claimed, False if already locked.
+    Count documents waiting for review and the live locks on them.
+
+    Cheaper than list_unverified_files (no per-file metadata) and read-only: expired
+    or corrupted locks are not counted, but left for cleanup_stale_locks.
+
+    Returns:
+        Tuple of (pending documents, locked pending documents)
     """
-    ensure_directories_exist()
-    
     dirs = get_directories()
-    lock_file = dirs.locks / f"{filename}.lock"
+    pending = {path.name for path in dirs.json_docs.glob("*.json")}
+    pending -= {path.name for path in dirs.corrected.glob("*.json")}
     
-    # Check if already locked
-    if is_file_locked(filename):
-        return False
+    now = datetime.now()
+    locked = 0
+    for lock_file in dirs.locks.glob("*.json.lock"):
+        if lock_file.name[:-len(".lock")] not in pending:
+            continue
+        try:
+            with open(lock_file, 'r') as f:
+                expires = datetime.fromisoformat(json.load(f)["expires"])
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        if expires > now:
+            locked += 1
+    
+    return len(pending), locked
+
+
+def claim_file(filename: str, user: str, timeout_minutes: int = DEFAULT_LOCK_TIMEOUT) -> bool:
+    """
+    Claim a file by creating a lock.
+    Returns True if successfully claimed, False if already locked or already corrected.
+    """
+    with metrics.CLAIM_SECONDS.time(outcome="error") as claim:
+        ensure_directories_exist()
+        
+        dirs = get_directories()
+        lock_file = dirs.locks / f"{filename}.lock"
+        
+        # Check if already locked
+        if is_file_locked(filename):
+            claim["outcome"] = "busy"
+            return False
+        
+        # Create lock
+        lock_data: Dict[str, Any] = {
+            "filename": filename,
+            "user": user,
+            "timestamp": datetime.now().isoformat(),
+            "expires": (datetime.now() + timedelta(minutes=timeout_minutes)).isoformat()
+        }
+        
+        try:
+            if not _create_lock_file(lock_file, lock_data):
+                # Another reviewer claimed it between the check and the write
+                claim["outcome"] = "busy"
+                return False
+            
+            if (dirs.corrected / filename).exists():
+                # Submitted by another reviewer since the queue was listed
+                lock_file.unlink()
+                claim["outcome"] = "busy"
+                return False
+            
+            logger.info(f"File {filename} claimed by {user}")
+            claim["outcome"] = "claimed"
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to claim file {filename}: {e}")
+            return False
+
+
+def _create_lock_file(lock_file: Path, lock_data: Dict[str, Any]) -> bool:
+    """
+    Create a lock file only if it does not exist yet.
     
-    # Create lock
-    lock_data: Dict[str, Any] = {
-        "filename": filename,
-        "user": user,
-        "timestamp": datetime.now().isoformat(),
-        "expires": (datetime.now() + timedelta(minutes=timeout_minutes)).isoformat()
-    }
+    The lock is written to a temporary file and hard-linked into place, so of two
+    concurrent claims only one succeeds and readers never see a half-written lock.
     
+    Returns:
+        True if the lock was created, False if it already existed
+    """
+    tmp_file = lock_file.with_name(f".{lock_file.name}.{uuid.uuid4().hex}.tmp")
     try:
-        with open(lock_file, 'w') as f:
+        with open(tmp_file, 'w') as f:
             json.dump(lock_data, f, indent=2)
-        
-        logger.info(f"File {filename} claimed by {user}")
+        with _locks_mutex(lock_file.parent):
+            try:
+                os.link(tmp_file, lock_file)
+            except FileExistsError:
+                return False
+            except OSError:
+                # Filesystems without hard links: exclusive create (briefly empty while written)
+                try:
+                    fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                except FileExistsError:
+                    return False
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(lock_data, f, indent=2)
         return True
-        
-    except Exception as e:
-        logger.error(f"Failed to claim file {filename}: {e}")
-        return False
+    finally:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
 
 
 def release_file(filename: str) -> bool:
@@ -220,7 +375,8 @@ def release_file(filename: str) -> bool:
     
     try:
         if lock_file.exists():
-            lock_file.unlink()
+            with _locks_mutex(lock_file.parent):
+                lock_file.unlink()
             logger.info(f"File {filename} released")
         return True
         
@@ -229,39 +385,102 @@ def release_file(filename: str) -> bool:
         return False
 
 
+@contextmanager
+def _locks_mutex(locks_dir: Path):
+    """
+    Hold the exclusive mutex of a locks directory (a flock on its ``.locks.mutex`` file).
+    
+    Lock files are created, reclaimed and released under it, so checking that a lock
+    is still the one that was read and removing it happen as one step.
+    """
+    with open(locks_dir / LOCKS_MUTEX_NAME, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_lock(lock_file: Path) -> Optional[bytes]:
+    """Return the raw content of a lock file, or None if there is no lock."""
+    try:
+        with open(lock_file, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _lock_expiry(content: bytes) -> datetime:
+    """Parse the expiry of a lock; raises ValueError, KeyError or TypeError if it is corrupted."""
+    return datetime.fromisoformat(json.loads(content)["expires"])
+
+
+def _reclaim_lock(lock_file: Path, content: bytes) -> bool:
+    """
+    Remove a stale or corrupted lock, provided it is still the lock that was read.
+    
+    Reading a lock and removing it are separate steps; meanwhile another process may
+    have reclaimed it and claimed the document. The lock is therefore read again and
+    removed under the locks directory's mutex, which claims also hold, so a fresh
+    lock is never removed.
+    
+    Returns:
+        True if the lock that was read has been removed by this call
+    
+    Raises:
+        OSError: If the mutex or the lock file cannot be accessed
+    """
+    with _locks_mutex(lock_file.parent):
+        if _read_lock(lock_file) != content:
+            # Reclaimed, released or replaced by someone else first
+            return False
+        lock_file.unlink()
+        return True
+
+
 def is_file_locked(filename: str) -> bool:
     """
     Check if a file is currently locked.
     Returns True if locked and not stale, False otherwise.
+    Stale and corrupted locks are removed.
     """
     dirs = get_directories()
     lock_file = dirs.locks / f"{filename}.lock"
     
-    if not lock_file.exists():
-        return False
-    
-    try:
-        with open(lock_file, 'r') as f:
-            lock_data = json.load(f)
-        
-        # Check if lock is stale
-        expires = datetime.fromisoformat(lock_data["expires"])
-        if datetime.now() > expires:
-            # Remove stale lock
-            lock_file.unlink()
-            logger.info(f"Removed stale lock for {filename}")
+    for _ in range(LOCK_CHECK_ATTEMPTS):
+        try:
+            content = _read_lock(lock_file)
+        except OSError as e:
+            logger.error(f"Error checking lock for {filename}: {e}")
+            return False
+        if content is None:
             return False
         
-        return True
+        try:
+            if datetime.now() <= _lock_expiry(content):
+                return True
+            reason = "stale"
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error checking lock for {filename}: {e}")
+            reason = "corrupted"
         
-    except Exception as e:
-        logger.error(f"Error checking lock for {filename}: {e}")
-        # Remove corrupted lock file
         try:
-            lock_file.unlink()
-        except Exception:
-            pass
-        return False
+            if _reclaim_lock(lock_file, content):
+                logger.info(f"Removed {reason} lock for {filename}")
+                return False
+        except OSError as e:
+            logger.error(f"Could not remove {reason} lock for {filename}; treating it as held: {e}")
+            return True
+        # Reclaimed or replaced by someone else first: check the lock that is there now
+    return True
 
 
 def get_lock_owner(filename: str) -> Optional[str]:
@@ -311,29 +530,48 @@ def cleanup_stale_locks(timeout_minutes: int = DEFAULT_LOCK_TIMEOUT) -> int:
     
     for lock_file in dirs.locks.glob("*.lock"):
         try:
-            with open(lock_file, 'r') as f:
-                lock_data = json.load(f)
-            
-            expires = datetime.fromisoformat(lock_data["expires"])
-            if datetime.now() > expires:
-                lock_file.unlink()
-                removed_count += 1
-                logger.info(f"Removed stale lock: {lock_file.name}")
-                
-        except Exception as e:
-            # Remove corrupted lock files
-            try:
-                lock_file.unlink()
-                removed_count += 1
-                logger.info(f"Removed corrupted lock: {lock_file.name}")
-            except Exception:
-                pass
+            content = _read_lock(lock_file)
+        except OSError:
+            continue
+        if content is None:
+            continue
+        
+        try:
+            if datetime.now() <= _lock_expiry(content):
+                continue
+            reason = "expired"
+        except (ValueError, KeyError, TypeError):
+            reason = "corrupted"
+        
+        # Only the lock that was read is removed, never a fresh claim that replaced it
+        try:
+            reclaimed = _reclaim_lock(lock_file, content)
+        except OSError as e:
+            logger.error(f"Could not remove {reason} lock {lock_file.name}: {e}")
+            continue
+        if reclaimed:
+            removed_count += 1
+            metrics.LOCK_RECLAIMS.inc(reason=reason)
+            logger.info(f"Removed {reason} lock: {lock_file.name}")
     
     return removed_count
 
 
-def load_json_file(filename: str) -> Optional[Dict[str, Any]]:
-    """Load JSON data from json_docs directory."""
+def load_json_file(filename: str, fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load JSON data from json_docs directory.
+    
+    Documents larger than processing.max_file_size are streamed instead of read
+    whole: only `fields` (when given) are decoded and large arrays are returned
+    as paged LazyJsonArray sequences. Smaller documents are loaded in full.
+    
+    Args:
+        filename: Name of the JSON file in json_docs
+        fields: Optional top-level keys to decode when streaming
+        
+    Returns:
+        Parsed document, or None if missing or unreadable
+    """
     dirs = get_directories()
     json_file = dirs.json_docs / filename
     
@@ -341,6 +579,11 @@ def load_json_file(filename: str) -> Optional[Dict[str, Any]]:
         return None
     
     try:
+        size = json_file.stat().st_size
+        if size > get_max_file_size_bytes():
+            logger.warning(f"{filename} is {size} bytes, above max_file_size; streaming selected fields")
+            return stream_json_fields(json_file, fields)
+        
         with open(json_file, 'r', encoding='utf-8') as f:
             return json.load(f)
             
@@ -417,6 +660,7 @@ def append_audit_log(entry: Dict[str, Any]) -> bool:
             return s
         return val
 
+    started = time.perf_counter()
     try:
         # Make a shallow copy to avoid mutating caller's object
         safe_entry = dict(entry)
@@ -424,15 +668,18 @@ def append_audit_log(entry: Dict[str, Any]) -> bool:
         if dd is not None:
             safe_entry['detailed_diff'] = _sanitize_deepdiff_section(dd)
 
-        # Finally write sanitized entry
-        with open(audit_file, 'a', encoding='utf-8') as f:
-            json.dump(safe_entry, f, ensure_ascii=False, default=str)
-            f.write('\n')
+        # Finally write sanitized entry: one unbuffered write of the whole line, so
+        # O_APPEND keeps entries from concurrent sessions and processes whole
+        line = json.dumps(safe_entry, ensure_ascii=False, default=str) + '\n'
+        with open(audit_file, 'ab', buffering=0) as f:
+            f.write(line.encode('utf-8'))
+        metrics.AUDIT_WRITE_SECONDS.observe(time.perf_counter() - started)
         
         logger.info(f"Added audit log entry for {entry.get('filename', 'unknown')}")
         return True
         
     except Exception as e:
+        metrics.AUDIT_WRITE_FAILURES.inc()
         logger.error(f"Failed to append audit log: {e}")
         return False
 
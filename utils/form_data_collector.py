@@ -8,6 +8,9 @@ import logging
 from typing import Dict, Any
 from datetime import date, datetime
 
+from .json_streaming import LazyJsonArray
+from .object_array_buffer import ObjectArrayBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,32 +54,29 @@ def collect_all_form_data(schema: Dict[str, Any]) -> Dict[str, Any]:
         
         value = st.session_state[field_key]
         
+        # Paged arrays from streamed documents carry their own edits
+        if field_type == 'array' and isinstance(value, LazyJsonArray):
+            logger.info(f"[SIMPLIFIED COLLECTOR] Paged array {field_name}: {len(value)} items, {len(value.edited_indices)} edited")
+            form_data[field_name] = value
+            continue
+        
         # Handle arrays (both scalar and object)
         if field_type == 'array':
             items_config = field_config.get('items', {})
             item_type = items_config.get('type', 'string')
             
-            # For object arrays, read from the _current key (edited DataFrame)
+            # For object arrays, read the edit buffer kept by the data editor
             if item_type == 'object':
                 array_key = f'array_{field_name}_v{form_version}'
-                current_key = f'{array_key}_current'
+                buffer = st.session_state.get(array_key)
                 
-                if current_key in st.session_state:
-                    # Use the edited DataFrame stored during rendering
-                    edited_df = st.session_state[current_key]
-                    if hasattr(edited_df, 'to_dict'):
-                        records = edited_df.to_dict('records')
-                        properties = items_config.get("properties", {})
-                        cleaned = _clean_object_array(records, properties)
-                        logger.info(f"[SIMPLIFIED COLLECTOR] Object array {field_name}: {len(cleaned)} objects from _current")
-                        if cleaned:
-                            logger.info(f"[SIMPLIFIED COLLECTOR]   First: {cleaned[0]}")
-                        form_data[field_name] = cleaned
-                    else:
-                        logger.warning(f"[SIMPLIFIED COLLECTOR] {current_key} is not a DataFrame: {type(edited_df)}")
-                        form_data[field_name] = []
+                if isinstance(buffer, ObjectArrayBuffer):
+                    # Rows are converted from the buffer only when the table changed
+                    cleaned = [dict(row) for row in buffer.to_records(_clean_object_array)]
+                    logger.info(f"[SIMPLIFIED COLLECTOR] Object array {field_name}: {len(cleaned)} objects from buffer")
+                    form_data[field_name] = cleaned
                 elif field_key in st.session_state and isinstance(st.session_state[field_key], list):
-                    # Fallback to field key if _current not available
+                    # Fallback to field key if the editor has not rendered yet
                     value = st.session_state[field_key]
                     properties = items_config.get("properties", {})
                     cleaned = _clean_object_array(value, properties)
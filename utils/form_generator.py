@@ -13,6 +13,14 @@ import logging
 from .model_builder import get_streamlit_widget_type, get_widget_kwargs
 from .session_manager import SessionManager
 from .submission_handler import SubmissionHandler
+from .json_streaming import LazyJsonArray
+from .object_array_buffer import ObjectArrayBuffer
+from .frozen_doc import assoc
+from . import validator_compiler as vc
+from . import field_validation
+from . import render_plan
+from . import session_keys
+from .perf import timed
 
 logger = logging.getLogger(__name__)
 
@@ -60,13 +68,13 @@ class FormGenerator:
         # Update session state with the versioned field key
         field_key = f"field_{field_name}_v{form_version}"
         array_copy = copy.deepcopy(array_value)
+        size_key = f"scalar_array_{field_name}_size_v{form_version}"
         st.session_state[field_key] = array_copy
-        st.session_state[f"scalar_array_{field_name}_size_v{form_version}"] = len(array_copy)
+        st.session_state[size_key] = len(array_copy)
+        session_keys.register(st.session_state, field_name, field_key, size_key)
         
-        # Update form data in SessionManager
-        current_form_data = SessionManager.get_form_data()
-        current_form_data[field_name] = array_copy
-        SessionManager.set_form_data(current_form_data)
+        # Update form data in SessionManager (path copy; other fields stay shared)
+        SessionManager.set_form_data(assoc(SessionManager.get_form_data(), (field_name,), array_copy))
         
         logger.info(
             "[SYNC DEBUG] %s -> Synced %d items to field_%s",
@@ -175,8 +183,8 @@ class FormGenerator:
 
             related_keys = {
                 key: st.session_state.get(key)
-                for key in st.session_state.keys()
-                if isinstance(key, str) and key.startswith(f"data_editor_{field_name}")
+                for key in sorted(session_keys.keys_for(st.session_state, field_name))
+                if key.startswith(f"data_editor_{field_name}")
             }
             container.markdown("**Related session_state keys:**")
 
@@ -413,7 +421,7 @@ class FormGenerator:
                                 collected_array = collected_candidates
                                 logger.info(f"[DEBUG] Collected {len(collected_array)} items from widget prefixes for {field_name}")
                         else:
-                            logger.warning(f"[DEBUG] No size hint available for {field_name}; session_state keys: {[k for k in st.session_state.keys() if field_name in str(k)]}")
+                            logger.warning(f"[DEBUG] No size hint available for {field_name}; registered keys: {sorted(session_keys.keys_for(st.session_state, field_name))}")
                     
                     logger.info(f"[DEBUG] Final collected array for {field_name}: {collected_array}")
                     form_data[field_name] = collected_array
@@ -429,6 +437,7 @@ class FormGenerator:
         return form_data
     
     @staticmethod
+    @timed("FormGenerator.render_dynamic_form")
     def render_dynamic_form(schema: Dict[str, Any], current_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Render a dynamic form based on schema and return form data.
@@ -453,6 +462,10 @@ class FormGenerator:
         fields = schema['fields']
         form_data = FormGenerator._render_form_fields(fields, current_data)
         
+        # Business rules rerun only when one of their input fields changed
+        for error in field_validation.check_rendered_rules(form_data, schema):
+            st.error(error)
+        
         # Create form with ONLY buttons
         with st.form("json_edit_form", clear_on_submit=False):
             
@@ -472,8 +485,9 @@ class FormGenerator:
             # Handle validation button
             if validate_submitted:
                 # DEBUG: Check what's in data_editor session state AFTER form submission
-                for key in st.session_state.keys():
-                    if 'data_editor' in str(key) or 'Items' in str(key):
+                for key in (k for name in session_keys.fields_for(st.session_state)
+                            for k in session_keys.keys_for(st.session_state, name)):
+                    if 'data_editor' in key or 'Items' in key:
                         value = st.session_state[key]
                         logger.info(f"[DEBUG VALIDATE] {key}: type={type(value)}, value={value if not isinstance(value, (list, dict)) or len(str(value)) < 200 else f'{type(value)} with {len(value)} items'}")
                 
@@ -484,8 +498,8 @@ class FormGenerator:
                 # Always save the form data first
                 SessionManager.set_form_data(form_data)
                 
-                # Validate using comprehensive submission validation
-                validation_errors = SubmissionHandler._validate_submission_data(form_data, schema, model_class)
+                # Validate using comprehensive submission validation (memoized per payload)
+                validation_errors = SubmissionHandler.validate_submission(form_data, schema, model_class)["errors"]
                 
                 if validation_errors:
                     SessionManager.set_validation_errors(validation_errors)
@@ -511,8 +525,8 @@ class FormGenerator:
                 # Save form data
                 SessionManager.set_form_data(form_data)
                 
-                # Validate first
-                validation_errors = SubmissionHandler._validate_submission_data(form_data, schema, model_class)
+                # Validate first; an unchanged payload reuses the "Validate Data" result
+                validation_errors = SubmissionHandler.validate_submission(form_data, schema, model_class)["errors"]
                 
                 if validation_errors:
                     SessionManager.set_validation_errors(validation_errors)
@@ -542,6 +556,11 @@ class FormGenerator:
                     # Clear state and navigate
                     SessionManager._clear_file_state()
                     SessionManager.set_current_page('queue')
+                    
+                    # Warm the next document while the reviewer is back in the queue
+                    from .prefetch import get_prefetcher
+                    get_prefetcher().discard(filename)
+                    get_prefetcher().prefetch_next(exclude=filename)
                     st.rerun()
                 else:
                     st.error("Submission failed:")
@@ -556,12 +575,11 @@ class FormGenerator:
     
     @staticmethod
     def _render_form_fields(fields: Dict[str, Any], current_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Render form fields based on schema definition."""
+        """Render form fields from the schema's cached render plan."""
         form_data = {}
         
-        # Group fields by category if possible
-        grouped_fields = FormGenerator._group_fields(fields)
-        for group_name, group_fields in grouped_fields.items():
+        plan = render_plan.get_render_plan({'fields': fields})
+        for group_name, field_plans in plan.groups:
             if group_name != "General":
                 st.subheader(f"{group_name}")
             
@@ -569,21 +587,19 @@ class FormGenerator:
             cols = st.columns(2)
             col_index = 0
             
-            for field_name, field_config in group_fields.items():
-                is_object_array = (
-                    field_config.get("type") == "array"
-                    and isinstance(field_config.get("items"), dict)
-                    and field_config.get("items", {}).get("type") == "object"
-                )
-
-                if is_object_array:
+            for field_plan in field_plans:
+                field_name = field_plan.name
+                if field_plan.full_width:
                     with st.container():
                         field_value = FormGenerator._render_field(
                             field_name,
-                            field_config,
-                            current_data.get(field_name)
+                            field_plan.config,
+                            current_data.get(field_name),
+                            plan=field_plan
                         )
                         form_data[field_name] = field_value
+                        # Cached for submit; the object array editor shows its own row errors
+                        field_validation.check_rendered_field(field_name, field_plan.config, field_value)
 
                     # restart the two-column flow after the full-width field
                     cols = st.columns(2)
@@ -593,13 +609,25 @@ class FormGenerator:
                 with cols[col_index % 2]:
                     field_value = FormGenerator._render_field(
                         field_name,
-                        field_config,
-                        current_data.get(field_name)
+                        field_plan.config,
+                        current_data.get(field_name),
+                        plan=field_plan
                     )
                     form_data[field_name] = field_value
+                    FormGenerator._show_field_errors(field_name, field_plan.config, field_value)
                 col_index += 1
         
         return form_data
+    
+    @staticmethod
+    def _show_field_errors(field_name: str, field_config: Dict[str, Any], value: Any) -> None:
+        """Show incremental validation errors under a field (validated only if it changed)."""
+        errors = field_validation.check_rendered_field(field_name, field_config, value)
+        # Array and object editors render their own item-level feedback
+        if field_config.get('type') in ('array', 'object'):
+            return
+        for error in errors:
+            st.error(error)
 
     @staticmethod
     def collect_current_form_data(schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -655,7 +683,7 @@ class FormGenerator:
                     logger.info(f"[DEBUG collect_current_form_data] Key exists: {data_editor_key in st.session_state}")
                     
                     # DEBUG: Check for the actual DataFrame value that data_editor returns
-                    logger.info(f"[DEBUG collect_current_form_data] All session keys with '{field_name}': {[k for k in st.session_state.keys() if field_name in str(k)]}")
+                    logger.info(f"[DEBUG collect_current_form_data] Registered session keys for '{field_name}': {sorted(session_keys.keys_for(st.session_state, field_name))}")
                     
                     if data_editor_key in st.session_state:
                         editor_state = st.session_state.get(data_editor_key)
@@ -804,185 +832,77 @@ class FormGenerator:
     @staticmethod
     def _group_fields(fields: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Group fields by category for better organization."""
-        groups = {
-            "General": {},
-            "Financial": {},
-            "Address": {},
-            "Metadata": {},
-            "Other": {}
-        }
-        
-        # Define field categories
-        financial_fields = ['amount', 'price', 'cost', 'tax', 'total', 'subtotal', 'currency', 'payment']
-        address_fields = ['address', 'street', 'city', 'state', 'zip', 'postal', 'country']
-        metadata_fields = ['confidence', 'timestamp', 'created', 'modified', 'extraction', 'processing']
-        
+        groups: Dict[str, Dict[str, Any]] = {group: {} for group in render_plan.GROUP_ORDER}
         for field_name, field_config in fields.items():
-            field_lower = field_name.lower()
-            if any(fin in field_lower for fin in financial_fields):
-                groups["Financial"][field_name] = field_config
-            elif any(addr in field_lower for addr in address_fields):
-                groups["Address"][field_name] = field_config
-            elif any(meta in field_lower for meta in metadata_fields):
-                groups["Metadata"][field_name] = field_config
-            elif field_config.get('readonly', False):
-                groups["Metadata"][field_name] = field_config
-            else:
-                groups["General"][field_name] = field_config
-        
+            groups[render_plan.group_for(field_name, field_config)][field_name] = field_config
         return {k: v for k, v in groups.items() if v}
     
     @staticmethod
-    def _render_field(field_name: str, field_config: Dict[str, Any], current_value: Any) -> Any:
-        """Render a single form field based on its configuration."""
+    def _render_field(
+        field_name: str,
+        field_config: Dict[str, Any],
+        current_value: Any,
+        plan: Optional[render_plan.FieldPlan] = None
+    ) -> Any:
+        """
+        Render a single form field based on its configuration.
+        
+        Args:
+            field_name: Field name
+            field_config: Field configuration from schema
+            current_value: Value from the document, if any
+            plan: Precomputed field plan; built from field_config when omitted
+        """
         try:
-            field_type = field_config.get('type', 'string')
+            if plan is None:
+                plan = render_plan.build_field_plan(field_name, field_config)
             
             # Get form version for reset functionality
             form_version = st.session_state.get('form_version', 0)
             widget_key = f"field_{field_name}_v{form_version}"
+            session_keys.register(st.session_state, field_name, widget_key)
             
-            # Initialize widget kwargs
-            widget_kwargs = {
-                'key': widget_key,
-                'label': field_config.get('label', field_name),
-                'help': field_config.get('help', None),
-                'disabled': field_config.get('readonly', False)
-            }
-            
-            # First determine hydrated value from data or schema default
-            
-            if current_value is not None:
-                hydrated_value = current_value
-            elif 'default' in field_config:
-                hydrated_value = field_config['default']
-            elif field_config.get('required', False):
-                # Set type-specific defaults for required fields
-                if field_type == 'string':
-                    hydrated_value = ''
-                elif field_type in ['number', 'integer']:
-                    hydrated_value = 0
-                elif field_type == 'boolean':
-                    hydrated_value = False
-                elif field_type == 'enum' and 'choices' in field_config and field_config['choices']:
-                    hydrated_value = field_config['choices'][0]  # Use first enum choice as default
-                elif field_type == 'array':
-                    hydrated_value = []
-                elif field_type == 'object':
-                    hydrated_value = {}
-                else:
-                    hydrated_value = None
-            else:
-                hydrated_value = None
-            
-            # Parse date/datetime values if they're strings
-            if field_type == 'date' and hydrated_value is not None:
-                if isinstance(hydrated_value, str):
-                    try:
-                        from dateutil import parser
-                        hydrated_value = parser.parse(hydrated_value).date()
-                    except Exception as e:
-                        logger.warning(f"Failed to parse date string '{hydrated_value}': {e}")
-                        hydrated_value = None
-                elif isinstance(hydrated_value, datetime):
-                    hydrated_value = hydrated_value.date()
-            elif field_type == 'datetime' and hydrated_value is not None:
-                if isinstance(hydrated_value, str):
-                    try:
-                        from dateutil import parser
-                        hydrated_value = parser.parse(hydrated_value)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse datetime string '{hydrated_value}': {e}")
-                        hydrated_value = None
-                elif isinstance(hydrated_value, date) and not isinstance(hydrated_value, datetime):
-                    hydrated_value = datetime.combine(hydrated_value, datetime.min.time())
-                
-            # Handle session state
+            # Handle session state: hydrate from the document, else the schema default
             if widget_key not in st.session_state:
-                if isinstance(hydrated_value, list):
-                    st.session_state[widget_key] = hydrated_value.copy()
-                elif isinstance(hydrated_value, dict):
-                    st.session_state[widget_key] = hydrated_value.copy()
-                else:
-                    st.session_state[widget_key] = hydrated_value
+                hydrated_value = current_value if current_value is not None else plan.default
+                if hydrated_value is not None and plan.coerce is not None:
+                    hydrated_value = plan.coerce(hydrated_value)
+                if isinstance(hydrated_value, (list, dict)):
+                    hydrated_value = hydrated_value.copy()
+                st.session_state[widget_key] = hydrated_value
             
             session_value = st.session_state.get(widget_key)
             
-            if field_type == 'date' and isinstance(session_value, str):
-                try:
-                    from dateutil import parser
-                    session_value = parser.parse(session_value).date()
+            # Date widgets need date objects; normalize strings written by other code paths
+            if plan.coerce is not None and isinstance(session_value, str):
+                coerced = plan.coerce(session_value)
+                if coerced is not None:
+                    session_value = coerced
                     st.session_state[widget_key] = session_value
-                except Exception as e:
-                    logger.warning(f"Failed to normalize date string in session state for '{field_name}': {e}")
-            elif field_type == 'datetime' and isinstance(session_value, str):
-                try:
-                    from dateutil import parser
-                    session_value = parser.parse(session_value)
-                    st.session_state[widget_key] = session_value
-                except Exception as e:
-                    logger.warning(f"Failed to normalize datetime string in session state for '{field_name}': {e}")
             
-            widget_kwargs.pop('value', None)
-
-            value_to_use = session_value
-            
-            logger.debug(f"[_render_field] Field: {field_name}, Widget Key: {widget_key}, Value to Use: {value_to_use}, Session State Value: {st.session_state.get(widget_key)}")
-            
-            # Determine widget type
-            if field_type == 'string':
-                if field_config.get('format') == 'date':
-                    widget_type = 'date_input'
-                elif field_config.get('format') == 'date-time':
-                    widget_type = 'datetime_input'
-                elif field_config.get('maxLength', 0) > 100:
-                    widget_type = 'text_area'
-                else:
-                    widget_type = 'text_input'
-            elif field_type == 'date':
-                widget_type = 'date_input'
-            elif field_type == 'datetime':
-                widget_type = 'datetime_input'
-            elif field_type == 'enum':
-                widget_type = 'selectbox'
-            elif field_type == 'number':
-                widget_type = 'number_input'
-            elif field_type == 'boolean':
-                widget_type = 'checkbox'
-            elif field_type == 'array':
-                widget_type = 'array_editor'
-            elif field_type == 'object':
-                if field_config.get('format') == 'data-grid':
-                    widget_type = 'data_editor'
-                else:
-                    widget_type = 'json_editor'
-            else:
-                widget_type = 'text_input'
+            logger.debug(f"[_render_field] Field: {field_name}, Widget Key: {widget_key}, Value to Use: {session_value}")
             
-            # Render based on widget type
-            if widget_type == 'text_input':
-                return FormGenerator._render_text_input(field_name, field_config, widget_kwargs)
-            elif widget_type == 'text_area':
-                return FormGenerator._render_text_area(field_name, field_config, widget_kwargs)
-            elif widget_type == 'number_input':
-                return FormGenerator._render_number_input(field_name, field_config, widget_kwargs)
-            elif widget_type == 'selectbox':
-                return FormGenerator._render_selectbox(field_name, field_config, widget_kwargs)
-            elif widget_type == 'checkbox':
-                return FormGenerator._render_checkbox(field_name, field_config, widget_kwargs)
-            elif widget_type == 'date_input':
-                return FormGenerator._render_date_input(field_name, field_config, widget_kwargs)
-            elif widget_type == 'datetime_input':
-                return FormGenerator._render_datetime_input(field_name, field_config, widget_kwargs)
-            elif widget_type == 'array_editor':
-                return FormGenerator._render_array_editor(field_name, field_config, value_to_use or [])
-            elif widget_type == 'data_editor':
-                return FormGenerator._render_array_editor(field_name, field_config, value_to_use or [])
+            widget_type = plan.widget_type
+            if widget_type in render_plan.SIMPLE_WIDGETS or widget_type in ('date_input', 'datetime_input'):
+                widget_kwargs = dict(plan.widget_kwargs)
+                widget_kwargs.update(key=widget_key, on_change=field_validation.on_field_change, args=(field_name,))
+                
+                if widget_type == 'date_input':
+                    return FormGenerator._render_date_input(field_name, plan.config, widget_kwargs)
+                if widget_type == 'datetime_input':
+                    return FormGenerator._render_datetime_input(field_name, plan.config, widget_kwargs)
+                
+                value = getattr(st, widget_type)(**widget_kwargs)
+                if widget_type in ('text_input', 'text_area'):
+                    return value if value is not None else ""
+                return value
+            elif widget_type in ('array_editor', 'data_editor'):
+                return FormGenerator._render_array_editor(field_name, field_config, session_value or [], plan=plan)
             elif widget_type == 'json_editor':
-                return FormGenerator._render_object_editor(field_name, field_config, value_to_use or {})
+                return FormGenerator._render_object_editor(field_name, field_config, session_value or {}, plan=plan)
             else:
                 # Fallback to text input
-                return st.text_input(**widget_kwargs)
+                return st.text_input(key=widget_key, label=field_config.get('label', field_name))
         
         except Exception as e:
             st.error(f"Error rendering field {field_name}: {str(e)}")
@@ -992,104 +912,6 @@ class FormGenerator:
                 st.code(str(e))
             return current_value
     
-    @staticmethod
-    def _render_text_input(field_name: str, field_config: Dict[str, Any], kwargs: Dict[str, Any]) -> str:
-        """Render text input field."""
-        # Handle pattern validation display
-        if 'pattern' in field_config:
-            pattern = field_config['pattern']
-            if 'help' not in kwargs:
-                kwargs['help'] = f"Pattern: {pattern}"
-            else:
-                kwargs['help'] += f" | Pattern: {pattern}"
-        
-        # Remove value from kwargs since it's handled by session state
-        kwargs.pop('value', None)
-        
-        value = st.text_input(**kwargs)
-        
-        # Show validation feedback
-        if value and 'pattern' in field_config:
-            import re
-            if not re.match(field_config['pattern'], value):
-                st.error(f"Value doesn't match required pattern: {field_config['pattern']}")
-        
-        return value if value is not None else ""
-    
-    @staticmethod
-    def _render_text_area(field_name: str, field_config: Dict[str, Any], kwargs: Dict[str, Any]) -> str:
-        """Render text area field."""
-        kwargs['height'] = 100  # Default height
-        
-        # Remove value from kwargs since it's handled by session state
-        kwargs.pop('value', None)
-            
-        value = st.text_area(**kwargs)
-        return value if value is not None else ""
-    
-    @staticmethod
-    def _render_number_input(field_name: str, field_config: Dict[str, Any], kwargs: Dict[str, Any]) -> Union[int, float]:
-        """Render number input field."""
-        field_type = field_config.get('type', 'number')
-        
-        # Ensure all numeric parameters are of the same type
-        if field_type == 'integer':
-            kwargs['step'] = 1
-            kwargs['format'] = "%d"
-            # Convert min/max values to int if present
-            if 'min_value' in kwargs and kwargs['min_value'] is not None:
-                kwargs['min_value'] = int(kwargs['min_value'])
-            if 'max_value' in kwargs and kwargs['max_value'] is not None:
-                kwargs['max_value'] = int(kwargs['max_value'])
-            if 'value' in kwargs and kwargs['value'] is not None:
-                kwargs['value'] = int(kwargs['value'])
-        else:
-            if 'step' not in kwargs:
-                kwargs['step'] = 0.01
-            kwargs['format'] = "%.2f"
-            # Convert min/max values to float if present
-            if 'min_value' in kwargs and kwargs['min_value'] is not None:
-                kwargs['min_value'] = float(kwargs['min_value'])
-            if 'max_value' in kwargs and kwargs['max_value'] is not None:
-                kwargs['max_value'] = float(kwargs['max_value'])
-            if 'value' in kwargs and kwargs['value'] is not None:
-                kwargs['value'] = float(kwargs['value'])
-            if 'step' in kwargs:
-                kwargs['step'] = float(kwargs['step'])
-        
-        # Remove value from kwargs since it's handled by session state
-        kwargs.pop('value', None)
-        
-        return st.number_input(**kwargs)
-    
-    @staticmethod
-    def _render_selectbox(field_name: str, field_config: Dict[str, Any], kwargs: Dict[str, Any]) -> Any:
-        """Render selectbox field."""
-        if field_config.get('type') == 'enum' and 'choices' in field_config:
-            kwargs['options'] = field_config['choices']
-            
-            # Handle optional enums
-            if not field_config.get('required', False):
-                kwargs['options'] = [None] + list(kwargs['options'])
-                kwargs['format_func'] = lambda x: "-- Select --" if x is None else str(x)
-        
-        # Remove value from kwargs since it's handled by session state
-        kwargs.pop('value', None)
-        
-        return st.selectbox(**kwargs)
-    
-    @staticmethod
-    def _render_checkbox(field_name: str, field_config: Dict[str, Any], kwargs: Dict[str, Any]) -> bool:
-        """Render checkbox field."""
-        # Convert value to boolean if needed
-        if 'value' in kwargs and not isinstance(kwargs['value'], bool):
-            kwargs['value'] = bool(kwargs['value'])
-        
-        # Remove value from kwargs since it's handled by session state
-        kwargs.pop('value', None)
-        
-        return st.checkbox(**kwargs)
-    
     @staticmethod
     def _render_date_input(field_name: str, field_config: Dict[str, Any], kwargs: Dict[str, Any]) -> Optional[str]:
         """Render date input field and return as string."""
@@ -1141,12 +963,16 @@ class FormGenerator:
         elif not isinstance(current_dt, datetime):
             current_dt = datetime.now()
         
+        session_keys.register(st.session_state, field_name, f"{kwargs['key']}_date", f"{kwargs['key']}_time")
+        
         with col1:
             date_part = st.date_input(
                 f"{kwargs.get('label', field_name)} (Date)",
                 value=current_dt.date(),
                 key=f"{kwargs['key']}_date",
-                disabled=kwargs.get('disabled', False)
+                disabled=kwargs.get('disabled', False),
+                on_change=kwargs.get('on_change'),
+                args=kwargs.get('args')
             )
         
         with col2:
@@ -1154,7 +980,9 @@ class FormGenerator:
                 f"{kwargs.get('label', field_name)} (Time)",
                 value=current_dt.time(),
                 key=f"{kwargs['key']}_time",
-                disabled=kwargs.get('disabled', False)
+                disabled=kwargs.get('disabled', False),
+                on_change=kwargs.get('on_change'),
+                args=kwargs.get('args')
             )
         
         # Convert datetime to ISO format string for JSON serialization and comparison
@@ -1162,8 +990,17 @@ class FormGenerator:
         return combined_dt.isoformat()
     
     @staticmethod
-    def _render_array_editor(field_name: str, field_config: Dict[str, Any], current_value: Any) -> List[Any]:
+    def _render_array_editor(
+        field_name: str,
+        field_config: Dict[str, Any],
+        current_value: Any,
+        plan: Optional[render_plan.FieldPlan] = None
+    ) -> List[Any]:
         """Enhanced array editor that delegates to specialized editors based on array type."""
+        # Arrays streamed from oversized documents are edited a page at a time
+        if isinstance(current_value, LazyJsonArray):
+            return FormGenerator._render_paged_array_editor(field_name, field_config, current_value, plan=plan)
+        
         # Convert current value to list if needed
         if not current_value or not isinstance(current_value, list):
             current_value = []
@@ -1174,11 +1011,123 @@ class FormGenerator:
         
         if item_type == 'object' and 'properties' in items_config:
             # Object array - use enhanced object array editor
-            return FormGenerator._render_object_array_editor(field_name, field_config, current_value)
+            return FormGenerator._render_object_array_editor(field_name, field_config, current_value, plan=plan)
         else:
             # Scalar array - use enhanced scalar array editor
             return FormGenerator._render_scalar_array_editor(field_name, field_config, current_value)
     
+    @staticmethod
+    def _render_paged_array_editor(
+        field_name: str,
+        field_config: Dict[str, Any],
+        current_value: LazyJsonArray,
+        plan: Optional[render_plan.FieldPlan] = None
+    ) -> LazyJsonArray:
+        """
+        Render a large streamed array one page at a time.
+        
+        Only the selected page is decoded and handed to st.data_editor; edits are
+        layered onto the LazyJsonArray with with_rows so the full array is never
+        materialized while editing. Rows cannot be added or removed in this mode.
+        """
+        import pandas as pd
+        
+        form_version = st.session_state.get('form_version', 0)
+        field_key = f"field_{field_name}_v{form_version}"
+        array_key = f'array_{field_name}_v{form_version}'
+        
+        items_config = field_config.get("items", {})
+        properties = items_config.get("properties", {})
+        is_object_array = items_config.get('type') == 'object' and bool(properties)
+        
+        session_keys.register(st.session_state, field_name, field_key, array_key, f'page_{array_key}')
+        if not isinstance(st.session_state.get(array_key), LazyJsonArray):
+            st.session_state[array_key] = current_value
+        paged_array: LazyJsonArray = st.session_state[array_key]
+        
+        with st.container():
+            st.markdown(f"**{field_config.get('label', field_name)}**")
+            if field_config.get('help'):
+                st.caption(field_config['help'])
+            
+            page_count = max(1, paged_array.page_count)
+            page_number = st.number_input(
+                f"Page (1-{page_count})",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                step=1,
+                key=f'page_{array_key}'
+            ) - 1
+            start, end = paged_array.page_bounds(page_number)
+            st.caption(
+                f"Showing rows {start + 1}-{end} of {len(paged_array):,}. "
+                "Large array: rows load on demand and cannot be added or removed here."
+            )
+            
+            rows = paged_array.page(page_number)
+            if is_object_array:
+                column_order: List[str] = list(properties.keys())
+                for obj in rows:
+                    if isinstance(obj, dict):
+                        column_order.extend(k for k in obj.keys() if k not in column_order)
+                df = pd.DataFrame(rows).reindex(columns=column_order)
+                if plan is not None and plan.column_config is not None:
+                    column_config = dict(plan.column_config)
+                else:
+                    column_config = FormGenerator._generate_column_config(properties)
+            else:
+                df = pd.DataFrame({"value": rows})
+                column_config = None
+            df.index = range(start, end)
+            
+            page_editor_key = f"data_editor_{field_name}_p{page_number}_v{form_version}"
+            session_keys.register(st.session_state, field_name, page_editor_key)
+            edited_df = st.data_editor(
+                df,
+                column_config=column_config,
+                num_rows="fixed",
+                width='stretch',
+                key=page_editor_key,
+            )
+            
+            if is_object_array:
+                edited_rows = FormGenerator._clean_object_array(edited_df.to_dict('records'), properties)
+            else:
+                edited_rows = [None if pd.isna(v) else v for v in edited_df["value"].tolist()]
+            
+            # Take only the cells in the editor's delta: the DataFrame round trip adds None
+            # for keys a row lacks and turns ints into floats in columns with gaps
+            editor_state = st.session_state.get(page_editor_key)
+            edited_cells = (editor_state.get('edited_rows') or {}) if isinstance(editor_state, dict) else {}
+            page_rows = list(rows)
+            for row_key, cells in edited_cells.items():
+                position = FormGenerator._parse_editor_row_index(row_key)
+                if position is None or not 0 <= position < len(rows):
+                    continue
+                if is_object_array:
+                    row = dict(rows[position]) if isinstance(rows[position], dict) else {}
+                    row.update({column: edited_rows[position].get(column) for column in cells})
+                else:
+                    row = edited_rows[position]
+                if row != rows[position]:
+                    page_rows[position] = row
+                    paged_array = paged_array.with_rows(start + position, [row])
+            if page_rows != rows:
+                st.session_state[array_key] = paged_array
+            
+            if is_object_array:
+                validation_errors = FormGenerator._validate_object_array(field_name, page_rows, items_config)
+            else:
+                validation_errors = FormGenerator._validate_scalar_array(field_name, page_rows, items_config)
+            
+            if validation_errors:
+                for error in validation_errors:
+                    st.error(f"Page {page_number + 1}: {error}")
+        
+        st.session_state[field_key] = paged_array
+        return paged_array
+    
     @staticmethod
     def _render_scalar_array_editor(field_name: str, field_config: Dict[str, Any], current_value: List[Any]) -> List[Any]:
         """
@@ -1192,6 +1141,8 @@ class FormGenerator:
         items_config = field_config.get("items", {})
         item_type = items_config.get("type", "string")
         
+        session_keys.register(st.session_state, field_name, array_key)
+        
         # Initialize if needed
         if array_key not in st.session_state:
             st.session_state[array_key] = [
@@ -1220,6 +1171,7 @@ class FormGenerator:
             col1, col2 = st.columns([5, 1])
             with col1:
                 item_key = f'{array_key}_item_{i}'
+                session_keys.register(st.session_state, field_name, item_key)
                 if item_key not in st.session_state:
                     st.session_state[item_key] = FormGenerator._coerce_scalar_value(item_type, item, items_config)
                 
@@ -1265,11 +1217,10 @@ class FormGenerator:
                     
                     # Clear all existing item keys
                     keys_to_delete = [
-                        key for key in list(st.session_state.keys())
-                        if str(key).startswith(f'{array_key}_item_')
+                        key for key in session_keys.keys_for(st.session_state, field_name)
+                        if key.startswith(f'{array_key}_item_')
                     ]
-                    for key in keys_to_delete:
-                        del st.session_state[key]
+                    session_keys.forget(st.session_state, field_name, keys_to_delete)
                     
                     st.rerun()
         
@@ -1490,61 +1441,37 @@ class FormGenerator:
         return raw_value
     
     @staticmethod
-    def _render_object_array_editor(field_name: str, field_config: Dict[str, Any], current_value: List[Any]) -> List[Any]:
+    def _render_object_array_editor(
+        field_name: str,
+        field_config: Dict[str, Any],
+        current_value: List[Any],
+        plan: Optional[render_plan.FieldPlan] = None
+    ) -> List[Any]:
         """
         Streamlined object array editor that relies on Streamlit's native data_editor controls
         for adding and removing rows while preserving production validation and state sync.
-        """
-        import pandas as pd
         
+        The rows live in an ObjectArrayBuffer (a DataFrame kept for the whole edit session),
+        so the table is not rebuilt from dicts on every rerun and is converted back to rows
+        and revalidated only when it changed.
+        """
         # Get form version for reset functionality
         form_version = st.session_state.get('form_version', 0)
         
         items_config = field_config.get("items", {})
         properties = items_config.get("properties", {})
+        field_plan = render_plan.build_field_plan(field_name, field_config) if plan is None else plan
         
-        working_array = list(current_value or [])
-
-        # Prepare DataFrame for data_editor, ensuring consistent column ordering
-        column_order: List[str] = list(properties.keys())
-        for obj in working_array:
-            for key in obj.keys():
-                if key not in column_order:
-                    column_order.append(key)
-
-        if working_array:
-            df = pd.DataFrame(working_array)
-            if column_order:
-                df = df.reindex(columns=column_order)
-        else:
-            df = pd.DataFrame(columns=pd.Index(column_order))
-
-        for column_name, prop_config in properties.items():
-            if prop_config.get("type") == "date" and column_name in df.columns:
-                df[column_name] = pd.to_datetime(df[column_name], errors="coerce")
-
-        column_config = FormGenerator._generate_column_config(properties)
-        
-        # Initialize versioned array in session state if needed
+        # Initialize the versioned buffer once per edit session (and per reset)
         array_key = f'array_{field_name}_v{form_version}'
-        if array_key not in st.session_state:
-            st.session_state[array_key] = working_array.copy()
-        
-        # Get current items from session state
-        current_items = st.session_state[array_key]
+        buffer = st.session_state.get(array_key)
+        if not isinstance(buffer, ObjectArrayBuffer):
+            buffer = ObjectArrayBuffer(list(current_value or []), properties, list(field_plan.column_order))
+            st.session_state[array_key] = buffer
         
-        # Default row for adding new items
-        default_row = {}
-        for prop_name, prop_config in properties.items():
-            prop_type = prop_config.get('type', 'string')
-            if prop_type == 'string':
-                default_row[prop_name] = "New Item"
-            elif prop_type in ['number', 'integer']:
-                default_row[prop_name] = 1
-            elif prop_type == 'boolean':
-                default_row[prop_name] = False
-            else:
-                default_row[prop_name] = None
+        column_config = dict(field_plan.column_config or {})
+        editor_key = f"data_editor_{field_name}_v{form_version}"
+        session_keys.register(st.session_state, field_name, array_key, editor_key)
 
         with st.container():
             label = field_config.get('label', field_name)
@@ -1557,72 +1484,42 @@ class FormGenerator:
             col1, col2 = st.columns([1, 1])
             with col1:
                 if st.button("➕ Add Row", key=f'add_{array_key}'):
-                    st.session_state[array_key].append(default_row.copy())
+                    buffer.add_row(dict(field_plan.default_row or {}))
                     st.rerun()
             with col2:
-                if len(current_items) > 0:
+                if len(buffer) > 0:
                     if st.button("🗑️ Delete Last Row", key=f'delete_{array_key}'):
-                        st.session_state[array_key].pop()
+                        buffer.delete_last_row()
                         st.rerun()
             
             st.caption("Edit cells directly. Use the buttons above to add/remove rows.")
 
-            # Create DataFrame from current items
-            if current_items:
-                df = pd.DataFrame(current_items)
-                if column_order:
-                    df = df.reindex(columns=column_order)
-            else:
-                df = pd.DataFrame(columns=pd.Index(column_order))
-
             edited_df = st.data_editor(
-                df,
+                buffer.frame,
                 column_config=column_config,
                 num_rows="fixed",  # Use manual buttons instead of dynamic
                 width='stretch',
-                key=f"data_editor_{field_name}_v{form_version}",
-                hide_index=True
-            )
-            try:
-                first_quantity = edited_df.iloc[0]["Quantity"] if not edited_df.empty else None
-            except Exception:
-                first_quantity = None
-            logger.debug(
-                "[_render_object_array_editor] data_editor df first quantity=%s",
-                first_quantity,
+                key=editor_key,
+                hide_index=True,
+                on_change=field_validation.on_field_change,
+                args=(field_name,)
             )
             FormGenerator._display_data_editor_debug(field_name, edited_df)
 
-            # CRITICAL: Store edited DataFrame in a separate key for data collection
-            # This is read during data collection, NOT used to update the source array
-            st.session_state[f'{array_key}_current'] = edited_df
+            # Keep the edited frame; rows are rebuilt only when the editor's delta changed
+            if buffer.record_edits(edited_df, st.session_state.get(editor_key)):
+                logger.debug(f"[_render_object_array_editor] {field_name} edited ({len(buffer)} rows)")
             
-            # Convert DataFrame to records for validation display
-            if hasattr(edited_df, 'to_dict'):
-                try:
-                    # Convert DataFrame directly to records - this contains the edited values
-                    editor_records = edited_df.to_dict('records')
-                    logger.info(f"[DEBUG _render_object_array_editor] Converted DataFrame: {len(editor_records)} records")
-                    if editor_records:
-                        logger.info(f"[DEBUG _render_object_array_editor] First record: {editor_records[0]}")
-                    
-                    # Clean the records for validation
-                    working_array = FormGenerator._clean_object_array(editor_records, properties)
-                    
-                    logger.info(
-                        "[DEBUG _render_object_array_editor] Cleaned %s: %d rows; first=%s",
-                        field_name,
-                        len(working_array),
-                        working_array[0] if working_array else None,
-                    )
-                except Exception as e:
-                    logger.error(f"[DEBUG _render_object_array_editor] Error converting DataFrame: {e}")
-                    working_array = list(current_items or [])
-            else:
-                logger.warning(f"[DEBUG _render_object_array_editor] edited_df is not a DataFrame: {type(edited_df)}")
-                working_array = list(current_items or [])
+            try:
+                working_array = buffer.to_records(FormGenerator._clean_object_array)
+            except Exception as e:
+                logger.error(f"[_render_object_array_editor] Error converting {field_name} rows: {e}")
+                working_array = list(current_value or [])
 
-            validation_errors = FormGenerator._validate_object_array(field_name, working_array, items_config)
+            validation_errors = buffer.cached(
+                'errors',
+                lambda: FormGenerator._validate_object_array(field_name, working_array, items_config)
+            )
             if validation_errors:
                 for error in validation_errors:
                     st.error(error)
@@ -1632,7 +1529,12 @@ class FormGenerator:
         return working_array
     
     @staticmethod
-    def _render_object_editor(field_name: str, field_config: Dict[str, Any], current_value: Any) -> Dict[str, Any]:
+    def _render_object_editor(
+        field_name: str,
+        field_config: Dict[str, Any],
+        current_value: Any,
+        plan: Optional[render_plan.FieldPlan] = None
+    ) -> Dict[str, Any]:
         """Render object editor for nested objects."""
         st.write(f"**{field_config.get('label', field_name)}**")
         
@@ -1643,14 +1545,17 @@ class FormGenerator:
             if not current_value or not isinstance(current_value, dict):
                 current_value = {}
             
+            if plan is None:
+                plan = render_plan.build_field_plan(field_name, field_config)
             nested_data = {}
             
             with st.container():
-                for prop_name, prop_config in properties.items():
+                for prop_name, prop_plan in zip(properties, plan.nested):
                     prop_value = FormGenerator._render_field(
-                        f"{field_name}_{prop_name}",
-                        prop_config,
-                        current_value.get(prop_name)
+                        prop_plan.name,
+                        prop_plan.config,
+                        current_value.get(prop_name),
+                        plan=prop_plan
                     )
                     nested_data[prop_name] = prop_value
             
@@ -1671,65 +1576,12 @@ class FormGenerator:
                 st.error("Invalid JSON format")
                 return current_value or {}
     
-    # Removed _validate_form_data as validation now uses SubmissionHandler._validate_submission_data
+    # Removed _validate_form_data as validation now uses SubmissionHandler.validate_submission
     
     @staticmethod
     def _validate_field_value(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate a single field value."""
-        errors = []
-        
-        # Check required fields
-        if field_config.get('required', False) and (value is None or value == ''):
-            errors.append(f"Field '{field_config.get('label', field_name)}' is required")
-            return errors
-        
-        # Skip validation for empty optional fields
-        if value is None or value == '':
-            return errors
-        
-        field_type = field_config.get('type', 'string')
-        
-        # Type-specific validation
-        if field_type == 'string':
-            if not isinstance(value, str):
-                errors.append(f"Field '{field_name}' must be text")
-            else:
-                # Length validation
-                min_length = field_config.get('min_length')
-                max_length = field_config.get('max_length')
-                
-                if min_length and len(value) < min_length:
-                    errors.append(f"Field '{field_name}' must be at least {min_length} characters")
-                
-                if max_length and len(value) > max_length:
-                    errors.append(f"Field '{field_name}' must be at most {max_length} characters")
-                
-                # Pattern validation
-                pattern = field_config.get('pattern')
-                if pattern:
-                    import re
-                    if not re.match(pattern, value):
-                        errors.append(f"Field '{field_name}' format is invalid")
-        
-        elif field_type in ['number', 'integer', 'float']:
-            if not isinstance(value, (int, float)):
-                errors.append(f"Field '{field_name}' must be a number")
-            else:
-                min_value = field_config.get('min_value')
-                max_value = field_config.get('max_value')
-                
-                if min_value is not None and value < min_value:
-                    errors.append(f"Field '{field_name}' must be at least {min_value}")
-                
-                if max_value is not None and value > max_value:
-                    errors.append(f"Field '{field_name}' must be at most {max_value}")
-        
-        elif field_type == 'enum':
-            choices = field_config.get('choices', [])
-            if value not in choices:
-                errors.append(f"Field '{field_name}' must be one of: {', '.join(map(str, choices))}")
-        
-        return errors
+        return vc.get_validator(vc.build_form_field, field_config)(field_name, value)
     
     @staticmethod
     def _get_default_value_for_type(item_type: str, items_config: Dict[str, Any]) -> Any:
@@ -1911,160 +1763,22 @@ class FormGenerator:
             return errors
         
         item_type = items_config.get("type", "string")
+        validate_item = vc.get_validator(vc.build_form_scalar, items_config, item_type)
         
         for i, item_value in enumerate(array_value):
-            item_errors = FormGenerator._validate_scalar_item(f"{field_name}[{i}]", item_value, item_type, items_config)
-            errors.extend(item_errors)
+            errors.extend(validate_item(f"{field_name}[{i}]", item_value))
         
         return errors
     
     @staticmethod
     def _validate_scalar_item(field_path: str, value: Any, item_type: str, items_config: Dict[str, Any]) -> List[str]:
         """Validate a single scalar array item with contextual error messages."""
-        errors = []
-        
-        # Type validation
-        if item_type == "string":
-            if not isinstance(value, str):
-                errors.append(f"{field_path} must be a string")
-                return errors
-            
-            # Length constraints
-            min_length = items_config.get("min_length")
-            if min_length is not None and len(value) < min_length:
-                errors.append(f"{field_path} must be at least {min_length} characters")
-            
-            max_length = items_config.get("max_length")
-            if max_length is not None and len(value) > max_length:
-                errors.append(f"{field_path} must be no more than {max_length} characters")
-            
-            # Pattern validation
-            pattern = items_config.get("pattern")
-            if pattern:
-                import re
-                try:
-                    if not re.match(pattern, value):
-                        errors.append(f"{field_path} must match pattern: {pattern}")
-                except re.error:
-                    errors.append(f"{field_path} has invalid pattern: {pattern}")
-        
-        elif item_type == "number":
-            try:
-                num_value = float(value)
-            except (ValueError, TypeError):
-                errors.append(f"{field_path} must be a valid number")
-                return errors
-            
-            min_value = items_config.get("min_value")
-            if min_value is not None and num_value < min_value:
-                errors.append(f"{field_path} must be at least {min_value}")
-            
-            max_value = items_config.get("max_value")
-            if max_value is not None and num_value > max_value:
-                errors.append(f"{field_path} must be no more than {max_value}")
-        
-        elif item_type == "integer":
-            try:
-                int_value = int(value)
-            except (ValueError, TypeError):
-                errors.append(f"{field_path} must be a valid integer")
-                return errors
-            
-            min_value = items_config.get("min_value")
-            if min_value is not None and int_value < min_value:
-                errors.append(f"{field_path} must be at least {min_value}")
-            
-            max_value = items_config.get("max_value")
-            if max_value is not None and int_value > max_value:
-                errors.append(f"{field_path} must be no more than {max_value}")
-        
-        elif item_type == "boolean":
-            if not isinstance(value, bool):
-                errors.append(f"{field_path} must be a boolean")
-        
-        elif item_type == "date":
-            if isinstance(value, str):
-                try:
-                    datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    errors.append(f"{field_path} must be a valid date in YYYY-MM-DD format")
-            elif not isinstance(value, date):
-                errors.append(f"{field_path} must be a valid date")
-        
-        elif item_type == "enum":
-            choices = items_config.get("choices", [])
-            if choices and value not in choices:
-                errors.append(f"{field_path} must be one of: {', '.join(map(str, choices))}")
-        
-        return errors
+        return vc.get_validator(vc.build_form_scalar, items_config, item_type)(field_path, value)
     
     @staticmethod
     def _generate_column_config(properties: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Generate column configuration for st.data_editor based on object properties"""
-        column_config = {}
-        
-        for prop_name, prop_config in properties.items():
-            prop_type = prop_config.get("type", "string")
-            label = prop_config.get("label", prop_name)
-            help_text = prop_config.get("help", "")
-            required = prop_config.get("required", False)
-            
-            if prop_type == "string":
-                column_config[prop_name] = st.column_config.TextColumn(
-                    label=label,
-                    help=help_text,
-                    required=required,
-                    max_chars=prop_config.get("max_length", None)
-                )
-            elif prop_type == "number":
-                column_config[prop_name] = st.column_config.NumberColumn(
-                    label=label,
-                    help=help_text,
-                    required=required,
-                    min_value=prop_config.get("min_value", None),
-                    max_value=prop_config.get("max_value", None),
-                    step=prop_config.get("step", 0.01),
-                    format="%.2f"
-                )
-            elif prop_type == "integer":
-                column_config[prop_name] = st.column_config.NumberColumn(
-                    label=label,
-                    help=help_text,
-                    required=required,
-                    min_value=prop_config.get("min_value", None),
-                    max_value=prop_config.get("max_value", None),
-                    step=prop_config.get("step", 1),
-                    format="%d"
-                )
-            elif prop_type == "boolean":
-                column_config[prop_name] = st.column_config.CheckboxColumn(
-                    label=label,
-                    help=help_text,
-                    required=required
-                )
-            elif prop_type == "date":
-                column_config[prop_name] = st.column_config.DateColumn(
-                    label=label,
-                    help=help_text,
-                    required=required
-                )
-            elif prop_type == "enum":
-                column_config[prop_name] = st.column_config.SelectboxColumn(
-                    label=label,
-                    help=help_text,
-                    required=required,
-                    options=prop_config.get("choices", []),
-                    default=prop_config.get("default")
-                )
-            else:
-                # Default to text column
-                column_config[prop_name] = st.column_config.TextColumn(
-                    label=label,
-                    help=help_text,
-                    required=required
-                )
-        
-        return column_config
+        return render_plan.build_column_config(properties)
     
     @staticmethod
     def _create_default_object(properties: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
@@ -2134,38 +1848,17 @@ class FormGenerator:
         """Validate object array according to schema constraints"""
         errors = []
         properties = items_config.get("properties", {})
+        validate_item = vc.get_validator(vc.build_form_object_item, properties)
         
         for i, obj in enumerate(array_value):
-            obj_errors = FormGenerator._validate_object_item(f"{field_name}[{i}]", obj, properties)
-            errors.extend(obj_errors)
+            errors.extend(validate_item(f"{field_name}[{i}]", obj))
         
         return errors
     
     @staticmethod
     def _validate_object_item(item_path: str, obj: Dict[str, Any], properties: Dict[str, Dict[str, Any]]) -> List[str]:
         """Validate individual object in array"""
-        errors = []
-        
-        # Check required properties
-        for prop_name, prop_config in properties.items():
-            required = prop_config.get("required", False)
-            prop_type = prop_config.get("type", "string")
-            
-            if required and (prop_name not in obj or obj[prop_name] is None or obj[prop_name] == ""):
-                errors.append(f"{item_path}.{prop_name}: is required")
-                continue
-            
-            # Skip validation if property is not present or is None/empty (for optional fields)
-            if prop_name not in obj or obj[prop_name] is None:
-                continue
-            
-            value = obj[prop_name]
-            
-            # Validate property value
-            prop_errors = FormGenerator._validate_scalar_item(f"{item_path}.{prop_name}", value, prop_type, prop_config)
-            errors.extend(prop_errors)
-        
-        return errors
+        return vc.get_validator(vc.build_form_object_item, properties)(item_path, obj)
 
 
 # Convenience functions
@@ -0,0 +1,180 @@
+"""
+Immutable, structurally shared document snapshots for JSON QA webapp.
+The edit session keeps the document twice (original_data and form_data). Instead of
+deep-copying it for each, both are frozen: dicts and lists become read-only
+FrozenDict/FrozenList containers that can be shared safely. Freezing the form data
+against the original reuses every unchanged subtree, and updates copy only the path
+to the changed value, so an edit session holds one copy of the document plus the edits.
+"""
+
+import logging
+from datetime import date, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Leaf types that are immutable and can be shared between snapshots when equal
+_SHAREABLE_LEAVES = (str, int, float, bool, Decimal, date, time)
+
+_MISSING = object()
+
+
+def _refuse(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable; use frozen_doc.assoc() or thaw() to change it")
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict. It is a real dict, so json, pandas and isinstance(x, dict)
+    checks work unchanged; only mutation is refused.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _refuse
+    clear = pop = popitem = setdefault = update = _refuse
+
+    def __copy__(self) -> Dict[str, Any]:
+        # A shallow copy is meant to be changed by the caller
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """Read-only list; see FrozenDict."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+    append = clear = extend = insert = pop = remove = reverse = sort = _refuse
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list.__repr__(self)})"
+
+
+def is_frozen(value: Any) -> bool:
+    """Return True if value is a frozen container."""
+    return isinstance(value, (FrozenDict, FrozenList))
+
+
+def freeze(value: Any, share_with: Any = None) -> Any:
+    """
+    Return a frozen snapshot of a JSON-like value.
+
+    Frozen containers are returned as is. When ``share_with`` is a frozen snapshot
+    (typically the original document), every subtree of ``value`` that equals the
+    corresponding subtree of ``share_with`` (same types, same content) is taken from
+    it instead of being copied, so both snapshots share it.
+
+    Args:
+        value: Plain or frozen data (dicts, lists, scalars; other objects are kept as is)
+        share_with: Earlier snapshot to share unchanged subtrees with
+
+    Returns:
+        Frozen value
+    """
+    if is_frozen(value):
+        return value
+    if isinstance(value, dict):
+        base = share_with if isinstance(share_with, FrozenDict) else None
+        items = {}
+        shared = base is not None and len(base) == len(value)
+        for key, item in value.items():
+            base_item = base.get(key, _MISSING) if base is not None else _MISSING
+            frozen = freeze(item, None if base_item is _MISSING else base_item)
+            if base_item is _MISSING or frozen is not base_item:
+                shared = False
+            items[key] = frozen
+        return base if shared else FrozenDict(items)
+    if isinstance(value, list):
+        base = share_with if isinstance(share_with, FrozenList) else None
+        items = []
+        shared = base is not None and len(base) == len(value)
+        for index, item in enumerate(value):
+            base_item = base[index] if base is not None and index < len(base) else _MISSING
+            frozen = freeze(item, None if base_item is _MISSING else base_item)
+            if base_item is _MISSING or frozen is not base_item:
+                shared = False
+            items.append(frozen)
+        return base if shared else FrozenList(items)
+    if (share_with is not None and type(value) is type(share_with)
+            and isinstance(value, _SHAREABLE_LEAVES) and value == share_with):
+        return share_with
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a plain, mutable deep copy of a (possibly frozen) JSON-like value."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def assoc(doc: Any, path: Sequence[Any], value: Any) -> Any:
+    """
+    Return a snapshot of ``doc`` with the value at ``path`` replaced.
+
+    Only the containers along the path are copied; all other subtrees are shared
+    with ``doc``. Dict keys that do not exist yet are added.
+
+    Args:
+        doc: Frozen (or plain) document
+        path: Keys and list indices leading to the value
+        value: New value
+
+    Returns:
+        New frozen snapshot
+    """
+    if not path:
+        return freeze(value)
+    head, rest = path[0], path[1:]
+    if isinstance(doc, list):
+        items = list(doc)
+        items[head] = assoc(items[head], rest, value)
+        return FrozenList(freeze(item) for item in items)
+    items = dict(doc or {})
+    items[head] = assoc(items.get(head), rest, value)
+    return FrozenDict({key: freeze(item) for key, item in items.items()})
+
+
+def shared_fraction(a: Any, b: Any) -> float:
+    """
+    Return the fraction of ``b``'s containers that are shared with ``a`` (for benchmarks).
+    """
+    seen_a = set(_container_ids(a))
+    ids_b = list(_container_ids(b))
+    if not ids_b:
+        return 1.0
+    return sum(1 for ident in ids_b if ident in seen_a) / len(ids_b)
+
+
+def _container_ids(value: Any) -> Iterable[int]:
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield id(current)
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            yield id(current)
+            stack.extend(current)
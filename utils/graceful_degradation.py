@@ -15,7 +15,8 @@ from .directory_exceptions import (
     DirectoryConfigError, ConfigurationLoadError, DirectoryValidationError,
     DirectoryCreationError, DirectoryPermissionError
 )
-from .config_loader import get_default_config, load_config
+from .config_loader import get_default_config
+from .config_service import get_config_service
 from .directory_validator import DirectoryValidator, ValidationResult
 from .directory_creator import DirectoryCreator, CreationResult
 
@@ -373,12 +374,15 @@ class GracefulDegradationManager:
         return guidance
 
 
-def apply_graceful_degradation(config_error: Optional[Exception] = None) -> DirectoryConfig:
+def apply_graceful_degradation(config_error: Optional[Exception] = None,
+                               raw_config: Optional[Dict[str, Any]] = None) -> DirectoryConfig:
     """
     Apply graceful degradation for directory configuration.
     
     Args:
         config_error: Optional configuration error that triggered degradation
+        raw_config: Configuration the caller already loaded; config.yaml is
+            re-read when None
         
     Returns:
         DirectoryConfig instance with fallbacks applied as needed
@@ -391,7 +395,9 @@ def apply_graceful_degradation(config_error: Optional[Exception] = None) -> Dire
             config = manager.handle_configuration_failure(config_error)
         else:
             try:
-                raw_config = load_config()
+                # Initialization reads config.yaml afresh rather than the last snapshot
+                if raw_config is None:
+                    raw_config = get_config_service().reload().data
                 config = DirectoryConfig.from_config(raw_config)
             except Exception as e:
                 config = manager.handle_configuration_failure(e)
@@ -0,0 +1,441 @@
+"""
+Streaming JSON loading utilities for the JSON QA webapp.
+Reads large documents incrementally, decoding only the requested top-level
+fields and exposing large arrays as lazily paged sequences.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from disk per refill while scanning
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Arrays with more items than this are returned as LazyJsonArray
+DEFAULT_LAZY_ARRAY_THRESHOLD = 1000
+
+# Rows decoded per page of a LazyJsonArray
+DEFAULT_PAGE_SIZE = 100
+
+# Decoded pages kept in memory per LazyJsonArray
+DEFAULT_CACHED_PAGES = 4
+
+_STRUCTURAL_RE = re.compile(rb'["\[\]{}]')
+_STRING_SPECIAL_RE = re.compile(rb'["\\]')
+_SCALAR_RE = re.compile(rb'[^,\]}\s]*')
+_WHITESPACE_RE = re.compile(rb'[ \t\r\n]*')
+
+
+class JsonStreamError(ValueError):
+    """Raised when a document cannot be scanned as a JSON object."""
+
+
+class StreamedDocument(dict):
+    """
+    Top-level JSON object produced by the streaming loader.
+
+    Behaves like a normal dict; `skipped_fields` lists top-level keys present
+    in the file that were not decoded because they were not requested.
+    """
+
+    def __init__(self, *args, skipped_fields: Optional[List[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.skipped_fields: List[str] = list(skipped_fields or [])
+
+
+class _ByteScanner:
+    """Incremental scanner that locates JSON value boundaries without decoding them."""
+
+    def __init__(self, handle, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buf = b""
+        self._pos = 0
+        self._base = 0
+        self._eof = False
+
+    @property
+    def offset(self) -> int:
+        """Absolute byte offset of the scan position."""
+        return self._base + self._pos
+
+    def _refill(self) -> bool:
+        """Drop consumed bytes and read the next chunk. Returns False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        self._base += self._pos
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        if not chunk:
+            self._eof = True
+            return False
+        return True
+
+    def _ensure(self, count: int) -> bool:
+        while len(self._buf) - self._pos < count:
+            if not self._refill():
+                return False
+        return True
+
+    def peek(self) -> bytes:
+        """Return the next non-whitespace byte without consuming it ('' at EOF)."""
+        self.skip_whitespace()
+        if not self._ensure(1):
+            return b""
+        return self._buf[self._pos:self._pos + 1]
+
+    def expect(self, token: bytes) -> None:
+        if self.peek() != token:
+            raise JsonStreamError(f"Expected {token!r} at byte {self.offset}")
+        self._pos += 1
+
+    def skip_whitespace(self) -> None:
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._refill():
+                return
+
+    def _skip_string(self) -> None:
+        self._pos += 1  # opening quote
+        while True:
+            match = _STRING_SPECIAL_RE.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._refill():
+                    raise JsonStreamError("Unterminated string")
+                continue
+            self._pos = match.start()
+            if self._buf[self._pos:self._pos + 1] == b'"':
+                self._pos += 1
+                return
+            # Backslash escape: step over it and the escaped byte
+            if not self._ensure(2):
+                raise JsonStreamError("Unterminated escape sequence")
+            self._pos += 2
+
+    def _skip_container(self) -> None:
+        depth = 0
+        while True:
+            match = _STRUCTURAL_RE.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._refill():
+                    raise JsonStreamError("Unterminated array or object")
+                continue
+            self._pos = match.start()
+            token = self._buf[self._pos:self._pos + 1]
+            if token == b'"':
+                self._skip_string()
+                continue
+            depth += 1 if token in (b"[", b"{") else -1
+            self._pos += 1
+            if depth == 0:
+                return
+
+    def _skip_scalar(self) -> None:
+        while True:
+            self._pos = _SCALAR_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._refill():
+                return
+
+    def skip_value(self) -> Tuple[int, int]:
+        """Skip the next JSON value and return its (start, end) byte span."""
+        token = self.peek()
+        start = self.offset
+        if token in (b"[", b"{"):
+            self._skip_container()
+        elif token == b'"':
+            self._skip_string()
+        elif token:
+            self._skip_scalar()
+        else:
+            raise JsonStreamError("Unexpected end of document")
+        if self.offset == start:
+            raise JsonStreamError(f"Invalid value at byte {start}")
+        return start, self.offset
+
+    def scan_array(self) -> Tuple[int, int, array, array]:
+        """Scan an array value, returning its span plus per-item start/end offsets."""
+        start = self.offset
+        self.expect(b"[")
+        starts, ends = array("q"), array("q")
+        if self.peek() == b"]":
+            self._pos += 1
+            return start, self.offset, starts, ends
+        while True:
+            item_start, item_end = self.skip_value()
+            starts.append(item_start)
+            ends.append(item_end)
+            token = self.peek()
+            self._pos += 1
+            if token == b"]":
+                return start, self.offset, starts, ends
+            if token != b",":
+                raise JsonStreamError(f"Expected ',' or ']' at byte {self.offset - 1}")
+
+
+def _read_span(handle, start: int, end: int) -> bytes:
+    handle.seek(start)
+    return handle.read(end - start)
+
+
+class LazyJsonArray(Sequence):
+    """
+    Read-only, paged view over a JSON array stored on disk.
+
+    Items are decoded on demand from recorded byte offsets, a page at a time,
+    with only a few pages kept in memory. Edits are layered on top with
+    `with_rows`, which returns a new array sharing the on-disk index, so
+    deep-copying an instance is free.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        starts: array,
+        ends: array,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        overrides: Optional[Dict[int, Any]] = None,
+        source_stamp: Optional[Tuple[float, int]] = None,
+    ):
+        self._path = Path(path)
+        self._starts = starts
+        self._ends = ends
+        self.page_size = max(1, int(page_size))
+        self._overrides: Dict[int, Any] = dict(overrides or {})
+        self._source_stamp = source_stamp or _file_stamp(self._path)
+        self._pages: "OrderedDict[int, List[Any]]" = OrderedDict()
+
+    # -- Sequence protocol -------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LazyJsonArray index out of range")
+        if index in self._overrides:
+            return copy.deepcopy(self._overrides[index])
+        page = self._load_page(index // self.page_size)
+        return copy.deepcopy(page[index % self.page_size])
+
+    def __iter__(self) -> Iterator[Any]:
+        for page_number in range(self.page_count):
+            yield from self.page(page_number)
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, LazyJsonArray) and self._shares_source(other):
+            changed = set(self._overrides) | set(other._overrides)
+            return all(self[i] == other[i] for i in changed)
+        if isinstance(other, (list, tuple, LazyJsonArray)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyJsonArray":
+        # Items are decoded (and copied) on every access, and edits go through
+        # with_rows, so instances are effectively immutable and can be shared.
+        return self
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyJsonArray(path={str(self._path)!r}, items={len(self)}, "
+            f"page_size={self.page_size}, edited={len(self._overrides)})"
+        )
+
+    # -- Paging ------------------------------------------------------------
+    @property
+    def page_count(self) -> int:
+        """Number of pages needed to cover every item."""
+        return (len(self) + self.page_size - 1) // self.page_size
+
+    @property
+    def edited_indices(self) -> List[int]:
+        """Indices whose values differ from the on-disk array."""
+        return sorted(self._overrides)
+
+    def page_bounds(self, page_number: int) -> Tuple[int, int]:
+        """Return the [start, end) item range for a page."""
+        start = page_number * self.page_size
+        return start, min(start + self.page_size, len(self))
+
+    def page(self, page_number: int) -> List[Any]:
+        """Return the items on a page, with any edits applied."""
+        start, end = self.page_bounds(page_number)
+        if start >= end:
+            return []
+        rows = copy.deepcopy(self._load_page(page_number))
+        for index in range(start, end):
+            if index in self._overrides:
+                rows[index - start] = copy.deepcopy(self._overrides[index])
+        return rows
+
+    def with_rows(self, start: int, rows: Iterable[Any]) -> "LazyJsonArray":
+        """Return a new array with items from `start` replaced by `rows`."""
+        overrides = dict(self._overrides)
+        for offset, row in enumerate(rows):
+            index = start + offset
+            if index >= len(self):
+                raise IndexError("LazyJsonArray does not support appending rows")
+            overrides[index] = copy.deepcopy(row)
+        clone = LazyJsonArray(
+            self._path, self._starts, self._ends, self.page_size,
+            overrides=overrides, source_stamp=self._source_stamp,
+        )
+        clone._pages = self._pages  # share decoded pages; they are never mutated
+        return clone
+
+    def to_list(self) -> List[Any]:
+        """Materialize every item. Use only at validation or submission time."""
+        return list(self)
+
+    # -- Internals ---------------------------------------------------------
+    def _shares_source(self, other: "LazyJsonArray") -> bool:
+        return (
+            self._path == other._path
+            and self._source_stamp == other._source_stamp
+            and len(self) == len(other)
+            and (self._starts is other._starts or self._starts == other._starts)
+        )
+
+    def _load_page(self, page_number: int) -> List[Any]:
+        if page_number in self._pages:
+            self._pages.move_to_end(page_number)
+            return self._pages[page_number]
+
+        if _file_stamp(self._path) != self._source_stamp:
+            raise JsonStreamError(f"Source file changed since it was indexed: {self._path}")
+
+        start, end = self.page_bounds(page_number)
+        with open(self._path, "rb") as handle:
+            raw = _read_span(handle, self._starts[start], self._ends[end - 1])
+        # Items in a page are contiguous on disk, so decode them as one array
+        rows = json.loads(b"[" + raw + b"]")
+
+        self._pages[page_number] = rows
+        while len(self._pages) > DEFAULT_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return rows
+
+
+def _file_stamp(path: Path) -> Tuple[float, int]:
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def stream_json_fields(
+    path: Union[str, Path],
+    fields: Optional[Iterable[str]] = None,
+    lazy_array_threshold: int = DEFAULT_LAZY_ARRAY_THRESHOLD,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StreamedDocument:
+    """
+    Load a JSON object incrementally, decoding only the requested fields.
+
+    The file is scanned in fixed-size chunks. Top-level values whose key is not
+    in `fields` are skipped without being decoded; top-level arrays with more
+    than `lazy_array_threshold` items are returned as LazyJsonArray instead of
+    being materialized.
+
+    Args:
+        path: Path to the JSON document
+        fields: Top-level keys to decode (None decodes every key)
+        lazy_array_threshold: Item count above which arrays stay on disk
+        page_size: Items per page for lazy arrays
+        chunk_size: Bytes read per refill while scanning
+
+    Returns:
+        StreamedDocument with the decoded fields
+
+    Raises:
+        JsonStreamError: If the document is not a well-formed JSON object
+    """
+    path = Path(path)
+    wanted = set(fields) if fields is not None else None
+    result: Dict[str, Any] = {}
+    skipped: List[str] = []
+    source_stamp = _file_stamp(path)
+
+    with open(path, "rb") as handle, open(path, "rb") as reader:
+        scanner = _ByteScanner(handle, chunk_size)
+        if scanner.peek() == b"\xef":  # UTF-8 BOM
+            scanner._pos += 3
+        scanner.expect(b"{")
+
+        if scanner.peek() == b"}":
+            return StreamedDocument()
+
+        while True:
+            if scanner.peek() != b'"':
+                raise JsonStreamError(f"Expected object key at byte {scanner.offset}")
+            key_start, key_end = scanner.skip_value()
+            key = json.loads(_read_span(reader, key_start, key_end))
+            scanner.expect(b":")
+
+            if wanted is not None and key not in wanted:
+                scanner.skip_value()
+                skipped.append(key)
+            elif scanner.peek() == b"[":
+                start, end, starts, ends = scanner.scan_array()
+                if len(starts) > lazy_array_threshold:
+                    result[key] = LazyJsonArray(
+                        path, starts, ends, page_size, source_stamp=source_stamp
+                    )
+                    logger.info(f"Streaming {key}: {len(starts)} items exposed as paged array")
+                else:
+                    result[key] = json.loads(_read_span(reader, start, end))
+            else:
+                start, end = scanner.skip_value()
+                result[key] = json.loads(_read_span(reader, start, end))
+
+            token = scanner.peek()
+            scanner._pos += 1
+            if token == b"}":
+                break
+            if token != b",":
+                raise JsonStreamError(f"Expected ',' or '}}' at byte {scanner.offset - 1}")
+
+    return StreamedDocument(result, skipped_fields=skipped)
+
+
+def contains_lazy_arrays(data: Any) -> bool:
+    """Return True if `data` holds a LazyJsonArray at any depth."""
+    if isinstance(data, LazyJsonArray):
+        return True
+    if isinstance(data, dict):
+        return any(contains_lazy_arrays(value) for value in data.values())
+    if isinstance(data, list):
+        return any(contains_lazy_arrays(item) for item in data)
+    return False
+
+
+def materialize_lazy_arrays(data: Any) -> Any:
+    """
+    Return `data` with every LazyJsonArray replaced by a plain list.
+
+    Values without lazy arrays are returned unchanged (not copied).
+    """
+    if not contains_lazy_arrays(data):
+        return data
+    if isinstance(data, LazyJsonArray):
+        return [materialize_lazy_arrays(item) for item in data]
+    if isinstance(data, dict):
+        return {key: materialize_lazy_arrays(value) for key, value in data.items()}
+    return [materialize_lazy_arrays(item) for item in data]
@@ -0,0 +1,460 @@
+"""
+Operational metrics for JSON QA webapp.
+A small process-wide registry of counters, gauges and histograms, rendered in the
+Prometheus text exposition format. ``file_utils``, ``SubmissionHandler`` and the app
+record queue depth, lock activity, claim/submit/audit latency, validation failures
+and rerun latency; cache statistics are collected when the registry is rendered.
+
+``start_metrics_exporter`` (called by the bootstrap) serves the registry at
+``/metrics`` from a local HTTP server and/or writes it periodically to a file for
+node_exporter's textfile collector, using the ``metrics`` config section.
+"""
+
+import functools
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_PATH = "/metrics"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9464
+DEFAULT_TEXTFILE_INTERVAL_SECONDS = 15.0
+
+# Seconds; suits lock files and audit appends (ms) as well as submissions (seconds)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class: a named metric with optional labels."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def label_sets(self) -> List[LabelValues]:
+        """Return the label values that have been recorded."""
+        with self._lock:
+            return sorted(self._values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (suffix, label text, value) rows."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", _labels_text(self.labelnames, key), value) for key, value in items]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_format_value(value)}" for suffix, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: Any) -> None:
+        """Mirror a cumulative count kept elsewhere (used by collectors)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][i] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Observe the duration of the enclosed block in seconds.
+
+        Yields a dict whose labels the block may change (e.g. set ``outcome``).
+        """
+        labels = dict(labels)
+        started = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, outcome: Callable[[Any], str]) -> Callable[[Callable], Callable]:
+        """
+        Decorator observing each call's duration, labelled ``outcome=outcome(result)``.
+
+        Calls that raise are labelled ``outcome="error"``.
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                label = "error"
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                    label = outcome(result)
+                    return result
+                finally:
+                    self.observe(time.perf_counter() - started, outcome=label)
+            return wrapper
+        return decorator
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state['count'] if state else 0
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted((key, {'buckets': list(state['buckets']), 'sum': state['sum'], 'count': state['count']})
+                           for key, state in self._values.items())
+        rows = []
+        for key, state in items:
+            for bound, count in zip(self.buckets, state['buckets']):
+                rows.append(("_bucket", _labels_text(self.labelnames, key, f'le="{_format_value(bound)}"'), count))
+            rows.append(("_bucket", _labels_text(self.labelnames, key, 'le="+Inf"'), state['count']))
+            rows.append(("_sum", _labels_text(self.labelnames, key), state['sum']))
+            rows.append(("_count", _labels_text(self.labelnames, key), state['count']))
+        return rows
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that refresh values when the registry is rendered."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Call ``collector()`` before every render, e.g. to copy cache statistics."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.debug(f"Metrics collector {getattr(collector, '__name__', collector)!r} failed: {e}")
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+QUEUE_DEPTH = REGISTRY.gauge("qa_queue_depth", "Documents waiting for review.")
+LOCKED_DOCUMENTS = REGISTRY.gauge("qa_locked_documents", "Documents waiting for review that a reviewer has claimed.")
+CLAIM_SECONDS = REGISTRY.histogram(
+    "qa_claim_duration_seconds", "Time to claim a document, by outcome (claimed, busy, error).", ["outcome"])
+SUBMIT_SECONDS = REGISTRY.histogram(
+    "qa_submit_duration_seconds", "Time to validate and submit a corrected document, by outcome (saved, invalid, error).",
+    ["outcome"])
+VALIDATION_FAILURES = REGISTRY.counter(
+    "qa_validation_failures_total", "Validation passes that found errors, by field ('general' for business rules).",
+    ["field"])
+AUDIT_WRITE_SECONDS = REGISTRY.histogram("qa_audit_write_duration_seconds", "Time to append an audit log entry.")
+AUDIT_WRITE_FAILURES = REGISTRY.counter("qa_audit_write_failures_total", "Audit log entries that could not be written.")
+LOCK_RECLAIMS = REGISTRY.counter(
+    "qa_lock_reclaims_total", "Locks removed by stale lock cleanup, by reason (expired, corrupted).", ["reason"])
+CACHE_REQUESTS = REGISTRY.counter(
+    "qa_cache_requests_total", "Cache lookups by cache and result (hit, miss).", ["cache", "result"])
+CACHE_HIT_RATIO = REGISTRY.gauge("qa_cache_hit_ratio", "Share of cache lookups that were hits, by cache.", ["cache"])
+RERUN_SECONDS = REGISTRY.histogram("qa_rerun_duration_seconds", "Streamlit script run time, by page.", ["page"])
+
+
+def _collect_cache_stats() -> None:
+    """Copy cumulative cache statistics kept by other modules and derive hit ratios."""
+    import sys
+
+    validator_compiler = sys.modules.get("utils.validator_compiler")
+    if validator_compiler is not None:
+        stats = validator_compiler.get_validator_cache_stats()
+        CACHE_REQUESTS.set_total(stats.get("hits", 0), cache="validators", result="hit")
+        CACHE_REQUESTS.set_total(stats.get("misses", 0), cache="validators", result="miss")
+    schema_catalog = sys.modules.get("utils.schema_catalog")
+    if schema_catalog is not None:
+        stats = schema_catalog.get_schema_catalog().stats()
+        CACHE_REQUESTS.set_total(stats.get("reused", 0), cache="schema_catalog", result="hit")
+        CACHE_REQUESTS.set_total(stats.get("parsed", 0), cache="schema_catalog", result="miss")
+
+    for cache in {cache for cache, _ in CACHE_REQUESTS.label_sets()}:
+        hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+        total = hits + CACHE_REQUESTS.value(cache=cache, result="miss")
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+def _collect_queue() -> None:
+    """Count pending documents and their live locks on disk, so the gauges are current at every scrape."""
+    import sys
+
+    file_utils = sys.modules.get("utils.file_utils")
+    if file_utils is None:
+        return
+    pending, locked = file_utils.count_pending_documents()
+    QUEUE_DEPTH.set(pending)
+    LOCKED_DOCUMENTS.set(locked)
+
+
+REGISTRY.add_collector(_collect_cache_stats)
+REGISTRY.add_collector(_collect_queue)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics."""
+
+    server_version = "JSONQA-Metrics/1.0"
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != METRICS_PATH:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("metrics-server %s - %s", self.address_string(), format % args)
+
+
+class MetricsServer:
+    """Background HTTP server exposing a registry at /metrics."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def running(self) -> bool:
+        return self._httpd is not None
+
+    @property
+    def url(self) -> Optional[str]:
+        if self._httpd is None:
+            return None
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{METRICS_PATH}"
+
+    def start(self) -> bool:
+        """Start serving on a daemon thread. Returns False if the socket cannot be bound."""
+        if self._httpd is not None:
+            return True
+        try:
+            httpd = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+        except OSError as e:
+            logger.error(f"Could not start metrics server on {self.host}:{self.port}: {e}")
+            return False
+        httpd.daemon_threads = True
+        httpd.registry = self.registry
+        self._httpd = httpd
+        threading.Thread(target=httpd.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info(f"Metrics available at {self.url}")
+        return True
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        self._httpd = None
+
+
+def write_textfile(path: Path, registry: MetricsRegistry = REGISTRY) -> None:
+    """Write the registry to ``path`` atomically (for node_exporter's textfile collector)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.render())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class _TextfileWriter(threading.Thread):
+    """Rewrites the textfile every ``interval`` seconds."""
+
+    def __init__(self, path: Path, interval: float, registry: MetricsRegistry = REGISTRY):
+        super().__init__(name="metrics-textfile", daemon=True)
+        self.path = Path(path)
+        self.interval = interval
+        self.registry = registry
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                write_textfile(self.path, self.registry)
+            except Exception as e:
+                logger.warning(f"Could not write metrics textfile {self.path}: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+_server: Optional[MetricsServer] = None
+_textfile_writer: Optional[_TextfileWriter] = None
+_exporter_lock = threading.Lock()
+
+
+def start_metrics_exporter(config: Optional[Dict[str, Any]] = None) -> Optional[MetricsServer]:
+    """
+    Start the process-wide metrics exporters once, using the ``metrics`` config section.
+
+    ``enabled`` turns exporting on; ``host`` and ``port`` configure the HTTP endpoint
+    (``port: null`` disables it) and ``textfile`` / ``textfile_interval`` the textfile.
+
+    Returns:
+        The running HTTP server, or None
+    """
+    global _server, _textfile_writer
+    settings = (config or {}).get("metrics", {}) or {}
+    if not settings.get("enabled", False):
+        return None
+
+    with _exporter_lock:
+        textfile = settings.get("textfile")
+        if textfile and _textfile_writer is None:
+            interval = float(settings.get("textfile_interval") or DEFAULT_TEXTFILE_INTERVAL_SECONDS)
+            _textfile_writer = _TextfileWriter(Path(textfile), interval)
+            _textfile_writer.start()
+        if _server is not None and _server.running:
+            return _server
+        port = settings.get("port", DEFAULT_PORT)
+        if port is None:
+            return None
+        server = MetricsServer(host=settings.get("host") or DEFAULT_HOST, port=int(port))
+        if not server.start():
+            return None
+        _server = server
+        return _server
+
+
+def stop_metrics_exporter() -> None:
+    """Stop the HTTP server and textfile writer (tests)."""
+    global _server, _textfile_writer
+    with _exporter_lock:
+        if _server is not None:
+            _server.stop()
+        if _textfile_writer is not None:
+            _textfile_writer.stop()
+        _server = None
+        _textfile_writer = None
@@ -0,0 +1,126 @@
+"""
+Columnar edit buffer for object arrays in JSON QA webapp.
+An object array (e.g. line items) is converted to a pandas DataFrame once per edit
+session and kept in session state. st.data_editor edits that frame; the buffer keeps
+the edited frame and only turns it back into JSON rows when the table actually changed,
+so reruns triggered by other widgets do not pay the DataFrame/records round trip.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+RowCleaner = Callable[[List[Dict[str, Any]], Dict[str, Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def _delta_fingerprint(editor_state: Any) -> str:
+    """Fingerprint Streamlit's data_editor delta (edited/added/deleted rows)."""
+    if editor_state is None:
+        return ""
+    try:
+        return json.dumps(dict(editor_state), sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return repr(editor_state)
+
+
+class ObjectArrayBuffer:
+    """
+    Edit-session buffer for one object array field.
+
+    ``frame`` is the DataFrame handed to st.data_editor. It is built once from the
+    document's rows and changed in place only by Add Row / Delete Last Row. ``current``
+    is the latest frame returned by the editor (frame plus the editor's cell edits).
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], properties: Dict[str, Dict[str, Any]],
+                 column_order: Optional[List[str]] = None):
+        self.properties = dict(properties or {})
+        self.columns: List[str] = list(column_order if column_order is not None else self.properties)
+        for row in records or []:
+            if isinstance(row, dict):
+                self.columns.extend(k for k in row if k not in self.columns)
+
+        rows = [row for row in records or [] if isinstance(row, dict)]
+        if rows:
+            self.frame = pd.DataFrame(rows).reindex(columns=self.columns)
+        else:
+            self.frame = pd.DataFrame(columns=pd.Index(self.columns))
+        self.current = self.frame
+        self.revision = 0
+        self._edit_key: Tuple[int, str] = (0, "")
+        self._derived: Dict[Any, Tuple[Tuple[int, str], Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+    def record_edits(self, edited_frame: Any, editor_state: Any = None) -> bool:
+        """
+        Keep the frame returned by st.data_editor.
+
+        Args:
+            edited_frame: DataFrame returned by st.data_editor
+            editor_state: The editor's session state entry (its delta)
+
+        Returns:
+            True if the table content changed since the last call
+        """
+        if hasattr(edited_frame, 'to_dict'):
+            self.current = edited_frame
+        key = (self.revision, _delta_fingerprint(editor_state))
+        changed = key != self._edit_key
+        self._edit_key = key
+        return changed
+
+    def add_row(self, row: Dict[str, Any]) -> None:
+        """Append a row in place, keeping the cell edits made so far."""
+        self._fold_edits()
+        self.frame.loc[len(self.frame)] = [row.get(column) for column in self.columns]
+        self._structure_changed()
+
+    def delete_last_row(self) -> None:
+        """Drop the last row in place, keeping the cell edits made so far."""
+        self._fold_edits()
+        if len(self.frame):
+            self.frame.drop(self.frame.index[-1], inplace=True)
+        self._structure_changed()
+
+    def to_records(self, cleaner: Optional[RowCleaner] = None) -> List[Dict[str, Any]]:
+        """
+        Return the buffer as JSON rows, converting only if the table changed.
+
+        Args:
+            cleaner: Normalizes the raw records (NaN, numpy scalars); results are
+                cached per cleaner
+
+        Returns:
+            List of row dicts (shared; callers must not mutate it)
+        """
+        def convert() -> List[Dict[str, Any]]:
+            records = self.current.to_dict('records')
+            logger.debug(f"Converted object array buffer to {len(records)} rows")
+            return cleaner(records, self.properties) if cleaner is not None else records
+
+        return self.cached(('records', cleaner), convert)
+
+    def cached(self, name: Any, compute: Callable[[], Any]) -> Any:
+        """Return a value derived from the buffer, recomputed only when the table changed."""
+        entry = self._derived.get(name)
+        if entry is not None and entry[0] == self._edit_key:
+            return entry[1]
+        value = compute()
+        self._derived[name] = (self._edit_key, value)
+        return value
+
+    def _fold_edits(self) -> None:
+        if self.current is not self.frame:
+            self.frame = self.current.reset_index(drop=True)
+            self.current = self.frame
+
+    def _structure_changed(self) -> None:
+        self.current = self.frame
+        self.revision += 1
+        self._edit_key = (self.revision, self._edit_key[1])
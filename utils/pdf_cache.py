@@ -0,0 +1,604 @@
+"""
+PDF artifact cache for JSON QA webapp.
+Pre-renders PDF pages to PNG and extracts page count, document metadata and per-page
+text in a process pool, storing the results on disk under the PDF's content hash. The
+viewer and queue read these artifacts instead of opening the PDF on every rerun. New
+files in pdf_docs are picked up by a background watcher. The cache is kept under a size
+limit by removing the least recently used entries.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIRNAME = ".pdf_cache"
+DEFAULT_RENDER_SCALES = (0.25, 1.5)  # thumbnail strip, page view
+DEFAULT_MAX_PAGES = 20
+DEFAULT_WORKERS = 2
+DEFAULT_TEXT_PAGES = 50
+DEFAULT_WATCH_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_CACHE_MB = 1024
+PRUNE_INTERVAL_SECONDS = 60.0
+MANIFEST_NAME = "pages.json"
+MANIFEST_VERSION = 1
+INFO_NAME = "info.json"
+INFO_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+MAX_HASH_MEMO_ENTRIES = 1024
+
+# Cache artifacts, one worker task each
+PAGES = "pages"
+INFO = "info"
+
+# PDF document info keys -> metadata names used by PDFViewer.get_pdf_metadata
+METADATA_KEYS = {
+    "/Title": "title",
+    "/Author": "author",
+    "/Subject": "subject",
+    "/Creator": "creator",
+    "/Producer": "producer",
+    "/CreationDate": "creation_date",
+    "/ModDate": "modification_date",
+}
+
+
+def _page_image_name(page_number: int, scale: float) -> str:
+    return f"page-{page_number:04d}@{scale:g}x.png"
+
+
+def render_pdf_pages(pdf_path: str, out_dir: str, scales: Tuple[float, ...], max_pages: int) -> Dict[str, Any]:
+    """
+    Render the first pages of a PDF to PNG files and write a manifest (runs in a worker process).
+
+    Files are written under temporary names and renamed into place, and the manifest is
+    written last, so readers never see a partially rendered cache entry.
+
+    Args:
+        pdf_path: PDF to render
+        out_dir: Cache directory for this PDF's content hash
+        scales: Render scales (1.0 = 72 dpi)
+        max_pages: Maximum number of pages to render
+
+    Returns:
+        The manifest that was written
+    """
+    import pypdfium2 as pdfium
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page_count = len(pdf)
+        pages = []
+        for index in range(min(page_count, max_pages)):
+            page = pdf[index]
+            try:
+                width, height = page.get_size()
+                images = {}
+                for scale in scales:
+                    name = _page_image_name(index + 1, scale)
+                    tmp = out / f".{name}.{pid}.tmp"
+                    page.render(scale=scale).to_pil().save(tmp, format="PNG", optimize=True)
+                    os.replace(tmp, out / name)
+                    images[f"{scale:g}"] = name
+            finally:
+                page.close()
+            pages.append({"page": index + 1, "width": width, "height": height, "images": images})
+    finally:
+        pdf.close()
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "page_count": page_count,
+        "scales": [f"{scale:g}" for scale in scales],
+        "pages": pages,
+    }
+    _write_json_atomic(out / MANIFEST_NAME, manifest)
+    return manifest
+
+
+def extract_pdf_info(pdf_path: str, out_dir: str, max_pages: int) -> Dict[str, Any]:
+    """
+    Extract page count, document metadata and per-page text and write the info sidecar
+    (runs in a worker process).
+
+    A PDF that cannot be parsed is recorded with its error, so it is not re-parsed on
+    every render; a changed file gets a new content hash and is extracted again.
+
+    Args:
+        pdf_path: PDF to read
+        out_dir: Cache directory for this PDF's content hash
+        max_pages: Maximum number of pages to extract text from
+
+    Returns:
+        The info that was written
+    """
+    import PyPDF2
+
+    info: Dict[str, Any] = {
+        "version": INFO_VERSION,
+        "page_count": None,
+        "metadata": {name: None for name in METADATA_KEYS.values()},
+        "pages": [],
+        "error": None,
+    }
+    try:
+        reader = PyPDF2.PdfReader(pdf_path)
+        info["page_count"] = len(reader.pages)
+        for key, name in METADATA_KEYS.items():
+            value = (reader.metadata or {}).get(key)
+            info["metadata"][name] = str(value) if value is not None else None
+        for index in range(min(info["page_count"], max_pages)):
+            try:
+                text = reader.pages[index].extract_text() or ""
+            except Exception as e:
+                text = ""
+                logger.debug(f"No text for page {index + 1} of {pdf_path}: {e}")
+            info["pages"].append({"page": index + 1, "text": text})
+    except Exception as e:
+        info["error"] = str(e)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(out / INFO_NAME, info)
+    return info
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class PDFCache:
+    """
+    Disk cache of rendered PDF pages and extracted PDF info keyed by PDF content hash.
+
+    Each artifact is produced by one task in a process pool, deduplicated while in flight.
+    Lookups only read small JSON files (info is also kept in memory), so they are cheap
+    enough for every rerun. Reads refresh an entry's directory mtime, which ``prune``
+    uses to remove the least recently used entries once the cache exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        scales: Tuple[float, ...] = DEFAULT_RENDER_SCALES,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        workers: int = DEFAULT_WORKERS,
+        render_pages: bool = True,
+        extract_info: bool = True,
+        text_pages: int = DEFAULT_TEXT_PAGES,
+        max_bytes: int = DEFAULT_MAX_CACHE_MB * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.scales = tuple(sorted(float(s) for s in scales)) or DEFAULT_RENDER_SCALES
+        self.max_pages = max(int(max_pages), 1)
+        self.workers = max(int(workers), 1)
+        self.render_pages = render_pages
+        self.extract_info = extract_info
+        self.text_pages = max(int(text_pages), 0)
+        self.max_bytes = max(int(max_bytes), 0)  # 0 = unlimited
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._failed: set = set()
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+        self._info_memo: Dict[str, Dict[str, Any]] = {}
+
+    def content_hash(self, pdf_path: Path) -> Optional[str]:
+        """
+        SHA-256 of the PDF's bytes, memoized by (path, mtime, size).
+
+        Returns:
+            Hex digest, or None if the file cannot be read
+        """
+        identity = self._identify(pdf_path)
+        return identity[0] if identity else None
+
+    def _identify(self, pdf_path: Path) -> Optional[Tuple[str, os.stat_result]]:
+        """Return (content hash, stat) for a PDF; only the stat is taken on a memo hit."""
+        try:
+            stat = os.stat(pdf_path)
+            memo_key = (str(pdf_path), stat.st_mtime_ns, stat.st_size)
+            with self._lock:
+                cached = self._hash_memo.get(memo_key)
+            if cached:
+                return cached, stat
+
+            digest = hashlib.sha256()
+            with open(pdf_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except OSError as e:
+            logger.warning(f"Cannot hash PDF {pdf_path}: {e}")
+            return None
+
+        with self._lock:
+            if len(self._hash_memo) >= MAX_HASH_MEMO_ENTRIES:
+                self._hash_memo.clear()
+            self._hash_memo[memo_key] = digest.hexdigest()
+        return digest.hexdigest(), stat
+
+    def entry_dir(self, content_hash: str) -> Path:
+        """Directory holding the cached artifacts for one PDF content hash."""
+        return self.cache_dir / content_hash[:2] / content_hash
+
+    def get_pages(self, pdf_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Return the page manifest for a PDF if its pages have been rendered.
+
+        Image names in the manifest are resolved to absolute paths.
+
+        Returns:
+            Manifest dictionary, or None if the PDF is not cached (yet)
+        """
+        content_hash = self.content_hash(pdf_path)
+        if not content_hash:
+            return None
+        entry = self.entry_dir(content_hash)
+        try:
+            manifest = json.loads((entry / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable page cache for {pdf_path}: {e}")
+            return None
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        _touch(entry)
+
+        for page in manifest.get("pages", []):
+            page["images"] = {scale: entry / name for scale, name in page.get("images", {}).items()}
+        return manifest
+
+    def get_info(self, pdf_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Return extracted PDF info if it is cached.
+
+        The result has ``page_count``, ``metadata``, per-page ``pages`` text and ``error``
+        from the sidecar, plus the file's current ``size`` and ``modified`` time.
+
+        Returns:
+            Info dictionary, or None if the PDF has not been extracted (yet)
+        """
+        identity = self._identify(pdf_path)
+        if not identity:
+            return None
+        content_hash, stat = identity
+
+        with self._lock:
+            info = self._info_memo.get(content_hash)
+        if info is None:
+            try:
+                info = json.loads((self.entry_dir(content_hash) / INFO_NAME).read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable info cache for {pdf_path}: {e}")
+                return None
+            if info.get("version") != INFO_VERSION:
+                return None
+            _touch(self.entry_dir(content_hash))
+            with self._lock:
+                if len(self._info_memo) >= MAX_HASH_MEMO_ENTRIES:
+                    self._info_memo.clear()
+                self._info_memo[content_hash] = info
+
+        return {**info, "size": stat.st_size, "modified": stat.st_mtime}
+
+    def warm(self, pdf_path: Path) -> List[Future]:
+        """
+        Schedule the artifacts of a PDF that are not cached or already being produced.
+
+        Returns:
+            Futures of the tasks for this PDF (empty if everything is cached)
+        """
+        content_hash = self.content_hash(pdf_path)
+        if not content_hash:
+            return []
+        entry = self.entry_dir(content_hash)
+
+        tasks = []
+        if self.extract_info:
+            tasks.append((INFO, INFO_NAME, extract_pdf_info, (str(pdf_path), str(entry), self.text_pages)))
+        if self.render_pages:
+            tasks.append(
+                (PAGES, MANIFEST_NAME, render_pdf_pages, (str(pdf_path), str(entry), self.scales, self.max_pages))
+            )
+
+        futures = []
+        for kind, artifact, fn, args in tasks:
+            if (entry / artifact).exists():
+                continue
+            key = (content_hash, kind)
+            with self._lock:
+                if key in self._failed:
+                    continue
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._get_executor().submit(fn, *args)
+                    self._in_flight[key] = future
+                    future.add_done_callback(
+                        lambda f, key=key, name=Path(pdf_path).name: self._finished(key, name, f)
+                    )
+            futures.append(future)
+        return futures
+
+    def warm_directory(self, pdf_dir: Path) -> int:
+        """
+        Schedule rendering for every uncached PDF in a directory.
+
+        Returns:
+            Number of render tasks scheduled
+        """
+        scheduled = 0
+        try:
+            paths = sorted(Path(pdf_dir).glob("*.pdf"))
+        except OSError as e:
+            logger.warning(f"Cannot scan {pdf_dir} for PDFs: {e}")
+            return 0
+        for pdf_path in paths:
+            if self.warm(pdf_path):
+                scheduled += 1
+        return scheduled
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Remove least recently used entries until the cache fits in ``max_bytes``.
+
+        Entries with a task in flight are kept.
+
+        Args:
+            max_bytes: Size limit (defaults to ``self.max_bytes``; 0 = unlimited)
+
+        Returns:
+            Number of entries removed
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            self._last_prune = time.monotonic()
+            busy = {content_hash for content_hash, _ in self._in_flight}
+        if not max_bytes:
+            return 0
+
+        entries = []
+        total = 0
+        try:
+            for shard in _list_dirs(self.cache_dir):
+                for entry in _list_dirs(Path(shard.path)):
+                    size = sum(item.stat().st_size for item in _list_files(Path(entry.path)))
+                    entries.append((entry.stat().st_mtime, size, entry.name, Path(entry.path)))
+                    total += size
+        except OSError as e:
+            logger.warning(f"Cannot measure PDF cache {self.cache_dir}: {e}")
+            return 0
+
+        removed = 0
+        for _, size, content_hash, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if content_hash in busy:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            with self._lock:
+                self._info_memo.pop(content_hash, None)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Removed {removed} least recently used PDF cache entries ({total / (1024 * 1024):.1f} MB kept)")
+        return removed
+
+    def maybe_prune(self) -> int:
+        """Prune if a size limit is set and the last prune is ``PRUNE_INTERVAL_SECONDS`` old."""
+        if not self.max_bytes or time.monotonic() - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return 0
+        return self.prune()
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, cancelling queued renders."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._in_flight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a threaded Streamlit server is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _finished(self, key: Tuple[str, str], name: str, future: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            with self._lock:
+                # Do not retry a failing PDF on every rerun; a changed file gets a new hash
+                self._failed.add(key)
+            logger.warning(f"Could not build {key[1]} cache for {name}: {error}")
+        else:
+            logger.debug(f"Built {key[1]} cache for {name}")
+            self.maybe_prune()
+
+
+def _touch(path: Path) -> None:
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _list_dirs(path: Path) -> List[os.DirEntry]:
+    with os.scandir(path) as entries:
+        return [entry for entry in entries if entry.is_dir()]
+
+
+def _list_files(path: Path) -> List[os.DirEntry]:
+    with os.scandir(path) as entries:
+        return [entry for entry in entries if entry.is_file()]
+
+
+class _DirectoryWatcher(threading.Thread):
+    """Polls pdf_docs and warms the cache for new or changed files."""
+
+    def __init__(self, cache: PDFCache, pdf_dir: Path, interval: float):
+        super().__init__(name="pdf-cache-watcher", daemon=True)
+        self.cache = cache
+        self.pdf_dir = Path(pdf_dir)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._seen: Dict[str, Tuple[int, int]] = {}
+
+    def scan(self) -> int:
+        """Warm files that are new or changed since the previous scan."""
+        scheduled = 0
+        current: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.pdf_dir) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(".pdf") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    current[entry.name] = signature
+                    if self._seen.get(entry.name) != signature and self.cache.warm(Path(entry.path)):
+                        scheduled += 1
+        except OSError as e:
+            logger.debug(f"PDF cache watcher cannot scan {self.pdf_dir}: {e}")
+            return 0
+        self._seen = current
+        return scheduled
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.scan()
+                self.cache.maybe_prune()
+            except Exception as e:
+                logger.warning(f"PDF cache watcher error: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+# Process-wide cache shared by all sessions
+_cache: Optional[PDFCache] = None
+_watcher: Optional[_DirectoryWatcher] = None
+_cache_lock = threading.Lock()
+
+
+def start_pdf_cache(config: Optional[Dict[str, Any]] = None, pdf_dir: Optional[Path] = None) -> Optional[PDFCache]:
+    """
+    Create the process-wide PDF cache once and start watching pdf_docs.
+
+    Uses the ``pdf_viewer`` section: ``cache_dir``, ``cache_max_mb``, ``workers`` and
+    ``watch_interval``, ``page_images`` (``enabled``, ``scales``, ``max_pages``) and ``text_extraction``
+    (``enabled``, ``max_pages``). The cache directory defaults to ``.pdf_cache`` inside
+    pdf_docs. Page images also need pypdfium2.
+
+    Args:
+        config: Application configuration
+        pdf_dir: PDF directory to watch (defaults to the configured pdf_docs directory)
+
+    Returns:
+        The PDF cache, or None when both page images and text extraction are disabled
+    """
+    global _cache, _watcher
+    settings = (config or {}).get("pdf_viewer", {}) or {}
+    page_settings = settings.get("page_images", {}) or {}
+    text_settings = settings.get("text_extraction", {}) or {}
+
+    render_pages = bool(page_settings.get("enabled", True))
+    if render_pages and importlib.util.find_spec("pypdfium2") is None:
+        logger.info("pypdfium2 not available, PDF page images disabled")
+        render_pages = False
+    extract_info = bool(text_settings.get("enabled", True))
+    if not render_pages and not extract_info:
+        return None
+
+    with _cache_lock:
+        if _cache is not None:
+            return _cache
+        if pdf_dir is None:
+            from .file_utils import get_directories
+            pdf_dir = get_directories().pdf_docs
+        cache_dir = Path(settings.get("cache_dir") or Path(pdf_dir) / DEFAULT_CACHE_DIRNAME)
+        try:
+            cache = PDFCache(
+                cache_dir,
+                scales=tuple(page_settings.get("scales") or DEFAULT_RENDER_SCALES),
+                max_pages=page_settings.get("max_pages", DEFAULT_MAX_PAGES),
+                workers=settings.get("workers", DEFAULT_WORKERS),
+                render_pages=render_pages,
+                extract_info=extract_info,
+                text_pages=text_settings.get("max_pages", DEFAULT_TEXT_PAGES),
+                max_bytes=int(float(settings.get("cache_max_mb", DEFAULT_MAX_CACHE_MB) or 0) * 1024 * 1024),
+            )
+            cache.cache_dir.mkdir(parents=True, exist_ok=True)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Could not start PDF cache: {e}")
+            return None
+
+        interval = float(settings.get("watch_interval", DEFAULT_WATCH_INTERVAL_SECONDS) or 0)
+        if interval > 0:
+            _watcher = _DirectoryWatcher(cache, Path(pdf_dir), interval)
+            _watcher.start()
+        _cache = cache
+        logger.info(f"PDF cache at {cache.cache_dir}")
+        return _cache
+
+
+def get_pdf_cache() -> Optional[PDFCache]:
+    """Return the process-wide PDF cache, if started."""
+    return _cache
+
+
+def get_cached_pdf_info(pdf_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Return cached PDF info, scheduling extraction on a miss.
+
+    Returns:
+        Info dictionary (see PDFCache.get_info), or None if the cache is not running
+        or the PDF has not been extracted yet
+    """
+    cache = get_pdf_cache()
+    if cache is None:
+        return None
+    info = cache.get_info(pdf_path)
+    if info is None:
+        cache.warm(pdf_path)
+    return info
+
+
+def stop_pdf_cache() -> None:
+    """Stop the watcher and worker pool."""
+    global _cache, _watcher
+    with _cache_lock:
+        if _watcher is not None:
+            _watcher.stop()
+        if _cache is not None:
+            _cache.shutdown()
+        _cache = None
+        _watcher = None
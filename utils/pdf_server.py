@@ -0,0 +1,369 @@
+"""
+Local PDF file server for JSON QA webapp.
+Serves registered PDFs by URL with HTTP Range and ETag support, so the edit view can
+reference a PDF instead of inlining it as a base64 data URL on every rerun. Browsers
+cache the response and their PDF viewers fetch only the byte ranges they display.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import re
+import secrets
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 0  # 0 = pick a free port
+ROUTE_PREFIX = "/pdf/"
+CACHE_MAX_AGE_SECONDS = 86400
+COPY_CHUNK_SIZE = 64 * 1024
+MAX_ENTRIES = 256  # registered file versions kept; the least recently registered are dropped
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+_LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+def is_loopback_host(host_header: Optional[str]) -> bool:
+    """Check whether a Host header (``name[:port]``) names this machine's loopback interface."""
+    host = (host_header or "").strip().lower()
+    if host.startswith("["):
+        host = host[1:].split("]", 1)[0]
+    elif host.count(":") == 1:
+        host = host.split(":", 1)[0]
+    return host in _LOOPBACK_HOSTS or host.startswith("127.")
+
+
+class _Entry:
+    """A registered PDF: path plus the validators captured at registration."""
+
+    __slots__ = ("path", "size", "mtime", "etag")
+
+    def __init__(self, path: Path, stat: os.stat_result):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        version = f"{stat.st_ino}-{stat.st_size}-{stat.st_mtime_ns}"
+        self.etag = '"' + hashlib.sha1(version.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` Range header.
+
+    Args:
+        header: Range header value
+        size: Resource size in bytes
+
+    Returns:
+        (start, end) inclusive byte offsets, or None to serve the whole file
+
+    Raises:
+        ValueError: If the range cannot be satisfied (respond 416)
+    """
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        # Multiple or malformed ranges: serving the full body is always valid
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError("empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(f"range {header} not satisfiable for {size} bytes")
+    return start, min(end, size - 1)
+
+
+class _PDFRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET/HEAD for registered PDF tokens."""
+
+    server_version = "JSONQA-PDF/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("pdf-server %s - %s", self.address_string(), format % args)
+
+    def _serve(self, send_body: bool) -> None:
+        entry = self.server.pdf_server.lookup(self.path)
+        if entry is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            stat = entry.path.stat()
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        if stat.st_size != entry.size or stat.st_mtime != entry.mtime:
+            # The URL identifies one version of the file; the viewer re-registers on change
+            self.send_error(HTTPStatus.GONE)
+            return
+
+        if self.headers.get("If-None-Match") == entry.etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(entry)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        byte_range = None
+        if_range = self.headers.get("If-Range")
+        if if_range is None or if_range == entry.etag:
+            try:
+                byte_range = parse_range(self.headers.get("Range"), entry.size)
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{entry.size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        start, end = byte_range if byte_range else (0, entry.size - 1)
+        length = max(end - start + 1, 0)
+
+        self.send_response(HTTPStatus.PARTIAL_CONTENT if byte_range else HTTPStatus.OK)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Content-Disposition", f"inline; filename=\"{entry.path.name}\"")
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{entry.size}")
+        self._send_cache_headers(entry)
+        self.end_headers()
+
+        if not send_body or length == 0:
+            return
+        try:
+            with open(entry.path, "rb") as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("pdf-server client closed connection for %s", entry.path.name)
+
+    def _send_cache_headers(self, entry: _Entry) -> None:
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", entry.etag)
+        self.send_header("Last-Modified", formatdate(entry.mtime, usegmt=True))
+        self.send_header("Cache-Control", f"private, max-age={CACHE_MAX_AGE_SECONDS}")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+
+class PDFFileServer:
+    """
+    Background HTTP server for registered PDF files.
+
+    Only files passed to register() are reachable. Each URL carries an HMAC token of
+    the file's path and version, so URLs cannot be guessed and change when the file does.
+    At most ``max_entries`` registrations are kept; older URLs then return 404.
+
+    URLs start with ``public_url`` when it is set (e.g. a reverse-proxy prefix), and
+    with the server's own loopback address otherwise, which only a browser on the
+    same machine can reach.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, public_url: Optional[str] = None,
+                 max_entries: int = MAX_ENTRIES):
+        self.host = host
+        self.port = port
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.max_entries = max(1, max_entries)
+        self._secret = secrets.token_bytes(32)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._httpd is not None
+
+    @property
+    def base_url(self) -> Optional[str]:
+        """URL prefix the browser uses to reach this server."""
+        if self.public_url:
+            return self.public_url
+        if self._httpd is None:
+            return None
+        host, port = self._httpd.server_address[:2]
+        if host in ("0.0.0.0", ""):
+            host = DEFAULT_HOST
+        return f"http://{host}:{port}"
+
+    def reachable_from(self, browser_host: Optional[str]) -> bool:
+        """
+        Check whether a browser that reached the app as ``browser_host`` can load the URLs.
+
+        Without a ``public_url`` the URLs point at this machine's loopback address, so
+        only local browsers (or an unknown host, e.g. outside a browser session) qualify.
+        """
+        return bool(self.public_url) or browser_host is None or is_loopback_host(browser_host)
+
+    def start(self) -> bool:
+        """Start serving on a daemon thread. Returns False if the socket cannot be bound."""
+        if self._httpd is not None:
+            return True
+        try:
+            httpd = ThreadingHTTPServer((self.host, self.port), _PDFRequestHandler)
+        except OSError as e:
+            logger.error(f"Could not start PDF server on {self.host}:{self.port}: {e}")
+            return False
+        httpd.daemon_threads = True
+        httpd.pdf_server = self
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name="pdf-server", daemon=True)
+        self._thread.start()
+        logger.info(f"PDF server listening on {self.base_url}")
+        return True
+
+    def stop(self) -> None:
+        """Stop the server and forget registered files."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        self._httpd = None
+        self._thread = None
+        with self._lock:
+            self._entries.clear()
+
+    def register(self, pdf_path: Path) -> Optional[str]:
+        """
+        Make a PDF reachable and return its URL.
+
+        Args:
+            pdf_path: PDF file to serve
+
+        Returns:
+            URL for the current version of the file, or None if the server is not
+            running or the file cannot be read
+        """
+        base_url = self.base_url
+        if base_url is None:
+            return None
+        try:
+            path = Path(pdf_path).resolve()
+            entry = _Entry(path, path.stat())
+        except OSError as e:
+            logger.warning(f"Cannot serve PDF {pdf_path}: {e}")
+            return None
+
+        token = hmac.new(
+            self._secret, f"{path}\0{entry.etag}".encode("utf-8"), hashlib.sha256
+        ).hexdigest()[:32]
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return f"{base_url}{ROUTE_PREFIX}{token}/{quote(path.name)}"
+
+    def lookup(self, request_path: str) -> Optional[_Entry]:
+        """Resolve a request path to a registered entry."""
+        path = unquote(request_path.split("?", 1)[0])
+        if not path.startswith(ROUTE_PREFIX):
+            return None
+        token = path[len(ROUTE_PREFIX):].split("/", 1)[0]
+        with self._lock:
+            return self._entries.get(token)
+
+
+# Process-wide server shared by all sessions
+_server: Optional[PDFFileServer] = None
+_server_lock = threading.Lock()
+
+
+def start_pdf_server(config: Optional[Dict[str, Any]] = None) -> Optional[PDFFileServer]:
+    """
+    Start the process-wide PDF server once, using the ``pdf_viewer`` config section.
+
+    Without ``public_url`` the URLs use the server's loopback address, which works for
+    local installs; browsers on other hosts get inline embedding (see ``get_pdf_url``).
+
+    Args:
+        config: Application configuration (``pdf_viewer.serve_by_url``, ``host``, ``port``,
+            ``public_url``, ``max_entries``)
+
+    Returns:
+        The running server, or None when disabled or it could not start
+    """
+    global _server
+    settings = (config or {}).get("pdf_viewer", {}) or {}
+    if not settings.get("serve_by_url", True):
+        return None
+
+    with _server_lock:
+        if _server is not None and _server.running:
+            return _server
+        try:
+            port = int(settings.get("port", DEFAULT_PORT) or 0)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid pdf_viewer.port {settings.get('port')!r}; using a free port")
+            port = DEFAULT_PORT
+        server = PDFFileServer(
+            host=settings.get("host") or DEFAULT_HOST,
+            port=port,
+            public_url=settings.get("public_url"),
+            max_entries=int(settings.get("max_entries") or MAX_ENTRIES),
+        )
+        if not server.start():
+            return None
+        _server = server
+        return _server
+
+
+def get_pdf_server() -> Optional[PDFFileServer]:
+    """Return the running PDF server, if any."""
+    return _server if _server is not None and _server.running else None
+
+
+def get_pdf_url(pdf_path: Path, browser_host: Optional[str] = None) -> Optional[str]:
+    """
+    Register a PDF with the running server and return its URL.
+
+    Args:
+        pdf_path: PDF file to serve
+        browser_host: Host header the browser reached the app with (None if unknown)
+
+    Returns:
+        The URL, or None if not serving or the browser cannot reach the server
+    """
+    server = get_pdf_server()
+    if server is None or not server.reachable_from(browser_host):
+        return None
+    return server.register(pdf_path)
+
+
+def stop_pdf_server() -> None:
+    """Stop the process-wide PDF server."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.stop()
+        _server = None
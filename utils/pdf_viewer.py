@@ -9,6 +9,8 @@ from typing import Optional, Any
 import base64
 import logging
 
+from .perf import timed
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -44,24 +46,117 @@ class PDFViewer:
             logger.error(f"Error in PDF preview for {filename}: {e}", exc_info=True)
     
     @staticmethod
+    @timed("PDFViewer._display_pdf")
     def _display_pdf(pdf_path: Path):
         """Display PDF using available methods."""
         try:
-            # Method 1: Try streamlit-pdf-viewer if available
+            # Method 1: Show pre-rendered page images (full PDF available on request)
+            if PDFViewer._try_cached_pages(pdf_path):
+                return
+            
+            # Method 2: Serve by URL from the local PDF server (cached, range requests)
+            if PDFViewer._try_url_embed(pdf_path):
+                return
+            
+            # Method 3: Try streamlit-pdf-viewer if available
             if PDFViewer._try_streamlit_pdf_viewer(pdf_path):
                 return
             
-            # Method 2: Try iframe embed
+            # Method 4: Try base64 iframe embed (re-sends the whole file every rerun)
             if PDFViewer._try_iframe_embed(pdf_path):
                 return
             
-            # Method 3: Fallback to file info and download
+            # Method 5: Fallback to file info and download
             PDFViewer._display_pdf_fallback(pdf_path)
             
         except Exception as e:
             logger.error(f"Error displaying PDF {pdf_path}: {e}")
             PDFViewer._display_pdf_fallback(pdf_path)
     
+    @staticmethod
+    def _try_cached_pages(pdf_path: Path) -> bool:
+        """Try to show cached page images; schedules rendering when they are missing."""
+        try:
+            from .pdf_cache import get_pdf_cache
+            cache = get_pdf_cache()
+            if cache is None:
+                return False
+            
+            manifest = cache.get_pages(pdf_path)
+            if not manifest or not manifest.get('pages'):
+                cache.warm(pdf_path)
+                return False
+            
+            if st.toggle("Show full PDF", key=f"pdf_full_view_{pdf_path.name}"):
+                return False
+            
+            pages = manifest['pages']
+            page_count = manifest.get('page_count', len(pages))
+            page_number = 1
+            if len(pages) > 1:
+                page_number = st.selectbox(
+                    "Page",
+                    options=[page['page'] for page in pages],
+                    key=f"pdf_page_{pdf_path.name}"
+                )
+            page = pages[page_number - 1]
+            
+            # Largest rendered scale for reading, smallest for the page strip
+            st.image(str(page['images'][manifest['scales'][-1]]), width='stretch')
+            if len(pages) < page_count:
+                st.caption(f"Showing the first {len(pages)} of {page_count} pages. Use 'Show full PDF' for the rest.")
+            
+            if len(pages) > 1:
+                thumbnails = [str(p['images'][manifest['scales'][0]]) for p in pages]
+                st.image(thumbnails, caption=[f"Page {p['page']}" for p in pages], width=80)
+            
+            # Add PDF info below
+            PDFViewer._display_pdf_info(pdf_path)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error showing cached PDF pages: {e}")
+            return False
+    
+    @staticmethod
+    def _browser_host() -> Optional[str]:
+        """Host the browser used to reach the app (None outside a browser session)."""
+        try:
+            return st.context.headers.get("Host")
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _try_url_embed(pdf_path: Path) -> bool:
+        """Try to embed PDF by URL from the local PDF server."""
+        try:
+            from .pdf_server import get_pdf_url
+            pdf_url = get_pdf_url(pdf_path, browser_host=PDFViewer._browser_host())
+            if not pdf_url:
+                return False
+            
+            iframe_html = f"""
+            <iframe 
+                src="{pdf_url}" 
+                width="100%" 
+                height="600px" 
+                style="border: 1px solid #ccc; border-radius: 5px;">
+                <p>Your browser does not support PDFs. 
+                <a href="{pdf_url}" target="_blank">Open the PDF</a>.</p>
+            </iframe>
+            """
+            
+            st.markdown(iframe_html, unsafe_allow_html=True)
+            st.caption(f"[Open PDF in a new tab]({pdf_url})")
+            
+            # Add PDF info below
+            PDFViewer._display_pdf_info(pdf_path)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error with URL embed: {e}")
+            return False
+    
     @staticmethod
     def _try_streamlit_pdf_viewer(pdf_path: Path) -> bool:
         """Try to use streamlit-pdf-viewer package."""
@@ -151,21 +246,29 @@ class PDFViewer:
     def _display_pdf_info(pdf_path: Path):
         """Display PDF file information."""
         try:
-            stat = pdf_path.stat()
+            from .pdf_cache import get_cached_pdf_info
+            info = get_cached_pdf_info(pdf_path)
+            if info:
+                size, modified = info['size'], info['modified']
+            else:
+                stat = pdf_path.stat()
+                size, modified = stat.st_size, stat.st_mtime
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.metric("File Name", pdf_path.name)
-                size_mb = stat.st_size / (1024 * 1024)
+                size_mb = size / (1024 * 1024)
                 if size_mb >= 1:
                     st.metric("File Size", f"{size_mb:.1f} MB")
                 else:
-                    st.metric("File Size", f"{stat.st_size / 1024:.1f} KB")
+                    st.metric("File Size", f"{size / 1024:.1f} KB")
+                if info and info.get('page_count'):
+                    st.metric("Pages", info['page_count'])
             
             with col2:
                 from datetime import datetime
-                modified_time = datetime.fromtimestamp(stat.st_mtime)
+                modified_time = datetime.fromtimestamp(modified)
                 st.metric("Modified", modified_time.strftime("%Y-%m-%d %H:%M"))
                 st.metric("Path", f".../{pdf_path.parent.name}/{pdf_path.name}")
             
@@ -176,6 +279,18 @@ class PDFViewer:
     def _try_display_pdf_text_preview(pdf_path: Path):
         """Try to display a text preview of the PDF content."""
         try:
+            from .pdf_cache import get_pdf_cache
+            cache = get_pdf_cache()
+            if cache is not None and cache.extract_info:
+                # Read extracted text from the cache; extraction runs in the worker pool
+                info = cache.get_info(pdf_path)
+                if info is None:
+                    cache.warm(pdf_path)
+                    st.caption("📝 Text preview is being prepared...")
+                    return
+                PDFViewer._render_text_preview(info['pages'][0]['text'] if info['pages'] else "")
+                return
+            
             # Try to extract text using PyPDF2 if available
             try:
                 import PyPDF2
@@ -186,23 +301,7 @@ class PDFViewer:
                     if len(pdf_reader.pages) > 0:
                         # Extract text from first page
                         first_page = pdf_reader.pages[0]
-                        text = first_page.extract_text()
-                        
-                        if text and text.strip():
-                            with st.expander("📝 Text Preview (First Page)"):
-                                # Show first 500 characters
-                                preview_text = text[:500]
-                                if len(text) > 500:
-                                    preview_text += "..."
-                                
-                                st.text_area(
-                                    "Extracted Text:",
-                                    value=preview_text,
-                                    height=150,
-                                    disabled=True
-                                )
-                        else:
-                            st.info("📄 PDF appears to be image-based (no extractable text)")
+                        PDFViewer._render_text_preview(first_page.extract_text())
                 
             except ImportError:
                 logger.info("PyPDF2 not available for text extraction")
@@ -212,6 +311,25 @@ class PDFViewer:
         except Exception as e:
             logger.error(f"Error in PDF text preview: {e}")
     
+    @staticmethod
+    def _render_text_preview(text: Optional[str]):
+        """Show the first page's text, or note that the PDF has no text layer."""
+        if text and text.strip():
+            with st.expander("📝 Text Preview (First Page)"):
+                # Show first 500 characters
+                preview_text = text[:500]
+                if len(text) > 500:
+                    preview_text += "..."
+                
+                st.text_area(
+                    "Extracted Text:",
+                    value=preview_text,
+                    height=150,
+                    disabled=True
+                )
+        else:
+            st.info("📄 PDF appears to be image-based (no extractable text)")
+    
     @staticmethod
     def _display_pdf_not_found(filename: str):
         """Display message when PDF is not found."""
@@ -267,6 +385,13 @@ class PDFViewer:
             'page_count': None
         }
         
+        from .pdf_cache import get_cached_pdf_info
+        info = get_cached_pdf_info(pdf_path)
+        if info is not None:
+            metadata.update(info['metadata'])
+            metadata['page_count'] = info['page_count']
+            return metadata
+        
         try:
             import PyPDF2
             
@@ -0,0 +1,288 @@
+"""
+Per-rerun phase timing for JSON QA webapp.
+``span(name)`` (a context manager) and ``timed(name)`` (a decorator) time phases of a
+script run such as listing the queue, loading the edit session, rendering the form,
+computing the diff, embedding the PDF or the submission stages. Spans are collected
+per rerun on the script thread (``begin_rerun`` / ``end_rerun``; fragment reruns,
+which skip ``main()``, are tagged with ``fragment=True``), kept in a
+process-wide history for percentiles and, when ``perf.log_file`` is set, appended to
+a JSONL log (one line per span, written once per rerun).
+
+Recording a span costs two ``perf_counter`` calls and an append; with
+``perf.enabled: false`` spans are not recorded at all.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Durations kept per span name for percentiles
+DEFAULT_HISTORY = 500
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class SpanRecord:
+    """One timed phase; times are in milliseconds from the start of the rerun."""
+    name: str
+    start_ms: float
+    duration_ms: float
+    depth: int
+
+
+@dataclass
+class RerunProfile:
+    """Spans recorded during one script run (or one rerun of a fragment)."""
+    page: str = ""
+    session: str = ""
+    fragment: bool = False
+    started: float = field(default_factory=time.perf_counter)
+    wall_time: float = field(default_factory=time.time)
+    spans: List[SpanRecord] = field(default_factory=list)
+    finished: Optional[float] = None
+
+    @property
+    def total_name(self) -> str:
+        """History and log name of the whole run: ``rerun`` or ``fragment_rerun``."""
+        return 'fragment_rerun' if self.fragment else 'rerun'
+
+    def total_ms(self) -> float:
+        """Duration of the rerun (so far, if it has not finished)."""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def phases(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate spans by name and nesting depth, in order of first start.
+
+        Returns:
+            Dicts with ``name``, ``depth``, ``calls`` and ``total_ms``
+        """
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for record in sorted(self.spans, key=lambda record: record.start_ms):
+            row = rows.setdefault((record.name, record.depth),
+                                  {'name': record.name, 'depth': record.depth, 'calls': 0, 'total_ms': 0.0})
+            row['calls'] += 1
+            row['total_ms'] += record.duration_ms
+        return list(rows.values())
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(durations: Dict[str, Iterable[float]]) -> Dict[str, Dict[str, float]]:
+    """Return count, p50/p90/p99 and max per span name."""
+    summary = {}
+    for name, values in durations.items():
+        values = list(values)
+        row = {'count': len(values)}
+        row.update({f"p{pct}": round(percentile(values, pct), 2) for pct in PERCENTILES})
+        row['max'] = round(max(values), 2) if values else 0.0
+        summary[name] = row
+    return summary
+
+
+class PerfRecorder:
+    """Process-wide span history and JSONL log."""
+
+    def __init__(self, history: int = DEFAULT_HISTORY, log_file: Optional[Path] = None):
+        self._lock = threading.Lock()
+        self._history: Dict[str, Deque[float]] = {}
+        self.history = history
+        self.log_file = Path(log_file) if log_file else None
+        self.reruns = 0
+
+    def configure(self, history: int, log_file: Optional[Path]) -> None:
+        with self._lock:
+            if history != self.history:
+                self.history = history
+                self._history = {name: deque(values, maxlen=history) for name, values in self._history.items()}
+            self.log_file = Path(log_file) if log_file else None
+
+    def add(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            values = self._history.get(name)
+            if values is None:
+                values = self._history[name] = deque(maxlen=self.history)
+            values.append(duration_ms)
+
+    def observe(self, profile: RerunProfile) -> None:
+        """Add a finished rerun's spans to the history and the log."""
+        with self._lock:
+            self.reruns += 1
+            rerun = self.reruns
+            log_file = self.log_file
+        for record in profile.spans:
+            self.add(record.name, record.duration_ms)
+        self.add(profile.total_name, profile.total_ms())
+        if log_file is not None:
+            self._write(log_file, profile, rerun)
+
+    def _write(self, log_file: Path, profile: RerunProfile, rerun: int) -> None:
+        base = {'ts': round(profile.wall_time, 3), 'session': profile.session, 'page': profile.page, 'rerun': rerun,
+                'fragment': profile.fragment}
+        lines = [json.dumps({**base, 'span': record.name, 'ms': round(record.duration_ms, 3),
+                             'start_ms': round(record.start_ms, 3), 'depth': record.depth})
+                 for record in profile.spans]
+        lines.append(json.dumps({**base, 'span': profile.total_name, 'ms': round(profile.total_ms(), 3),
+                                 'start_ms': 0.0, 'depth': -1}))
+        try:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            # One write per rerun; O_APPEND keeps lines from concurrent sessions whole
+            with open(log_file, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write perf log {log_file}: {e}")
+
+    def summary(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Return percentiles of the recorded history, for all or the given span names."""
+        with self._lock:
+            durations = {name: list(values) for name, values in self._history.items()
+                         if names is None or name in names}
+        return summarize(durations)
+
+
+_recorder = PerfRecorder()
+_local = threading.local()
+_enabled = True
+_configured = False
+
+
+def get_recorder() -> PerfRecorder:
+    """Return the process-wide recorder."""
+    return _recorder
+
+
+def configure(settings: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Apply the ``perf`` settings: ``enabled``, ``log_file`` and ``history``.
+
+    Args:
+        settings: ``perf`` section (defaults to the current configuration)
+    """
+    global _enabled, _configured
+    _configured = True
+    if settings is None:
+        from .config_service import get_config
+        settings = get_config().section('perf')
+    _enabled = bool(settings.get('enabled', True))
+    _recorder.configure(int(settings.get('history') or DEFAULT_HISTORY), settings.get('log_file'))
+
+
+def begin_rerun(page: str = "", session: str = "", fragment: bool = False) -> Optional[RerunProfile]:
+    """Start collecting spans for a script run (or a fragment rerun) on the current thread."""
+    if not _configured:
+        from .config_service import get_config_service
+        configure()
+        get_config_service().subscribe(lambda old, new: configure(new.section('perf')), sections=('perf',))
+    _local.depth = 0
+    _local.profile = RerunProfile(page=page, session=session, fragment=fragment) if _enabled else None
+    return _local.profile
+
+
+def current_profile() -> Optional[RerunProfile]:
+    """Return the profile of the script run on the current thread, if any."""
+    return getattr(_local, 'profile', None)
+
+
+def end_rerun() -> Optional[RerunProfile]:
+    """Finish the current thread's script run and record its spans."""
+    profile = current_profile()
+    _local.profile = None
+    if profile is None:
+        return None
+    profile.finished = time.perf_counter()
+    _recorder.observe(profile)
+    return profile
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as phase ``name``.
+
+    Inside a rerun the span is added to its profile; elsewhere (background threads,
+    tools) only to the process-wide history.
+    """
+    if not _enabled:
+        yield
+        return
+    depth = getattr(_local, 'depth', 0)
+    _local.depth = depth + 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ended = time.perf_counter()
+        _local.depth = depth
+        profile = getattr(_local, 'profile', None)
+        if profile is not None:
+            profile.spans.append(SpanRecord(name, (started - profile.started) * 1000, (ended - started) * 1000, depth))
+        else:
+            _recorder.add(name, (ended - started) * 1000)
+
+
+def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator form of ``span``; the name defaults to the function's qualified name."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name: str, duration_ms: float) -> None:
+    """Add a span measured elsewhere (e.g. the submission validation stages)."""
+    if not _enabled:
+        return
+    profile = current_profile()
+    if profile is not None:
+        start_ms = (time.perf_counter() - profile.started) * 1000 - duration_ms
+        profile.spans.append(SpanRecord(name, start_ms, duration_ms, getattr(_local, 'depth', 0)))
+    else:
+        _recorder.add(name, duration_ms)
+
+
+def summarize_log(path: Path, page: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Return percentiles per span name from a JSONL perf log.
+
+    Args:
+        path: Log file
+        page: Only count reruns of this page
+
+    Returns:
+        ``summarize`` output
+    """
+    durations: Dict[str, List[float]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if page is not None and entry.get('page') != page:
+                continue
+            durations.setdefault(entry.get('span', '?'), []).append(float(entry.get('ms', 0.0)))
+    return summarize(durations)
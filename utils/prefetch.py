@@ -0,0 +1,322 @@
+"""
+Edit session prefetching for JSON QA webapp.
+On claim and on submit, a background thread loads the document a reviewer is likely to
+open next (JSON, active schema, schema-filtered snapshot, validation model) and warms its
+PDF artifacts. Results go into a small cache shared by all sessions, so the edit view can
+open the document without blocking on disk I/O.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config_service import get_config_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFETCH_DOCUMENTS = 8  # documents kept in the cache; 0 disables prefetching
+PREFETCH_WAIT_SECONDS = 5.0  # how long the edit view waits for an in-flight prefetch
+
+
+@dataclass(frozen=True)
+class PrefetchedDocument:
+    """
+    A document prepared for the edit view.
+
+    The data dictionaries are shared across sessions and must not be mutated; the
+    SessionManager setters deep-copy them.
+    """
+
+    filename: str
+    file_signature: Tuple[int, int]
+    schema_path: str
+    schema_mtime: float
+    schema: Dict[str, Any]
+    schema_fields: frozenset
+    original_data: Dict[str, Any]
+    filtered_data: Dict[str, Any]
+    extras: List[str]
+    model_class: Any = None
+    pdf_path: Optional[Path] = field(default=None, compare=False)
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _primary_schema_path() -> str:
+    from .schema_loader import get_config_value
+    return get_config_value('schema', 'primary_schema', 'default_schema.yaml')
+
+
+def _schema_mtime(schema_path: str) -> Optional[float]:
+    from .schema_loader import SCHEMAS_DIR
+    try:
+        return os.path.getmtime(SCHEMAS_DIR / schema_path)
+    except OSError:
+        return None
+
+
+def build_prefetched_document(filename: str) -> Optional[PrefetchedDocument]:
+    """
+    Load and prepare a document the way EditView._initialize_edit_data does.
+
+    Runs on the prefetch thread, so it only uses plain loaders and never touches
+    session state.
+
+    Args:
+        filename: JSON filename in json_docs
+
+    Returns:
+        The prepared document, or None if it cannot be loaded
+    """
+    from .file_utils import get_directories, load_json_file, get_pdf_path
+    from .schema_loader import load_schema, extract_field_names
+    from .model_builder import create_model_from_schema, filter_to_schema_fields
+    from .validator_compiler import compile_schema
+    from .business_rules import get_rule_set
+    from .frozen_doc import freeze
+
+    signature = _file_signature(get_directories().json_docs / filename)
+    schema_path = _primary_schema_path()
+    schema_mtime = _schema_mtime(schema_path)
+    if signature is None or schema_mtime is None:
+        return None
+
+    schema = load_schema(schema_path)
+    if not schema:
+        return None
+    schema_fields = frozenset(extract_field_names(schema))
+
+    original_data = load_json_file(filename, fields=schema_fields or None)
+    if not original_data:
+        return None
+    filtered_data, extras = filter_to_schema_fields(original_data, set(schema_fields))
+    # Frozen here so the session adopts it without copying
+    filtered_data = freeze(filtered_data)
+    skipped_fields = getattr(original_data, "skipped_fields", None)
+    if skipped_fields:
+        extras = sorted(set(extras) | set(skipped_fields))
+
+    # Shared, process-wide caches: validators and business rules for the schema
+    compile_schema(schema).comprehensive_validators
+    get_rule_set(schema)
+
+    model_class = None
+    try:
+        model_class = create_model_from_schema(schema, f"Model_{filename.replace('.', '_')}")
+    except Exception as e:
+        logger.debug(f"Prefetch could not build model for {filename}: {e}")
+
+    pdf_path = get_pdf_path(filename)
+    if pdf_path is not None:
+        from .pdf_cache import get_pdf_cache
+        cache = get_pdf_cache()
+        if cache is not None:
+            cache.warm(pdf_path)
+
+    return PrefetchedDocument(
+        filename=filename,
+        file_signature=signature,
+        schema_path=schema_path,
+        schema_mtime=schema_mtime,
+        schema=schema,
+        schema_fields=schema_fields,
+        original_data=original_data,
+        filtered_data=filtered_data,
+        extras=list(extras),
+        model_class=model_class,
+        pdf_path=pdf_path,
+    )
+
+
+def pick_next_document(exclude: Optional[str] = None) -> Optional[str]:
+    """
+    Return the document a reviewer is most likely to open next.
+
+    That is the first unlocked file in queue order (oldest first), skipping ``exclude``.
+    """
+    from .file_utils import list_unverified_files
+
+    for file_info in list_unverified_files():
+        if file_info['filename'] != exclude and not file_info['is_locked']:
+            return file_info['filename']
+    return None
+
+
+class DocumentPrefetcher:
+    """Bounded LRU of prefetched documents filled by one background thread."""
+
+    def __init__(self, max_documents: int = DEFAULT_PREFETCH_DOCUMENTS):
+        self.max_documents = max(int(max_documents), 0)
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, PrefetchedDocument]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_documents > 0
+
+    def prefetch(self, filename: str) -> Optional[Future]:
+        """Prefetch a document in the background unless it is cached and current."""
+        if not self.enabled or not filename:
+            return None
+        with self._lock:
+            future = self._in_flight.get(filename)
+            if future is not None:
+                return future
+            if filename in self._documents and self._is_current(self._documents[filename]):
+                return None
+            future = self._get_executor().submit(self._load, filename)
+            self._in_flight[filename] = future
+        return future
+
+    def prefetch_next(self, exclude: Optional[str] = None) -> Optional[Future]:
+        """Pick the likely next document and prefetch it, all on the background thread."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._get_executor().submit(self._prefetch_next, exclude)
+
+    def get(self, filename: str, wait: float = PREFETCH_WAIT_SECONDS) -> Optional[PrefetchedDocument]:
+        """
+        Return the prefetched document if it still matches the files on disk.
+
+        If the document is being prefetched, waits up to ``wait`` seconds for it.
+        """
+        with self._lock:
+            future = self._in_flight.get(filename)
+        if future is not None and wait > 0:
+            try:
+                future.result(timeout=wait)
+            except Exception as e:
+                logger.debug(f"Prefetch of {filename} not available: {e}")
+
+        with self._lock:
+            document = self._documents.get(filename)
+            if document is None:
+                return None
+            if not self._is_current(document):
+                del self._documents[filename]
+                return None
+            self._documents.move_to_end(filename)
+            return document
+
+    def discard(self, filename: str) -> None:
+        """Drop a document, e.g. after it has been submitted."""
+        with self._lock:
+            self._documents.pop(filename, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._in_flight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prefetch_next(self, exclude: Optional[str]) -> Optional[str]:
+        # Runs on the worker thread, so the load is queued behind it rather than awaited
+        filename = pick_next_document(exclude)
+        if filename:
+            self.prefetch(filename)
+        return filename
+
+    def _load(self, filename: str) -> Optional[PrefetchedDocument]:
+        try:
+            document = build_prefetched_document(filename)
+        except Exception as e:
+            logger.warning(f"Prefetch failed for {filename}: {e}")
+            document = None
+        with self._lock:
+            self._in_flight.pop(filename, None)
+            if document is not None:
+                self._documents[filename] = document
+                self._documents.move_to_end(filename)
+                while len(self._documents) > self.max_documents:
+                    self._documents.popitem(last=False)
+        if document is not None:
+            logger.debug(f"Prefetched edit session for {filename}")
+        return document
+
+    @staticmethod
+    def _is_current(document: PrefetchedDocument) -> bool:
+        from .file_utils import get_directories
+        if _file_signature(get_directories().json_docs / document.filename) != document.file_signature:
+            return False
+        return (
+            _primary_schema_path() == document.schema_path
+            and _schema_mtime(document.schema_path) == document.schema_mtime
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        return self._executor
+
+
+# Process-wide prefetcher shared by all sessions
+_prefetcher: Optional[DocumentPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> DocumentPrefetcher:
+    """Return the process-wide prefetcher, sized by ``processing.prefetch_documents``."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            from .schema_loader import get_config_value
+            try:
+                size = int(get_config_value('processing', 'prefetch_documents', DEFAULT_PREFETCH_DOCUMENTS))
+            except (TypeError, ValueError):
+                size = DEFAULT_PREFETCH_DOCUMENTS
+            _prefetcher = DocumentPrefetcher(size)
+        return _prefetcher
+
+
+def _on_config_change(old, new) -> None:
+    """Configuration subscriber: follow the prefetch size and drop documents built for another schema."""
+    prefetcher = _prefetcher
+    if prefetcher is None:
+        return
+    if old.section('schema') != new.section('schema'):
+        prefetcher.clear()
+    try:
+        size = int(new.get('processing', 'prefetch_documents', DEFAULT_PREFETCH_DOCUMENTS))
+    except (TypeError, ValueError):
+        size = DEFAULT_PREFETCH_DOCUMENTS
+    if size != prefetcher.max_documents:
+        logger.info(f"Prefetch size changed to {size}")
+        prefetcher.max_documents = max(size, 0)
+        prefetcher.clear()
+
+
+get_config_service().subscribe(_on_config_change, sections=('schema', 'processing'))
+
+
+def prefetch_document(filename: str) -> Optional[Future]:
+    """Prefetch a specific document (e.g. the one just claimed)."""
+    return get_prefetcher().prefetch(filename)
+
+
+def prefetch_next_document(exclude: Optional[str] = None) -> Optional[Future]:
+    """Prefetch the likely next document in the queue."""
+    return get_prefetcher().prefetch_next(exclude)
+
+
+def get_prefetched_document(filename: str) -> Optional[PrefetchedDocument]:
+    """Return a current prefetched document, or None."""
+    return get_prefetcher().get(filename)
@@ -5,7 +5,6 @@ Handles file listing, sorting, filtering, and display.
 
 import streamlit as st
 import streamlit.components.v1 as components
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
@@ -407,6 +406,9 @@ class QueueView:
                     st.caption(f"📄 {size_mb:.1f} MB")
                 else:
                     st.caption(f"📄 {file_info['size']:,} bytes")
+                
+                if file_info.get('exceeds_size_limit'):
+                    st.caption("⚠️ Over size limit: selected fields load in streaming mode")
             
             with col2:
                 # Creation date
@@ -512,7 +514,14 @@ class QueueView:
             pdf_path = get_pdf_path(file_info['filename'])
             if pdf_path and pdf_path.exists():
                 st.write(f"• PDF: ✅ Available ({pdf_path.name})")
-                st.write(f"• PDF size: {pdf_path.stat().st_size:,} bytes")
+                from .pdf_cache import get_cached_pdf_info
+                pdf_info = get_cached_pdf_info(pdf_path)
+                if pdf_info:
+                    st.write(f"• PDF size: {pdf_info['size']:,} bytes")
+                    if pdf_info.get('page_count'):
+                        st.write(f"• PDF pages: {pdf_info['page_count']}")
+                else:
+                    st.write(f"• PDF size: {pdf_path.stat().st_size:,} bytes")
             else:
                 st.write("• PDF: ❌ Not found")
             
@@ -584,6 +593,10 @@ class QueueView:
                     load_active_schema(schema_path)
                 except Exception as schema_exc:
                     logger.warning(f"Failed to preload schema for {filename}: {schema_exc}")
+                # Prepare this document and the likely next one in the background
+                from .prefetch import prefetch_document, prefetch_next_document
+                prefetch_document(filename)
+                prefetch_next_document(exclude=filename)
                 SessionManager.set_current_page('edit')
                 return True
             else:
@@ -722,6 +735,10 @@ class QueueView:
             st.sidebar.metric("Available", available_files)
             st.sidebar.metric("Locked", locked_files)
             
+            oversized_files = sum(1 for f in files if f.get('exceeds_size_limit'))
+            if oversized_files:
+                st.sidebar.metric("Over Size Limit", oversized_files)
+            
             if total_size > 1024 * 1024:
                 st.sidebar.metric("Total Size", f"{total_size / (1024 * 1024):.1f} MB")
             else:
@@ -0,0 +1,414 @@
+"""
+Widget render plans for JSON QA webapp.
+Turns a schema into an immutable, ordered list of field descriptors (widget type,
+prepared widget kwargs, hydration default, value coercer, data editor columns) so
+FormGenerator renders a form by looping over the plan instead of re-reading the
+schema dict for every field on every rerun.
+
+Plans are cached per process by schema content, so every session editing the same
+schema version shares one plan, and an edited schema gets a new plan automatically.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Plans kept per process (one per schema version in use)
+MAX_CACHED_PLANS = 32
+
+# Widgets rendered by a direct st.<widget_type>(**kwargs) call
+SIMPLE_WIDGETS = frozenset({'text_input', 'text_area', 'number_input', 'selectbox', 'checkbox'})
+
+# Group order used by the form; fields are grouped by name keywords
+GROUP_ORDER = ("General", "Financial", "Address", "Metadata", "Other")
+FINANCIAL_KEYWORDS = ('amount', 'price', 'cost', 'tax', 'total', 'subtotal', 'currency', 'payment')
+ADDRESS_KEYWORDS = ('address', 'street', 'city', 'state', 'zip', 'postal', 'country')
+METADATA_KEYWORDS = ('confidence', 'timestamp', 'created', 'modified', 'extraction', 'processing')
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """
+    Everything needed to render one field that does not depend on the session.
+
+    ``config`` is the schema's field configuration and is shared; it must not be
+    mutated. ``widget_kwargs`` excludes the per-session key and callbacks.
+    """
+
+    name: str
+    config: Mapping[str, Any]
+    field_type: str
+    widget_type: str
+    group: str
+    full_width: bool
+    widget_kwargs: Mapping[str, Any]
+    default: Any = None
+    coerce: Optional[Callable[[Any], Any]] = None
+    column_config: Optional[Mapping[str, Any]] = None
+    column_order: Tuple[str, ...] = ()
+    default_row: Optional[Mapping[str, Any]] = None
+    nested: Tuple["FieldPlan", ...] = ()
+
+
+@dataclass(frozen=True)
+class FormRenderPlan:
+    """Ordered field plans for a schema, grouped the way the form lays them out."""
+
+    fingerprint: str
+    groups: Tuple[Tuple[str, Tuple[FieldPlan, ...]], ...]
+    fields: Mapping[str, FieldPlan]
+
+
+def widget_type_for(field_config: Mapping[str, Any]) -> str:
+    """Return the form widget used for a field configuration."""
+    field_type = field_config.get('type', 'string')
+    if field_type == 'string':
+        if field_config.get('format') == 'date':
+            return 'date_input'
+        if field_config.get('format') == 'date-time':
+            return 'datetime_input'
+        if field_config.get('maxLength', 0) > 100:
+            return 'text_area'
+        return 'text_input'
+    if field_type == 'date':
+        return 'date_input'
+    if field_type == 'datetime':
+        return 'datetime_input'
+    if field_type == 'enum':
+        return 'selectbox'
+    if field_type == 'number':
+        return 'number_input'
+    if field_type == 'boolean':
+        return 'checkbox'
+    if field_type == 'array':
+        return 'array_editor'
+    if field_type == 'object':
+        return 'data_editor' if field_config.get('format') == 'data-grid' else 'json_editor'
+    return 'text_input'
+
+
+def group_for(field_name: str, field_config: Mapping[str, Any]) -> str:
+    """Return the form group a field belongs to."""
+    field_lower = field_name.lower()
+    if any(keyword in field_lower for keyword in FINANCIAL_KEYWORDS):
+        return "Financial"
+    if any(keyword in field_lower for keyword in ADDRESS_KEYWORDS):
+        return "Address"
+    if any(keyword in field_lower for keyword in METADATA_KEYWORDS):
+        return "Metadata"
+    if field_config.get('readonly', False):
+        return "Metadata"
+    return "General"
+
+
+def hydration_default(field_config: Mapping[str, Any]) -> Any:
+    """Value a widget starts with when the document has no value for the field."""
+    if 'default' in field_config:
+        return field_config['default']
+    if not field_config.get('required', False):
+        return None
+    field_type = field_config.get('type', 'string')
+    if field_type == 'string':
+        return ''
+    if field_type in ('number', 'integer'):
+        return 0
+    if field_type == 'boolean':
+        return False
+    if field_type == 'enum' and field_config.get('choices'):
+        return field_config['choices'][0]
+    if field_type == 'array':
+        return []
+    if field_type == 'object':
+        return {}
+    return None
+
+
+def _parse_date(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            from dateutil import parser
+            return parser.parse(value).date()
+        except Exception as e:
+            logger.warning(f"Failed to parse date string '{value}': {e}")
+            return None
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            from dateutil import parser
+            return parser.parse(value)
+        except Exception as e:
+            logger.warning(f"Failed to parse datetime string '{value}': {e}")
+            return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, datetime.min.time())
+    return value
+
+
+_COERCERS = {'date': _parse_date, 'datetime': _parse_datetime}
+
+
+def _optional_choice_label(choice: Any) -> str:
+    return "-- Select --" if choice is None else str(choice)
+
+
+def prepare_widget_kwargs(field_name: str, field_config: Mapping[str, Any], widget_type: str) -> Dict[str, Any]:
+    """
+    Build the session-independent kwargs for a field's widget.
+
+    Args:
+        field_name: Field name (label fallback)
+        field_config: Field configuration from schema
+        widget_type: Result of widget_type_for(field_config)
+
+    Returns:
+        Widget kwargs without key, value and callbacks
+    """
+    kwargs: Dict[str, Any] = {
+        'label': field_config.get('label', field_name),
+        'help': field_config.get('help', None),
+        'disabled': field_config.get('readonly', False),
+    }
+
+    if widget_type == 'text_input' and 'pattern' in field_config:
+        pattern = field_config['pattern']
+        kwargs['help'] = f"{kwargs['help']} | Pattern: {pattern}" if kwargs['help'] else f"Pattern: {pattern}"
+    elif widget_type == 'text_area':
+        kwargs['height'] = 100
+    elif widget_type == 'number_input':
+        if field_config.get('type', 'number') == 'integer':
+            kwargs['step'] = 1
+            kwargs['format'] = "%d"
+        else:
+            kwargs['step'] = 0.01
+            kwargs['format'] = "%.2f"
+    elif widget_type == 'selectbox' and field_config.get('type') == 'enum' and 'choices' in field_config:
+        options = list(field_config['choices'])
+        if not field_config.get('required', False):
+            options = [None] + options
+            kwargs['format_func'] = _optional_choice_label
+        kwargs['options'] = tuple(options)
+
+    return kwargs
+
+
+def build_column_config(properties: Mapping[str, Mapping[str, Any]]) -> Dict[str, Any]:
+    """Generate st.data_editor column configuration from object item properties."""
+    column_config = {}
+
+    for prop_name, prop_config in properties.items():
+        prop_type = prop_config.get("type", "string")
+        label = prop_config.get("label", prop_name)
+        help_text = prop_config.get("help", "")
+        required = prop_config.get("required", False)
+
+        if prop_type == "string":
+            column_config[prop_name] = st.column_config.TextColumn(
+                label=label,
+                help=help_text,
+                required=required,
+                max_chars=prop_config.get("max_length", None)
+            )
+        elif prop_type == "number":
+            column_config[prop_name] = st.column_config.NumberColumn(
+                label=label,
+                help=help_text,
+                required=required,
+                min_value=prop_config.get("min_value", None),
+                max_value=prop_config.get("max_value", None),
+                step=prop_config.get("step", 0.01),
+                format="%.2f"
+            )
+        elif prop_type == "integer":
+            column_config[prop_name] = st.column_config.NumberColumn(
+                label=label,
+                help=help_text,
+                required=required,
+                min_value=prop_config.get("min_value", None),
+                max_value=prop_config.get("max_value", None),
+                step=prop_config.get("step", 1),
+                format="%d"
+            )
+        elif prop_type == "boolean":
+            column_config[prop_name] = st.column_config.CheckboxColumn(
+                label=label,
+                help=help_text,
+                required=required
+            )
+        elif prop_type == "date":
+            column_config[prop_name] = st.column_config.DateColumn(
+                label=label,
+                help=help_text,
+                required=required
+            )
+        elif prop_type == "enum":
+            column_config[prop_name] = st.column_config.SelectboxColumn(
+                label=label,
+                help=help_text,
+                required=required,
+                options=prop_config.get("choices", []),
+                default=prop_config.get("default")
+            )
+        else:
+            # Default to text column
+            column_config[prop_name] = st.column_config.TextColumn(
+                label=label,
+                help=help_text,
+                required=required
+            )
+
+    return column_config
+
+
+def default_row_for(properties: Mapping[str, Mapping[str, Any]]) -> Dict[str, Any]:
+    """Row added by the object array editor's "Add Row" button."""
+    default_row: Dict[str, Any] = {}
+    for prop_name, prop_config in properties.items():
+        prop_type = prop_config.get('type', 'string')
+        if prop_type == 'string':
+            default_row[prop_name] = "New Item"
+        elif prop_type in ('number', 'integer'):
+            default_row[prop_name] = 1
+        elif prop_type == 'boolean':
+            default_row[prop_name] = False
+        else:
+            default_row[prop_name] = None
+    return default_row
+
+
+def is_object_array(field_config: Mapping[str, Any]) -> bool:
+    items = field_config.get("items")
+    return field_config.get("type") == "array" and isinstance(items, dict) and items.get("type") == "object"
+
+
+def build_field_plan(field_name: str, field_config: Mapping[str, Any]) -> FieldPlan:
+    """
+    Build the render plan for a single field.
+
+    Args:
+        field_name: Field name (widget keys are derived from it)
+        field_config: Field configuration from schema
+
+    Returns:
+        Immutable field plan
+    """
+    field_type = field_config.get('type', 'string')
+    widget_type = widget_type_for(field_config)
+
+    column_config = None
+    column_order: Tuple[str, ...] = ()
+    default_row: Optional[Mapping[str, Any]] = None
+    if field_type == 'array':
+        properties = (field_config.get('items') or {}).get('properties') or {}
+        if properties:
+            column_config = MappingProxyType(build_column_config(properties))
+            column_order = tuple(properties.keys())
+            default_row = MappingProxyType(default_row_for(properties))
+
+    nested: Tuple[FieldPlan, ...] = ()
+    if widget_type == 'json_editor' and field_config.get('properties'):
+        nested = tuple(
+            build_field_plan(f"{field_name}_{prop_name}", prop_config)
+            for prop_name, prop_config in field_config['properties'].items()
+        )
+
+    return FieldPlan(
+        name=field_name,
+        config=field_config,
+        field_type=field_type,
+        widget_type=widget_type,
+        group=group_for(field_name, field_config),
+        full_width=is_object_array(field_config),
+        widget_kwargs=MappingProxyType(prepare_widget_kwargs(field_name, field_config, widget_type)),
+        default=hydration_default(field_config),
+        coerce=_COERCERS.get(field_type),
+        column_config=column_config,
+        column_order=column_order,
+        default_row=default_row,
+        nested=nested,
+    )
+
+
+def build_render_plan(schema: Mapping[str, Any], fingerprint: str = "") -> FormRenderPlan:
+    """Build the render plan for every field of a schema, in form order."""
+    fields = {
+        name: build_field_plan(name, config)
+        for name, config in (schema.get('fields') or {}).items()
+    }
+    groups = tuple(
+        (group, tuple(plan for plan in fields.values() if plan.group == group))
+        for group in GROUP_ORDER
+    )
+    return FormRenderPlan(
+        fingerprint=fingerprint,
+        groups=tuple((group, plans) for group, plans in groups if plans),
+        fields=MappingProxyType(fields),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Caching
+# ---------------------------------------------------------------------------
+
+_plan_cache: "OrderedDict[str, FormRenderPlan]" = OrderedDict()
+_plan_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _fingerprint(schema: Mapping[str, Any]) -> str:
+    try:
+        return json.dumps(schema.get('fields') or {}, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return repr(schema.get('fields'))
+
+
+def get_render_plan(schema: Mapping[str, Any]) -> FormRenderPlan:
+    """
+    Return the shared render plan for a schema, building it at most once per version.
+
+    Plans are keyed by the content of the schema's fields, so sessions with equal
+    schemas share a plan and in-place schema edits produce a new one.
+    """
+    fingerprint = _fingerprint(schema)
+    with _plan_lock:
+        plan = _plan_cache.get(fingerprint)
+        if plan is not None:
+            _cache_stats["hits"] += 1
+            _plan_cache.move_to_end(fingerprint)
+            return plan
+
+    plan = build_render_plan(schema, fingerprint)
+    with _plan_lock:
+        _cache_stats["misses"] += 1
+        _plan_cache[fingerprint] = plan
+        while len(_plan_cache) > MAX_CACHED_PLANS:
+            _plan_cache.popitem(last=False)
+    logger.debug(f"Built render plan for {len(plan.fields)} fields")
+    return plan
+
+
+def clear_render_plan_cache() -> None:
+    """Drop all cached render plans."""
+    with _plan_lock:
+        _plan_cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
+
+
+def get_render_plan_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters and current size of the render plan cache."""
+    with _plan_lock:
+        return {**_cache_stats, "size": len(_plan_cache)}
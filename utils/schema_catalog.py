@@ -0,0 +1,142 @@
+"""
+Schema catalog for JSON QA webapp.
+Keeps the schema editor's list of schema files with their parsed metadata (field
+count, validity, errors) in a process-wide cache keyed by each file's path, mtime and
+size. A scan stats the directory and reparses only files that are new or changed.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# libyaml's loader is several times faster; fall back to the pure-Python one
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(text: str) -> Any:
+    """Parse YAML like ``yaml.safe_load``, using the libyaml loader when available."""
+    return yaml.load(text, Loader=_SafeLoader)
+
+
+# File signature: (mtime_ns, size)
+Signature = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Metadata of one schema file, as shown in the schema list."""
+    filename: str
+    path: str
+    size: int
+    modified: datetime
+    is_valid: bool = False
+    field_count: int = 0
+    error_message: Optional[str] = None
+    validation_errors: Tuple[str, ...] = field(default=(), compare=False)
+
+    def as_file_info(self) -> Dict[str, Any]:
+        """Return the dictionary ``list_schema_files`` returns for this file."""
+        return {
+            'filename': self.filename,
+            'path': self.path,
+            'size': self.size,
+            'modified': self.modified,
+            'is_valid': self.is_valid,
+            'field_count': self.field_count,
+            'error_message': self.error_message,
+        }
+
+
+# build(path, size, modified) -> CatalogEntry
+EntryBuilder = Callable[[Path, int, datetime], CatalogEntry]
+
+
+class SchemaCatalog:
+    """Cached catalog of the ``*.yaml`` files in schema directories."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # resolved directory -> {filename: (signature, entry)}
+        self._entries: Dict[str, Dict[str, Tuple[Signature, CatalogEntry]]] = {}
+        self.parsed = 0
+        self.reused = 0
+
+    def scan(self, directory: Path, build: EntryBuilder) -> List[CatalogEntry]:
+        """
+        Return entries for all ``*.yaml`` files in ``directory``, sorted by filename.
+
+        Files whose mtime and size are unchanged since the last scan are not read again.
+
+        Args:
+            directory: Schema directory
+            build: Builds the entry of a new or changed file
+
+        Returns:
+            Catalog entries
+
+        Raises:
+            OSError: If the directory cannot be scanned
+        """
+        key = str(Path(directory).resolve())
+        paths = list(Path(directory).glob("*.yaml"))
+        with self._lock:
+            cached = self._entries.get(key, {})
+        entries: Dict[str, Tuple[Signature, CatalogEntry]] = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError as e:
+                logger.warning(f"Cannot access file metadata for {path.name}: {e}")
+                entries[path.name] = ((0, -1), CatalogEntry(
+                    path.name, str(path), 0, datetime.now(), error_message=f"File access error: {str(e)}"))
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            previous = cached.get(path.name)
+            if previous is not None and previous[0] == signature:
+                entries[path.name] = previous
+                self.reused += 1
+                continue
+            entries[path.name] = (signature, build(path, stat.st_size, datetime.fromtimestamp(stat.st_mtime)))
+            self.parsed += 1
+        with self._lock:
+            self._entries[key] = entries
+        return sorted((entry for _, entry in entries.values()), key=lambda entry: entry.filename.lower())
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Forget one file (by path) or, without a path, the whole catalog."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = Path(path)
+            self._entries.get(str(path.parent.resolve()), {}).pop(path.name, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            files = sum(len(entries) for entries in self._entries.values())
+        return {'files': files, 'parsed': self.parsed, 'reused': self.reused}
+
+
+_catalog: Optional[SchemaCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_schema_catalog() -> SchemaCatalog:
+    """Return the process-wide schema catalog."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = SchemaCatalog()
+        return _catalog
+
+
+def invalidate_schema_catalog(path: Optional[Path] = None) -> None:
+    """Drop cached catalog entries (one file, or all of them)."""
+    get_schema_catalog().invalidate(path)
@@ -15,6 +15,8 @@ import re
 import collections
 from utils.ui_feedback import Notify
 from utils.array_field_manager import ArrayFieldManager
+from utils.business_rules import validate_rules_config
+from utils.schema_catalog import invalidate_schema_catalog, load_yaml
 
 # Helper functions for managing the editor dirty state and caches.
 # These centralize dirty/clean semantics and keep backward compatibility
@@ -97,6 +99,8 @@ def _clear_schema_caches() -> None:
     """
     logger.debug("_clear_schema_caches: attempting to clear streamlit caches")
     try:
+        # Schema list metadata is reparsed on the next scan
+        invalidate_schema_catalog()
         # Clear streamlit cache for data functions
         if hasattr(st, "cache_data"):
             st.cache_data.clear()
@@ -119,6 +123,16 @@ def _clear_schema_caches() -> None:
 DIRTY_KEY = "schema_dirty"
 LAST_SAVE_TS_KEY = "schema_last_saved_at"
 
+# Per-field validation results (FieldValidationIndex) and the ids of open field editors
+FIELD_VALIDATION_KEY = "schema_editor_field_validation"
+EXPANDED_FIELDS_KEY = "schema_editor_expanded_fields"
+
+# (schema file name, Future of its ImpactReport) of the last save's impact analysis
+IMPACT_JOB_KEY = "schema_editor_impact_job"
+
+# Schemas with more fields than this render full editors only for fields opened for editing
+EAGER_FIELD_EDITOR_LIMIT = 3
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -206,6 +220,8 @@ class SchemaEditor:
             keys_to_clear = [
                 'schema_editor_fields',
                 'schema_editor_validation_results',
+                FIELD_VALIDATION_KEY,
+                EXPANDED_FIELDS_KEY,
                 'schema_editor_imported_schema',
                 'schema_editor_pending_delete',
                 'schema_editor_pending_duplicate',
@@ -298,6 +314,7 @@ class SchemaEditor:
                 # Clear any existing editor state and switch to edit mode
                 st.session_state.schema_editor_active_file = None
                 st.session_state.schema_editor_fields = []
+                st.session_state.schema_editor_business_rules = []
                 _mark_clean()
                 st.session_state.schema_editor_initialized = False
                 st.session_state.schema_editor_mode = 'edit'
@@ -485,6 +502,9 @@ class SchemaEditor:
             # Header with filename and unsaved indicator
             SchemaEditor._render_editor_header(schema_data)
             
+            # Impact of the last save on pending and corrected documents
+            SchemaEditor._render_impact_report()
+            
             # Schema metadata inputs (title, description)
             SchemaEditor._render_schema_metadata(schema_data)
             
@@ -654,7 +674,8 @@ class SchemaEditor:
                         warnings.append(f"Field '{field_name}' has array items definition which will be ignored")
             
             # Check for unsupported top-level properties
-            unsupported_props = set(schema.keys()) - {'title', 'description', 'fields'}
+            unsupported_props = set(schema.keys()) - {'title', 'description', 'fields', 'business_rules'}
+            errors.extend(validate_rules_config(schema.get('business_rules')))
             if unsupported_props:
                 for prop in unsupported_props:
                     warnings.append(f"Top-level property '{prop}' is not supported and will be ignored")
@@ -780,6 +801,10 @@ class SchemaEditor:
                 
                 filtered_schema['fields'][field_name] = filtered_field
             
+            # Business rules are declared in YAML and carried through unchanged
+            if schema.get('business_rules'):
+                filtered_schema['business_rules'] = schema['business_rules']
+            
             return filtered_schema
             
         except Exception as e:
@@ -998,6 +1023,9 @@ class SchemaEditor:
         st.session_state.schema_editor_fields = editor_fields
         st.session_state.schema_editor_title = schema_data.get('title', '')
         st.session_state.schema_editor_description = schema_data.get('description', '')
+        st.session_state.schema_editor_business_rules = list(schema_data.get('business_rules') or [])
+        st.session_state[FIELD_VALIDATION_KEY] = FieldValidationIndex()
+        st.session_state[EXPANDED_FIELDS_KEY] = set()
 
         # Initialize clean state WITHOUT calling _mark_clean() to avoid "All changes saved" banner
         # This prevents the misleading UX where opening a schema shows it as "already saved"
@@ -1250,28 +1278,63 @@ class SchemaEditor:
                 - **Enum**: Dropdown with predefined choices
                 - **Date/DateTime**: Date and time values
                 """)
+        elif len(fields) <= EAGER_FIELD_EDITOR_LIMIT:
+            for i, field in enumerate(fields):
+                SchemaEditor._render_field_editor(i, field)
         else:
-            # Field organization options
-            if len(fields) > 3:
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    show_collapsed = st.checkbox("🔽 Collapse All Fields", 
-                                               help="Collapse all field editors for better overview")
-                with col2:
-                    field_filter = st.selectbox("🔍 Filter by Type", 
-                                              options=["All Types"] + list(set(f.get('type', 'string') for f in fields)),
-                                              help="Show only fields of selected type")
+            # Large schemas: a summary row per field, full editors only for opened fields
+            expanded = SchemaEditor._expanded_field_ids()
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                if st.button("🔽 Collapse All Fields", key="collapse_all_fields",
+                             help="Close all field editors for better overview",
+                             disabled=not expanded):
+                    expanded.clear()
+                    st.rerun()
+            with col2:
+                field_filter = st.selectbox("🔍 Filter by Type", 
+                                          options=["All Types"] + sorted(set(f.get('type', 'string') for f in fields)),
+                                          help="Show only fields of selected type")
             
-            # Render each field with enhanced styling
             for i, field in enumerate(fields):
-                # Apply field filter if set
-                if len(fields) > 3 and 'field_filter' in locals():
-                    if field_filter != "All Types" and field.get('type', 'string') != field_filter:
-                        continue
-                
-                # Pass collapse state to field renderer
-                collapse_state = locals().get('show_collapsed', False) if len(fields) > 3 else False
-                SchemaEditor._render_field_editor(i, field, collapsed=collapse_state)
+                if field_filter != "All Types" and field.get('type', 'string') != field_filter:
+                    continue
+                if field['id'] in expanded:
+                    SchemaEditor._render_field_editor(i, field, closable=True)
+                else:
+                    SchemaEditor._render_field_summary(i, field)
+    
+    @staticmethod
+    def _expanded_field_ids() -> set:
+        """Return the ids of fields whose editors are open (large schemas only)."""
+        expanded = st.session_state.get(EXPANDED_FIELDS_KEY)
+        if not isinstance(expanded, set):
+            expanded = set()
+            st.session_state[EXPANDED_FIELDS_KEY] = expanded
+        return expanded
+    
+    @staticmethod
+    def _field_header(field: Dict[str, Any], field_errors: List[str]) -> str:
+        """Return the one-line header shown for a field."""
+        field_name = field.get('name', 'Unnamed Field')
+        field_type = field.get('type', 'string')
+        required_indicator = " 🔴" if field.get('required', False) else ""
+        error_indicator = " ❌" if field_errors else " ✅"
+        return f"🏷️ {field_name} ({field_type}){required_indicator}{error_indicator}"
+    
+    @staticmethod
+    def _render_field_summary(index: int, field: Dict[str, Any]) -> None:
+        """Render a closed field as a header row with a button that opens its editor."""
+        field_errors = SchemaEditor._validate_field_real_time(index, field)
+        col1, col2 = st.columns([6, 1])
+        with col1:
+            st.markdown(SchemaEditor._field_header(field, field_errors))
+        with col2:
+            if st.button("✏️ Edit", key=f"open_{field['id']}",
+                         help="Open the editor for this field",
+                         width='stretch'):
+                SchemaEditor._expanded_field_ids().add(field['id'])
+                st.rerun()
     
     @staticmethod
     def _add_new_field() -> None:
@@ -1297,8 +1360,9 @@ class SchemaEditor:
                 'help': ''
             }
             
-            # Add the new field
+            # Add the new field and open its editor
             st.session_state.schema_editor_fields.append(new_field)
+            SchemaEditor._expanded_field_ids().add(new_field['id'])
             _mark_dirty()
             
             # Show feedback
@@ -1312,7 +1376,8 @@ class SchemaEditor:
             Notify.error(f"Failed to add new field: {str(e)}")
     
     @staticmethod
-    def _render_field_editor(index: int, field: Dict[str, Any], collapsed: bool = False) -> None:
+    def _render_field_editor(index: int, field: Dict[str, Any], collapsed: bool = False,
+                             closable: bool = False) -> None:
         """Render editor for a single field with enhanced UI polish."""
         field_id = field['id']
         # Diagnostic logging to detect duplicate IDs and rendering paths\nlogger.debug(f\"editor_render_start: field_index={index} field_id={field_id} field_name={field.get('name')}\")\nids = [f.get('id') for f in st.session_state.get('schema_editor_fields', [])]\nlogger.debug(f\"editor_field_ids: {ids}\")\nlogger.debug(f\"editor_field_id_counts: {dict(collections.Counter(ids))}\")\n
@@ -1321,13 +1386,7 @@ class SchemaEditor:
         field_errors = SchemaEditor._validate_field_real_time(index, field)
         
         # Create expandable container for field with enhanced indicators
-        field_name = field.get('name', 'Unnamed Field')
-        field_type = field.get('type', 'string')
-        required_indicator = " 🔴" if field.get('required', False) else ""
-        error_indicator = " ❌" if field_errors else " ✅"
-        
-        # Enhanced field header with more information
-        field_header = f"🏷️ {field_name} ({field_type}){required_indicator}{error_indicator}"
+        field_header = SchemaEditor._field_header(field, field_errors)
         
         with st.expander(field_header, expanded=not collapsed):
             # Show inline field errors at the top with better formatting
@@ -1370,6 +1429,10 @@ class SchemaEditor:
                 # Field position indicator
                 total_fields = len(st.session_state.schema_editor_fields)
                 st.caption(f"Position: {index + 1} of {total_fields}")
+                if closable and st.button("✖️ Close", key=f"close_{field_id}",
+                                          help="Close this field's editor"):
+                    SchemaEditor._expanded_field_ids().discard(field_id)
+                    st.rerun()
             
             # Enhanced basic field properties with responsive layout
             col1, col2 = st.columns([1, 1])
@@ -1612,10 +1675,14 @@ class SchemaEditor:
         if diag_mode:
             logger.debug(f"_validate_current_schema: validation complete; is_valid={is_valid}, errors={len(errors)}")
         
+        # Form generator compatibility is only checked here and when saving or exporting
+        warnings = SchemaEditor._test_form_generator_compatibility(schema_dict)
+        
         # Store validation results in session state
         st.session_state.schema_editor_validation_results = {
             'is_valid': is_valid,
             'errors': errors,
+            'warnings': warnings,
             'last_validated': datetime.now()
         }
         
@@ -1624,6 +1691,8 @@ class SchemaEditor:
             Notify.error("Schema validation failed")
             for error in errors:
                 st.error(f"  • {error}")
+        for warning in warnings:
+            st.warning(f"  • {warning}")
     
     @staticmethod
     def _validate_field_real_time(field_index: int, field: Dict[str, Any]) -> List[str]:
@@ -1637,19 +1706,20 @@ class SchemaEditor:
         Returns:
             List of validation errors for this field
         """
-        field_name = field.get('name', f'field_{field_index}')
+        if 'name' not in field:
+            field = {**field, 'name': f'field_{field_index}'}
         
-        # Validate field configuration
-        field_errors = validate_field(field_name, field)
-        
-        # Check for duplicate field names
-        if field_name:
-            fields = st.session_state.get('schema_editor_fields', [])
-            duplicate_count = sum(1 for f in fields if f.get('name') == field_name)
-            if duplicate_count > 1:
-                field_errors.append(f"Field name '{field_name}' is used multiple times")
-        
-        return field_errors
+        # Cached unless this field changed; duplicate names come from the name index
+        return SchemaEditor._field_validation_index().update(field)
+    
+    @staticmethod
+    def _field_validation_index() -> 'FieldValidationIndex':
+        """Return this session's per-field validation index."""
+        index = st.session_state.get(FIELD_VALIDATION_KEY)
+        if not isinstance(index, FieldValidationIndex):
+            index = FieldValidationIndex()
+            st.session_state[FIELD_VALIDATION_KEY] = index
+        return index
     
     @staticmethod
     def _show_validation_summary() -> None:
@@ -1675,12 +1745,11 @@ class SchemaEditor:
     
     @staticmethod
     def _update_validation_on_change() -> None:
-        """Update validation results when fields change."""
-        # Build current schema
-        schema_dict = SchemaEditor._build_schema_from_session()
-        
-        # Run validation
-        is_valid, errors = validate_schema_structure(schema_dict)
+        """Update validation results when fields change, revalidating only changed fields."""
+        index = SchemaEditor._field_validation_index()
+        index.sync(st.session_state.get('schema_editor_fields', []))
+        errors = index.errors()
+        is_valid = len(errors) == 0
         
         # Update session state
         st.session_state.schema_editor_validation_results = {
@@ -1721,6 +1790,11 @@ class SchemaEditor:
                 field_config = {k: v for k, v in field_config.items() if v is not None and v != ''}
                 schema_dict['fields'][field_name] = field_config
         
+        # Preserve YAML-declared business rules (not editable in the form editor)
+        business_rules = st.session_state.get('schema_editor_business_rules')
+        if business_rules:
+            schema_dict['business_rules'] = business_rules
+        
         return schema_dict
     
     @staticmethod
@@ -1739,6 +1813,12 @@ class SchemaEditor:
                     st.error(f"  • {error}")
                 return False
             
+            compatibility_warnings = SchemaEditor._test_form_generator_compatibility(schema_dict)
+            if compatibility_warnings:
+                Notify.warn("Schema may have compatibility issues with form generator")
+                for warning in compatibility_warnings:
+                    logger.warning(f"_save_current_schema: {warning}")
+            
             # Determine save path
             active_file = st.session_state.get('schema_editor_active_file')
             if active_file:
@@ -1774,6 +1854,9 @@ class SchemaEditor:
             except Exception as _e:
                 logger.debug(f"_save_current_schema: starting save (failed to read full context: {_e})")
             
+            # Keep the version being replaced for the impact analysis
+            previous_schema = load_schema(save_path) if Path(save_path).exists() else None
+            
             # Save the schema with comprehensive error handling
             # Add schema versioning
             if 'schema_version' not in schema_dict:
@@ -1807,6 +1890,8 @@ class SchemaEditor:
                 # Mark editor as clean using canonical helper (keeps legacy flag in sync)
                 _mark_clean()
                 
+                SchemaEditor._start_impact_analysis(previous_schema, schema_dict, save_path)
+                
                 # Explicit rerun to update UI banner after state change
                 st.rerun()
 
@@ -1882,6 +1967,71 @@ class SchemaEditor:
             
             return False
     
+    @staticmethod
+    def _start_impact_analysis(old_schema: Optional[Dict[str, Any]], new_schema: Dict[str, Any],
+                               save_path: str) -> None:
+        """
+        Analyse the saved change against pending and corrected documents in the background.
+
+        Documents are always validated against the configured primary schema, so saves
+        of any other schema file have no impact to report.
+        """
+        from utils.schema_impact import impact_settings, start_impact_analysis
+        from utils.schema_loader import SCHEMAS_DIR, get_config_value
+        
+        if old_schema is None:
+            return
+        try:
+            primary_schema = get_config_value('schema', 'primary_schema', 'default_schema.yaml')
+            if Path(save_path).resolve() != (SCHEMAS_DIR / primary_schema).resolve():
+                return
+            if not impact_settings()['enabled']:
+                return
+            name = Path(save_path).name
+            st.session_state[IMPACT_JOB_KEY] = (name, start_impact_analysis(old_schema, new_schema, name))
+        except Exception as e:
+            logger.warning(f"Could not start schema impact analysis for {save_path}: {e}")
+    
+    @staticmethod
+    def _render_impact_report() -> None:
+        """Show the progress or result of the last save's impact analysis."""
+        job = st.session_state.get(IMPACT_JOB_KEY)
+        if not job:
+            return
+        name, future = job
+        if not future.done():
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.info(f"🔎 Analysing the impact of {name} on pending and corrected documents...")
+            with col2:
+                st.button("🔄 Refresh", key="refresh_impact_report", width='stretch')
+            return
+        
+        try:
+            report = future.result()
+        except Exception as e:
+            st.warning(f"Impact analysis of {name} failed: {e}")
+            del st.session_state[IMPACT_JOB_KEY]
+            return
+        
+        total = sum(report.documents.values())
+        with st.expander(f"🔎 Impact of {name}: {report.affected_documents} of {total} documents affected",
+                         expanded=report.affected_documents > 0):
+            rows = [{'field': field_name, **counts} for field_name, counts in report.fields.items()]
+            if rows:
+                st.dataframe(rows, hide_index=True, width='stretch')
+            else:
+                st.caption("No field changes")
+            st.caption(f"missing: documents without an added field • extra: documents with a dropped field "
+                       f"(ignored when edited) • newly_invalid: values the old schema accepted and the new one rejects")
+            st.caption(f"{report.analyzed} documents analysed, {report.reused} unchanged since the last analysis, "
+                       f"{report.duration_ms:.0f} ms")
+            if report.unreadable:
+                st.warning(f"Could not read {len(report.unreadable)} documents: {', '.join(report.unreadable[:5])}")
+            if st.button("Dismiss", key="dismiss_impact_report"):
+                del st.session_state[IMPACT_JOB_KEY]
+                st.rerun()
+    
     @staticmethod
     def _show_save_as_dialog() -> None:
         """Show Save As dialog for specifying filename."""
@@ -2858,6 +3008,7 @@ class SchemaEditor:
                     st.session_state.schema_editor_fields = []
                     st.session_state.schema_editor_title = ''
                     st.session_state.schema_editor_description = ''
+                    st.session_state.schema_editor_business_rules = []
                     st.rerun()
             
             with col3:
@@ -2887,6 +3038,8 @@ class SchemaEditor:
                         st.session_state.schema_editor_fields.pop(field_index)
                         Notify.warn(f"Deleted field: {field_name}")
                         _mark_dirty()
+                        # Drop the deleted field from the validation index (e.g. duplicate names)
+                        SchemaEditor._update_validation_on_change()
                         st.session_state.schema_editor_pending_field_delete = None
                         st.rerun()
                 
@@ -2983,6 +3136,9 @@ def list_schema_files() -> List[Dict[str, Any]]:
     Scan schemas/ directory for .yaml files and return list with metadata.
     Enhanced with comprehensive error handling and graceful degradation.
     
+    Metadata comes from the process-wide schema catalog, so only files whose mtime
+    or size changed since the last scan are parsed and validated again.
+    
     Returns:
         List of dictionaries containing file information including:
         - filename: str
@@ -2993,8 +3149,9 @@ def list_schema_files() -> List[Dict[str, Any]]:
         - field_count: int (number of fields in schema)
         - error_message: str (if there were issues loading the file)
     """
+    from utils.schema_catalog import get_schema_catalog
+    
     schemas_dir = Path("schemas")
-    schema_files = []
     
     try:
         # Ensure schemas directory exists with proper error handling
@@ -3015,77 +3172,71 @@ def list_schema_files() -> List[Dict[str, Any]]:
         
         # Scan for .yaml files with comprehensive error handling
         try:
-            yaml_files = list(schemas_dir.glob("*.yaml"))
+            entries = get_schema_catalog().scan(schemas_dir, _build_catalog_entry)
         except OSError as e:
             logger.error(f"Error scanning schemas directory: {e}")
             return []
         
-        for yaml_file in yaml_files:
-            file_info = {
-                'filename': yaml_file.name,
-                'path': str(yaml_file),
-                'size': 0,
-                'modified': datetime.now(),
-                'is_valid': False,
-                'field_count': 0,
-                'error_message': None
-            }
-            
-            try:
-                # Get file metadata with error handling
-                try:
-                    stat = yaml_file.stat()
-                    file_info['size'] = stat.st_size
-                    file_info['modified'] = datetime.fromtimestamp(stat.st_mtime)
-                except (OSError, PermissionError) as e:
-                    logger.warning(f"Cannot access file metadata for {yaml_file.name}: {e}")
-                    file_info['error_message'] = f"File access error: {str(e)}"
-                
-                # Load and validate schema with comprehensive error handling
-                try:
-                    schema_data = load_schema(str(yaml_file))
-                    if schema_data and isinstance(schema_data, dict):
-                        # Use comprehensive validation
-                        is_valid, validation_errors = validate_schema_structure(schema_data)
-                        file_info['is_valid'] = is_valid
-                        
-                        # Count fields regardless of validation status
-                        fields = schema_data.get('fields', {})
-                        if isinstance(fields, dict):
-                            file_info['field_count'] = len(fields)
-                        
-                        if not is_valid:
-                            logger.debug(f"Schema validation issues for {yaml_file.name}: {validation_errors}")
-                            file_info['error_message'] = f"Validation errors: {len(validation_errors)} issues"
-                    else:
-                        file_info['error_message'] = "Invalid schema format"
-                        
-                except yaml.YAMLError as e:
-                    logger.warning(f"YAML parsing error for {yaml_file.name}: {e}")
-                    file_info['error_message'] = f"YAML error: {str(e)}"
-                except UnicodeDecodeError as e:
-                    logger.warning(f"Encoding error for {yaml_file.name}: {e}")
-                    file_info['error_message'] = "File encoding error"
-                except Exception as e:
-                    logger.warning(f"Schema loading failed for {yaml_file.name}: {e}")
-                    file_info['error_message'] = f"Loading error: {str(e)}"
-                
-                schema_files.append(file_info)
-                
-            except Exception as e:
-                logger.error(f"Unexpected error processing schema file {yaml_file.name}: {e}")
-                file_info['error_message'] = f"Unexpected error: {str(e)}"
-                schema_files.append(file_info)
-        
-        # Sort by filename for consistent ordering
-        schema_files.sort(key=lambda x: x['filename'].lower())
-        
     except Exception as e:
         logger.error(f"Critical error scanning schemas directory: {e}")
         # Return empty list on critical errors
         return []
     
-    return schema_files
+    return [entry.as_file_info() for entry in entries]
+
+
+def _build_catalog_entry(yaml_file: Path, size: int, modified: datetime):
+    """
+    Parse and validate one schema file for the schema catalog.
+    
+    Args:
+        yaml_file: Schema file
+        size: File size in bytes
+        modified: Last modified timestamp
+        
+    Returns:
+        CatalogEntry with validity, field count and error message
+    """
+    from utils.schema_catalog import CatalogEntry
+    
+    is_valid, field_count, error_message, validation_errors = False, 0, None, []
+    try:
+        schema_data = load_schema(str(yaml_file))
+        if schema_data and isinstance(schema_data, dict):
+            # Use comprehensive validation
+            is_valid, validation_errors = validate_schema_structure(schema_data)
+            
+            # Count fields regardless of validation status
+            fields = schema_data.get('fields', {})
+            if isinstance(fields, dict):
+                field_count = len(fields)
+            
+            if not is_valid:
+                logger.debug(f"Schema validation issues for {yaml_file.name}: {validation_errors}")
+                error_message = f"Validation errors: {len(validation_errors)} issues"
+        else:
+            error_message = "Invalid schema format"
+            
+    except yaml.YAMLError as e:
+        logger.warning(f"YAML parsing error for {yaml_file.name}: {e}")
+        error_message = f"YAML error: {str(e)}"
+    except UnicodeDecodeError as e:
+        logger.warning(f"Encoding error for {yaml_file.name}: {e}")
+        error_message = "File encoding error"
+    except Exception as e:
+        logger.warning(f"Schema loading failed for {yaml_file.name}: {e}")
+        error_message = f"Loading error: {str(e)}"
+    
+    return CatalogEntry(
+        filename=yaml_file.name,
+        path=str(yaml_file),
+        size=size,
+        modified=modified,
+        is_valid=is_valid,
+        field_count=field_count,
+        error_message=error_message,
+        validation_errors=tuple(validation_errors),
+    )
 
 
 def load_schema(path: str) -> Optional[Dict[str, Any]]:
@@ -3134,7 +3285,7 @@ def load_schema(path: str) -> Optional[Dict[str, Any]]:
                     logger.warning(f"Schema file is empty: {path}")
                     return {'title': '', 'description': '', 'fields': {}}
                 
-                schema_data = yaml.safe_load(file_content)
+                schema_data = load_yaml(file_content)
                 
         except UnicodeDecodeError as e:
             logger.error(f"Encoding error reading {path}: {e}")
@@ -3142,7 +3293,7 @@ def load_schema(path: str) -> Optional[Dict[str, Any]]:
             try:
                 with open(schema_path, 'r', encoding='latin-1') as f:
                     file_content = f.read()
-                    schema_data = yaml.safe_load(file_content)
+                    schema_data = load_yaml(file_content)
                 logger.warning(f"Successfully loaded {path} with latin-1 encoding")
             except Exception as fallback_e:
                 logger.error(f"Failed to load {path} with fallback encoding: {fallback_e}")
@@ -3907,10 +4058,8 @@ def validate_field_names(fields: Dict[str, Any]) -> List[str]:
             errors.append("Field names must be unique (case-insensitive)")
         
         # Check for reserved field names
-        reserved_names = ['id', 'type', 'class', 'name', 'value']
         for field_name in field_names:
-            if isinstance(field_name, str) and field_name.lower() in reserved_names:
-                errors.append(f"Field name '{field_name}' is reserved and cannot be used")
+            errors.extend(_reserved_field_name_errors(field_name))
         
     except Exception as e:
         errors.append(f"Error validating field names: {str(e)}")
@@ -3929,6 +4078,117 @@ def _validate_single_field_name(field_name: Any) -> List[str]:
     return []
 
 
+_RESERVED_FIELD_NAMES = ('id', 'type', 'class', 'name', 'value')
+
+
+def _reserved_field_name_errors(field_name: Any) -> List[str]:
+    """Return the error for a reserved field name, if it is one."""
+    if isinstance(field_name, str) and field_name.lower() in _RESERVED_FIELD_NAMES:
+        return [f"Field name '{field_name}' is reserved and cannot be used"]
+    return []
+
+
+def _editor_field_config(field: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an editor field's configuration as it is written to the schema."""
+    return {k: v for k, v in field.items() if k not in ('id', 'name') and v is not None and v != ''}
+
+
+class FieldValidationIndex:
+    """
+    Validation results of the schema editor's fields, kept across reruns.
+
+    Each field's ``validate_field`` result is stored with the configuration it was
+    computed from and recomputed only when that field changes. Duplicate names are
+    checked through a name index instead of scanning all fields. ``errors()`` returns
+    the same errors as ``validate_schema_structure`` on the schema built from the
+    fields; form generator compatibility is left to explicit validation and saving.
+    """
+
+    def __init__(self):
+        # field id -> (name, config, validate_field errors)
+        self._results: Dict[str, Tuple[str, Dict[str, Any], List[str]]] = {}
+        self._order: List[str] = []
+        self._names: collections.Counter = collections.Counter()
+        self._lower_names: collections.Counter = collections.Counter()
+        self.validated = 0
+
+    @staticmethod
+    def _field_id(field: Dict[str, Any]) -> str:
+        return field.get('id') or f"name:{field.get('name', '')}"
+
+    def _index_name(self, name: str, delta: int) -> None:
+        if not name:
+            return
+        self._names[name] += delta
+        self._lower_names[name.lower()] += delta
+        if self._names[name] <= 0:
+            del self._names[name]
+        if self._lower_names[name.lower()] <= 0:
+            del self._lower_names[name.lower()]
+
+    def update(self, field: Dict[str, Any]) -> List[str]:
+        """
+        Revalidate one field if it changed since it was last validated.
+
+        Args:
+            field: Editor field (with ``id`` and ``name``)
+
+        Returns:
+            The field's errors, including duplicate name errors
+        """
+        field_id = self._field_id(field)
+        name = field.get('name', '')
+        config = _editor_field_config(field)
+        cached = self._results.get(field_id)
+        if cached is None or cached[0] != name or cached[1] != config:
+            if cached is not None:
+                self._index_name(cached[0], -1)
+            self._index_name(name, 1)
+            self._results[field_id] = (name, config, validate_field(name, config))
+            self.validated += 1
+        return self.field_errors(field_id)
+
+    def sync(self, fields: List[Dict[str, Any]]) -> int:
+        """
+        Bring the index up to date with the editor's fields.
+
+        Args:
+            fields: Editor fields, in schema order
+
+        Returns:
+            Number of fields that were revalidated
+        """
+        before = self.validated
+        order = []
+        for field in fields:
+            self.update(field)
+            order.append(self._field_id(field))
+        for field_id in set(self._results) - set(order):
+            self._index_name(self._results.pop(field_id)[0], -1)
+        self._order = order
+        return self.validated - before
+
+    def field_errors(self, field_id: str) -> List[str]:
+        """Return the errors of one field, as shown in its editor."""
+        cached = self._results.get(field_id)
+        if cached is None:
+            return []
+        name, _, errors = cached
+        if name and self._names[name] > 1:
+            return errors + [f"Field name '{name}' is used multiple times"]
+        return list(errors)
+
+    def errors(self) -> List[str]:
+        """Return the schema-level field errors, in ``validate_schema_structure`` order."""
+        named = [self._results[field_id] for field_id in self._order if self._results[field_id][0]]
+        errors = [error for name, _, _ in named for error in _validate_single_field_name(name)]
+        if any(count > 1 for count in self._lower_names.values()):
+            errors.append("Field names must be unique (case-insensitive)")
+        errors.extend(error for name, _, _ in named for error in _reserved_field_name_errors(name))
+        errors.extend(error for _, _, field_errors in named for error in field_errors)
+        return errors
+
+
 
 
 
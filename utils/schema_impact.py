@@ -0,0 +1,413 @@
+"""
+Schema change impact analysis for JSON QA webapp.
+Compares how the pending (json_docs) and corrected documents fare under an old and a
+new version of a schema and counts, per field, the documents that lack a new field,
+gain a deprecated key (one the new schema no longer has, which the edit view ignores)
+or hold a value the new schema rejects but the old one accepted.
+
+Documents are analysed in a process pool. Each document's result per schema is cached
+on disk under the document's content hash and the schema's fingerprint, so a rerun
+only reads documents that changed.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_CACHE_DIRNAME = ".schema_impact"
+CACHE_NAME = "cache.json"
+CACHE_VERSION = 1
+REPORTS_DIRNAME = "reports"
+
+# Documents per worker task; schemas are sent once per batch
+BATCH_SIZE = 64
+
+# Fewer documents than this are analysed in-process (starting workers costs more)
+MIN_DOCUMENTS_FOR_POOL = 32
+
+# Per-document result for one schema: {'missing': [...], 'extra': [...], 'invalid': [...]}
+Summary = Dict[str, List[str]]
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    """Return a short content hash of a schema's fields (the only part that affects documents)."""
+    fields = (schema or {}).get('fields') or {}
+    encoded = json.dumps(fields, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def summarize_document(data: Any, fields: Dict[str, Any]) -> Summary:
+    """
+    Check one document against a schema's fields.
+
+    Args:
+        data: Parsed document
+        fields: Schema ``fields`` section
+
+    Returns:
+        Schema fields absent from the document (``missing``), document keys the schema
+        does not have (``extra``, see ``filter_to_schema_fields``) and schema fields whose
+        value fails comprehensive validation (``invalid``)
+    """
+    from .model_builder import filter_to_schema_fields
+    from .validator_compiler import compile_schema
+
+    if not isinstance(data, dict):
+        data = {}
+    _, extra = filter_to_schema_fields(data, set(fields))
+    invalid = [name for name, validator in compile_schema({'fields': fields}).comprehensive_validators
+               if validator(name, data.get(name))]
+    return {
+        'missing': [name for name in fields if name not in data],
+        'extra': extra,
+        'invalid': invalid,
+    }
+
+
+def analyze_documents(paths: List[str], schemas: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Optional[str], Optional[Dict[str, Summary]], Optional[str]]]:
+    """
+    Hash and check a batch of documents against several schemas (runs in a worker process).
+
+    Args:
+        paths: Document paths
+        schemas: Schema fingerprint -> ``fields`` section
+
+    Returns:
+        ``(path, content hash, {fingerprint: summary}, error)`` per document; hash and
+        summaries are None when the document cannot be read or parsed
+    """
+    results = []
+    for path in paths:
+        try:
+            raw = Path(path).read_bytes()
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            results.append((path, None, None, str(e)))
+            continue
+        content_hash = hashlib.sha256(raw).hexdigest()
+        summaries = {fingerprint: summarize_document(data, fields) for fingerprint, fields in schemas.items()}
+        results.append((path, content_hash, summaries, None))
+    return results
+
+
+class ImpactCache:
+    """
+    Per-document analysis results, keyed by content hash and schema fingerprint.
+
+    Content hashes are memoized by (path, mtime, size), so unchanged documents are not
+    even read. The cache is a single JSON file, written atomically.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        # document path -> [mtime_ns, size, content hash]
+        self.files: Dict[str, List[Any]] = {}
+        # content hash -> {schema fingerprint: summary}
+        self.results: Dict[str, Dict[str, Summary]] = {}
+        if self.path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            cached = json.loads(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schema impact cache {self.path}: {e}")
+            return
+        if cached.get('version') != CACHE_VERSION:
+            return
+        self.files = cached.get('files', {})
+        self.results = cached.get('results', {})
+
+    def lookup(self, path: Path, stat: os.stat_result, fingerprints: Iterable[str]) -> Optional[Dict[str, Summary]]:
+        """Return cached summaries of an unchanged document for all fingerprints, or None."""
+        known = self.files.get(str(path))
+        if not known or known[0] != stat.st_mtime_ns or known[1] != stat.st_size:
+            return None
+        cached = self.results.get(known[2], {})
+        if not all(fingerprint in cached for fingerprint in fingerprints):
+            return None
+        return cached
+
+    def store(self, path: Path, stat: os.stat_result, content_hash: str, summaries: Dict[str, Summary]) -> None:
+        self.files[str(path)] = [stat.st_mtime_ns, stat.st_size, content_hash]
+        self.results.setdefault(content_hash, {}).update(summaries)
+
+    def save(self, keep_paths: Iterable[str], keep_fingerprints: Iterable[str]) -> None:
+        """
+        Write the cache, keeping only the given documents and schema fingerprints.
+
+        The new schema of one analysis is the old schema of the next, so keeping the
+        fingerprints of the latest run is enough for incremental reruns.
+        """
+        if self.path is None:
+            return
+        keep_paths = set(keep_paths)
+        keep_fingerprints = set(keep_fingerprints)
+        self.files = {path: known for path, known in self.files.items() if path in keep_paths}
+        hashes = {known[2] for known in self.files.values()}
+        self.results = {
+            content_hash: {fp: summary for fp, summary in summaries.items() if fp in keep_fingerprints}
+            for content_hash, summaries in self.results.items() if content_hash in hashes
+        }
+        _write_json(self.path, {'version': CACHE_VERSION, 'files': self.files, 'results': self.results})
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class ImpactReport:
+    """Outcome of comparing the corpus against an old and a new schema."""
+    schema: str
+    old_fingerprint: str
+    new_fingerprint: str
+    documents: Dict[str, int]
+    affected_documents: int
+    # field -> {'status', 'missing', 'extra', 'newly_invalid'}
+    fields: Dict[str, Dict[str, Any]]
+    analyzed: int
+    reused: int
+    unreadable: List[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _field_status(name: str, old_fields: Dict[str, Any], new_fields: Dict[str, Any]) -> str:
+    if name not in old_fields:
+        return 'added'
+    if name not in new_fields:
+        return 'removed'
+    return 'changed' if old_fields[name] != new_fields[name] else 'unchanged'
+
+
+def collect_documents(json_docs: Path, corrected: Path) -> List[Tuple[str, Path]]:
+    """
+    Return the documents to analyse as (directory label, path).
+
+    Pending documents are the files in json_docs without a corrected version; the
+    corrected versions stand in for the rest.
+    """
+    corrected_paths = sorted(Path(corrected).glob("*.json")) if Path(corrected).exists() else []
+    corrected_names = {path.name for path in corrected_paths}
+    pending = sorted(Path(json_docs).glob("*.json")) if Path(json_docs).exists() else []
+    return ([('json_docs', path) for path in pending if path.name not in corrected_names]
+            + [('corrected', path) for path in corrected_paths])
+
+
+def analyze_schema_change(
+    old_schema: Dict[str, Any],
+    new_schema: Dict[str, Any],
+    documents: Optional[List[Tuple[str, Path]]] = None,
+    workers: int = DEFAULT_WORKERS,
+    cache_path: Optional[Path] = None,
+    schema_name: str = "",
+) -> ImpactReport:
+    """
+    Count, per field, the documents a schema change affects.
+
+    - ``missing``: documents without a field the new schema adds
+    - ``extra``: documents with a key the old schema had and the new one drops
+    - ``newly_invalid``: documents whose value the new schema rejects but the old accepted
+
+    Args:
+        old_schema: Schema currently in use
+        new_schema: Schema replacing it
+        documents: (label, path) pairs (defaults to the configured json_docs and corrected)
+        workers: Worker processes (1 or less analyses in-process)
+        cache_path: Per-document result cache (None disables caching)
+        schema_name: Schema file name, for the report
+
+    Returns:
+        ImpactReport
+    """
+    started = time.perf_counter()
+    if documents is None:
+        from .file_utils import get_directories
+        dirs = get_directories()
+        documents = collect_documents(dirs.json_docs, dirs.corrected)
+
+    old_fields = dict((old_schema or {}).get('fields') or {})
+    new_fields = dict((new_schema or {}).get('fields') or {})
+    old_fp, new_fp = schema_fingerprint(old_schema), schema_fingerprint(new_schema)
+    schemas = {old_fp: old_fields, new_fp: new_fields}
+
+    cache = ImpactCache(cache_path)
+    summaries: Dict[str, Dict[str, Summary]] = {}
+    stats: Dict[str, os.stat_result] = {}
+    unreadable: List[str] = []
+    todo: List[str] = []
+    for _, path in documents:
+        try:
+            stats[str(path)] = path.stat()
+        except OSError as e:
+            logger.warning(f"Cannot access {path} for impact analysis: {e}")
+            unreadable.append(path.name)
+            continue
+        cached = cache.lookup(path, stats[str(path)], schemas)
+        if cached is not None:
+            summaries[str(path)] = cached
+        else:
+            todo.append(str(path))
+
+    for path, content_hash, result, error in _run(todo, schemas, workers):
+        if error is not None:
+            logger.warning(f"Skipping unreadable document {path} in impact analysis: {error}")
+            unreadable.append(Path(path).name)
+            continue
+        summaries[path] = result
+        cache.store(Path(path), stats[path], content_hash, result)
+
+    counts: Dict[str, Dict[str, int]] = {}
+
+    def bump(name: str, kind: str) -> None:
+        counts.setdefault(name, {'missing': 0, 'extra': 0, 'newly_invalid': 0})[kind] += 1
+
+    by_directory: Dict[str, int] = {}
+    affected = 0
+    for label, path in documents:
+        result = summaries.get(str(path))
+        if result is None:
+            continue
+        by_directory[label] = by_directory.get(label, 0) + 1
+        old, new = result[old_fp], result[new_fp]
+        changes = [(name, 'missing') for name in new['missing'] if name not in old_fields]
+        changes += [(name, 'extra') for name in set(new['extra']) - set(old['extra'])]
+        changes += [(name, 'newly_invalid') for name in set(new['invalid']) - set(old['invalid'])]
+        for name, kind in changes:
+            bump(name, kind)
+        affected += bool(changes)
+
+    fields = {}
+    for name in list(new_fields) + [name for name in old_fields if name not in new_fields]:
+        status = _field_status(name, old_fields, new_fields)
+        if status != 'unchanged' or name in counts:
+            fields[name] = {'status': status, **counts.get(name, {'missing': 0, 'extra': 0, 'newly_invalid': 0})}
+
+    cache.save(stats, schemas)
+    report = ImpactReport(
+        schema=schema_name,
+        old_fingerprint=old_fp,
+        new_fingerprint=new_fp,
+        documents=by_directory,
+        affected_documents=affected,
+        fields=fields,
+        analyzed=len(todo),
+        reused=len(stats) - len(todo),
+        unreadable=sorted(unreadable),
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    logger.info(f"Schema impact for {schema_name or new_fp}: {affected} of {sum(by_directory.values())} documents "
+                f"affected ({report.analyzed} analysed, {report.reused} cached) in {report.duration_ms} ms")
+    return report
+
+
+def _run(paths: List[str], schemas: Dict[str, Dict[str, Any]], workers: int):
+    """Analyse documents in batches, in a process pool when it pays off."""
+    batches = [paths[i:i + BATCH_SIZE] for i in range(0, len(paths), BATCH_SIZE)]
+    if workers <= 1 or len(paths) < MIN_DOCUMENTS_FOR_POOL:
+        for batch in batches:
+            yield from analyze_documents(batch, schemas)
+        return
+    # spawn: forking a threaded Streamlit server is not safe
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)),
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        for results in executor.map(analyze_documents, batches, [schemas] * len(batches)):
+            yield from results
+
+
+def impact_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Return the ``schema_impact`` settings with defaults applied.
+
+    ``cache_dir`` defaults to ``.schema_impact`` inside the audits directory; reports
+    are written to its ``reports`` subdirectory.
+    """
+    if config is None:
+        from .config_service import get_config
+        config = get_config().data
+    settings = (config or {}).get('schema_impact') or {}
+    cache_dir = settings.get('cache_dir')
+    if not cache_dir:
+        from .file_utils import get_directories
+        cache_dir = get_directories().audits / DEFAULT_CACHE_DIRNAME
+    return {
+        'enabled': bool(settings.get('enabled', True)),
+        'workers': int(settings.get('workers', DEFAULT_WORKERS)),
+        'cache_dir': Path(cache_dir),
+    }
+
+
+def save_report(report: ImpactReport, cache_dir: Path) -> Path:
+    """Write a report as JSON under ``<cache_dir>/reports`` and return its path."""
+    stem = Path(report.schema).stem or report.new_fingerprint
+    timestamp = datetime.fromisoformat(report.created_at).strftime("%Y%m%dT%H%M%S")
+    path = Path(cache_dir) / REPORTS_DIRNAME / f"{stem}-{timestamp}.json"
+    _write_json(path, report.to_dict())
+    return path
+
+
+def run_impact_analysis(old_schema: Dict[str, Any], new_schema: Dict[str, Any], schema_name: str = "",
+                        config: Optional[Dict[str, Any]] = None) -> ImpactReport:
+    """Analyse a schema change with the configured workers and cache, and save the report."""
+    settings = impact_settings(config)
+    report = analyze_schema_change(
+        old_schema, new_schema,
+        workers=settings['workers'],
+        cache_path=settings['cache_dir'] / CACHE_NAME,
+        schema_name=schema_name,
+    )
+    try:
+        save_report(report, settings['cache_dir'])
+    except OSError as e:
+        logger.warning(f"Could not save schema impact report: {e}")
+    return report
+
+
+# One analysis at a time; each uses its own process pool
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def start_impact_analysis(old_schema: Dict[str, Any], new_schema: Dict[str, Any],
+                          schema_name: str = "") -> Future:
+    """
+    Run ``run_impact_analysis`` on a background thread.
+
+    Returns:
+        Future resolving to the ImpactReport
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="schema-impact")
+        return _executor.submit(run_impact_analysis, old_schema, new_schema, schema_name)
@@ -12,6 +12,9 @@ import re
 import os
 import streamlit as st
 
+from .config_service import get_config, get_config_service
+from .schema_catalog import load_yaml
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -25,10 +28,6 @@ SUPPORTED_FIELD_TYPES = {
     'date', 'datetime', 'enum', 'array', 'object'
 }
 
-# Global configuration cache
-_config_cache = None
-
-
 def ensure_directories():
     """Ensure required directories exist."""
     SCHEMAS_DIR.mkdir(exist_ok=True)
@@ -38,68 +37,13 @@ def load_config() -> Dict[str, Any]:
     """
     Load application configuration from config.yaml.
     
+    Returns the current snapshot of the configuration service, which reloads
+    config.yaml when it changes. The result is read-only.
+    
     Returns:
         Configuration dictionary with default values if file not found
     """
-    global _config_cache
-    
-    # Return cached config if available
-    if _config_cache is not None:
-        return _config_cache
-    
-    # Default configuration
-    default_config = {
-        "app": {
-            "name": "JSON QA Webapp",
-            "version": "1.0.0",
-            "debug": False
-        },
-        "schema": {
-            "primary_schema": "default_schema.yaml",
-            "fallback_schema": "default_schema.yaml"
-        },
-        "ui": {
-            "page_title": "JSON Quality Assurance",
-            "sidebar_title": "Navigation"
-        },
-        "processing": {
-            "lock_timeout": 60,
-            "max_file_size": 10
-        }
-    }
-    
-    if not CONFIG_FILE.exists():
-        logger.warning(f"Configuration file {CONFIG_FILE} not found, using defaults")
-        _config_cache = default_config
-        return _config_cache
-    
-    try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        
-        # Merge with defaults to ensure all required keys exist
-        merged_config = default_config.copy()
-        if config:
-            for section, values in config.items():
-                if section in merged_config and isinstance(values, dict):
-                    merged_config[section].update(values)
-                else:
-                    merged_config[section] = values
-        
-        _config_cache = merged_config
-        logger.info(f"Successfully loaded configuration from {CONFIG_FILE}")
-        return _config_cache
-        
-    except yaml.YAMLError as e:
-        logger.error(f"YAML parsing error in {CONFIG_FILE}: {e}")
-        logger.info("Using default configuration")
-        _config_cache = default_config
-        return _config_cache
-    except Exception as e:
-        logger.error(f"Error loading configuration {CONFIG_FILE}: {e}")
-        logger.info("Using default configuration")
-        _config_cache = default_config
-        return _config_cache
+    return get_config().data
 
 
 def get_configured_schema() -> Dict[str, Any]:
@@ -156,7 +100,7 @@ def load_schema(schema_path: str) -> Optional[Dict[str, Any]]:
     try:
         with open(full_path, 'r', encoding='utf-8') as f:
             if full_path.suffix.lower() in ['.yaml', '.yml']:
-                schema = yaml.safe_load(f)
+                schema = load_yaml(f.read())
             elif full_path.suffix.lower() == '.json':
                 schema = json.load(f)
             else:
@@ -227,6 +171,14 @@ def validate_schema(schema: Dict[str, Any]) -> bool:
         if not validate_field_config(field_name, field_config):
             return False
     
+    # Business rules must compile
+    from .business_rules import validate_rules_config
+    rule_errors = validate_rules_config(schema.get('business_rules'))
+    if rule_errors:
+        for error in rule_errors:
+            logger.error(f"Invalid business rule: {error}")
+        return False
+    
     return True
 
 
@@ -453,9 +405,7 @@ def reload_config():
     Force reload of configuration from file.
     Useful for testing or when configuration changes.
     """
-    global _config_cache
-    _config_cache = None
-    return load_config()
+    return get_config_service().reload().data
 
 
 def get_config_value(section: str, key: str, default: Any = None) -> Any:
@@ -470,8 +420,7 @@ def get_config_value(section: str, key: str, default: Any = None) -> Any:
     Returns:
         Configuration value or default
     """
-    config = load_config()
-    return config.get(section, {}).get(key, default)
+    return get_config().get(section, key, default)
 
 
 def validate_field_value(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
@@ -591,6 +540,15 @@ def _load_schema_with_mtime(path: str, mtime: float) -> Optional[Dict[str, Any]]
     return load_schema(path)
 
 
+def _on_config_change(old, new) -> None:
+    """Configuration subscriber: reload schemas after the schema section changed."""
+    logger.info(f"Schema configuration changed, primary schema: {new.primary_schema}")
+    _load_schema_with_mtime.clear()
+
+
+get_config_service().subscribe(_on_config_change, sections=('schema',))
+
+
 def load_active_schema(path: str) -> Optional[Dict[str, Any]]:
     """
     Load active schema with hot-reload using file mtime.
@@ -617,6 +575,11 @@ def load_active_schema(path: str) -> Optional[Dict[str, Any]]:
         st.session_state['schema_fields'] = extract_field_names(schema)
         # Preserve explicit schema version if present in the schema; fall back to file mtime
         st.session_state['schema_version'] = schema.get("schema_version", mtime)
+        # Build the schema's validators now so the first validation is not paying for it
+        from .business_rules import get_rule_set
+        from .validator_compiler import compile_schema
+        compile_schema(schema).comprehensive_validators
+        get_rule_set(schema)
         logger.info(f"Loaded active schema: {path} (mtime: {mtime})")
     
     return schema
\ No newline at end of file
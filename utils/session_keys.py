@@ -0,0 +1,117 @@
+"""
+Session-state key index for versioned form widgets in JSON QA webapp.
+Form widgets and editors store their state under keys that embed the form version
+(field_{name}_v{n}, array_{name}_v{n}, data_editor_{name}_v{n}, ...). Every key a
+field creates is recorded here under its form version, so collectors can look a
+field's keys up directly instead of scanning st.session_state, and superseded
+versions can be dropped on reset or when another file is opened.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Session-state entry holding {form_version: {field_name: {key, ...}}}
+INDEX_KEY = "_widget_key_index"
+
+
+def current_version(state: MutableMapping[str, Any]) -> int:
+    """Return the form version widgets are currently rendered with."""
+    return state.get('form_version', 0)
+
+
+def _index(state: MutableMapping[str, Any]) -> Dict[int, Dict[str, Set[str]]]:
+    index = state.get(INDEX_KEY)
+    if not isinstance(index, dict):
+        index = {}
+        state[INDEX_KEY] = index
+    return index
+
+
+def register(state: MutableMapping[str, Any], field_name: str, *keys: str,
+             version: Optional[int] = None) -> None:
+    """
+    Record session-state keys owned by a field.
+
+    Args:
+        state: Streamlit session state (or any mutable mapping)
+        field_name: Schema field that owns the keys
+        *keys: Session-state keys created for the field
+        version: Form version the keys belong to (defaults to the current one)
+    """
+    if version is None:
+        version = current_version(state)
+    _index(state).setdefault(version, {}).setdefault(field_name, set()).update(keys)
+
+
+def keys_for(state: MutableMapping[str, Any], field_name: str,
+             version: Optional[int] = None) -> Set[str]:
+    """
+    Return the keys registered for a field that are still in session state.
+
+    Args:
+        state: Streamlit session state
+        field_name: Schema field name
+        version: Form version to look in (defaults to the current one)
+
+    Returns:
+        Set of session-state keys
+    """
+    if version is None:
+        version = current_version(state)
+    owned = _index(state).get(version, {}).get(field_name, ())
+    return {key for key in owned if key in state}
+
+
+def fields_for(state: MutableMapping[str, Any], version: Optional[int] = None) -> List[str]:
+    """Return the fields that registered keys for a form version, in registration order."""
+    if version is None:
+        version = current_version(state)
+    return list(_index(state).get(version, {}))
+
+
+def forget(state: MutableMapping[str, Any], field_name: str, keys: Iterable[str],
+           version: Optional[int] = None) -> None:
+    """Remove some of a field's keys from session state and from the index."""
+    if version is None:
+        version = current_version(state)
+    owned = _index(state).get(version, {}).get(field_name, set())
+    for key in list(keys):
+        owned.discard(key)
+        state.pop(key, None)
+
+
+def collect_garbage(state: MutableMapping[str, Any], keep_version: Optional[int] = None) -> int:
+    """
+    Delete the keys of every form version except ``keep_version``.
+
+    Args:
+        state: Streamlit session state
+        keep_version: Version whose keys stay; None drops all registered keys
+            (used when another file is opened)
+
+    Returns:
+        Number of session-state keys deleted
+    """
+    index = _index(state)
+    removed = 0
+    for version in [v for v in index if v != keep_version]:
+        for owned in index.pop(version).values():
+            for key in owned:
+                if key in state:
+                    del state[key]
+                    removed += 1
+    if removed:
+        logger.debug(f"Dropped {removed} session keys from superseded form versions")
+    return removed
+
+
+def get_index_stats(state: MutableMapping[str, Any]) -> Dict[str, int]:
+    """Return the number of indexed versions, fields and keys (for debugging)."""
+    index = _index(state)
+    return {
+        'versions': len(index),
+        'fields': sum(len(fields) for fields in index.values()),
+        'keys': sum(len(keys) for fields in index.values() for keys in fields.values()),
+    }
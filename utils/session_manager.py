@@ -7,7 +7,11 @@ import streamlit as st
 from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
-import copy
+import uuid
+
+from . import session_keys
+from .frozen_doc import freeze
+from .session_memory import STORE_ID_KEY, current_session_id, get_session_store
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +22,13 @@ DEFAULT_PAGE = "queue"
 
 
 class SessionManager:
-    """Manages Streamlit session state for the JSON QA webapp."""
+    """
+    Manages Streamlit session state for the JSON QA webapp.
+    
+    The heavy values (document snapshots, schema, model, diffs) are kept in the
+    process-wide session store (see utils.session_memory); session_state holds the
+    session's store id.
+    """
     
     @staticmethod
     def initialize():
@@ -28,9 +38,6 @@ class SessionManager:
             'current_file': None,
             'current_user': DEFAULT_USER,
             'lock_timeout': DEFAULT_LOCK_TIMEOUT,
-            'form_data': {},
-            'original_data': {},
-            'schema': {},
             # New session keys related to active schema and schema metadata.
             # These are intentionally initialized here in an idempotent way so
             # calling initialize() multiple times is safe and existing keys
@@ -40,13 +47,13 @@ class SessionManager:
             'schema_fields': [],
             'schema_version': 0,
             'deprecated_fields_current_doc': [],
-            'model_class': None,
             'last_activity': datetime.now(),
             'session_id': None,
             'edit_mode': False,
             'unsaved_changes': False,
             'validation_errors': [],
             'diff_cache': {},
+            'validation_cache': {},
             'ui_state': {
                 'sidebar_expanded': True,
                 'show_advanced': False,
@@ -134,21 +141,41 @@ class SessionManager:
         """Set the lock timeout."""
         st.session_state.lock_timeout = max(5, min(240, timeout))  # Clamp between 5-240 minutes
     
+    @staticmethod
+    def get_store_id() -> str:
+        """Get the id this session's heavy values are stored under."""
+        store_id = st.session_state.get(STORE_ID_KEY)
+        if not store_id:
+            store_id = current_session_id() or uuid.uuid4().hex
+            st.session_state[STORE_ID_KEY] = store_id
+        return store_id
+    
+    @staticmethod
+    def _get_stored(key: str, default: Any = None) -> Any:
+        return get_session_store().get(SessionManager.get_store_id(), key, default)
+    
+    @staticmethod
+    def _set_stored(key: str, value: Any):
+        get_session_store().set(SessionManager.get_store_id(), key, value)
+    
     @staticmethod
     def get_form_data() -> Dict[str, Any]:
-        """Get the current form data."""
-        return st.session_state.get('form_data', {})
+        """Get the current form data (a frozen snapshot; see utils.frozen_doc)."""
+        return SessionManager._get_stored('form_data', {})
     
     @staticmethod
     def set_form_data(data: Dict[str, Any]):
         """Set the form data and mark as having unsaved changes."""
-        original_data = st.session_state.get('original_data', {})
+        original_data = SessionManager.get_original_data()
+        
+        # Freeze against the original so unchanged fields share its subtrees
+        snapshot = freeze(data, share_with=original_data)
         
         # Check if data has changed from original
-        has_changes = data != original_data
+        has_changes = snapshot is not original_data and snapshot != original_data
         st.session_state.unsaved_changes = has_changes
         
-        st.session_state.form_data = copy.deepcopy(data)
+        SessionManager._set_stored('form_data', snapshot)
         SessionManager.update_activity()
         
         # Clear diff cache when data changes
@@ -156,37 +183,58 @@ class SessionManager:
     
     @staticmethod
     def get_original_data() -> Dict[str, Any]:
-        """Get the original data."""
-        return st.session_state.get('original_data', {})
+        """Get the original data (a frozen snapshot)."""
+        return SessionManager._get_stored('original_data', {})
     
     @staticmethod
     def set_original_data(data: Dict[str, Any]):
         """Set the original data."""
-        st.session_state.original_data = copy.deepcopy(data)
+        snapshot = freeze(data)
+        SessionManager._set_stored('original_data', snapshot)
         
-        # Initialize form data with original data if not set
-        if not st.session_state.get('form_data'):
-            st.session_state.form_data = copy.deepcopy(data)
+        # Initialize form data with original data if not set (shared, not copied)
+        if not SessionManager.get_form_data():
+            SessionManager._set_stored('form_data', snapshot)
     
     @staticmethod
     def get_schema() -> Dict[str, Any]:
         """Get the current schema."""
-        return st.session_state.get('schema', {})
+        return SessionManager._get_stored('schema', {})
     
     @staticmethod
     def set_schema(schema: Dict[str, Any]):
         """Set the schema."""
-        st.session_state.schema = schema
+        SessionManager._set_stored('schema', schema)
     
     @staticmethod
     def get_model_class():
         """Get the current Pydantic model class."""
-        return st.session_state.get('model_class')
+        return SessionManager._get_stored('model_class')
     
     @staticmethod
     def set_model_class(model_class):
         """Set the Pydantic model class."""
-        st.session_state.model_class = model_class
+        SessionManager._set_stored('model_class', model_class)
+    
+    @staticmethod
+    def get_current_diff() -> Dict[str, Any]:
+        """Get the diff shown in the changes preview."""
+        return SessionManager._get_stored('current_diff', {})
+    
+    @staticmethod
+    def set_current_diff(diff: Dict[str, Any]):
+        """Set the diff shown in the changes preview."""
+        SessionManager._set_stored('current_diff', diff)
+    
+    @staticmethod
+    def get_cached_diff() -> Optional[Dict[str, Any]]:
+        """Get the edit view's memoized diff ({'key': ..., 'diff': ...})."""
+        return SessionManager._get_stored('edit_view_diff')
+    
+    @staticmethod
+    def set_cached_diff(entry: Dict[str, Any]):
+        """Set the edit view's memoized diff."""
+        SessionManager._set_stored('edit_view_diff', entry)
     
     @staticmethod
     def has_unsaved_changes() -> bool:
@@ -242,6 +290,41 @@ class SessionManager:
         """Get the session ID."""
         return st.session_state.get('session_id', 'unknown')
     
+    @staticmethod
+    def track_memory():
+        """
+        Report this session to the process-wide memory ledger (see utils.session_memory).
+        
+        Call once per script run. The ledger estimates the session's memory and
+        evicts other idle sessions' stored values when due; if this session's
+        values were evicted while it was idle, this prepares it to rehydrate.
+        """
+        from .session_memory import get_session_ledger, restore_evicted_state
+        
+        try:
+            store_id = SessionManager.get_store_id()
+            get_session_ledger().record_run(
+                store_id,
+                st.session_state,
+                user=SessionManager.get_current_user(),
+                current_file=SessionManager.get_current_file(),
+                last_activity=SessionManager.get_last_activity(),
+            )
+            restore_evicted_state(st.session_state, store_id)
+        except Exception as e:
+            logger.warning(f"Session memory tracking failed: {e}")
+    
+    @staticmethod
+    def was_evicted() -> bool:
+        """Check whether this session's stored values were evicted while idle (until its next full run)."""
+        return get_session_store().is_evicted(SessionManager.get_store_id())
+    
+    @staticmethod
+    def take_restored_draft() -> Optional[Dict[str, Any]]:
+        """Return (once) the unsaved edits saved when this session was evicted."""
+        from .session_memory import RESTORED_DRAFT_KEY
+        return st.session_state.pop(RESTORED_DRAFT_KEY, None)
+    
     @staticmethod
     def is_edit_mode() -> bool:
         """Check if currently in edit mode."""
@@ -256,6 +339,7 @@ class SessionManager:
         user = SessionManager.get_current_user()
         timeout = SessionManager.get_lock_timeout()
         ui_state = SessionManager.get_ui_state()
+        get_session_store().forget(SessionManager.get_store_id())
         
         # Clear all session state
         for key in list(st.session_state.keys()):
@@ -270,14 +354,17 @@ class SessionManager:
     @staticmethod
     def _clear_file_state():
         """Clear file-specific state."""
-        st.session_state.form_data = {}
-        st.session_state.original_data = {}
-        st.session_state.schema = {}
-        st.session_state.model_class = None
+        get_session_store().clear(SessionManager.get_store_id())
         st.session_state.unsaved_changes = False
         st.session_state.validation_errors = []
         st.session_state.diff_cache = {}
+        st.session_state.validation_cache = {}
+        st.session_state.field_validation_results = {}
+        st.session_state.business_rule_results = {}
+        st.session_state.pending_field_validation = set()
         st.session_state.edit_mode = False
+        # Widget keys of the previous document are never reused; drop every version
+        session_keys.collect_garbage(st.session_state)
     
     @staticmethod
     def _cleanup_edit_state():
@@ -0,0 +1,480 @@
+"""
+Per-session memory accounting and idle eviction for JSON QA webapp.
+The heavy values of a session (document snapshots, schema, model, diff results) live
+in a process-wide SessionStore keyed by session id; st.session_state only holds the
+id. Every script run reports its session to a process-wide ledger, which
+periodically estimates the session's memory (stored values and widget buffers).
+Sessions idle for longer than ``processing.session_idle_minutes`` have their stored
+values dropped by the sweeper, on whichever session's thread it runs, with unsaved
+edits kept in a draft file. On its next run an evicted session drops its widget
+buffers, reloads the document from disk (the edit view does this whenever the session
+holds no data) and restores the draft.
+"""
+
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import session_keys
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_MINUTES = 30
+# Sizes are re-estimated at most this often per session (walking a large document is not free)
+SAMPLE_INTERVAL_SECONDS = 30
+# Idle sessions are looked for at most this often (from whichever session runs)
+SWEEP_INTERVAL_SECONDS = 60
+# Bound on objects visited per estimate
+MAX_VISITED_OBJECTS = 2_000_000
+
+# Accounted from the session's own state (active_schema is shared through the schema cache)
+STATE_ACCOUNTED_KEYS = ('active_schema', 'validation_cache')
+
+# session_state entry holding the id the session's values are stored under
+STORE_ID_KEY = '_session_store_id'
+RESTORED_DRAFT_KEY = 'restored_draft'
+
+
+def estimate_size(value: Any, seen: Optional[set] = None) -> int:
+    """
+    Estimate the memory held by a value, following containers and object attributes.
+
+    Objects already in ``seen`` are not counted again, so sizes of several values
+    estimated with one ``seen`` set do not double count shared subtrees.
+
+    Args:
+        value: Any object
+        seen: ids of objects already counted (updated in place)
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set() if seen is None else seen
+    stack = [value]
+    total = 0
+    while stack and len(seen) < MAX_VISITED_OBJECTS:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (str, bytes, int, float, bool)):
+            total += sys.getsizeof(obj)
+        elif isinstance(obj, dict):
+            total += sys.getsizeof(obj)
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            total += sys.getsizeof(obj)
+            stack.extend(obj)
+        elif isinstance(obj, type):
+            # Model classes: the class and its namespace, not everything it references
+            total += sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+        elif hasattr(obj, 'memory_usage') and type(obj).__module__.startswith('pandas'):
+            usage = obj.memory_usage(deep=True)
+            total += int(usage.sum() if hasattr(usage, 'sum') else usage)
+        elif isinstance(obj, types.ModuleType) or callable(obj):
+            total += sys.getsizeof(obj)
+        elif hasattr(obj, '__dict__'):
+            total += sys.getsizeof(obj)
+            stack.append(vars(obj))
+        elif hasattr(obj, '__slots__'):
+            total += sys.getsizeof(obj)
+            stack.extend(getattr(obj, slot, None) for slot in obj.__slots__ if isinstance(slot, str))
+        else:
+            total += sys.getsizeof(obj)
+    return total
+
+
+def estimate_session_memory(state: Any, stored: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Estimate the heavy state of one session.
+
+    Args:
+        state: The session's own state (st.session_state)
+        stored: The session's values in the SessionStore
+
+    Returns:
+        Bytes per stored or accounted key, plus 'widgets' for registered widget keys
+    """
+    seen: set = set()
+    sizes: Dict[str, int] = {}
+    for key, value in (stored or {}).items():
+        sizes[key] = estimate_size(value, seen)
+    for key in STATE_ACCOUNTED_KEYS:
+        if key in state:
+            sizes[key] = estimate_size(state[key], seen)
+
+    widgets = 0
+    index = state[session_keys.INDEX_KEY] if session_keys.INDEX_KEY in state else {}
+    for fields in index.values():
+        for keys in fields.values():
+            for key in keys:
+                if key in state:
+                    widgets += estimate_size(state[key], seen)
+    sizes['widgets'] = widgets
+    return sizes
+
+
+class SessionStore:
+    """
+    Process-wide home of the heavy values of every session, keyed by session id.
+
+    session_state keeps only the id (under ``STORE_ID_KEY``), so the idle sweeper
+    can drop a session's values from any thread without touching its session_state.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Dict[str, Any]] = {}
+        self._evicted: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get(session_id, {}).get(key, default)
+
+    def set(self, session_id: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._values.setdefault(session_id, {})[key] = value
+
+    def values(self, session_id: str) -> Dict[str, Any]:
+        """Return a copy of a session's stored values."""
+        with self._lock:
+            return dict(self._values.get(session_id, {}))
+
+    def holds_data(self, session_id: str) -> bool:
+        """Check whether a session has any non-empty stored value."""
+        with self._lock:
+            return any(self._values.get(session_id, {}).values())
+
+    def evict(self, session_id: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop a session's values, keeping ``info`` until the session takes it; returns what was dropped."""
+        with self._lock:
+            self._evicted[session_id] = info
+            return self._values.pop(session_id, {})
+
+    def is_evicted(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._evicted
+
+    def take_eviction(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return (once) the eviction info of a session, or None if it was not evicted."""
+        with self._lock:
+            return self._evicted.pop(session_id, None)
+
+    def clear(self, session_id: str) -> None:
+        """Drop a session's values (e.g. when its document is closed)."""
+        with self._lock:
+            self._values.pop(session_id, None)
+
+    def forget(self, session_id: str) -> None:
+        """Drop everything held for a session."""
+        with self._lock:
+            self._values.pop(session_id, None)
+            self._evicted.pop(session_id, None)
+
+
+# Process-wide store shared by all sessions
+_store = SessionStore()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide store of heavy session values."""
+    return _store
+
+
+class _StateView:
+    """Mapping view over a session's state supporting what eviction needs."""
+
+    def __init__(self, state: Any):
+        self._state = state
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._state[key] if key in self._state else default
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        if key not in self._state:
+            return default
+        value = self._state[key]
+        del self._state[key]
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._state
+
+    def __getitem__(self, key: str) -> Any:
+        return self._state[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._state[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._state[key]
+
+
+def _drafts_dir() -> Path:
+    from .file_utils import get_directories
+    return get_directories().locks / "drafts"
+
+
+def _draft_path(session_id: str) -> Path:
+    return _drafts_dir() / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', session_id)}.json"
+
+
+def evict_session_values(store: SessionStore, session_id: str,
+                         current_file: Optional[str] = None) -> Optional[Path]:
+    """
+    Drop the stored values of a session, keeping unsaved edits in a draft file.
+
+    Only the store is touched, so this is safe on any session's thread.
+
+    Args:
+        store: Store holding the session's values
+        session_id: Session identifier (names the draft file)
+        current_file: Document the session has open
+
+    Returns:
+        Path of the draft written, or None if there were no unsaved edits
+    """
+    from .json_streaming import materialize_lazy_arrays
+    from .frozen_doc import thaw
+
+    values = store.values(session_id)
+    form_data, original_data = values.get('form_data'), values.get('original_data')
+    draft_path = None
+    if current_file and form_data and form_data is not original_data and form_data != original_data:
+        draft_path = _draft_path(session_id)
+        draft_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'file': current_file, 'form_data': thaw(materialize_lazy_arrays(form_data))}
+        draft_path.write_text(json.dumps(payload, default=str), encoding='utf-8')
+
+    store.evict(session_id, {
+        'at': datetime.now().isoformat(),
+        'file': current_file,
+        'draft': str(draft_path) if draft_path else None,
+    })
+    logger.info(f"Evicted idle session values for {session_id} (file: {current_file}, draft: {bool(draft_path)})")
+    return draft_path
+
+
+def restore_evicted_state(state: Any, session_id: str, store: Optional[SessionStore] = None) -> bool:
+    """
+    Prepare a session whose stored values were evicted to rehydrate on this run.
+
+    Runs on the session's own thread: drops its widget keys and reads back the
+    draft of unsaved edits (if any) into ``state['restored_draft']``. The document
+    itself is reloaded by the edit view.
+
+    Returns:
+        True if the session had been evicted
+    """
+    store = get_session_store() if store is None else store
+    info = store.take_eviction(session_id)
+    if not info:
+        return False
+    view = _StateView(state)
+    session_keys.collect_garbage(view)
+    draft = info.get('draft')
+    if draft:
+        path = Path(draft)
+        try:
+            payload = json.loads(path.read_text(encoding='utf-8'))
+            if payload.get('file') == view.get('current_file'):
+                view[RESTORED_DRAFT_KEY] = payload.get('form_data') or {}
+            path.unlink()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not restore session draft {path}: {e}")
+    logger.info(f"Rehydrating evicted session (file: {info.get('file')})")
+    return True
+
+
+@dataclass
+class SessionRecord:
+    """Ledger entry for one browser session."""
+    session_id: str
+    user: str = ""
+    current_file: Optional[str] = None
+    last_activity: Optional[datetime] = None
+    last_run: float = 0.0
+    sizes: Dict[str, int] = field(default_factory=dict)
+    sampled_at: float = 0.0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.sizes.values())
+
+    def idle_seconds(self, now: float) -> float:
+        """Seconds since the later of the session's last activity and its last script run."""
+        last = self.last_run
+        if self.last_activity is not None:
+            last = max(last, self.last_activity.timestamp())
+        return max(0.0, now - last)
+
+
+class SessionLedger:
+    """Process-wide table of sessions, their estimated memory, and idle eviction."""
+
+    def __init__(self, idle_seconds: float, sample_seconds: float = SAMPLE_INTERVAL_SECONDS,
+                 sweep_seconds: float = SWEEP_INTERVAL_SECONDS, store: Optional[SessionStore] = None):
+        self.idle_seconds = idle_seconds
+        self.sample_seconds = sample_seconds
+        self.sweep_seconds = sweep_seconds
+        self.store = get_session_store() if store is None else store
+        self._records: Dict[str, SessionRecord] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.evictions = 0
+
+    def record_run(self, session_id: str, state: Any, user: str = "",
+                   current_file: Optional[str] = None, last_activity: Optional[datetime] = None,
+                   now: Optional[float] = None) -> SessionRecord:
+        """
+        Record a script run of a session; re-estimate its memory and sweep when due.
+
+        Args:
+            session_id: Session identifier (the id its values are stored under)
+            state: The session's own state (estimated)
+            user, current_file, last_activity: Shown in the admin view
+            now: Current time (for tests)
+
+        Returns:
+            The session's ledger record
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None:
+                record = self._records[session_id] = SessionRecord(session_id)
+            record.user, record.current_file, record.last_activity = user, current_file, last_activity
+            record.last_run = now
+            resample = not record.sampled_at or now - record.sampled_at >= self.sample_seconds
+            sweep = self.idle_seconds > 0 and now - self._last_sweep >= self.sweep_seconds
+            if sweep:
+                self._last_sweep = now
+
+        if resample:
+            sizes = estimate_session_memory(state, self.store.values(session_id))
+            with self._lock:
+                record.sizes, record.sampled_at = sizes, now
+        if sweep:
+            self.evict_idle(now=now, exclude=session_id)
+        return record
+
+    def evict_idle(self, now: Optional[float] = None, exclude: Optional[str] = None,
+                   idle_seconds: Optional[float] = None) -> List[str]:
+        """
+        Drop the stored values of sessions idle for at least ``idle_seconds``.
+
+        The values are freed right away; the session's own state is left alone and
+        it rehydrates on its next run (see ``restore_evicted_state``). Sessions are
+        checked and evicted under the ledger lock, so a session that starts a run
+        meanwhile is no longer idle.
+
+        Returns:
+            Ids of the sessions evicted
+        """
+        now = time.time() if now is None else now
+        idle_seconds = self.idle_seconds if idle_seconds is None else idle_seconds
+        self._prune()
+        evicted = []
+        with self._lock:
+            for record in self._records.values():
+                if (record.session_id == exclude or record.idle_seconds(now) < idle_seconds
+                        or not self.store.holds_data(record.session_id)):
+                    continue
+                try:
+                    evict_session_values(self.store, record.session_id, record.current_file)
+                except Exception as e:
+                    logger.warning(f"Could not evict session {record.session_id}: {e}")
+                    continue
+                # Only the widget buffers in the session's own state remain accounted
+                record.sizes = {key: size for key, size in record.sizes.items()
+                                if key == 'widgets' or key in STATE_ACCOUNTED_KEYS}
+                self.evictions += 1
+                evicted.append(record.session_id)
+        return evicted
+
+    def snapshot(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return one row per session for the admin view, largest first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            records = list(self._records.values())
+        rows = [{
+            'session': r.session_id,
+            'user': r.user,
+            'file': r.current_file,
+            'idle_min': round(r.idle_seconds(now) / 60, 1),
+            'memory_mb': round(r.total_bytes / (1024 * 1024), 2),
+            'evicted': self.store.is_evicted(r.session_id),
+            'sizes': dict(r.sizes),
+        } for r in records]
+        return sorted(rows, key=lambda row: row['memory_mb'], reverse=True)
+
+    def totals(self) -> Dict[str, Any]:
+        """Return session count, estimated total bytes and the eviction counter."""
+        with self._lock:
+            records = list(self._records.values())
+            evictions = self.evictions
+        return {
+            'sessions': len(records),
+            'total_bytes': sum(r.total_bytes for r in records),
+            'evictions': evictions,
+        }
+
+    def forget(self, session_id: str) -> None:
+        """Remove a session from the ledger and drop its stored values."""
+        with self._lock:
+            self._records.pop(session_id, None)
+        self.store.forget(session_id)
+
+    def _prune(self) -> None:
+        # Drop sessions the Streamlit runtime has closed, with their stored values
+        try:
+            from streamlit.runtime import Runtime
+            if not Runtime.exists():
+                return
+            runtime = Runtime.instance()
+            with self._lock:
+                closed = [sid for sid in self._records if not runtime.is_active_session(sid)]
+                for sid in closed:
+                    del self._records[sid]
+            for sid in closed:
+                self.store.forget(sid)
+        except Exception as e:
+            logger.debug(f"Session ledger prune skipped: {e}")
+
+
+# Process-wide ledger shared by all sessions
+_ledger: Optional[SessionLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_session_ledger() -> SessionLedger:
+    """Return the process-wide ledger, configured by ``processing.session_idle_minutes``."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            from .schema_loader import get_config_value
+            try:
+                minutes = float(get_config_value('processing', 'session_idle_minutes', DEFAULT_IDLE_MINUTES))
+            except (TypeError, ValueError):
+                minutes = DEFAULT_IDLE_MINUTES
+            _ledger = SessionLedger(idle_seconds=minutes * 60)
+        return _ledger
+
+
+def current_session_id() -> Optional[str]:
+    """Return the Streamlit runtime's id of the running session (None outside a script run)."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+        return ctx.session_id if ctx is not None else None
+    except Exception:
+        return None
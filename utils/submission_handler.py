@@ -8,17 +8,41 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, date
 from decimal import Decimal
 import logging
-import re
+import time
 
 from .session_manager import SessionManager
 from .model_builder import validate_model_data
 from .file_utils import save_corrected_json, release_file, append_audit_log
 from .diff_utils import create_audit_diff_entry, has_changes, calculate_diff
+from .json_streaming import LazyJsonArray, materialize_lazy_arrays
+from . import validator_compiler as vc
+from . import field_validation
+from . import session_keys
+from . import metrics
+from .business_rules import get_rule_set
+from .field_validation import payload_hash
+from .perf import record, span, timed
 from utils.ui_feedback import Notify
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Session key holding memoized validation results
+VALIDATION_CACHE_KEY = 'validation_cache'
+MAX_CACHED_VALIDATIONS = 16
+
+
+def _schema_version_key(schema: Dict[str, Any]) -> str:
+    """Version key for a schema: its declared schema_version plus a content hash."""
+    return f"{schema.get('schema_version', '')}:{payload_hash(schema)}"
+
+def _submit_outcome(success: bool, errors: List[str]) -> str:
+    """Metrics outcome of a validate_and_submit result: saved, invalid or error."""
+    if success:
+        return "saved"
+    failures = ("Submission error for ", "Failed to save corrected data for ")
+    return "error" if len(errors) == 1 and errors[0].startswith(failures) else "invalid"
+
 def _sanitize_for_json(obj: Any, parent_key: str = None) -> Any:
     """
     Recursively sanitize an object for JSON serialization.
@@ -27,7 +51,7 @@ def _sanitize_for_json(obj: Any, parent_key: str = None) -> Any:
     """
     if isinstance(obj, dict):
         return {k: _sanitize_for_json(v, k) for k, v in obj.items()}
-    elif isinstance(obj, list):
+    elif isinstance(obj, (list, LazyJsonArray)):
         return [_sanitize_for_json(item, parent_key) for item in obj]
     elif isinstance(obj, (datetime, date)):
         return obj.isoformat()
@@ -79,6 +103,8 @@ class SubmissionHandler:
         return payload
     
     @staticmethod
+    @timed("SubmissionHandler.validate_and_submit")
+    @metrics.SUBMIT_SECONDS.timed(lambda result: _submit_outcome(*result))
     def validate_and_submit(
         filename: str,
         form_data: Dict[str, Any],
@@ -102,10 +128,14 @@ class SubmissionHandler:
             Tuple of (success: bool, errors: List[str])
         """
         try:
-            # Step 1: Validate form data
-            validation_errors = SubmissionHandler._validate_submission_data(
+            # Paged arrays from streamed documents are materialized only here
+            form_data = materialize_lazy_arrays(form_data)
+            original_data = materialize_lazy_arrays(original_data)
+            
+            # Step 1: Validate form data (reuses the result of an earlier identical pass)
+            validation_errors = SubmissionHandler.validate_submission(
                 form_data, schema, model_class
-            )
+            )["errors"]
             
             if validation_errors:
                 logger.warning(f"Validation failed for {filename}: {len(validation_errors)} errors")
@@ -116,7 +146,8 @@ class SubmissionHandler:
             # This ensures that new fields added by the schema and filled by the user are included in the submission and audit.
             
             # Step 2: Check for changes
-            diff = calculate_diff(original_data, form_data)
+            with span("submit.diff"):
+                diff = calculate_diff(original_data, form_data)
             if not has_changes(diff):
                 logger.info(f"No changes detected for {filename}")
                 # Still proceed with submission to mark as reviewed
@@ -133,7 +164,9 @@ class SubmissionHandler:
             sanitized_data = _sanitize_for_json(form_data)
             
             # Step 4: Save corrected data
-            if not save_corrected_json(filename, sanitized_data):
+            with span("submit.save"):
+                saved = save_corrected_json(filename, sanitized_data)
+            if not saved:
                 error_msg = f"Failed to save corrected data for {filename}"
                 logger.error(error_msg)
                 return False, [error_msg]
@@ -141,16 +174,19 @@ class SubmissionHandler:
             # Step 5: Create and log audit entry (use sanitized data for clean audit logs)
             deprecated = st.session_state.get("deprecated_fields_current_doc", [])
             schema_version = st.session_state.get("schema_version")
-            audit_success = SubmissionHandler._create_audit_entry(
-                filename, original_data, sanitized_data, user, diff, deprecated, schema_version
-            )
+            with span("submit.audit"):
+                audit_success = SubmissionHandler._create_audit_entry(
+                    filename, original_data, sanitized_data, user, diff, deprecated, schema_version
+                )
             
             if not audit_success:
                 logger.warning(f"Audit logging failed for {filename}")
                 # Don't fail submission for audit logging issues
             
             # Step 6: Release file lock
-            if not release_file(filename):
+            with span("submit.release"):
+                released = release_file(filename)
+            if not released:
                 logger.warning(f"Failed to release lock for {filename}")
                 # Don't fail submission for lock release issues
             
@@ -162,6 +198,75 @@ class SubmissionHandler:
             logger.error(error_msg, exc_info=True)
             return False, [error_msg]
     
+    @staticmethod
+    @timed("SubmissionHandler.validate_submission")
+    def validate_submission(
+        form_data: Dict[str, Any],
+        schema: Dict[str, Any],
+        model_class: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate form data once per distinct payload within the session.
+        
+        Results are memoized in session state by (schema version, canonical payload
+        hash), so "Validate Data" followed by "Submit Changes", and the re-check inside
+        validate_and_submit, reuse a single validation pass.
+        On a miss, schema and business-rule results are aggregated from the per-field
+        cache kept by utils.field_validation, so only changed fields are revalidated.
+        
+        Args:
+            form_data: Form data to validate
+            schema: Schema definition
+            model_class: Optional Pydantic model class
+            
+        Returns:
+            Dict with 'errors' (List[str]), 'timings' (per-stage milliseconds)
+            and 'cache_hit' (bool)
+        """
+        form_data = materialize_lazy_arrays(form_data)
+        cache_key = None
+        cache: Dict[Any, Any] = {}
+        try:
+            cache_key = (
+                _schema_version_key(schema),
+                payload_hash(form_data),
+                f"{getattr(model_class, '__qualname__', None)}:{id(model_class) if model_class else 0}"
+            )
+            cache = st.session_state.get(VALIDATION_CACHE_KEY) or {}
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Validation cache hit for payload %s", cache_key[1][:12])
+                return {"errors": list(cached["errors"]), "timings": dict(cached["timings"]), "cache_hit": True}
+        except Exception as e:
+            logger.debug(f"Validation cache unavailable: {e}")
+            cache_key = None
+        
+        errors, timings = SubmissionHandler._run_validation_stages(
+            form_data, schema, model_class, incremental=True
+        )
+        logger.info(
+            "Validation: %d errors in %.1f ms (%s)",
+            len(errors),
+            timings.get("total", 0.0),
+            ", ".join(f"{stage}={ms:.1f}" for stage, ms in timings.items() if stage != "total"),
+        )
+        for stage, ms in timings.items():
+            if stage != "total":
+                record(f"validate.{stage}", ms)
+        
+        # System failures are not cached so a retry re-runs validation
+        if cache_key is not None and "system" not in timings:
+            try:
+                cache = dict(cache)
+                cache[cache_key] = {"errors": list(errors), "timings": dict(timings)}
+                while len(cache) > MAX_CACHED_VALIDATIONS:
+                    cache.pop(next(iter(cache)))
+                st.session_state[VALIDATION_CACHE_KEY] = cache
+            except Exception as e:
+                logger.debug(f"Could not store validation result: {e}")
+        
+        return {"errors": errors, "timings": timings, "cache_hit": False}
+    
     @staticmethod
     def _validate_submission_data(
         form_data: Dict[str, Any],
@@ -169,11 +274,46 @@ class SubmissionHandler:
         model_class: Optional[Any] = None,
         use_comprehensive: bool = True
     ) -> List[str]:
-        """Validate form data before submission."""
+        """Validate form data before submission (uncached; see validate_submission)."""
+        errors, _ = SubmissionHandler._run_validation_stages(
+            materialize_lazy_arrays(form_data), schema, model_class, use_comprehensive
+        )
+        return errors
+    
+    @staticmethod
+    def _run_validation_stages(
+        form_data: Dict[str, Any],
+        schema: Dict[str, Any],
+        model_class: Optional[Any] = None,
+        use_comprehensive: bool = True,
+        incremental: bool = False
+    ) -> Tuple[List[str], Dict[str, float]]:
+        """
+        Run schema, model and business-rule validation, timing each stage in ms.
+        
+        With incremental=True the schema and business-rule stages are aggregated from
+        per-field results cached by utils.field_validation, so only fields changed since
+        their last validation are rechecked.
+        """
         field_errors = {}  # Dict to group errors by field
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        stage_start = started
+        
+        def _mark(stage: str) -> None:
+            nonlocal stage_start
+            now = time.perf_counter()
+            timings[stage] = (now - stage_start) * 1000
+            stage_start = now
         
+        business_errors = None
         try:
-            if use_comprehensive:
+            if incremental:
+                cached_field_errors, business_errors = field_validation.aggregate_field_results(form_data, schema)
+                for field_name, errs in cached_field_errors.items():
+                    field_errors.setdefault(field_name, []).extend(errs)
+                _mark("schema")
+            elif use_comprehensive:
                 # Use comprehensive validation with detailed error reporting
                 comprehensive_result = SubmissionHandler.comprehensive_validate_data(form_data, schema)
                 
@@ -186,6 +326,7 @@ class SubmissionHandler:
                     if base_field not in field_errors:
                         field_errors[base_field] = []
                     field_errors[base_field].append(error["message"])
+                _mark("schema")
             else:
                 # Use legacy validation
                 schema_errors = SubmissionHandler._validate_against_schema(form_data, schema)
@@ -195,6 +336,7 @@ class SubmissionHandler:
                     if field_name not in field_errors:
                         field_errors[field_name] = []
                     field_errors[field_name].append(error)
+                _mark("schema")
             
             # Pydantic model validation (if available)
             if model_class:
@@ -204,18 +346,22 @@ class SubmissionHandler:
                     if field_name not in field_errors:
                         field_errors[field_name] = []
                     field_errors[field_name].append(error)
+                _mark("model")
             
             # Business logic validation
-            business_errors = SubmissionHandler._validate_business_rules(form_data, schema)
+            if business_errors is None:
+                business_errors = SubmissionHandler._validate_business_rules(form_data, schema)
             for error in business_errors:
                 # Business rules may not reference specific fields; add as general
                 if 'general' not in field_errors:
                     field_errors['general'] = []
                 field_errors['general'].append(error)
+            _mark("business_rules")
             
         except Exception as e:
             logger.error(f"Validation error: {e}")
             field_errors['system'] = [f"Validation system error: {str(e)}"]
+            _mark("system")
         
         # Flatten to list, deduplicating per field
         all_errors = []
@@ -223,7 +369,8 @@ class SubmissionHandler:
             unique_errs = list(set(errs))  # Deduplicate errors for the field
             all_errors.extend(unique_errs)
         
-        return all_errors
+        timings["total"] = (time.perf_counter() - started) * 1000
+        return all_errors, timings
 
     @staticmethod
     def _extract_field_from_error(error: str) -> str:
@@ -246,689 +393,113 @@ class SubmissionHandler:
     @staticmethod
     def _validate_against_schema(form_data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
         """Validate data against schema definition."""
-        errors = []
-        fields = schema.get('fields', {})
-        
-        for field_name, field_config in fields.items():
-            value = form_data.get(field_name)
-            field_errors = SubmissionHandler._validate_field(field_name, value, field_config)
-            errors.extend(field_errors)
-        
-        return errors
+        return vc.compile_schema(schema).validate_legacy(form_data)
     
     @staticmethod
     def _validate_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate a single field value against its configuration."""
-        errors = []
-        
-        # Check required fields
-        if field_config.get('required', False):
-            if value is None or (isinstance(value, str) and value.strip() == ''):
-                label = field_config.get('label', field_name)
-                errors.append(f"'{label}' is required")
-                return errors  # Skip other validations if required field is missing
-        
-        # Skip validation for empty optional fields (but not for required validation)
-        if value is None:
-            return errors
-        
-        # For strings, only skip if it's empty AND not required AND no min_length constraint
-        if isinstance(value, str) and value.strip() == '':
-            if not field_config.get('required', False) and field_config.get('min_length') is None:
-                return errors
-        
-        field_type = field_config.get('type', 'string')
-        
-        # Type-specific validation
-        if field_type == 'string':
-            errors.extend(SubmissionHandler._validate_string_field(field_name, value, field_config))
-        
-        elif field_type in ['number', 'integer', 'float']:
-            errors.extend(SubmissionHandler._validate_numeric_field(field_name, value, field_config))
-        
-        elif field_type == 'boolean':
-            if not isinstance(value, bool):
-                label = field_config.get('label', field_name)
-                errors.append(f"'{label}' must be true or false")
-        
-        elif field_type == 'enum':
-            errors.extend(SubmissionHandler._validate_enum_field(field_name, value, field_config))
-        
-        elif field_type == 'date':
-            errors.extend(SubmissionHandler._validate_date_field(field_name, value, field_config))
-        
-        elif field_type == 'array':
-            errors.extend(SubmissionHandler._validate_array_field(field_name, value, field_config))
-        
-        elif field_type == 'object':
-            errors.extend(SubmissionHandler._validate_object_field(field_name, value, field_config))
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_field, field_config)(field_name, value)
     
     @staticmethod
     def _validate_string_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate string field."""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if not isinstance(value, str):
-            errors.append(f"'{label}' must be text")
-            return errors
-        
-        # Length validation
-        min_length = field_config.get('min_length')
-        max_length = field_config.get('max_length')
-        
-        if min_length is not None and len(value) < min_length:
-            errors.append(f"'{label}' must be at least {min_length} characters long")
-        
-        if max_length is not None and len(value) > max_length:
-            errors.append(f"'{label}' must be at most {max_length} characters long")
-        
-        # Pattern validation
-        pattern = field_config.get('pattern')
-        if pattern:
-            try:
-                if not re.match(pattern, value):
-                    errors.append(f"'{label}' format is invalid")
-            except re.error:
-                logger.error(f"Invalid regex pattern for field {field_name}: {pattern}")
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_string, field_config)(field_name, value)
     
     @staticmethod
     def _validate_scalar_item(item_path: str, value: Any, items_config: Dict[str, Any]) -> List[str]:
         """Validate individual scalar array item with enhanced error reporting"""
-        errors = []
-        item_type = items_config.get("type", "string")
-        
-        # Type validation
-        if item_type == "string":
-            if not isinstance(value, str):
-                errors.append(f"{item_path}: must be a string")
-                return errors
-            
-            # String constraints
-            min_length = items_config.get("min_length")
-            if min_length is not None and len(value) < min_length:
-                errors.append(f"{item_path}: must be at least {min_length} characters long")
-            
-            max_length = items_config.get("max_length")
-            if max_length is not None and len(value) > max_length:
-                errors.append(f"{item_path}: must be no more than {max_length} characters long")
-            
-            pattern = items_config.get("pattern")
-            if pattern and value:
-                try:
-                    if not re.match(pattern, value):
-                        errors.append(f"{item_path}: must match pattern {pattern}")
-                except re.error:
-                    logger.error(f"Invalid regex pattern for item {item_path}: {pattern}")
-        
-        elif item_type in ["number", "integer"]:
-            try:
-                numeric_value = float(value) if item_type == "number" else int(value)
-            except (ValueError, TypeError):
-                errors.append(f"{item_path}: must be a valid {item_type}")
-                return errors
-            
-            min_value = items_config.get("min_value")
-            if min_value is not None and numeric_value < min_value:
-                errors.append(f"{item_path}: must be at least {min_value}")
-            
-            max_value = items_config.get("max_value")
-            if max_value is not None and numeric_value > max_value:
-                errors.append(f"{item_path}: must be no more than {max_value}")
-        
-        elif item_type == "boolean":
-            if not isinstance(value, bool):
-                errors.append(f"{item_path}: must be a boolean")
-        
-        elif item_type == "date":
-            if isinstance(value, str):
-                try:
-                    datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    errors.append(f"{item_path}: must be a valid date in YYYY-MM-DD format")
-            elif not isinstance(value, date):
-                errors.append(f"{item_path}: must be a valid date")
-        
-        elif item_type == "enum":
-            choices = items_config.get("choices", [])
-            if value not in choices:
-                choices_str = ', '.join(str(c) for c in choices)
-                errors.append(f"{item_path}: must be one of: {choices_str}")
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_scalar, items_config)(item_path, value)
     
     @staticmethod
     def _validate_numeric_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate numeric field."""
-        errors = []
-        label = field_config.get('label', field_name)
-        field_type = field_config.get('type', 'number')
-        
-        # Type checking
-        if field_type == 'integer':
-            if not isinstance(value, int):
-                try:
-                    value = int(value)
-                except (ValueError, TypeError):
-                    errors.append(f"'{label}' must be a whole number")
-                    return errors
-        else:
-            if not isinstance(value, (int, float)):
-                try:
-                    value = float(value)
-                except (ValueError, TypeError):
-                    errors.append(f"'{label}' must be a number")
-                    return errors
-        
-        # Range validation
-        min_value = field_config.get('min_value')
-        max_value = field_config.get('max_value')
-        
-        if min_value is not None and value < min_value:
-            errors.append(f"'{label}' must be at least {min_value}")
-        
-        if max_value is not None and value > max_value:
-            errors.append(f"'{label}' must be at most {max_value}")
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_numeric, field_config)(field_name, value)
     
     @staticmethod
     def _validate_enum_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate enum field."""
-        errors = []
-        label = field_config.get('label', field_name)
-        choices = field_config.get('choices', [])
-        
-        if value not in choices:
-            choices_str = ', '.join(str(c) for c in choices)
-            errors.append(f"'{label}' must be one of: {choices_str}")
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_enum, field_config)(field_name, value)
     
     @staticmethod
     def _validate_date_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate date field."""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if value is None:
-            return errors
-        
-        # Check for various date-like objects
-        if isinstance(value, str):
-            try:
-                datetime.fromisoformat(value.replace('Z', '+00:00'))
-            except ValueError:
-                errors.append(f"'{label}' must be a valid date")
-        else:
-            # Check if it has date-like attributes (works for both date and datetime)
-            if not (hasattr(value, 'year') and hasattr(value, 'month') and hasattr(value, 'day')):
-                errors.append(f"'{label}' must be a valid date")
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_date, field_config)(field_name, value)
     
     @staticmethod
     def _validate_array_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate array field with enhanced item validation."""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if not isinstance(value, list):
-            errors.append(f"'{label}' must be a list")
-            return errors
-        
-        # Validate array items if item schema is provided
-        items_config = field_config.get('items')
-        if items_config:
-            items_type = items_config.get('type')
-            
-            for i, item in enumerate(value):
-                item_path = f"{field_name}[{i}]"
-                
-                if items_type == "object":
-                    # Validate object items
-                    properties = items_config.get("properties", {})
-                    if not isinstance(item, dict):
-                        errors.append(f"{item_path}: must be an object")
-                        continue
-                    
-                    # Validate object properties
-                    for prop_name, prop_config in properties.items():
-                        prop_path = f"{item_path}.{prop_name}"
-                        prop_value = item.get(prop_name)
-                        prop_errors = SubmissionHandler._validate_field(prop_path, prop_value, prop_config)
-                        errors.extend(prop_errors)
-                else:
-                    # Validate scalar items using enhanced validation
-                    item_errors = SubmissionHandler._validate_scalar_item(item_path, item, items_config)
-                    errors.extend(item_errors)
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_array, field_config)(field_name, value)
     
     @staticmethod
     def _validate_object_field(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[str]:
         """Validate object field."""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if not isinstance(value, dict):
-            errors.append(f"'{label}' must be an object")
-            return errors
-        
-        # Validate object properties if schema is provided
-        properties = field_config.get('properties', {})
-        for prop_name, prop_config in properties.items():
-            prop_value = value.get(prop_name)
-            prop_errors = SubmissionHandler._validate_field(f"{field_name}.{prop_name}", prop_value, prop_config)
-            errors.extend(prop_errors)
-        
-        return errors
+        return vc.get_validator(vc.build_legacy_object, field_config)(field_name, value)
     
     @staticmethod
     def _validate_business_rules(form_data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
-        """Apply business logic validation rules."""
-        errors = []
+        """
+        Apply the schema's declarative business rules (see utils.business_rules).
         
+        Schemas without a 'business_rules' section get the default invoice rules.
+        """
         try:
-            # Example business rules - customize based on your needs
-            
-            # Invoice-specific validations
-            if 'invoice_amount' in form_data and 'subtotal' in form_data:
-                invoice_amount = form_data.get('invoice_amount')
-                subtotal = form_data.get('subtotal')
-                
-                if isinstance(invoice_amount, (int, float)) and isinstance(subtotal, (int, float)):
-                    if invoice_amount < subtotal:
-                        errors.append("Invoice amount cannot be less than subtotal")
-            
-            # Date consistency checks
-            if 'invoice_date' in form_data and 'due_date' in form_data:
-                invoice_date = form_data.get('invoice_date')
-                due_date = form_data.get('due_date')
-                
-                if invoice_date and due_date:
-                    try:
-                        if isinstance(invoice_date, str):
-                            invoice_dt = datetime.fromisoformat(invoice_date.replace('Z', '+00:00'))
-                        else:
-                            invoice_dt = datetime.combine(invoice_date, datetime.min.time())
-                        
-                        if isinstance(due_date, str):
-                            due_dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                        else:
-                            due_dt = datetime.combine(due_date, datetime.min.time())
-                        
-                        if due_dt < invoice_dt:
-                            errors.append("Due date cannot be before invoice date")
-                    
-                    except (ValueError, AttributeError):
-                        # Date parsing errors are handled by field validation
-                        pass
-            
-            # Tax calculation validation
-            if all(k in form_data for k in ['subtotal', 'tax_amount', 'invoice_amount']):
-                subtotal = form_data.get('subtotal')
-                tax_amount = form_data.get('tax_amount')
-                invoice_amount = form_data.get('invoice_amount')
-                
-                # Ensure values are present (not None) before attempting conversion.
-                if subtotal is None or tax_amount is None or invoice_amount is None:
-                    # Let field-level validation handle missing values; skip numeric rule here.
-                    subtotal_num = tax_amount_num = invoice_amount_num = None
-                else:
-                    # Convert to floats safely — guard against non-numeric values.
-                    try:
-                        subtotal_num = float(subtotal)
-                        tax_amount_num = float(tax_amount)
-                        invoice_amount_num = float(invoice_amount)
-                    except (TypeError, ValueError):
-                        # Non-numeric values should be caught by field validation elsewhere; skip this rule here.
-                        subtotal_num = tax_amount_num = invoice_amount_num = None
-                
-                if subtotal_num is not None and tax_amount_num is not None and invoice_amount_num is not None:
-                    expected_total = subtotal_num + tax_amount_num
-                    # Allow small rounding differences
-                    if abs(invoice_amount_num - expected_total) > 0.01:
-                        errors.append(f"Invoice amount ({invoice_amount_num}) should equal subtotal + tax ({expected_total})")
-        
+            return get_rule_set(schema).validate(form_data)
         except Exception as e:
             logger.error(f"Business rule validation error: {e}")
-            errors.append("Business rule validation failed")
-        
-        return errors
+            return ["Business rule validation failed"]
     
     @staticmethod
     def _validate_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Validate a single field with comprehensive error reporting"""
-        errors = []
-        field_type = field_config.get("type")
-        required = field_config.get("required", False)
-        label = field_config.get('label', field_name)
-        
-        # Check required fields
-        if required and (value is None or value == "" or (isinstance(value, list) and len(value) == 0)):
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Required Field",
-                "message": f"'{label}' is required but is missing or empty",
-                "suggestion": f"Provide a value for {label}"
-            })
-            return errors  # Don't continue validation if required field is missing
-        
-        # Skip validation if field is optional and empty
-        if not required and (value is None or value == ""):
-            return errors
-        
-        # Type-specific validation
-        if field_type == "array":
-            array_errors = SubmissionHandler._validate_array_field_comprehensive(field_name, value, field_config)
-            errors.extend(array_errors)
-        elif field_type == "string":
-            string_errors = SubmissionHandler._validate_string_field_comprehensive(field_name, value, field_config)
-            errors.extend(string_errors)
-        elif field_type in ["number", "integer"]:
-            numeric_errors = SubmissionHandler._validate_numeric_field_comprehensive(field_name, value, field_config)
-            errors.extend(numeric_errors)
-        elif field_type == "boolean":
-            boolean_errors = SubmissionHandler._validate_boolean_field_comprehensive(field_name, value, field_config)
-            errors.extend(boolean_errors)
-        elif field_type == "date":
-            date_errors = SubmissionHandler._validate_date_field_comprehensive(field_name, value, field_config)
-            errors.extend(date_errors)
-        elif field_type == "enum":
-            enum_errors = SubmissionHandler._validate_enum_field_comprehensive(field_name, value, field_config)
-            errors.extend(enum_errors)
-        
-        return errors
+        return vc.get_validator(vc.build_comprehensive_field, field_config)(field_name, value)
     
     @staticmethod
     def _validate_array_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for array fields"""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        # Check if value is actually an array
-        if not isinstance(value, list):
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Type Error",
-                "message": f"'{label}' must be an array, got {type(value).__name__}",
-                "suggestion": "Ensure the field contains a JSON array (e.g., [\"item1\", \"item2\"])"
-            })
-            return errors
-        
-        items_config = field_config.get("items", {})
-        items_type = items_config.get("type")
-        
-        # Validate each item in the array
-        for i, item in enumerate(value):
-            item_path = f"{field_name}[{i}]"
-            
-            if items_type == "object":
-                # Validate object items
-                properties = items_config.get("properties", {})
-                if not isinstance(item, dict):
-                    errors.append({
-                        "field_path": item_path,
-                        "error_type": "Type Error",
-                        "message": f"Array item at {item_path} must be an object, got {type(item).__name__}",
-                        "suggestion": "Ensure array items are JSON objects with properties"
-                    })
-                    continue
-                
-                # Validate object properties
-                for prop_name, prop_config in properties.items():
-                    prop_path = f"{item_path}.{prop_name}"
-                    prop_value = item.get(prop_name)
-                    prop_errors = SubmissionHandler._validate_field_comprehensive(prop_path, prop_value, prop_config)
-                    errors.extend(prop_errors)
-            else:
-                # Validate scalar items
-                item_errors = SubmissionHandler._validate_scalar_item_comprehensive(item_path, item, items_config)
-                errors.extend(item_errors)
-        
-        return errors
+        return vc.get_validator(vc.build_comprehensive_array, field_config)(field_name, value)
     
     @staticmethod
     def _validate_scalar_item_comprehensive(item_path: str, value: Any, items_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for scalar array items"""
-        errors = []
-        item_type = items_config.get("type", "string")
-        
-        # Type validation with detailed messages
-        if item_type == "string":
-            if not isinstance(value, str):
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Type Error",
-                    "message": f"Item at {item_path} must be a string, got {type(value).__name__}",
-                    "suggestion": "Ensure the value is enclosed in quotes"
-                })
-                return errors
-            
-            # String constraints
-            min_length = items_config.get("min_length")
-            if min_length is not None and len(value) < min_length:
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Length Constraint",
-                    "message": f"Item at {item_path} must be at least {min_length} characters long, got {len(value)}",
-                    "suggestion": f"Add more characters to reach minimum length of {min_length}"
-                })
-            
-            max_length = items_config.get("max_length")
-            if max_length is not None and len(value) > max_length:
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Length Constraint",
-                    "message": f"Item at {item_path} must be no more than {max_length} characters long, got {len(value)}",
-                    "suggestion": f"Shorten the text to {max_length} characters or less"
-                })
-            
-            pattern = items_config.get("pattern")
-            if pattern and value:
-                try:
-                    if not re.match(pattern, value):
-                        errors.append({
-                            "field_path": item_path,
-                            "error_type": "Pattern Constraint",
-                            "message": f"Item at {item_path} must match pattern '{pattern}', got '{value}'",
-                            "suggestion": f"Ensure the value follows the required pattern: {pattern}"
-                        })
-                except re.error:
-                    logger.error(f"Invalid regex pattern for item {item_path}: {pattern}")
-        
-        elif item_type in ["number", "integer"]:
-            try:
-                numeric_value = float(value) if item_type == "number" else int(value)
-            except (ValueError, TypeError):
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Type Error",
-                    "message": f"Item at {item_path} must be a valid {item_type}, got '{value}'",
-                    "suggestion": f"Provide a numeric value (e.g., 42 for integer, 42.5 for number)"
-                })
-                return errors
-            
-            min_value = items_config.get("min_value")
-            if min_value is not None and numeric_value < min_value:
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Range Constraint",
-                    "message": f"Item at {item_path} must be at least {min_value}, got {numeric_value}",
-                    "suggestion": f"Use a value of {min_value} or higher"
-                })
-            
-            max_value = items_config.get("max_value")
-            if max_value is not None and numeric_value > max_value:
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Range Constraint",
-                    "message": f"Item at {item_path} must be no more than {max_value}, got {numeric_value}",
-                    "suggestion": f"Use a value of {max_value} or lower"
-                })
-        
-        elif item_type == "boolean":
-            if not isinstance(value, bool):
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Type Error",
-                    "message": f"Item at {item_path} must be a boolean, got {type(value).__name__}",
-                    "suggestion": "Use true or false (without quotes)"
-                })
-        
-        elif item_type == "date":
-            if isinstance(value, str):
-                try:
-                    datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    errors.append({
-                        "field_path": item_path,
-                        "error_type": "Format Error",
-                        "message": f"Item at {item_path} must be a valid date in YYYY-MM-DD format, got '{value}'",
-                        "suggestion": "Use format like '2024-01-15'"
-                    })
-            elif not isinstance(value, date):
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Type Error",
-                    "message": f"Item at {item_path} must be a valid date, got {type(value).__name__}",
-                    "suggestion": "Use date format YYYY-MM-DD in quotes"
-                })
-        
-        elif item_type == "enum":
-            choices = items_config.get("choices", [])
-            if value not in choices:
-                choices_str = ', '.join(str(c) for c in choices)
-                errors.append({
-                    "field_path": item_path,
-                    "error_type": "Enum Constraint",
-                    "message": f"Item at {item_path} must be one of: {choices_str}, got '{value}'",
-                    "suggestion": f"Choose from the available options: {choices_str}"
-                })
-        
-        return errors
+        return vc.get_validator(vc.build_comprehensive_scalar, items_config)(item_path, value)
     
     @staticmethod
     def _validate_string_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for string fields"""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if not isinstance(value, str):
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Type Error",
-                "message": f"'{label}' must be a string, got {type(value).__name__}",
-                "suggestion": "Enclose the value in quotes"
-            })
-            return errors
-        
-        # Apply same string validation as scalar items
-        string_errors = SubmissionHandler._validate_scalar_item_comprehensive(field_name, value, field_config)
-        return string_errors
+        return vc.get_validator(vc.build_comprehensive_string, field_config)(field_name, value)
     
     @staticmethod
     def _validate_numeric_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for numeric fields"""
-        errors = []
-        label = field_config.get('label', field_name)
-        field_type = field_config.get('type', 'number')
-        
-        try:
-            numeric_value = float(value) if field_type == "number" else int(value)
-        except (ValueError, TypeError):
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Type Error",
-                "message": f"'{label}' must be a valid {field_type}, got '{value}'",
-                "suggestion": f"Provide a numeric value (e.g., 42 for integer, 42.5 for number)"
-            })
-            return errors
-        
-        # Apply same numeric validation as scalar items
-        numeric_errors = SubmissionHandler._validate_scalar_item_comprehensive(field_name, numeric_value, field_config)
-        return numeric_errors
+        return vc.get_validator(vc.build_comprehensive_numeric, field_config)(field_name, value)
     
     @staticmethod
     def _validate_boolean_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for boolean fields"""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if not isinstance(value, bool):
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Type Error",
-                "message": f"'{label}' must be a boolean, got {type(value).__name__}",
-                "suggestion": "Use true or false (without quotes)"
-            })
-        
-        return errors
+        return vc.get_validator(vc.build_comprehensive_boolean, field_config)(field_name, value)
     
     @staticmethod
     def _validate_date_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for date fields"""
-        errors = []
-        label = field_config.get('label', field_name)
-        
-        if isinstance(value, str):
-            try:
-                datetime.strptime(value, "%Y-%m-%d")
-            except ValueError:
-                errors.append({
-                    "field_path": field_name,
-                    "error_type": "Format Error",
-                    "message": f"'{label}' must be a valid date in YYYY-MM-DD format, got '{value}'",
-                    "suggestion": "Use format like '2024-01-15'"
-                })
-        elif not isinstance(value, date):
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Type Error",
-                "message": f"'{label}' must be a valid date, got {type(value).__name__}",
-                "suggestion": "Use date format YYYY-MM-DD in quotes"
-            })
-        
-        return errors
+        return vc.get_validator(vc.build_comprehensive_date, field_config)(field_name, value)
     
     @staticmethod
     def _validate_enum_field_comprehensive(field_name: str, value: Any, field_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Comprehensive validation for enum fields"""
-        errors = []
-        label = field_config.get('label', field_name)
-        choices = field_config.get('choices', [])
-        
-        if value not in choices:
-            choices_str = ', '.join(str(c) for c in choices)
-            errors.append({
-                "field_path": field_name,
-                "error_type": "Enum Constraint",
-                "message": f"'{label}' must be one of: {choices_str}, got '{value}'",
-                "suggestion": f"Choose from the available options: {choices_str}"
-            })
-        
-        return errors
+        return vc.get_validator(vc.build_comprehensive_enum, field_config)(field_name, value)
     
     @staticmethod
     def comprehensive_validate_data(data: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
         """
         Comprehensive validation of data against schema with detailed error reporting
         
+        Runs the schema's compiled validators (see utils.validator_compiler), which are
+        built once per schema and reused across calls.
+        
         Returns:
             Dict with 'is_valid' boolean and 'errors' list with detailed error information
         """
-        errors = []
-        fields = schema.get("fields", {})
-        
-        # Validate each field in the schema
-        for field_name, field_config in fields.items():
-            field_errors = SubmissionHandler._validate_field_comprehensive(field_name, data.get(field_name), field_config)
-            errors.extend(field_errors)
+        errors = vc.compile_schema(schema).validate_comprehensive(data)
         
         return {
             "is_valid": len(errors) == 0,
@@ -968,6 +539,7 @@ class SubmissionHandler:
             return False
     
     @staticmethod
+    @timed("SubmissionHandler.handle_streamlit_submission")
     def handle_streamlit_submission() -> bool:
         """Handle submission from Streamlit interface."""
         try:
@@ -1041,13 +613,13 @@ class SubmissionHandler:
             # Update session state with collected form data
             SessionManager.set_form_data(form_data)
             
-            # Process any fields that might be in session_state but weren't caught by the schema iteration
-            for key in st.session_state:
-                if key.startswith('field_'):
-                    field_name = key[6:]  # Remove 'field_' prefix
-                    if field_name not in form_data and st.session_state[key] is not None:
-                        form_data[field_name] = st.session_state[key]
-                        logger.debug(f"Added additional field {field_name} = {form_data[field_name]}")
+            # Pick up widgets rendered for the current form version that the schema loop missed
+            form_version = session_keys.current_version(st.session_state)
+            for field_name in session_keys.fields_for(st.session_state):
+                key = f"field_{field_name}_v{form_version}"
+                if field_name not in form_data and st.session_state.get(key) is not None:
+                    form_data[field_name] = st.session_state[key]
+                    logger.debug(f"Added additional field {field_name} = {form_data[field_name]}")
             
             # Build final payload restricted to schema fields and include schema_version
             schema_fields = st.session_state.get("schema_fields", set())
@@ -1083,8 +655,9 @@ class SubmissionHandler:
             # Persist merged form_data into session so UI reflects latest edits
             SessionManager.set_form_data(form_data)
 
-            # Run validation check first (as if "Validate Data" button was clicked)
-            validation_errors = SubmissionHandler._validate_submission_data(form_data, schema, model_class)
+            # Run validation check first (as if "Validate Data" button was clicked).
+            # validate_and_submit re-checks the same payload and hits the memoized result.
+            validation_errors = SubmissionHandler.validate_submission(form_data, schema, model_class)["errors"]
             if validation_errors:
                 # Throw error message and do not proceed to submit
                 logger.info(f"Submission blocked - validation errors for {filename}: {validation_errors}")
@@ -1108,6 +681,11 @@ class SubmissionHandler:
                 SessionManager._clear_file_state()
                 SessionManager.set_current_page('queue')
                 
+                # Warm the next document while the reviewer is back in the queue
+                from .prefetch import get_prefetcher
+                get_prefetcher().discard(filename)
+                get_prefetcher().prefetch_next(exclude=filename)
+                
                 Notify.success("Saved changes")
                 st.balloons()
                 return True
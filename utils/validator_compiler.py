@@ -0,0 +1,827 @@
+"""
+Schema validator compiler for JSON QA webapp.
+Turns schema field configurations into trees of prebuilt validation closures
+with precompiled regexes, cached by schema identity (and, for equal copies, by
+content) so repeated validations skip re-interpreting the schema dict.
+
+Three message dialects are compiled from the same schema:
+- comprehensive: detailed error dicts (SubmissionHandler.comprehensive_validate_data)
+- legacy: plain strings (SubmissionHandler._validate_against_schema)
+- form: inline widget messages (FormGenerator._validate_field_value and friends)
+"""
+
+import json
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime, date
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Validators take (field_path, value) and return a list of errors
+FieldValidator = Callable[[str, Any], List[Any]]
+
+# Compiled validators kept per process (keyed by kind + config content)
+MAX_CACHED_VALIDATORS = 512
+
+_validator_cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+# Fast path keyed by kind + id(config); entries hold the config so its id is not reused
+_identity_cache: "OrderedDict[Tuple[str, int, Tuple[Any, ...]], Tuple[Any, Any]]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _no_errors(path: str, value: Any) -> List[Any]:
+    return []
+
+
+def _compile_pattern(pattern: Optional[str]) -> Tuple[Optional[Pattern], bool]:
+    """Compile a schema regex once. Returns (compiled, is_invalid)."""
+    if not pattern:
+        return None, False
+    try:
+        return re.compile(pattern), False
+    except re.error:
+        logger.error(f"Invalid regex pattern in schema: {pattern}")
+        return None, True
+
+
+def _label_for(config: Dict[str, Any]) -> Callable[[str], Any]:
+    """Mirror config.get('label', field_path) without a dict lookup per call."""
+    if 'label' in config:
+        label = config['label']
+        return lambda path: label
+    return lambda path: path
+
+
+def _choices_text(choices: List[Any]) -> str:
+    return ', '.join(str(c) for c in choices)
+
+
+# ---------------------------------------------------------------------------
+# Comprehensive dialect (error dicts)
+# ---------------------------------------------------------------------------
+
+def _issue(path: str, error_type: str, message: str, suggestion: str) -> Dict[str, Any]:
+    return {
+        "field_path": path,
+        "error_type": error_type,
+        "message": message,
+        "suggestion": suggestion
+    }
+
+
+def build_comprehensive_scalar(items_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for a scalar value typed by items_config['type']."""
+    item_type = items_config.get("type", "string")
+
+    if item_type == "string":
+        min_length = items_config.get("min_length")
+        max_length = items_config.get("max_length")
+        pattern_text = items_config.get("pattern")
+        pattern, _ = _compile_pattern(pattern_text)
+
+        def validate_string(path: str, value: Any) -> List[Dict[str, Any]]:
+            if not isinstance(value, str):
+                return [_issue(path, "Type Error",
+                               f"Item at {path} must be a string, got {type(value).__name__}",
+                               "Ensure the value is enclosed in quotes")]
+            errors = []
+            if min_length is not None and len(value) < min_length:
+                errors.append(_issue(path, "Length Constraint",
+                                     f"Item at {path} must be at least {min_length} characters long, got {len(value)}",
+                                     f"Add more characters to reach minimum length of {min_length}"))
+            if max_length is not None and len(value) > max_length:
+                errors.append(_issue(path, "Length Constraint",
+                                     f"Item at {path} must be no more than {max_length} characters long, got {len(value)}",
+                                     f"Shorten the text to {max_length} characters or less"))
+            if pattern is not None and value and not pattern.match(value):
+                errors.append(_issue(path, "Pattern Constraint",
+                                     f"Item at {path} must match pattern '{pattern_text}', got '{value}'",
+                                     f"Ensure the value follows the required pattern: {pattern_text}"))
+            return errors
+
+        return validate_string
+
+    if item_type in ("number", "integer"):
+        convert = float if item_type == "number" else int
+        min_value = items_config.get("min_value")
+        max_value = items_config.get("max_value")
+
+        def validate_numeric(path: str, value: Any) -> List[Dict[str, Any]]:
+            try:
+                numeric_value = convert(value)
+            except (ValueError, TypeError):
+                return [_issue(path, "Type Error",
+                               f"Item at {path} must be a valid {item_type}, got '{value}'",
+                               "Provide a numeric value (e.g., 42 for integer, 42.5 for number)")]
+            errors = []
+            if min_value is not None and numeric_value < min_value:
+                errors.append(_issue(path, "Range Constraint",
+                                     f"Item at {path} must be at least {min_value}, got {numeric_value}",
+                                     f"Use a value of {min_value} or higher"))
+            if max_value is not None and numeric_value > max_value:
+                errors.append(_issue(path, "Range Constraint",
+                                     f"Item at {path} must be no more than {max_value}, got {numeric_value}",
+                                     f"Use a value of {max_value} or lower"))
+            return errors
+
+        return validate_numeric
+
+    if item_type == "boolean":
+        def validate_boolean(path: str, value: Any) -> List[Dict[str, Any]]:
+            if isinstance(value, bool):
+                return []
+            return [_issue(path, "Type Error",
+                           f"Item at {path} must be a boolean, got {type(value).__name__}",
+                           "Use true or false (without quotes)")]
+
+        return validate_boolean
+
+    if item_type == "date":
+        def validate_date(path: str, value: Any) -> List[Dict[str, Any]]:
+            if isinstance(value, str):
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    return [_issue(path, "Format Error",
+                                   f"Item at {path} must be a valid date in YYYY-MM-DD format, got '{value}'",
+                                   "Use format like '2024-01-15'")]
+                return []
+            if not isinstance(value, date):
+                return [_issue(path, "Type Error",
+                               f"Item at {path} must be a valid date, got {type(value).__name__}",
+                               "Use date format YYYY-MM-DD in quotes")]
+            return []
+
+        return validate_date
+
+    if item_type == "enum":
+        choices = items_config.get("choices", [])
+        choices_str = _choices_text(choices)
+
+        def validate_enum(path: str, value: Any) -> List[Dict[str, Any]]:
+            if value in choices:
+                return []
+            return [_issue(path, "Enum Constraint",
+                           f"Item at {path} must be one of: {choices_str}, got '{value}'",
+                           f"Choose from the available options: {choices_str}")]
+
+        return validate_enum
+
+    return _no_errors
+
+
+def build_comprehensive_string(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for a string field."""
+    label_for = _label_for(field_config)
+    scalar = build_comprehensive_scalar(field_config)
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        if not isinstance(value, str):
+            return [_issue(path, "Type Error",
+                           f"'{label_for(path)}' must be a string, got {type(value).__name__}",
+                           "Enclose the value in quotes")]
+        return scalar(path, value)
+
+    return validate
+
+
+def build_comprehensive_numeric(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for a number/integer field."""
+    label_for = _label_for(field_config)
+    field_type = field_config.get('type', 'number')
+    convert = float if field_type == "number" else int
+    scalar = build_comprehensive_scalar(field_config)
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        try:
+            numeric_value = convert(value)
+        except (ValueError, TypeError):
+            return [_issue(path, "Type Error",
+                           f"'{label_for(path)}' must be a valid {field_type}, got '{value}'",
+                           "Provide a numeric value (e.g., 42 for integer, 42.5 for number)")]
+        return scalar(path, numeric_value)
+
+    return validate
+
+
+def build_comprehensive_boolean(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for a boolean field."""
+    label_for = _label_for(field_config)
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        if isinstance(value, bool):
+            return []
+        return [_issue(path, "Type Error",
+                       f"'{label_for(path)}' must be a boolean, got {type(value).__name__}",
+                       "Use true or false (without quotes)")]
+
+    return validate
+
+
+def build_comprehensive_date(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for a date field."""
+    label_for = _label_for(field_config)
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        if isinstance(value, str):
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                return [_issue(path, "Format Error",
+                               f"'{label_for(path)}' must be a valid date in YYYY-MM-DD format, got '{value}'",
+                               "Use format like '2024-01-15'")]
+            return []
+        if not isinstance(value, date):
+            return [_issue(path, "Type Error",
+                           f"'{label_for(path)}' must be a valid date, got {type(value).__name__}",
+                           "Use date format YYYY-MM-DD in quotes")]
+        return []
+
+    return validate
+
+
+def build_comprehensive_enum(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for an enum field."""
+    label_for = _label_for(field_config)
+    choices = field_config.get('choices', [])
+    choices_str = _choices_text(choices)
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        if value in choices:
+            return []
+        return [_issue(path, "Enum Constraint",
+                       f"'{label_for(path)}' must be one of: {choices_str}, got '{value}'",
+                       f"Choose from the available options: {choices_str}")]
+
+    return validate
+
+
+def build_comprehensive_array(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for an array field and its items."""
+    label_for = _label_for(field_config)
+    items_config = field_config.get("items") or {}
+
+    if items_config.get("type") == "object":
+        property_validators = [
+            (prop_name, build_comprehensive_field(prop_config))
+            for prop_name, prop_config in (items_config.get("properties") or {}).items()
+        ]
+
+        def validate_item(item_path: str, item: Any) -> List[Dict[str, Any]]:
+            if not isinstance(item, dict):
+                return [_issue(item_path, "Type Error",
+                               f"Array item at {item_path} must be an object, got {type(item).__name__}",
+                               "Ensure array items are JSON objects with properties")]
+            errors = []
+            for prop_name, prop_validator in property_validators:
+                errors.extend(prop_validator(f"{item_path}.{prop_name}", item.get(prop_name)))
+            return errors
+    else:
+        validate_item = build_comprehensive_scalar(items_config)
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        if not isinstance(value, list):
+            return [_issue(path, "Type Error",
+                           f"'{label_for(path)}' must be an array, got {type(value).__name__}",
+                           "Ensure the field contains a JSON array (e.g., [\"item1\", \"item2\"])")]
+        errors = []
+        for i, item in enumerate(value):
+            errors.extend(validate_item(f"{path}[{i}]", item))
+        return errors
+
+    return validate
+
+
+_COMPREHENSIVE_TYPE_BUILDERS = {
+    "array": build_comprehensive_array,
+    "string": build_comprehensive_string,
+    "number": build_comprehensive_numeric,
+    "integer": build_comprehensive_numeric,
+    "boolean": build_comprehensive_boolean,
+    "date": build_comprehensive_date,
+    "enum": build_comprehensive_enum,
+}
+
+
+def build_comprehensive_field(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile comprehensive validation for a field, including required checks."""
+    label_for = _label_for(field_config)
+    required = field_config.get("required", False)
+    builder = _COMPREHENSIVE_TYPE_BUILDERS.get(field_config.get("type"))
+    type_validator = builder(field_config) if builder else _no_errors
+
+    def validate(path: str, value: Any) -> List[Dict[str, Any]]:
+        if required and (value is None or value == "" or (isinstance(value, list) and len(value) == 0)):
+            label = label_for(path)
+            return [_issue(path, "Required Field",
+                           f"'{label}' is required but is missing or empty",
+                           f"Provide a value for {label}")]
+        if not required and (value is None or value == ""):
+            return []
+        return type_validator(path, value)
+
+    return validate
+
+
+# ---------------------------------------------------------------------------
+# Legacy dialect (plain strings)
+# ---------------------------------------------------------------------------
+
+def build_legacy_scalar(items_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for a scalar array item."""
+    item_type = items_config.get("type", "string")
+
+    if item_type == "string":
+        min_length = items_config.get("min_length")
+        max_length = items_config.get("max_length")
+        pattern_text = items_config.get("pattern")
+        pattern, _ = _compile_pattern(pattern_text)
+
+        def validate_string(path: str, value: Any) -> List[str]:
+            if not isinstance(value, str):
+                return [f"{path}: must be a string"]
+            errors = []
+            if min_length is not None and len(value) < min_length:
+                errors.append(f"{path}: must be at least {min_length} characters long")
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{path}: must be no more than {max_length} characters long")
+            if pattern is not None and value and not pattern.match(value):
+                errors.append(f"{path}: must match pattern {pattern_text}")
+            return errors
+
+        return validate_string
+
+    if item_type in ("number", "integer"):
+        convert = float if item_type == "number" else int
+        min_value = items_config.get("min_value")
+        max_value = items_config.get("max_value")
+
+        def validate_numeric(path: str, value: Any) -> List[str]:
+            try:
+                numeric_value = convert(value)
+            except (ValueError, TypeError):
+                return [f"{path}: must be a valid {item_type}"]
+            errors = []
+            if min_value is not None and numeric_value < min_value:
+                errors.append(f"{path}: must be at least {min_value}")
+            if max_value is not None and numeric_value > max_value:
+                errors.append(f"{path}: must be no more than {max_value}")
+            return errors
+
+        return validate_numeric
+
+    if item_type == "boolean":
+        return lambda path, value: [] if isinstance(value, bool) else [f"{path}: must be a boolean"]
+
+    if item_type == "date":
+        def validate_date(path: str, value: Any) -> List[str]:
+            if isinstance(value, str):
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    return [f"{path}: must be a valid date in YYYY-MM-DD format"]
+                return []
+            if not isinstance(value, date):
+                return [f"{path}: must be a valid date"]
+            return []
+
+        return validate_date
+
+    if item_type == "enum":
+        choices = items_config.get("choices", [])
+        choices_str = _choices_text(choices)
+        return lambda path, value: [] if value in choices else [f"{path}: must be one of: {choices_str}"]
+
+    return _no_errors
+
+
+def build_legacy_string(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for a string field."""
+    label_for = _label_for(field_config)
+    min_length = field_config.get('min_length')
+    max_length = field_config.get('max_length')
+    pattern, _ = _compile_pattern(field_config.get('pattern'))
+
+    def validate(path: str, value: Any) -> List[str]:
+        label = label_for(path)
+        if not isinstance(value, str):
+            return [f"'{label}' must be text"]
+        errors = []
+        if min_length is not None and len(value) < min_length:
+            errors.append(f"'{label}' must be at least {min_length} characters long")
+        if max_length is not None and len(value) > max_length:
+            errors.append(f"'{label}' must be at most {max_length} characters long")
+        if pattern is not None and not pattern.match(value):
+            errors.append(f"'{label}' format is invalid")
+        return errors
+
+    return validate
+
+
+def build_legacy_numeric(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for a numeric field."""
+    label_for = _label_for(field_config)
+    is_integer = field_config.get('type', 'number') == 'integer'
+    min_value = field_config.get('min_value')
+    max_value = field_config.get('max_value')
+
+    def validate(path: str, value: Any) -> List[str]:
+        label = label_for(path)
+        if is_integer:
+            if not isinstance(value, int):
+                try:
+                    value = int(value)
+                except (ValueError, TypeError):
+                    return [f"'{label}' must be a whole number"]
+        elif not isinstance(value, (int, float)):
+            try:
+                value = float(value)
+            except (ValueError, TypeError):
+                return [f"'{label}' must be a number"]
+        errors = []
+        if min_value is not None and value < min_value:
+            errors.append(f"'{label}' must be at least {min_value}")
+        if max_value is not None and value > max_value:
+            errors.append(f"'{label}' must be at most {max_value}")
+        return errors
+
+    return validate
+
+
+def build_legacy_enum(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for an enum field."""
+    label_for = _label_for(field_config)
+    choices = field_config.get('choices', [])
+    choices_str = _choices_text(choices)
+    return lambda path, value: [] if value in choices else [f"'{label_for(path)}' must be one of: {choices_str}"]
+
+
+def build_legacy_date(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for a date field."""
+    label_for = _label_for(field_config)
+
+    def validate(path: str, value: Any) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            try:
+                datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                return [f"'{label_for(path)}' must be a valid date"]
+            return []
+        if not (hasattr(value, 'year') and hasattr(value, 'month') and hasattr(value, 'day')):
+            return [f"'{label_for(path)}' must be a valid date"]
+        return []
+
+    return validate
+
+
+def build_legacy_boolean(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for a boolean field."""
+    label_for = _label_for(field_config)
+    return lambda path, value: [] if isinstance(value, bool) else [f"'{label_for(path)}' must be true or false"]
+
+
+def build_legacy_array(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for an array field and its items."""
+    label_for = _label_for(field_config)
+    items_config = field_config.get('items')
+
+    if not items_config:
+        validate_item = None
+    elif items_config.get('type') == "object":
+        property_validators = [
+            (prop_name, build_legacy_field(prop_config))
+            for prop_name, prop_config in (items_config.get("properties") or {}).items()
+        ]
+
+        def validate_item(item_path: str, item: Any) -> List[str]:
+            if not isinstance(item, dict):
+                return [f"{item_path}: must be an object"]
+            errors = []
+            for prop_name, prop_validator in property_validators:
+                errors.extend(prop_validator(f"{item_path}.{prop_name}", item.get(prop_name)))
+            return errors
+    else:
+        validate_item = build_legacy_scalar(items_config)
+
+    def validate(path: str, value: Any) -> List[str]:
+        if not isinstance(value, list):
+            return [f"'{label_for(path)}' must be a list"]
+        if validate_item is None:
+            return []
+        errors = []
+        for i, item in enumerate(value):
+            errors.extend(validate_item(f"{path}[{i}]", item))
+        return errors
+
+    return validate
+
+
+def build_legacy_object(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for an object field and its properties."""
+    label_for = _label_for(field_config)
+    property_validators = [
+        (prop_name, build_legacy_field(prop_config))
+        for prop_name, prop_config in (field_config.get('properties') or {}).items()
+    ]
+
+    def validate(path: str, value: Any) -> List[str]:
+        if not isinstance(value, dict):
+            return [f"'{label_for(path)}' must be an object"]
+        errors = []
+        for prop_name, prop_validator in property_validators:
+            errors.extend(prop_validator(f"{path}.{prop_name}", value.get(prop_name)))
+        return errors
+
+    return validate
+
+
+_LEGACY_TYPE_BUILDERS = {
+    "string": build_legacy_string,
+    "number": build_legacy_numeric,
+    "integer": build_legacy_numeric,
+    "float": build_legacy_numeric,
+    "boolean": build_legacy_boolean,
+    "enum": build_legacy_enum,
+    "date": build_legacy_date,
+    "array": build_legacy_array,
+    "object": build_legacy_object,
+}
+
+
+def build_legacy_field(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile legacy validation for a field, including required checks."""
+    label_for = _label_for(field_config)
+    required = field_config.get('required', False)
+    has_min_length = field_config.get('min_length') is not None
+    builder = _LEGACY_TYPE_BUILDERS.get(field_config.get('type', 'string'))
+    type_validator = builder(field_config) if builder else _no_errors
+
+    def validate(path: str, value: Any) -> List[str]:
+        if required and (value is None or (isinstance(value, str) and value.strip() == '')):
+            return [f"'{label_for(path)}' is required"]
+        if value is None:
+            return []
+        if isinstance(value, str) and value.strip() == '' and not required and not has_min_length:
+            return []
+        return type_validator(path, value)
+
+    return validate
+
+
+# ---------------------------------------------------------------------------
+# Form dialect (inline widget messages)
+# ---------------------------------------------------------------------------
+
+def build_form_field(field_config: Dict[str, Any]) -> FieldValidator:
+    """Compile the form-level single field check used next to widgets."""
+    label_for = _label_for(field_config)
+    required = field_config.get('required', False)
+    field_type = field_config.get('type', 'string')
+    min_length = field_config.get('min_length')
+    max_length = field_config.get('max_length')
+    min_value = field_config.get('min_value')
+    max_value = field_config.get('max_value')
+    pattern, _ = _compile_pattern(field_config.get('pattern')) if field_type == 'string' else (None, False)
+    choices = field_config.get('choices', [])
+
+    def validate(path: str, value: Any) -> List[str]:
+        if required and (value is None or value == ''):
+            return [f"Field '{label_for(path)}' is required"]
+        if value is None or value == '':
+            return []
+
+        errors = []
+        if field_type == 'string':
+            if not isinstance(value, str):
+                return [f"Field '{path}' must be text"]
+            if min_length and len(value) < min_length:
+                errors.append(f"Field '{path}' must be at least {min_length} characters")
+            if max_length and len(value) > max_length:
+                errors.append(f"Field '{path}' must be at most {max_length} characters")
+            if pattern is not None and not pattern.match(value):
+                errors.append(f"Field '{path}' format is invalid")
+        elif field_type in ('number', 'integer', 'float'):
+            if not isinstance(value, (int, float)):
+                return [f"Field '{path}' must be a number"]
+            if min_value is not None and value < min_value:
+                errors.append(f"Field '{path}' must be at least {min_value}")
+            if max_value is not None and value > max_value:
+                errors.append(f"Field '{path}' must be at most {max_value}")
+        elif field_type == 'enum':
+            if value not in choices:
+                errors.append(f"Field '{path}' must be one of: {', '.join(map(str, choices))}")
+        return errors
+
+    return validate
+
+
+def build_form_scalar(items_config: Dict[str, Any], item_type: Optional[str] = None) -> FieldValidator:
+    """Compile the form-level scalar item check used by array editors."""
+    item_type = item_type or items_config.get("type", "string")
+
+    if item_type == "string":
+        min_length = items_config.get("min_length")
+        max_length = items_config.get("max_length")
+        pattern_text = items_config.get("pattern")
+        pattern, invalid_pattern = _compile_pattern(pattern_text)
+
+        def validate_string(path: str, value: Any) -> List[str]:
+            if not isinstance(value, str):
+                return [f"{path} must be a string"]
+            errors = []
+            if min_length is not None and len(value) < min_length:
+                errors.append(f"{path} must be at least {min_length} characters")
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{path} must be no more than {max_length} characters")
+            if invalid_pattern:
+                errors.append(f"{path} has invalid pattern: {pattern_text}")
+            elif pattern is not None and not pattern.match(value):
+                errors.append(f"{path} must match pattern: {pattern_text}")
+            return errors
+
+        return validate_string
+
+    if item_type in ("number", "integer"):
+        convert = float if item_type == "number" else int
+        min_value = items_config.get("min_value")
+        max_value = items_config.get("max_value")
+
+        def validate_numeric(path: str, value: Any) -> List[str]:
+            try:
+                numeric_value = convert(value)
+            except (ValueError, TypeError):
+                return [f"{path} must be a valid {item_type}"]
+            errors = []
+            if min_value is not None and numeric_value < min_value:
+                errors.append(f"{path} must be at least {min_value}")
+            if max_value is not None and numeric_value > max_value:
+                errors.append(f"{path} must be no more than {max_value}")
+            return errors
+
+        return validate_numeric
+
+    if item_type == "boolean":
+        return lambda path, value: [] if isinstance(value, bool) else [f"{path} must be a boolean"]
+
+    if item_type == "date":
+        def validate_date(path: str, value: Any) -> List[str]:
+            if isinstance(value, str):
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    return [f"{path} must be a valid date in YYYY-MM-DD format"]
+                return []
+            if not isinstance(value, date):
+                return [f"{path} must be a valid date"]
+            return []
+
+        return validate_date
+
+    if item_type == "enum":
+        choices = items_config.get("choices", [])
+        if not choices:
+            return _no_errors
+        choices_str = ', '.join(map(str, choices))
+        return lambda path, value: [] if value in choices else [f"{path} must be one of: {choices_str}"]
+
+    return _no_errors
+
+
+def build_form_object_item(properties: Dict[str, Dict[str, Any]]) -> FieldValidator:
+    """Compile the form-level check for one object row of an object array."""
+    property_checks = [
+        (prop_name, prop_config.get("required", False),
+         build_form_scalar(prop_config, prop_config.get("type", "string")))
+        for prop_name, prop_config in properties.items()
+    ]
+
+    def validate(item_path: str, obj: Dict[str, Any]) -> List[str]:
+        errors = []
+        for prop_name, required, check in property_checks:
+            value = obj.get(prop_name)
+            if required and (value is None or value == ""):
+                errors.append(f"{item_path}.{prop_name}: is required")
+                continue
+            if value is None:
+                continue
+            errors.extend(check(f"{item_path}.{prop_name}", value))
+        return errors
+
+    return validate
+
+
+# ---------------------------------------------------------------------------
+# Caching
+# ---------------------------------------------------------------------------
+
+def _fingerprint(config: Any) -> str:
+    try:
+        return json.dumps(config, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return repr(config)
+
+
+def get_validator(builder: Callable[..., Any], config: Dict[str, Any], *args: Any) -> Any:
+    """
+    Return the compiled validator for `config`, building it at most once.
+
+    Repeat lookups with the same config object are served by identity, without
+    serializing it; loaded schemas are not modified in place, so an object always
+    compiles to the same validator. Other objects are matched by content, so equal
+    copies (e.g. each session's copy of a schema) share a validator.
+
+    Args:
+        builder: One of the build_* functions in this module
+        config: Field, items or properties configuration to compile
+        *args: Extra builder arguments (e.g. item type)
+
+    Returns:
+        The compiled validator
+    """
+    try:
+        identity = (builder.__name__, id(config), args)
+        entry = _identity_cache.get(identity)
+    except TypeError:  # unhashable extra arguments
+        identity, entry = None, None
+    if entry is not None and entry[0] is config:
+        _cache_stats["hits"] += 1
+        return entry[1]
+
+    key = (builder.__name__, _fingerprint([config, *args]))
+    compiled = _validator_cache.get(key)
+    if compiled is not None:
+        _cache_stats["hits"] += 1
+        _validator_cache.move_to_end(key)
+    else:
+        _cache_stats["misses"] += 1
+        compiled = builder(config, *args)
+        _validator_cache[key] = compiled
+        while len(_validator_cache) > MAX_CACHED_VALIDATORS:
+            _validator_cache.popitem(last=False)
+
+    if identity is not None:
+        _identity_cache[identity] = (config, compiled)
+        while len(_identity_cache) > MAX_CACHED_VALIDATORS:
+            _identity_cache.popitem(last=False)
+    return compiled
+
+
+class CompiledSchema:
+    """Prebuilt validators for every field of a schema."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.fields: Dict[str, Dict[str, Any]] = dict(schema.get("fields", {}) or {})
+        self._comprehensive: Optional[List[Tuple[str, FieldValidator]]] = None
+        self._legacy: Optional[List[Tuple[str, FieldValidator]]] = None
+
+    @property
+    def comprehensive_validators(self) -> List[Tuple[str, FieldValidator]]:
+        if self._comprehensive is None:
+            self._comprehensive = [
+                (name, build_comprehensive_field(config)) for name, config in self.fields.items()
+            ]
+        return self._comprehensive
+
+    @property
+    def legacy_validators(self) -> List[Tuple[str, FieldValidator]]:
+        if self._legacy is None:
+            self._legacy = [
+                (name, build_legacy_field(config)) for name, config in self.fields.items()
+            ]
+        return self._legacy
+
+    def validate_comprehensive(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run comprehensive validation over every schema field."""
+        errors: List[Dict[str, Any]] = []
+        for name, validator in self.comprehensive_validators:
+            errors.extend(validator(name, data.get(name)))
+        return errors
+
+    def validate_legacy(self, data: Dict[str, Any]) -> List[str]:
+        """Run legacy validation over every schema field."""
+        errors: List[str] = []
+        for name, validator in self.legacy_validators:
+            errors.extend(validator(name, data.get(name)))
+        return errors
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    """Return the cached CompiledSchema for a schema dict."""
+    return get_validator(CompiledSchema, schema)
+
+
+def clear_validator_cache() -> None:
+    """Drop all compiled validators (e.g. after schema files change on disk)."""
+    _validator_cache.clear()
+    _identity_cache.clear()
+    _cache_stats["hits"] = 0
+    _cache_stats["misses"] = 0
+
+
+def get_validator_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters and current size of the validator cache."""
+    return {**_cache_stats, "size": len(_validator_cache)}